@@ -3,10 +3,12 @@ from flask_cors import CORS
 from flask_security import Security, SQLAlchemyUserDatastore
 
 from database import db
+from db_profile import apply_database_profile
 from models import Users, Roles
 from routes.auth import auth_bp
 from routes.project import project_bp
 from routes.task import task_bp
+from routes.nl_task import nl_task_bp
 from routes.team import team_bp
 from routes.discussion import discussion_bp
 from routes.custom_status import custom_status_bp
@@ -14,17 +16,23 @@ from routes.notifications import notifications_bp
 from routes.analytics import analytics_bp
 from routes.budget import budget_bp
 from routes.expense import expense_bp
+from routes.search import search_bp
+from routes.export import export_bp
+from routes.blobs import blobs_bp
+from routes.assignment import assignment_bp
+import task_history  # noqa: F401 - records task_events on every task write
 
-def create_app():
+def create_app(process_type=None):
     app = Flask(__name__)
     app.config.from_object('config.Config')
+    # WAL/pragmas for SQLite and pool sizing for this kind of process
+    apply_database_profile(app, process_type)
     CORS(app, 
          supports_credentials=True, 
          origins=["http://localhost:5173", "http://localhost:5174"],
          allow_headers=["Content-Type", "Authorization"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 
-
     db.init_app(app)
 
     # Flask-Security setup
@@ -35,6 +43,7 @@ def create_app():
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(project_bp, url_prefix='/api/projects')
     app.register_blueprint(task_bp, url_prefix='/api/tasks')
+    app.register_blueprint(nl_task_bp, url_prefix='/api/tasks')
     app.register_blueprint(team_bp, url_prefix='/api/team')
     app.register_blueprint(discussion_bp, url_prefix='/api/discussions')
     app.register_blueprint(custom_status_bp, url_prefix='/api/custom-status')
@@ -42,6 +51,10 @@ def create_app():
     app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
     app.register_blueprint(budget_bp, url_prefix='/api/budget')
     app.register_blueprint(expense_bp, url_prefix='/api/expenses')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    app.register_blueprint(blobs_bp, url_prefix='/api/blobs')
+    app.register_blueprint(assignment_bp, url_prefix='/api/assignment')
 
     return app
 
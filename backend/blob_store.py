@@ -0,0 +1,271 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from database import db
+from models import Blob, Expense, Projects, Tasks, TeamMembers
+from config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BlobError(ValueError):
+    """An upload that cannot be stored"""
+
+
+class BlobStore:
+    """
+    Content-Addressed File Storage
+
+    Uploads (expense receipts, project images) are stored once per distinct
+    content:
+    1. Upload: the stream is copied to a temp file in BLOB_CHUNK_SIZE chunks
+       while its SHA-256 is computed, so memory use does not depend on file
+       size; uploads over BLOB_MAX_SIZE are rejected part way
+    2. Address: the file moves to <root>/<aa>/<bb>/<sha256>. If that file is
+       already there the upload is a duplicate and the temp file is dropped
+    3. Thumbnails: generated on first request by a small thread pool and
+       kept next to the originals; concurrent requests for the same
+       thumbnail share one render
+
+    The type is detected from the file's leading bytes, not the client's
+    Content-Type. Stored files never change, so they are served with
+    long-lived immutable cache headers and the hash as ETag.
+
+    Knowing a hash is not enough to read a file: see can_read.
+    """
+
+    # Leading bytes -> content type accepted for storage
+    SIGNATURES = (
+        (b'\xff\xd8\xff', 'image/jpeg'),
+        (b'\x89PNG\r\n\x1a\n', 'image/png'),
+        (b'GIF87a', 'image/gif'),
+        (b'GIF89a', 'image/gif'),
+        (b'%PDF-', 'application/pdf'),
+    )
+    THUMBNAIL_SIZES = (128, 256, 512)
+    DEFAULT_THUMBNAIL_SIZE = 256
+
+    _SHA256 = re.compile(r'^[0-9a-f]{64}$')
+    _URL_HASH = re.compile(r'/api/blobs/([0-9a-fA-F]{64})')
+
+    _executor = None
+    _pending = {}  # thumbnail path -> Future
+    _lock = threading.RLock()  # done-callbacks may run while it is held
+
+    # ---------- paths ----------
+
+    @staticmethod
+    def is_valid_hash(sha256: str) -> bool:
+        return bool(BlobStore._SHA256.match(sha256 or ''))
+
+    @staticmethod
+    def path_for(sha256: str) -> str:
+        return os.path.join(Config.BLOB_STORAGE_DIR, sha256[:2], sha256[2:4], sha256)
+
+    @staticmethod
+    def thumbnail_path_for(sha256: str, size: int) -> str:
+        return os.path.join(Config.BLOB_STORAGE_DIR, 'thumbs', str(size), sha256[:2], f"{sha256}.jpg")
+
+    @staticmethod
+    def url_for(sha256: str) -> str:
+        return f"/api/blobs/{sha256}"
+
+    @classmethod
+    def hash_in_url(cls, url) -> Optional[str]:
+        """The sha256 a /api/blobs/... URL points at, or None for any other URL"""
+        match = cls._URL_HASH.search(url) if isinstance(url, str) else None
+        return match.group(1).lower() if match else None
+
+    @classmethod
+    def describe(cls, blob: Blob, deduplicated: bool = False) -> dict:
+        info = {
+            "sha256": blob.sha256,
+            "size": blob.size,
+            "content_type": blob.content_type,
+            "url": cls.url_for(blob.sha256),
+            "thumbnail_url": None,
+            "deduplicated": deduplicated,
+        }
+        if blob.content_type.startswith('image/'):
+            info["thumbnail_url"] = f"{cls.url_for(blob.sha256)}/thumbnail"
+        return info
+
+    # ---------- access ----------
+
+    @classmethod
+    def can_read(cls, blob: Blob, user_id: int) -> bool:
+        """
+        Whether a user may download a blob: they uploaded it first, it is the
+        receipt of an expense they created or whose project (directly or
+        through its task) they are on, or it is the image of a project they
+        are on. Content is shared across uploads, so a later uploader of the
+        same bytes can read it once it is attached to one of their expenses.
+        """
+        if blob.created_by == user_id:
+            return True
+        url = cls.url_for(blob.sha256)
+        expense_project = db.func.coalesce(Expense.project_id, Tasks.project_id)
+        receipt = db.session.query(Expense.id).outerjoin(Tasks, Tasks.id == Expense.task_id).filter(
+            Expense.receipt_url == url,
+            db.or_(Expense.created_by == user_id, expense_project.in_(
+                db.session.query(TeamMembers.project_id).filter(TeamMembers.user_id == user_id)
+            )),
+        ).exists()
+        image = db.session.query(Projects.id).join(TeamMembers, TeamMembers.project_id == Projects.id).filter(
+            Projects.image_url == url, TeamMembers.user_id == user_id
+        ).exists()
+        return db.session.query(db.or_(receipt, image)).scalar()
+
+    @classmethod
+    def may_attach(cls, url, user_id: int) -> bool:
+        """
+        Whether a user may store url as a receipt: any URL that is not a
+        blob, or a blob they can already read. Attaching a hash they merely
+        know would otherwise make can_read grant them the file.
+        """
+        sha256 = cls.hash_in_url(url)
+        if sha256 is None:
+            return True
+        blob = Blob.query.filter_by(sha256=sha256).first()
+        return blob is not None and cls.can_read(blob, user_id)
+
+    # ---------- upload ----------
+
+    @classmethod
+    def save(cls, stream: BinaryIO, user_id: Optional[int] = None) -> Tuple[Blob, bool]:
+        """
+        Store an upload stream
+
+        Returns:
+            Tuple[Blob, bool]: the blob row and whether identical content was
+            already stored (nothing new was written)
+        """
+        tmp_dir = os.path.join(Config.BLOB_STORAGE_DIR, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+
+        digest = hashlib.sha256()
+        size, head = 0, b''
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = stream.read(Config.BLOB_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > Config.BLOB_MAX_SIZE:
+                        raise BlobError(f"File exceeds the {Config.BLOB_MAX_SIZE / (1024 * 1024):g} MB limit")
+                    if len(head) < 16:
+                        head = (head + chunk)[:16]
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            if not size:
+                raise BlobError("Empty upload")
+            content_type = cls.sniff(head)
+            if not content_type:
+                raise BlobError("Unsupported file type. Upload a JPEG, PNG, GIF, WebP or PDF")
+
+            sha256 = digest.hexdigest()
+            path = cls.path_for(sha256)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.chmod(tmp_path, 0o644)
+                # Atomic; a concurrent identical upload just replaces it with the same bytes
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        blob = Blob.query.filter_by(sha256=sha256).first()
+        if blob:
+            return blob, True
+        blob = Blob(sha256=sha256, size=size, content_type=content_type, created_by=user_id)
+        db.session.add(blob)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Same content uploaded concurrently; its row won
+            db.session.rollback()
+            return Blob.query.filter_by(sha256=sha256).one(), True
+        return blob, False
+
+    @classmethod
+    def sniff(cls, head: bytes) -> Optional[str]:
+        """Content type from a file's first bytes, or None if not accepted"""
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return 'image/webp'
+        for signature, content_type in cls.SIGNATURES:
+            if head.startswith(signature):
+                return content_type
+        return None
+
+    # ---------- thumbnails ----------
+
+    @classmethod
+    def thumbnail(cls, sha256: str, size: Optional[int] = None) -> str:
+        """
+        Path of a JPEG thumbnail (longest side `size` px), rendered on first use
+
+        Raises BlobError for sizes outside THUMBNAIL_SIZES or files Pillow
+        cannot read.
+        """
+        size = size or cls.DEFAULT_THUMBNAIL_SIZE
+        if size not in cls.THUMBNAIL_SIZES:
+            raise BlobError(f"Thumbnail size must be one of {', '.join(map(str, cls.THUMBNAIL_SIZES))}")
+        path = cls.thumbnail_path_for(sha256, size)
+        if os.path.exists(path):
+            return path
+
+        with cls._lock:
+            future = cls._pending.get(path)
+            if future is None:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=Config.BLOB_THUMBNAIL_WORKERS,
+                                                       thread_name_prefix='thumbnail')
+                future = cls._executor.submit(_render_thumbnail, cls.path_for(sha256), path, size)
+                cls._pending[path] = future
+                future.add_done_callback(lambda _: cls._forget(path))
+        try:
+            return future.result()
+        except BlobError:
+            raise
+        except Exception as e:
+            logger.warning(f"Thumbnail for {sha256} failed: {e}")
+            raise BlobError("Could not render a thumbnail for this file")
+
+    @classmethod
+    def _forget(cls, path: str) -> None:
+        with cls._lock:
+            cls._pending.pop(path, None)
+
+
+def _render_thumbnail(source: str, target: str, size: int) -> str:
+    """Runs on the thumbnail pool"""
+    from PIL import Image, ImageOps  # Loaded on first thumbnail, not at app startup
+
+    with Image.open(source) as image:
+        # JPEG decodes at reduced scale straight away
+        image.draft('RGB', (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.jpg')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                image.save(out, 'JPEG', quality=80, optimize=True)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return target
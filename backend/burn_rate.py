@@ -0,0 +1,186 @@
+from datetime import datetime, date, timedelta
+from statistics import NormalDist
+from typing import Dict, Optional
+from sqlalchemy import func
+from database import db
+from models import Budget, Expense
+from db_compat import date_of
+from cache import make_cache
+from config import Config
+
+
+class BurnRateForecaster:
+    """
+    Budget Burn-Rate Forecasting
+
+    Projects when a project's budget runs out from its spending history:
+    1. Daily spend series: expenses summed per day in SQL, expanded to a dense
+       zero-filled numpy array from the budget start (or first expense) to today
+    2. Burn rate: exponentially weighted mean of daily spend (recent days count
+       more; half-life BURN_RATE_HALF_LIFE_DAYS) with its standard error
+    3. Exhaustion date: remaining funds / burn rate, with a confidence band
+       from the rate's upper/lower bounds, compared against Budget.end_date
+
+    Forecasts are cached per project for the day and dropped by invalidate()
+    whenever the project's expenses or budgets change.
+    """
+
+    # Need at least this many days of history before fitting a rate
+    MIN_HISTORY_DAYS = 7
+
+    _cache = make_cache('burn_rate', maxsize=1024, ttl=Config.BURN_RATE_CACHE_TTL)
+
+    @classmethod
+    def _cache_key(cls, project_id: int, today: date) -> str:
+        return f"{project_id}:{today.isoformat()}"
+
+    @classmethod
+    def forecast(cls, project_id: int, today: Optional[date] = None) -> Dict:
+        """Cached forecast for a project (see compute())"""
+        today = today or datetime.utcnow().date()
+        key = cls._cache_key(project_id, today)
+        result = cls._cache.get(key)
+        if result is None:
+            result = cls.compute(project_id, today)
+            cls._cache.set(key, result)
+        return result
+
+    @classmethod
+    def invalidate(cls, project_id: Optional[int]) -> None:
+        """Drop a project's cached forecast after its expenses or budgets change"""
+        if project_id is not None:
+            cls._cache.delete(cls._cache_key(project_id, datetime.utcnow().date()))
+
+    @classmethod
+    def compute(cls, project_id: int, today: Optional[date] = None) -> Dict:
+        """
+        Fit the burn rate and project budget exhaustion
+
+        Returns:
+            Dict: JSON-ready forecast. Dates are ISO strings; exhaustion fields
+            are None when spending is flat (the budget never runs out at the
+            current rate) or there is not enough history.
+        """
+        import numpy as np  # Loaded on first forecast, not at app startup
+
+        today = today or datetime.utcnow().date()
+
+        budget = db.session.query(
+            func.sum(Budget.amount).label('total'),
+            func.min(Budget.start_date).label('start'),
+            func.max(Budget.end_date).label('end')
+        ).filter(Budget.project_id == project_id).one()
+
+        day = date_of(Expense.date)
+        rows = db.session.query(
+            day.label('day'),
+            func.sum(Expense.amount).label('amount')
+        ).filter(Expense.project_id == project_id).group_by(day).all()
+
+        total_budget = float(budget.total or 0)
+        end_date = _as_date(budget.end)
+        days = np.array([_as_date(r.day).toordinal() for r in rows], dtype=np.int64)
+        amounts = np.array([float(r.amount or 0) for r in rows], dtype=np.float64)
+        spent = float(amounts.sum())
+        remaining = total_budget - spent
+
+        result = {
+            "project_id": project_id,
+            "as_of": today.isoformat(),
+            "total_budget": total_budget,
+            "spent": spent,
+            "remaining": remaining,
+            "budget_end_date": end_date.isoformat() if end_date else None,
+            "history_days": 0,
+            "daily_burn_rate": 0.0,
+            "burn_rate_low": 0.0,
+            "burn_rate_high": 0.0,
+            "confidence": Config.BURN_RATE_CONFIDENCE,
+            "exhaustion_date": None,
+            "exhaustion_date_earliest": None,
+            "exhaustion_date_latest": None,
+            "projected_spend_at_end": None,
+            "overrun_probability": None,
+            "status": "no_budget" if total_budget <= 0 else "insufficient_data",
+        }
+        if not len(rows):
+            return result
+
+        # Dense daily series; future-dated expenses count as spent today
+        start = min(int(days.min()), _as_date(budget.start).toordinal() if budget.start else int(days.min()))
+        start = min(start, today.toordinal())
+        offsets = np.clip(days, start, today.toordinal()) - start
+        series = np.bincount(offsets, weights=amounts, minlength=today.toordinal() - start + 1)
+        history_days = len(series)
+        result["history_days"] = history_days
+        if history_days < cls.MIN_HISTORY_DAYS:
+            return result
+
+        # Exponentially weighted mean/variance of daily spend
+        age = np.arange(history_days - 1, -1, -1, dtype=np.float64)
+        weights = 0.5 ** (age / Config.BURN_RATE_HALF_LIFE_DAYS)
+        weight_sum = weights.sum()
+        rate = float(np.dot(weights, series) / weight_sum)
+        variance = float(np.dot(weights, (series - rate) ** 2) / weight_sum)
+        effective_n = weight_sum ** 2 / float(np.dot(weights, weights))
+        std_error = (variance / effective_n) ** 0.5
+
+        z = NormalDist().inv_cdf(0.5 + Config.BURN_RATE_CONFIDENCE / 2)
+        rate_low, rate_high = max(0.0, rate - z * std_error), rate + z * std_error
+        result.update(
+            daily_burn_rate=round(rate, 2),
+            burn_rate_low=round(rate_low, 2),
+            burn_rate_high=round(rate_high, 2),
+        )
+
+        if total_budget <= 0:
+            return result
+        if remaining <= 0:
+            result.update(status="exhausted", exhaustion_date=today.isoformat(),
+                          exhaustion_date_earliest=today.isoformat(), exhaustion_date_latest=today.isoformat())
+            return result
+
+        # Faster burn -> earlier exhaustion, so the high rate gives the earliest date
+        result.update(
+            exhaustion_date=_days_ahead(today, remaining, rate),
+            exhaustion_date_earliest=_days_ahead(today, remaining, rate_high),
+            exhaustion_date_latest=_days_ahead(today, remaining, rate_low),
+        )
+
+        if end_date and end_date > today:
+            days_left = (end_date - today).days
+            required_rate = remaining / days_left
+            result["projected_spend_at_end"] = round(spent + rate * days_left, 2)
+            if std_error > 0:
+                probability = 1 - NormalDist(rate, std_error).cdf(required_rate)
+            else:
+                probability = 1.0 if rate > required_rate else 0.0
+            result["overrun_probability"] = round(probability, 3)
+            if probability >= 0.5:
+                result["status"] = "overrun_likely"
+            elif probability >= 1 - Config.BURN_RATE_CONFIDENCE:
+                result["status"] = "at_risk"
+            else:
+                result["status"] = "on_track"
+        else:
+            result["status"] = "period_ended" if end_date else "on_track"
+        return result
+
+
+def _as_date(value) -> Optional[date]:
+    """Dates come back as date, datetime or 'YYYY-MM-DD' depending on the database"""
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def _days_ahead(today: date, remaining: float, rate: float) -> Optional[str]:
+    """Date the remaining funds run out at a daily rate (None if never, or beyond 100 years)"""
+    if rate <= 0:
+        return None
+    days = remaining / rate
+    if days > 36500:
+        return None
+    return (today + timedelta(days=int(days))).isoformat()
@@ -0,0 +1,129 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with LRU eviction and per-entry expiry
+
+    Values are returned as stored, so callers should treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < time.monotonic():
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'backend': 'memory', 'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+class RedisCache:
+    """
+    Redis-backed cache with the same interface as TTLCache
+
+    Values are stored as JSON under "<namespace>:<key>" with a Redis TTL, so
+    they are shared by every web and Celery process. Redis errors are logged
+    and treated as cache misses; the cache must never break a request.
+    """
+
+    def __init__(self, namespace: str, ttl: float = 300.0, url: Optional[str] = None):
+        import redis  # Only needed when the Redis backend is configured
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url or Config.CACHE_REDIS_URL, socket_timeout=0.25)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            raw = self._client.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis cache get failed for {self.namespace}: {e}")
+            return default
+        return json.loads(raw) if raw is not None else default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self._client.set(self._key(key), json.dumps(value), ex=max(1, int(self.ttl if ttl is None else ttl)))
+        except Exception as e:
+            logger.warning(f"Redis cache set failed for {self.namespace}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed for {self.namespace}: {e}")
+
+    def clear(self) -> None:
+        try:
+            for key in self._client.scan_iter(match=f"{self.namespace}:*", count=500):
+                self._client.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis cache clear failed for {self.namespace}: {e}")
+
+    def stats(self) -> dict:
+        return {'backend': 'redis', 'namespace': self.namespace}
+
+
+def make_cache(namespace: str, maxsize: int = 1024, ttl: float = 300.0, backend: Optional[str] = None):
+    """
+    Create a cache for one feature
+
+    Args:
+        namespace: Key prefix (also used to name the cache in logs)
+        maxsize: LRU size for the in-process backend
+        ttl: Default time-to-live in seconds
+        backend: 'memory' or 'redis' (defaults to Config.CACHE_BACKEND)
+    """
+    backend = (backend or Config.CACHE_BACKEND).lower()
+    if backend == 'redis':
+        try:
+            return RedisCache(namespace, ttl=ttl)
+        except ImportError:
+            logger.warning("redis package not installed; using in-process cache")
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -39,6 +39,7 @@ def create_celery_app(app=None):
         task_routes={
             'scheduled_jobs.send_daily_reminders': {'queue': 'scheduled'},
             'scheduled_jobs.send_monthly_reports': {'queue': 'scheduled'},
+            'scheduled_jobs.snapshot_project_status': {'queue': 'scheduled'},
         },
         
         # Beat schedule for periodic tasks
@@ -55,6 +56,10 @@ def create_celery_app(app=None):
                 # Uncomment next line to run on 1st of every month at 9 AM UTC
                 # 'schedule': crontab(hour=9, minute=0, day_of_month=1),
             },
+            'nightly-status-snapshots': {
+                'task': 'scheduled_jobs.snapshot_project_status',
+                'schedule': crontab(hour=0, minute=5),  # Just after midnight UTC
+            },
         },
         
         # Worker configuration
@@ -87,8 +92,10 @@ def create_celery_app(app=None):
 app = Flask(__name__)
 app.config.from_object(Config)
 
-# Initialize database with app context
+# Initialize database with app context (worker or beat connection profile)
 from database import db
+from db_profile import apply_database_profile, detect_process_type
+apply_database_profile(app, detect_process_type(default='worker'))
 db.init_app(app)
 
 # Create Celery instance
@@ -1,3 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from db_routing import RoutingSession
+
+# RoutingSession sends reads from replica-enabled views/jobs to the read pool
+db = SQLAlchemy(session_options={'class_': RoutingSession})
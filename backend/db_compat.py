@@ -0,0 +1,98 @@
+"""
+Dialect-neutral SQL helpers.
+
+The app runs on SQLite (development, small installs) and PostgreSQL
+(production). Anything that is spelled differently per database lives here
+so models and queries stay portable:
+
+- days_between(later, earlier): fractional days between two timestamps
+- date_of(expr): calendar date of a timestamp, for GROUP BY day
+- month_of(expr): 'YYYY-MM' of a timestamp, for GROUP BY month
+- JSONList: JSON list column (JSONB on PostgreSQL) that tracks in-place edits
+- stream_query(query): iterate a large result in batches (server-side cursor
+  on PostgreSQL) instead of loading it with .all()
+"""
+
+from sqlalchemy import JSON, Float, Date, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.sql.expression import FunctionElement
+
+from config import Config
+
+
+class days_between(FunctionElement):
+    """(later - earlier) in days, as a float"""
+    type = Float()
+    name = 'days_between'
+    inherit_cache = True
+
+
+@compiles(days_between)
+def _days_between_default(element, compiler, **kw):
+    later, earlier = list(element.clauses)
+    return "(EXTRACT(EPOCH FROM (%s - %s)) / 86400.0)" % (
+        compiler.process(later, **kw), compiler.process(earlier, **kw)
+    )
+
+
+@compiles(days_between, 'sqlite')
+def _days_between_sqlite(element, compiler, **kw):
+    later, earlier = list(element.clauses)
+    return "(julianday(%s) - julianday(%s))" % (
+        compiler.process(later, **kw), compiler.process(earlier, **kw)
+    )
+
+
+class date_of(FunctionElement):
+    """Calendar date part of a timestamp"""
+    type = Date()
+    name = 'date_of'
+    inherit_cache = True
+
+
+@compiles(date_of)
+def _date_of_default(element, compiler, **kw):
+    return "CAST(%s AS DATE)" % compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(date_of, 'sqlite')
+def _date_of_sqlite(element, compiler, **kw):
+    # CAST(... AS DATE) in SQLite yields a number; date() yields 'YYYY-MM-DD'
+    return "date(%s)" % compiler.process(list(element.clauses)[0], **kw)
+
+
+class month_of(FunctionElement):
+    """'YYYY-MM' of a timestamp"""
+    type = String()
+    name = 'month_of'
+    inherit_cache = True
+
+
+@compiles(month_of)
+def _month_of_default(element, compiler, **kw):
+    return "to_char(%s, 'YYYY-MM')" % compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(month_of, 'sqlite')
+def _month_of_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m', %s)" % compiler.process(list(element.clauses)[0], **kw)
+
+
+# List of IDs stored as JSON (JSONB on PostgreSQL, so it can be indexed and
+# queried with containment operators). MutableList makes .append()/.remove()
+# on the loaded list mark the row dirty.
+JSONList = MutableList.as_mutable(JSON().with_variant(JSONB(), 'postgresql'))
+
+
+def stream_query(query, batch_size=None):
+    """
+    Iterate an ORM query in batches of batch_size rows
+
+    PostgreSQL streams rows through a server-side cursor; SQLite fetches
+    batch by batch from the same cursor. Either way the full result is never
+    held in memory. Keep writes out of the loop body or do them on a
+    separate session.
+    """
+    return query.yield_per(batch_size or Config.DB_STREAM_BATCH_SIZE)
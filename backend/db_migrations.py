@@ -0,0 +1,336 @@
+"""
+Versioned schema migrations.
+
+Each file in migrations/ named NNNN_description.py is one migration with an
+upgrade(op) function; applied versions are recorded in schema_migrations.
+Run them with migrate.py.
+
+Migrations are written to run against a live database:
+
+- No migration runs inside one long transaction. Every operation commits on
+  its own, and every operation is idempotent (add-if-missing), so a migration
+  that stops halfway is simply run again.
+- DDL waits at most MIGRATION_LOCK_TIMEOUT_MS for its table lock on
+  PostgreSQL and retries with backoff, instead of queueing behind a long
+  report and stalling every request that touches the table.
+- Indexes are built with CREATE INDEX CONCURRENTLY on PostgreSQL.
+- Data backfills run in primary-key batches of MIGRATION_BATCH_SIZE rows,
+  each in its own short transaction with a pause in between, so app writes
+  keep flowing while millions of rows are updated.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+import importlib
+import os
+import re
+import time
+import logging
+
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from config import Config
+from database import db
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = 'schema_migrations'
+MIGRATIONS_PACKAGE = 'migrations'
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), MIGRATIONS_PACKAGE)
+
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+# Arbitrary key for the PostgreSQL advisory lock held while migrating
+_ADVISORY_LOCK_KEY = 724_310_037
+
+Migration = namedtuple('Migration', ['version', 'name', 'module'])
+
+
+class MigrationError(Exception):
+    """A migration could not be applied"""
+
+
+class Operations:
+    """
+    Schema and data operations available to a migration's upgrade(op)
+
+    All checks read the live schema, so every operation is safe to repeat.
+    """
+
+    def __init__(self, engine, log=None):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.log = log or logger.info
+
+    # ---------- introspection ----------
+
+    def has_table(self, table):
+        with self.engine.connect() as connection:
+            return sa.inspect(connection).has_table(table)
+
+    def has_column(self, table, column):
+        with self.engine.connect() as connection:
+            return column in {c['name'] for c in sa.inspect(connection).get_columns(table)}
+
+    def has_index(self, table, name):
+        with self.engine.connect() as connection:
+            return name in {i['name'] for i in sa.inspect(connection).get_indexes(table)}
+
+    # ---------- DDL ----------
+
+    def create_tables(self, *tables):
+        """
+        Create the given tables (sa.Table, e.g. from migrations/schema_0015.py)
+        if they do not exist yet, along with their indexes
+
+        With no arguments every model table is created; migrations pass their
+        own frozen tables instead, so they keep building the same schema when
+        the models change.
+        """
+        tables = [t.__table__ if hasattr(t, '__table__') else t for t in tables]
+        metadata = tables[0].metadata if tables else db.metadata
+        self._ddl(lambda connection: metadata.create_all(connection, tables=tables or None, checkfirst=True))
+
+    def add_column(self, table, column):
+        """
+        Add a column (sa.Column) if it is missing
+
+        Keep new columns nullable or give them a constant server default: both
+        are metadata-only changes on PostgreSQL and SQLite, with no table
+        rewrite. Fill existing rows afterwards with backfill().
+        """
+        if self.has_column(table, column.name):
+            return False
+        ddl = f"ALTER TABLE {table} ADD COLUMN {column.name} {column.type.compile(dialect=self.engine.dialect)}"
+        if column.server_default is not None:
+            default = column.server_default.arg
+            if hasattr(default, 'text'):
+                ddl += f" DEFAULT {default.text}"
+            else:
+                ddl += " DEFAULT '" + str(default).replace("'", "''") + "'"
+        for foreign_key in column.foreign_keys:
+            target_table, target_column = foreign_key.target_fullname.split('.')
+            ddl += f" REFERENCES {target_table}({target_column})"
+        self._ddl(lambda connection: connection.execute(text(ddl)))
+        self.log(f"added column {table}.{column.name}")
+        return True
+
+    def create_index(self, name, table, columns, unique=False):
+        """
+        Create an index if it is missing
+
+        PostgreSQL builds it CONCURRENTLY, so writes continue during the
+        build; an invalid leftover from an interrupted build is dropped and
+        rebuilt. SQLite holds its write lock while building.
+        """
+        unique_sql = 'UNIQUE ' if unique else ''
+        columns_sql = ', '.join(columns)
+
+        if self.dialect == 'postgresql':
+            with self._autocommit() as connection:
+                valid = connection.execute(text(
+                    "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+                ), {'name': name}).scalar()
+                if valid:
+                    return False
+                if valid is False:
+                    self.log(f"dropping invalid index {name} from an interrupted build")
+                    connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                connection.execute(text(
+                    f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns_sql})"
+                ))
+        else:
+            if self.has_index(table, name):
+                return False
+            self._ddl(lambda connection: connection.execute(text(
+                f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({columns_sql})"
+            )))
+        self.log(f"created index {name} on {table} ({columns_sql})")
+        return True
+
+    def create_model_indexes(self, *tables):
+        """Create every index declared on the models (or on the given tables) that is missing"""
+        tables = [t.__table__ if hasattr(t, '__table__') else t for t in tables] or db.metadata.sorted_tables
+        created = 0
+        for table in tables:
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                created += self.create_index(index.name, table.name, [c.name for c in index.columns], index.unique)
+        return created
+
+    # ---------- data ----------
+
+    def execute(self, sql, params=None):
+        """
+        Run one statement in its own transaction
+
+        params may be a list of dicts to execute the statement once per row.
+        """
+        with self.engine.begin() as connection:
+            return connection.execute(text(sql), params or {}).rowcount
+
+    def scalars(self, sql, params=None):
+        """First column of every row a query returns"""
+        with self.engine.connect() as connection:
+            return connection.execute(text(sql), params or {}).scalars().all()
+
+    def backfill(self, table, set_sql, where_sql, params=None, batch_size=None, pk='id'):
+        """
+        UPDATE table SET set_sql WHERE where_sql, in primary-key batches
+
+        where_sql must stop matching a row once it has been updated (e.g.
+        "new_column IS NULL"), which makes the backfill resumable. Returns the
+        number of rows updated.
+        """
+        batch_size = batch_size or Config.MIGRATION_BATCH_SIZE
+        params = dict(params or {})
+        select_batch = text(
+            f"SELECT {pk} FROM {table} WHERE {pk} > :_after AND ({where_sql}) ORDER BY {pk} LIMIT :_limit"
+        )
+        update_batch = text(
+            f"UPDATE {table} SET {set_sql} WHERE {pk} BETWEEN :_first AND :_last AND ({where_sql})"
+        )
+
+        after, total, batches = None, 0, 0
+        while True:
+            with self.engine.begin() as connection:
+                if after is None:
+                    after = connection.execute(text(f"SELECT MIN({pk}) - 1 FROM {table}")).scalar()
+                    if after is None:
+                        return 0
+                ids = connection.execute(select_batch, {**params, '_after': after, '_limit': batch_size}).scalars().all()
+                if not ids:
+                    break
+                total += connection.execute(update_batch, {**params, '_first': ids[0], '_last': ids[-1]}).rowcount
+            after, batches = ids[-1], batches + 1
+            if len(ids) < batch_size:
+                break
+            if batches % 50 == 0:
+                self.log(f"backfill {table}: {total} rows so far")
+            time.sleep(Config.MIGRATION_BATCH_PAUSE)
+
+        if total:
+            self.log(f"backfilled {total} rows in {table}")
+        return total
+
+    # ---------- internals ----------
+
+    def _autocommit(self):
+        connection = self.engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        if self.dialect == 'postgresql':
+            connection.execute(text(f"SET lock_timeout = {int(Config.MIGRATION_LOCK_TIMEOUT_MS)}"))
+        return connection
+
+    def _ddl(self, apply):
+        """Run DDL in a short transaction, retrying when the table lock is busy"""
+        for attempt in range(Config.MIGRATION_DDL_RETRIES + 1):
+            try:
+                with self.engine.begin() as connection:
+                    if self.dialect == 'postgresql':
+                        connection.execute(text(f"SET LOCAL lock_timeout = {int(Config.MIGRATION_LOCK_TIMEOUT_MS)}"))
+                    apply(connection)
+                return
+            except DBAPIError as e:
+                if not _is_lock_timeout(e) or attempt == Config.MIGRATION_DDL_RETRIES:
+                    raise
+                wait = min(30.0, 0.5 * 2 ** attempt)
+                self.log(f"table lock busy, retrying in {wait:.1f}s")
+                time.sleep(wait)
+
+
+def _is_lock_timeout(error):
+    sqlstate = getattr(error.orig, 'sqlstate', None) or getattr(error.orig, 'pgcode', None)
+    return sqlstate == '55P03' or 'database is locked' in str(error.orig)
+
+
+class SchemaMigrator:
+    """Discovers, records and applies migrations for one engine"""
+
+    def __init__(self, engine=None, log=None):
+        self.engine = engine or db.engine
+        self.log = log or logger.info
+
+    @staticmethod
+    def discover():
+        """Every migration in migrations/, ordered by version"""
+        migrations = []
+        for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+            match = _FILENAME.match(filename)
+            if match:
+                module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{filename[:-3]}")
+                migrations.append(Migration(match.group(1), match.group(2), module))
+
+        versions = [m.version for m in migrations]
+        duplicates = {v for v in versions if versions.count(v) > 1}
+        if duplicates:
+            raise MigrationError(f"Duplicate migration versions: {', '.join(sorted(duplicates))}")
+        return migrations
+
+    def ensure_version_table(self):
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+                "version VARCHAR(32) PRIMARY KEY, name VARCHAR(200) NOT NULL, "
+                "applied_at TIMESTAMP NOT NULL, duration_ms INTEGER)"
+            ))
+
+    def applied(self):
+        """version -> applied_at"""
+        self.ensure_version_table()
+        with self.engine.connect() as connection:
+            rows = connection.execute(text(f"SELECT version, applied_at FROM {VERSION_TABLE}")).all()
+        return {version: applied_at for version, applied_at in rows}
+
+    def pending(self):
+        applied = self.applied()
+        return [m for m in self.discover() if m.version not in applied]
+
+    def status(self):
+        """[(version, name, applied_at or None)] for every known migration"""
+        applied = self.applied()
+        return [(m.version, m.name, applied.get(m.version)) for m in self.discover()]
+
+    def upgrade(self, target=None):
+        """
+        Apply pending migrations up to and including target (default: all)
+
+        Returns the versions applied.
+        """
+        with self._migration_lock():
+            done = []
+            for migration in self.pending():
+                if target and migration.version > target:
+                    break
+                self.log(f"applying {migration.version}_{migration.name}")
+                started = time.perf_counter()
+                try:
+                    migration.module.upgrade(Operations(self.engine, log=self.log))
+                except Exception as e:
+                    raise MigrationError(f"{migration.version}_{migration.name} failed: {e}") from e
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                self._record(migration, duration_ms)
+                done.append(migration.version)
+            return done
+
+    def _record(self, migration, duration_ms):
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                f"INSERT INTO {VERSION_TABLE} (version, name, applied_at, duration_ms) "
+                "VALUES (:version, :name, :applied_at, :duration_ms)"
+            ), {'version': migration.version, 'name': migration.name,
+                'applied_at': datetime.utcnow(), 'duration_ms': duration_ms})
+
+    @contextmanager
+    def _migration_lock(self):
+        """Keep two deploys from migrating the same PostgreSQL database at once"""
+        if self.engine.dialect.name != 'postgresql':
+            yield
+            return
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {'key': _ADVISORY_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': _ADVISORY_LOCK_KEY})
@@ -0,0 +1,130 @@
+"""
+Database connection profile.
+
+Applies per-process engine options (pool sizing) and, for SQLite, the
+production pragmas on every new connection:
+
+- journal_mode=WAL: readers never wait for a writer and a writer never waits
+  for readers, so nightly jobs (analyze_all_tasks, reminders) no longer
+  block the web app
+- synchronous=NORMAL: safe with WAL, avoids an fsync per commit
+- busy_timeout: writers wait for the write lock instead of failing with
+  "database is locked"
+- cache_size / mmap_size / temp_store: keep hot pages and temp tables in memory
+
+Usage (before db.init_app):
+
+    apply_database_profile(app, 'web')
+"""
+
+import os
+import sqlite3
+import sys
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from config import Config
+from db_routing import REPLICA_BIND, replica_bind_options
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing per process type. The web app serves concurrent requests,
+# each Celery worker process runs one task at a time (prefetch 1), beat only
+# schedules, and one-off scripts are single-threaded.
+POOL_PROFILES = {
+    'web': {'pool_size': 10, 'max_overflow': 10, 'pool_timeout': 10},
+    'worker': {'pool_size': 2, 'max_overflow': 2, 'pool_timeout': 30},
+    'beat': {'pool_size': 1, 'max_overflow': 0, 'pool_timeout': 30},
+    'script': {'pool_size': 1, 'max_overflow': 2, 'pool_timeout': 30},
+}
+
+
+def sqlite_pragmas():
+    """PRAGMA name -> value applied to every SQLite connection, in order"""
+    return [
+        ('journal_mode', Config.SQLITE_JOURNAL_MODE),
+        ('synchronous', Config.SQLITE_SYNCHRONOUS),
+        ('busy_timeout', Config.SQLITE_BUSY_TIMEOUT_MS),
+        ('cache_size', -Config.SQLITE_CACHE_SIZE_KB),  # negative = KiB
+        ('mmap_size', Config.SQLITE_MMAP_SIZE),
+        ('temp_store', 'MEMORY'),
+    ]
+
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite profile to each new DB-API connection"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def detect_process_type(default='web'):
+    """
+    Process type from DB_PROCESS_TYPE, else guessed from a Celery command line
+    ("celery ... beat" / "celery ... worker"), else the default
+    """
+    configured = os.getenv('DB_PROCESS_TYPE')
+    if configured:
+        return configured.lower()
+    if 'beat' in sys.argv:
+        return 'beat'
+    if 'worker' in sys.argv:
+        return 'worker'
+    return default
+
+
+def engine_options(database_uri, process_type='web'):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URI and process type
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool, since
+    every pooled connection would otherwise see its own empty database.
+    """
+    url = make_url(database_uri)
+    pool = dict(POOL_PROFILES.get(process_type, POOL_PROFILES['web']))
+
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            return {}
+        return {
+            **pool,
+            'connect_args': {
+                # Seconds the driver waits for a lock (matches busy_timeout)
+                'timeout': Config.SQLITE_BUSY_TIMEOUT_MS / 1000.0,
+                # Pooled connections move between request threads
+                'check_same_thread': False,
+            },
+        }
+
+    return {**pool, 'pool_pre_ping': True, 'pool_recycle': 1800}
+
+
+def apply_database_profile(app, process_type=None):
+    """
+    Set engine options for this process on a Flask app (call before db.init_app)
+
+    Options already present in SQLALCHEMY_ENGINE_OPTIONS take precedence.
+    """
+    process_type = process_type or detect_process_type()
+    options = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], process_type)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    app.config['DB_PROCESS_TYPE'] = process_type
+
+    # Read pool for reporting queries (see db_routing.py)
+    replica = replica_bind_options(app.config['SQLALCHEMY_DATABASE_URI'], options)
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    if replica and REPLICA_BIND not in binds:
+        binds[REPLICA_BIND] = replica
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+    logger.info(f"Database profile '{process_type}': {options}")
+    return options
@@ -0,0 +1,155 @@
+"""
+Read/write session routing.
+
+Reporting reads (analytics, funds usage, monthly reports) can run on a
+separate read-only connection pool, or a replica, so they never compete
+with task updates for primary connections:
+
+- Views opt in with @replica_view, whole blueprints with
+  use_replica_for(blueprint), and Celery jobs with `with replica_reads():`.
+- Only plain SELECTs are routed. Flushes, DML, raw SQL and SELECT ... FOR
+  UPDATE always use the primary.
+- Read-your-writes: once a session has written anything, every later read
+  in the same request/job goes to the primary.
+- Fallback: if the replica is unreachable, reads go to the primary until the
+  next health check succeeds.
+
+The replica is DATABASE_REPLICA_URL when set; otherwise a read-only pool on
+the primary database (SQLite opened with mode=ro, PostgreSQL sessions with
+default_transaction_read_only), which still isolates reporting from the
+write pool.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import threading
+import time
+import logging
+
+import sqlalchemy as sa
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends eligible reads to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('replica_reads') and not self.info.get('has_writes'):
+            if self._flushing or (clause is not None and not _is_plain_select(clause)):
+                # Anything but a plain SELECT pins the rest of the session to the primary
+                self.info['has_writes'] = True
+            else:
+                engine = _replica_engine(self._db)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_written(session, flush_context):
+    session.info['has_writes'] = True
+
+
+def _is_plain_select(clause):
+    return isinstance(clause, sa.Select) and clause._for_update_arg is None
+
+
+# engine -> (healthy, checked_at)
+_health = {}
+_health_lock = threading.Lock()
+
+
+def _replica_engine(db):
+    """The replica engine if configured and healthy, else None"""
+    engine = db.engines.get(REPLICA_BIND)
+    if engine is None:
+        return None
+
+    now = time.monotonic()
+    healthy, checked_at = _health.get(engine, (None, 0.0))
+    if healthy is None or now - checked_at >= Config.REPLICA_HEALTH_CHECK_INTERVAL:
+        with _health_lock:
+            healthy, checked_at = _health.get(engine, (None, 0.0))
+            if healthy is None or now - checked_at >= Config.REPLICA_HEALTH_CHECK_INTERVAL:
+                healthy = _ping(engine)
+                _health[engine] = (healthy, now)
+    return engine if healthy else None
+
+
+def _ping(engine):
+    try:
+        with engine.connect() as connection:
+            connection.execute(sa.text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning(f"Read replica unavailable, using primary: {e}")
+        return False
+
+
+def replica_bind_options(database_uri, pool_options):
+    """
+    SQLALCHEMY_BINDS entry for the replica, or None when reads must stay on
+    the primary (routing disabled, in-memory SQLite)
+    """
+    if not Config.READ_REPLICA_ENABLED:
+        return None
+
+    if Config.DATABASE_REPLICA_URL:
+        return {'url': Config.DATABASE_REPLICA_URL, **pool_options, 'pool_pre_ping': True}
+
+    url = make_url(database_uri)
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            return None
+        # Same file opened read-only; with WAL these readers never block writers
+        read_only_url = url.set(database=f"file:{url.database}", query={**url.query, 'mode': 'ro', 'uri': 'true'})
+        return {'url': read_only_url.render_as_string(hide_password=False), **pool_options}
+
+    if url.get_backend_name() == 'postgresql':
+        return {
+            'url': database_uri,
+            **pool_options,
+            'connect_args': {'options': '-c default_transaction_read_only=on'},
+        }
+
+    return None
+
+
+@contextmanager
+def replica_reads(session=None):
+    """Route this session's plain reads to the replica for the duration of the block"""
+    if session is None:
+        from database import db
+        session = db.session
+    previous = session.info.get('replica_reads', False)
+    session.info['replica_reads'] = True
+    try:
+        yield session
+    finally:
+        session.info['replica_reads'] = previous
+
+
+def replica_view(view):
+    """Decorator for read-heavy views whose queries may be served by the replica"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def use_replica_for(blueprint):
+    """Route plain reads of every request in a read-only blueprint to the replica"""
+    @blueprint.before_request
+    def _enable_replica_reads():
+        from database import db
+        db.session.info['replica_reads'] = True
+    return blueprint
@@ -1,8 +1,9 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
-from models import Tasks, Notifications, Users, CustomStatus, Projects, TeamMembers
+from models import Tasks, CustomStatus, Notifications, Users, Projects, TeamMembers, UNKNOWN_STATUS_PROGRESS
 from database import db
 from task_prioritization import TaskPrioritizationEngine
+from status_catalog import StatusCatalog
 import json
 
 class DeadlineWarningEngine:
@@ -37,43 +38,13 @@ class DeadlineWarningEngine:
         Returns:
             float: Progress score from 0.0 to 1.0 (1.0 = completed)
         """
-        if not task.custom_status:
+        status = StatusCatalog.status(task.project_id, task.status_id)
+        if not status:
             return 0.1  # Default low progress if no status
-        
-        status_name = task.custom_status.name.lower()
-        
-        # Standard progress mapping based on common status patterns
-        progress_mapping = {
-            'to-do': 0.0,
-            'todo': 0.0,
-            'backlog': 0.0,
-            'planned': 0.1,
-            'in progress': 0.5,
-            'in-progress': 0.5,
-            'working': 0.5,
-            'active': 0.5,
-            'development': 0.4,
-            'testing': 0.7,
-            'review': 0.8,
-            'qa': 0.7,
-            'done': 1.0,
-            'completed': 1.0,
-            'finished': 1.0,
-            'closed': 1.0,
-            'deployed': 1.0
-        }
-        
-        # Check for exact matches first
-        if status_name in progress_mapping:
-            return progress_mapping[status_name]
-        
-        # Check for partial matches
-        for status_key, progress in progress_mapping.items():
-            if status_key in status_name:
-                return progress
-        
-        # Default progress for unknown statuses
-        return 0.2
+
+        # Set per status (backfilled from the old status-name heuristics)
+        progress = status["progress"]
+        return progress if progress is not None else UNKNOWN_STATUS_PROGRESS
     
     @staticmethod
     def calculate_deadline_risk(task: Tasks) -> Tuple[float, str]:
@@ -254,16 +225,13 @@ Project: {task.project.name if task.project else 'Unknown'}
         Returns:
             Dict: Analysis summary
         """
-        # Get all tasks with deadlines that are not completed
-        completed_statuses = ['done', 'completed', 'finished', 'closed', 'deployed']
-        
-        active_tasks = db.session.query(Tasks).join(CustomStatus).filter(
+        # Get all tasks with deadlines that are not in a terminal status
+        # (the join uses ix_custom_status_terminal instead of a NOT IN list)
+        active_tasks = db.session.query(Tasks).join(
+            CustomStatus, CustomStatus.id == Tasks.status_id
+        ).filter(
             Tasks.due_date.isnot(None),
-            ~CustomStatus.name.ilike('%done%'),
-            ~CustomStatus.name.ilike('%completed%'),
-            ~CustomStatus.name.ilike('%finished%'),
-            ~CustomStatus.name.ilike('%closed%'),
-            ~CustomStatus.name.ilike('%deployed%')
+            CustomStatus.is_terminal.isnot(True)
         ).all()
         
         analysis_summary = {
@@ -320,7 +288,7 @@ Project: {task.project.name if task.project else 'Unknown'}
             'progress_score': progress,
             'days_remaining': days_remaining,
             'due_date': task.due_date.isoformat() if task.due_date else None,
-            'current_status': task.custom_status.name if task.custom_status else None,
+            'current_status': (StatusCatalog.status(task.project_id, task.status_id) or {}).get('name'),
             'priority': task.priority,
             'effort_score': task.effort_score,
             'recommendations': cls._generate_recommendations(task, risk_score, risk_level, progress)
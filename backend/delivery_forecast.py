@@ -0,0 +1,229 @@
+import time
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Sequence
+from database import db
+from models import Tasks
+from task_history import TaskHistory
+from status_catalog import StatusCatalog
+from cache import make_cache
+from config import Config
+
+
+class DeliveryForecaster:
+    """
+    Monte Carlo Delivery Forecasting
+
+    Estimates how likely a project's team is to finish its open work by each
+    deadline from how much work it has actually been finishing:
+    1. Throughput history: effort points completed per day (completion times
+       from the task event log, effort_score per task) over the last
+       DELIVERY_FORECAST_HISTORY_DAYS days, zero days included
+    2. Remaining work: open tasks grouped by due date, earliest first, so the
+       work due by a date is everything due on or before it
+    3. Trials: DELIVERY_FORECAST_TRIALS futures, each a run of days drawn
+       with replacement from the history, simulated as (trials x days) numpy
+       arrays of at most DELIVERY_FORECAST_CHUNK_TRIALS rows at a time, so
+       memory stays bounded whatever the trial count; the probability for a
+       deadline is the share of trials whose cumulative throughput covers
+       the work due by then
+
+    Forecasts are cached per project version: invalidate() (called on task
+    writes) and any status catalog change start a new version.
+    """
+
+    # Need at least this many days of history before simulating
+    MIN_HISTORY_DAYS = 7
+    # Effort assumed for tasks without an effort_score
+    DEFAULT_EFFORT = 3
+    # Lowest on-time probability -> project risk level
+    RISK_LEVELS = ((0.85, 'low'), (0.6, 'medium'), (0.3, 'high'))
+    PERCENTILES = (50, 85, 95)
+
+    _cache = make_cache('delivery_forecast', maxsize=1024, ttl=Config.DELIVERY_FORECAST_CACHE_TTL)
+
+    # ---------- caching ----------
+
+    @classmethod
+    def version(cls, project_id: int) -> str:
+        """Changes whenever the project's tasks or statuses do"""
+        token = cls._cache.get(f"v:{project_id}")
+        if token is None:
+            token = time.time_ns()
+            cls._cache.set(f"v:{project_id}", token)
+        return f"{token}.{StatusCatalog.version(project_id)}"
+
+    @classmethod
+    def invalidate(cls, project_id: Optional[int]) -> None:
+        """Start a new version after a task write (older forecasts expire unused)"""
+        if project_id is not None:
+            cls._cache.set(f"v:{project_id}", time.time_ns())
+
+    @classmethod
+    def forecast(cls, project_id: int, trials: Optional[int] = None, today: Optional[date] = None) -> Dict:
+        """Cached forecast for a project (see compute())"""
+        trials = cls.clamp_trials(trials or Config.DELIVERY_FORECAST_TRIALS)
+        today = today or datetime.utcnow().date()
+        key = f"{project_id}:{cls.version(project_id)}:{today.isoformat()}:{trials}"
+        result = cls._cache.get(key)
+        if result is None:
+            result = cls.compute(project_id, trials, today)
+            cls._cache.set(key, result)
+        return result
+
+    @staticmethod
+    def clamp_trials(trials: int) -> int:
+        """Trials rounded down to a multiple of 1000 within 1000..DELIVERY_FORECAST_MAX_TRIALS (bounds cache entries)"""
+        return max(1000, min(int(trials), Config.DELIVERY_FORECAST_MAX_TRIALS) // 1000 * 1000)
+
+    # ---------- forecasting ----------
+
+    @classmethod
+    def compute(cls, project_id: int, trials: Optional[int] = None, today: Optional[date] = None,
+                seed: Optional[int] = None) -> Dict:
+        """
+        Sample throughput and simulate the project's remaining work
+
+        Returns:
+            Dict: JSON-ready forecast. deadlines lists each open due date with
+            the tasks/effort due by then and the probability of finishing it
+            in time; probability and risk_level describe the least likely
+            deadline. Probabilities are None without enough history.
+        """
+        import numpy as np  # Loaded on first forecast, not at app startup
+
+        trials = trials or Config.DELIVERY_FORECAST_TRIALS
+        today = today or datetime.utcnow().date()
+
+        rows = db.session.query(
+            Tasks.id, Tasks.status_id, Tasks.due_date, Tasks.effort_score, Tasks.created_at
+        ).filter(Tasks.project_id == project_id).all()
+        terminal_ids = StatusCatalog.terminal_ids(project_id)
+        effort = {r.id: r.effort_score or cls.DEFAULT_EFFORT for r in rows}
+        open_rows = [r for r in rows if r.status_id not in terminal_ids]
+
+        # Work due by each date, earliest deadline first
+        due = {}
+        for r in open_rows:
+            if r.due_date:
+                tasks_due, effort_due = due.get(r.due_date, (0, 0))
+                due[r.due_date] = (tasks_due + 1, effort_due + effort[r.id])
+        deadlines, tasks_due, effort_due = [], 0, 0
+        for due_date in sorted(due):
+            tasks_due += due[due_date][0]
+            effort_due += due[due_date][1]
+            deadlines.append({"date": due_date.isoformat(), "days_remaining": (due_date - today).days,
+                              "tasks_due": tasks_due, "effort_due": effort_due, "probability": None})
+
+        remaining_effort = sum(effort[r.id] for r in open_rows)
+        result = {
+            "project_id": project_id,
+            "as_of": today.isoformat(),
+            "trials": trials,
+            "total_tasks": len(rows),
+            "completed_tasks": len(rows) - len(open_rows),
+            "remaining_tasks": len(open_rows),
+            "remaining_effort": remaining_effort,
+            "history_days": 0,
+            "throughput_per_day": 0.0,
+            "deadlines": deadlines,
+            "completion_dates": {f"p{q}": None for q in cls.PERCENTILES},
+            "probability": None,
+            "at_risk_deadline": None,
+            "risk_level": "low",
+            "status": "complete" if not open_rows else "insufficient_data",
+        }
+        if not open_rows:
+            return result
+
+        # Daily completed effort from the first task (at most HISTORY_DAYS ago) to today
+        created = [r.created_at.date() for r in rows if r.created_at]
+        start = max(today - timedelta(days=Config.DELIVERY_FORECAST_HISTORY_DAYS - 1), min(created, default=today))
+        history = np.zeros((today - start).days + 1, dtype=np.float32)
+        for task_id, completed_at in TaskHistory.flow_metrics(project_id)["completed_at"].items():
+            completed_on = datetime.fromisoformat(completed_at).date()
+            if task_id in effort and start <= completed_on <= today:
+                history[(completed_on - start).days] += effort[task_id]
+        result["history_days"] = len(history)
+        result["throughput_per_day"] = round(float(history.mean()), 2)
+
+        if len(history) < cls.MIN_HISTORY_DAYS or not history.any():
+            # Without a track record only overdue work is known to be at risk
+            overdue = any(d["days_remaining"] < 0 for d in deadlines)
+            result["risk_level"] = "critical" if overdue else "medium" if deadlines else "low"
+            return result
+
+        mean_rate = float(history.mean())
+        furthest = max((d["days_remaining"] + 1 for d in deadlines), default=1)
+        horizon = min(Config.DELIVERY_FORECAST_MAX_DAYS,
+                      max(furthest, int(np.ceil(3 * remaining_effort / mean_rate)), 1))
+
+        probabilities, finish_days = cls.simulate(
+            history, [d["days_remaining"] for d in deadlines], [d["effort_due"] for d in deadlines],
+            remaining_effort, trials, horizon, seed
+        )
+        for deadline, probability in zip(deadlines, probabilities):
+            deadline["probability"] = round(float(probability), 3)
+        for q, days in zip(cls.PERCENTILES, np.percentile(finish_days, cls.PERCENTILES, method='higher')):
+            if np.isfinite(days):
+                result["completion_dates"][f"p{q}"] = (today + timedelta(days=int(days))).isoformat()
+
+        result["status"] = "ok"
+        if deadlines:
+            worst = min(deadlines, key=lambda d: d["probability"])
+            result["probability"] = worst["probability"]
+            result["at_risk_deadline"] = worst["date"]
+            result["risk_level"] = cls.risk_level(worst["probability"])
+        return result
+
+    @staticmethod
+    def simulate(history: Sequence[float], days_remaining: List[int], effort_due: List[float],
+                 total_effort: float, trials: int, horizon: int, seed: Optional[int] = None):
+        """
+        Run the trials
+
+        Args:
+            history: Effort completed on each past day (sampled with replacement)
+            days_remaining: Per deadline, days from today (0 = due today)
+            effort_due: Per deadline, effort that must be done by then
+            total_effort: All remaining effort, for the completion dates
+            trials, horizon: Simulated futures and days per future
+
+        Returns:
+            (probabilities, finish_days): on-time probability per deadline, and
+            per trial the day offset all work is done (inf beyond the horizon)
+        """
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        samples = np.asarray(history, dtype=np.float32)
+        index_type = np.uint16 if len(samples) <= np.iinfo(np.uint16).max else np.int64
+
+        on_time = np.zeros(len(days_remaining))
+        finish_days = np.empty(trials)
+        for first in range(0, trials, Config.DELIVERY_FORECAST_CHUNK_TRIALS):
+            rows = min(Config.DELIVERY_FORECAST_CHUNK_TRIALS, trials - first)
+            picks = rng.integers(0, len(samples), size=(rows, horizon), dtype=index_type)
+            progress = samples[picks]
+            del picks
+            np.cumsum(progress, axis=1, out=progress)
+
+            for i, (days, effort) in enumerate(zip(days_remaining, effort_due)):
+                if effort > 0 and days >= 0:
+                    # Work done by the end of the due date (today is day 0)
+                    on_time[i] += np.count_nonzero(progress[:, min(days, horizon - 1)] >= effort)
+
+            done = progress >= total_effort
+            finish_days[first:first + rows] = np.where(done[:, -1], done.argmax(axis=1), np.inf)
+
+        probabilities = on_time / trials
+        for i, effort in enumerate(effort_due):
+            if effort <= 0:
+                probabilities[i] = 1.0
+        return probabilities, finish_days
+
+    @classmethod
+    def risk_level(cls, probability: float) -> str:
+        for threshold, level in cls.RISK_LEVELS:
+            if probability >= threshold:
+                return level
+        return "critical"
@@ -0,0 +1,245 @@
+import csv
+import json
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import insert
+from database import db
+from models import Expense, ExpenseCategory, Tasks, TeamMembers
+from burn_rate import BurnRateForecaster
+from blob_store import BlobStore
+from config import Config
+
+
+class ExpenseImportError(ValueError):
+    """A row that cannot be imported"""
+
+
+class ExpenseImporter:
+    """
+    Bulk Expense Import
+
+    Imports CSV or NDJSON expense rows (e.g. a month of card transactions) in
+    chunks of EXPENSE_IMPORT_CHUNK_SIZE rows:
+    1. Parse: rows are read from the stream one at a time, never the whole file
+    2. Validate: per chunk, one query each resolves the chunk's new task ids
+       and project memberships; categories are loaded once per import.
+       Invalid rows are reported by line number and skipped
+    3. Insert: the chunk's valid rows go in as one executemany insert and one
+       commit
+
+    Columns: amount, date (YYYY-MM-DD or ISO timestamp), category_id or
+    category (name), project_id and/or task_id, notes, receipt_url (a blob
+    URL only for a file the importer can already read). Rows
+    without project_id/task_id use the import's default project.
+    """
+
+    FORMATS = ('csv', 'ndjson')
+
+    def __init__(self, user_id: int, default_project_id: Optional[int] = None,
+                 chunk_size: Optional[int] = None, dry_run: bool = False):
+        self.user_id = user_id
+        self.default_project_id = default_project_id
+        self.chunk_size = max(1, chunk_size or Config.EXPENSE_IMPORT_CHUNK_SIZE)
+        self.dry_run = dry_run
+
+        # Lookups shared by every chunk; each id is only queried once
+        self._member_of = {}  # project_id -> bool
+        self._task_project = {}  # task_id -> project_id (None if missing)
+        self._categories = None  # (ids, {lower-case name: id})
+        self._may_attach = {}  # receipt blob sha256 -> bool
+
+    # ---------- parsing ----------
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], fmt: str = 'csv') -> Iterator[Tuple[int, object]]:
+        """
+        (line number, row dict or ExpenseImportError) for each record
+
+        lines is any iterable of text lines (an open file, a decoded request
+        stream); CSV needs a header row.
+        """
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Use: {', '.join(cls.FORMATS)}")
+
+        if fmt == 'csv':
+            reader = csv.DictReader(lines)
+            if reader.fieldnames and reader.fieldnames[0].startswith('\ufeff'):
+                reader.fieldnames[0] = reader.fieldnames[0][1:]
+            for row in reader:
+                if row.get(None):
+                    yield reader.line_num, ExpenseImportError("Too many columns")
+                else:
+                    yield reader.line_num, row
+            return
+
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip().lstrip('\ufeff')
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, ExpenseImportError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield line_no, ExpenseImportError("Each line must be a JSON object")
+                continue
+            yield line_no, row
+
+    # ---------- import ----------
+
+    def run(self, records: Iterable[Tuple[int, object]]) -> Dict:
+        """
+        Validate and insert parsed records chunk by chunk
+
+        Returns:
+            Dict: imported, failed, chunks, dry_run, errors (first
+            EXPENSE_IMPORT_MAX_ERRORS, each {row, error}) and project_ids
+        """
+        summary = {"imported": 0, "failed": 0, "chunks": 0, "dry_run": self.dry_run, "errors": [], "project_ids": []}
+        projects = set()
+
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk, summary, projects)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, summary, projects)
+
+        if not self.dry_run:
+            for project_id in projects:
+                BurnRateForecaster.invalidate(project_id)
+        summary["project_ids"] = sorted(projects)
+        return summary
+
+    def _import_chunk(self, chunk: List[Tuple[int, object]], summary: Dict, projects: set) -> None:
+        self._resolve(chunk)
+
+        values = []
+        for line_no, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                values.append(self._validate(row))
+            except ExpenseImportError as e:
+                summary["failed"] += 1
+                if len(summary["errors"]) < Config.EXPENSE_IMPORT_MAX_ERRORS:
+                    summary["errors"].append({"row": line_no, "error": str(e)})
+
+        if values and not self.dry_run:
+            db.session.execute(insert(Expense), values)
+            db.session.commit()
+        summary["imported"] += len(values)
+        summary["chunks"] += 1
+        projects.update(v["project_id"] for v in values if v["project_id"])
+
+    def _resolve(self, chunk: List[Tuple[int, object]]) -> None:
+        """Load the tasks, memberships and categories the chunk refers to, one query each"""
+        if self._categories is None:
+            rows = db.session.query(ExpenseCategory.id, ExpenseCategory.name).all()
+            self._categories = ({r.id for r in rows}, {r.name.strip().lower(): r.id for r in rows})
+
+        task_ids = {_id_or_none(row.get("task_id")) for _, row in chunk if isinstance(row, dict)}
+        task_ids = {t for t in task_ids if t is not None} - self._task_project.keys()
+        if task_ids:
+            found = dict(db.session.query(Tasks.id, Tasks.project_id).filter(Tasks.id.in_(task_ids)).all())
+            for task_id in task_ids:
+                self._task_project[task_id] = found.get(task_id)
+
+        project_ids = {_id_or_none(row.get("project_id")) for _, row in chunk if isinstance(row, dict)}
+        project_ids |= {p for p in self._task_project.values() if p is not None}
+        project_ids.add(self.default_project_id)
+        project_ids = {p for p in project_ids if p is not None} - self._member_of.keys()
+        if project_ids:
+            member_of = {r.project_id for r in db.session.query(TeamMembers.project_id).filter(
+                TeamMembers.user_id == self.user_id, TeamMembers.project_id.in_(project_ids)
+            )}
+            for project_id in project_ids:
+                self._member_of[project_id] = project_id in member_of
+
+    def _validate(self, row: Dict) -> Dict:
+        """Insert values for a row, or ExpenseImportError"""
+        try:
+            amount = float(row.get("amount"))
+        except (TypeError, ValueError):
+            raise ExpenseImportError("Amount must be a number")
+        if not (math.isfinite(amount) and amount > 0):
+            raise ExpenseImportError("Amount must be positive")
+
+        date_str = str(row.get("date") or "").strip()
+        if not date_str:
+            raise ExpenseImportError("Date is required")
+        try:
+            date = datetime.fromisoformat(date_str) if 'T' in date_str else datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            raise ExpenseImportError(f"Invalid date '{date_str}'")
+
+        category_ids, category_names = self._categories
+        category_id = _int_or_none(row.get("category_id"))
+        if category_id is None and row.get("category"):
+            category_id = category_names.get(str(row["category"]).strip().lower())
+            if category_id is None:
+                raise ExpenseImportError(f"Unknown category '{row['category']}'")
+        if category_id is None:
+            raise ExpenseImportError("Category is required")
+        if category_id not in category_ids:
+            raise ExpenseImportError(f"Unknown category_id {category_id}")
+
+        task_id = _int_or_none(row.get("task_id"))
+        project_id = _int_or_none(row.get("project_id"))
+        if task_id is not None:
+            task_project = self._task_project.get(task_id)
+            if task_project is None:
+                raise ExpenseImportError(f"Task {task_id} not found")
+            if project_id is not None and project_id != task_project:
+                raise ExpenseImportError(f"Task {task_id} is not in project {project_id}")
+            authorized = self._member_of.get(task_project)
+        else:
+            project_id = project_id if project_id is not None else self.default_project_id
+            if project_id is None:
+                raise ExpenseImportError("Either project_id or task_id is required")
+            authorized = self._member_of.get(project_id)
+        if not authorized:
+            raise ExpenseImportError("Not authorized for this project")
+
+        return {
+            "amount": amount,
+            "date": date,
+            "notes": row.get("notes") or None,
+            "receipt_url": self._receipt_url(row.get("receipt_url") or None),
+            "project_id": project_id,
+            "task_id": task_id,
+            "category_id": category_id,
+            "created_by": self.user_id,
+        }
+
+    def _receipt_url(self, url):
+        """The row's receipt_url; blob URLs only for files the importer can read"""
+        sha256 = BlobStore.hash_in_url(url)
+        if sha256 is None:
+            return url
+        if sha256 not in self._may_attach:
+            self._may_attach[sha256] = BlobStore.may_attach(url, self.user_id)
+        if not self._may_attach[sha256]:
+            raise ExpenseImportError("Receipt not found")
+        return url
+
+
+def _int_or_none(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ExpenseImportError(f"Invalid id '{value}'")
+
+
+def _id_or_none(value) -> Optional[int]:
+    """Lookup-time id parsing; bad ids are reported later by _validate"""
+    try:
+        return _int_or_none(value)
+    except ExpenseImportError:
+        return None
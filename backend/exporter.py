@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+from database import db
+from models import Users, CustomStatus, Tasks, Budget, Expense, ExpenseCategory
+from db_compat import stream_query
+from config import Config
+
+
+class DataExporter:
+    """
+    Streaming CSV/NDJSON export of a project's expenses, budgets and tasks
+
+    Exports never load ORM objects: each dataset is one column-projected
+    query (category, creator, status and assignee names joined in SQL, so
+    nothing is lazy-loaded per row) iterated with stream_query(), and rows
+    are encoded and yielded a batch at a time. Memory stays bounded by
+    DB_STREAM_BATCH_SIZE however many rows the project has.
+    """
+
+    DATASETS = ('expenses', 'budgets', 'tasks')
+    FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+    # Spreadsheet apps evaluate cells starting with these as formulas
+    _FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+    @classmethod
+    def export(cls, dataset: str, project_id: int, fmt: str = 'csv',
+               start: Optional[date] = None, end: Optional[date] = None,
+               category_ids: Optional[List[int]] = None) -> Iterator[str]:
+        """
+        Generator of encoded chunks (CSV header first) for one dataset
+
+        start/end are inclusive dates matched against the expense date, the
+        task due date, or for budgets any overlap with the budget period.
+        category_ids filters expenses by category and tasks by status.
+        """
+        columns, query = cls._query(dataset, project_id, start, end, category_ids)
+        rows = stream_query(query)
+        if fmt == 'ndjson':
+            return cls._ndjson(columns, rows)
+        return cls._csv(columns, rows)
+
+    @staticmethod
+    def _query(dataset: str, project_id: int, start: Optional[date], end: Optional[date],
+               category_ids: Optional[List[int]]) -> Tuple[List[str], object]:
+        # Inclusive end date -> exclusive upper bound on timestamps
+        start_at = datetime.combine(start, datetime.min.time()) if start else None
+        end_before = datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else None
+
+        if dataset == 'expenses':
+            creator = db.aliased(Users)
+            query = db.session.query(
+                Expense.id, Expense.date, Expense.amount,
+                Expense.category_id, ExpenseCategory.name.label('category'),
+                Expense.task_id, Expense.notes, Expense.receipt_url,
+                creator.name.label('created_by'), Expense.created_at
+            ).join(ExpenseCategory, Expense.category_id == ExpenseCategory.id) \
+             .outerjoin(creator, Expense.created_by == creator.id) \
+             .filter(Expense.project_id == project_id)
+            if start_at:
+                query = query.filter(Expense.date >= start_at)
+            if end_before:
+                query = query.filter(Expense.date < end_before)
+            if category_ids:
+                query = query.filter(Expense.category_id.in_(category_ids))
+            query = query.order_by(Expense.date, Expense.id)
+
+        elif dataset == 'budgets':
+            creator = db.aliased(Users)
+            query = db.session.query(
+                Budget.id, Budget.start_date, Budget.end_date, Budget.amount,
+                Budget.task_id, Budget.notes,
+                creator.name.label('created_by'), Budget.created_at
+            ).outerjoin(creator, Budget.created_by == creator.id) \
+             .filter(Budget.project_id == project_id)
+            if start_at:
+                query = query.filter(Budget.end_date >= start_at)
+            if end_before:
+                query = query.filter(Budget.start_date < end_before)
+            query = query.order_by(Budget.start_date, Budget.id)
+
+        elif dataset == 'tasks':
+            assignee = db.aliased(Users)
+            query = db.session.query(
+                Tasks.id, Tasks.title, Tasks.status_id, CustomStatus.name.label('status'),
+                Tasks.priority, Tasks.priority_score, Tasks.due_date,
+                Tasks.effort_score, Tasks.impact_score,
+                assignee.name.label('assigned_to'), Tasks.created_at, Tasks.updated_at
+            ).outerjoin(CustomStatus, Tasks.status_id == CustomStatus.id) \
+             .outerjoin(assignee, Tasks.assigned_to == assignee.id) \
+             .filter(Tasks.project_id == project_id)
+            if start:
+                query = query.filter(Tasks.due_date >= start)
+            if end:
+                query = query.filter(Tasks.due_date <= end)
+            if category_ids:
+                query = query.filter(Tasks.status_id.in_(category_ids))
+            query = query.order_by(Tasks.id)
+
+        else:
+            raise ValueError(f"Unknown dataset '{dataset}'. Use: {', '.join(DataExporter.DATASETS)}")
+
+        return [c['name'] for c in query.column_descriptions], query
+
+    @classmethod
+    def _csv(cls, columns: List[str], rows: Iterable) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for count, row in enumerate(rows, 1):
+            writer.writerow([cls._csv_cell(value) for value in row])
+            if count % Config.DB_STREAM_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @classmethod
+    def _ndjson(cls, columns: List[str], rows: Iterable) -> Iterator[str]:
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(dict(zip(columns, (cls._json_value(v) for v in row)))))
+            if len(lines) == Config.DB_STREAM_BATCH_SIZE:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+    @classmethod
+    def _csv_cell(cls, value):
+        if value is None:
+            return ''
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(cls._FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    @staticmethod
+    def _json_value(value):
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def filename(dataset: str, project_id: int, fmt: str) -> str:
+        return f"project-{project_id}-{dataset}-{datetime.utcnow():%Y%m%d}.{fmt}"
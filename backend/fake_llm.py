@@ -0,0 +1,93 @@
+import json
+import time
+import threading
+from types import SimpleNamespace
+
+from rule_task_parser import get_rule_parser
+
+
+class SystemMessage(SimpleNamespace):
+    """LangChain-free system message for the offline backends (only .content is read)"""
+
+
+class HumanMessage(SimpleNamespace):
+    """LangChain-free human message for the offline backends"""
+
+
+class FakeLLM:
+    """
+    Offline stand-in for the LangChain chat model
+
+    Called like the Gemini client (a list of messages in, an object with
+    .content out) and answers with the JSON the system prompt asks for,
+    built from the rule-based parser. Use it with NL_LLM_BACKEND=fake or by
+    passing it to NaturalLanguageTaskParser(llm=...) in scripts. It takes
+    the plain messages above, so LangChain does not have to be installed.
+
+    Args:
+        latency: Seconds to sleep per call, to exercise timeouts and concurrency
+        fail_every: Raise on every n-th call (0 never fails)
+        responses: Optional {task text: raw response string} overrides
+    """
+
+    PREFIX = "Parse this task: "
+    plain_messages = True
+
+    def __init__(self, latency=0.0, fail_every=0, responses=None):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.responses = responses or {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, messages):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_every and call_number % self.fail_every == 0:
+            raise RuntimeError(f"Fake LLM failure on call {call_number}")
+
+        text = messages[-1].content
+        if text.startswith(self.PREFIX):
+            text = text[len(self.PREFIX):]
+        if text in self.responses:
+            return SimpleNamespace(content=self.responses[text])
+
+        parsed = get_rule_parser().parse(text)
+        parsed['extracted_info'] = {
+            'confidence': 'medium',
+            'date_context': parsed['extracted_info'].get('date_context'),
+            'assignee_context': parsed['extracted_info'].get('assignee_context')
+        }
+        return SimpleNamespace(content=json.dumps(parsed))
+
+
+class StubServerLLM:
+    """
+    Client for the local stub LLM server (stub_llm_server.py)
+
+    Goes over real HTTP, so timeouts, refused connections and slow responses
+    behave as they would against the provider, without network access.
+    """
+
+    plain_messages = True
+
+    def __init__(self, url, timeout=10.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def __call__(self, messages):
+        from urllib import request as urllib_request
+
+        payload = json.dumps({
+            'messages': [{'type': type(m).__name__, 'content': m.content} for m in messages]
+        }).encode('utf-8')
+        http_request = urllib_request.Request(
+            f"{self.url}/v1/chat", data=payload, headers={'Content-Type': 'application/json'}
+        )
+        with urllib_request.urlopen(http_request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode('utf-8'))
+        return SimpleNamespace(content=body['content'])
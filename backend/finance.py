@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from database import db
+from models import Budget, Expense, ExpenseCategory
+from db_compat import month_of
+
+
+class FinanceAggregator:
+    """
+    Budget/expense aggregation for a project or a task
+
+    Everything is computed by the database with three grouped queries, so the
+    cost no longer grows with the number of expense rows loaded into Python:
+    1. Budgets grouped by start month (totals and counts are sums of the groups)
+    2. Expenses grouped by month
+    3. Expenses grouped by category, joined to the category name
+    """
+
+    @staticmethod
+    def _scope(model, project_id: Optional[int], task_id: Optional[int]):
+        if task_id is not None:
+            return model.task_id == task_id
+        return model.project_id == project_id
+
+    @classmethod
+    def summarize(cls, project_id: Optional[int] = None, task_id: Optional[int] = None) -> Dict:
+        """
+        Totals, monthly buckets and category breakdown for a project or task
+
+        Returns:
+            Dict: total_budget, total_expenses, remaining_funds,
+            usage_percentage, budget_count, expense_count, monthly_breakdown
+            (sorted by month) and categories (largest first)
+        """
+        if (project_id is None) == (task_id is None):
+            raise ValueError("Pass exactly one of project_id or task_id")
+
+        budget_month = month_of(Budget.start_date)
+        budget_rows = db.session.query(
+            budget_month.label('month'),
+            func.sum(Budget.amount).label('total'),
+            func.count(Budget.id).label('count')
+        ).filter(cls._scope(Budget, project_id, task_id)).group_by(budget_month).all()
+
+        expense_month = month_of(Expense.date)
+        expense_rows = db.session.query(
+            expense_month.label('month'),
+            func.sum(Expense.amount).label('total'),
+            func.count(Expense.id).label('count')
+        ).filter(cls._scope(Expense, project_id, task_id)).group_by(expense_month).all()
+
+        category_rows = db.session.query(
+            Expense.category_id,
+            ExpenseCategory.name,
+            func.sum(Expense.amount).label('total')
+        ).join(ExpenseCategory, Expense.category_id == ExpenseCategory.id).filter(
+            cls._scope(Expense, project_id, task_id)
+        ).group_by(Expense.category_id, ExpenseCategory.name).all()
+
+        total_budget = sum(float(row.total or 0) for row in budget_rows)
+        total_expenses = sum(float(row.total or 0) for row in expense_rows)
+
+        months = {}
+        for row in budget_rows:
+            months.setdefault(row.month, {"budget": 0, "expenses": 0})["budget"] = float(row.total or 0)
+        for row in expense_rows:
+            months.setdefault(row.month, {"budget": 0, "expenses": 0})["expenses"] = float(row.total or 0)
+
+        return {
+            "total_budget": total_budget,
+            "total_expenses": total_expenses,
+            "remaining_funds": total_budget - total_expenses,
+            "usage_percentage": (total_expenses / total_budget * 100) if total_budget > 0 else 0,
+            "budget_count": sum(row.count for row in budget_rows),
+            "expense_count": sum(row.count for row in expense_rows),
+            "monthly_breakdown": [{
+                "month": month,
+                "budget": data["budget"],
+                "expenses": data["expenses"],
+                "remaining": data["budget"] - data["expenses"]
+            } for month, data in sorted(months.items())],
+            "categories": sorted([{
+                "category_id": row.category_id,
+                "name": row.name,
+                "total": float(row.total or 0)
+            } for row in category_rows], key=lambda c: -c["total"]),
+        }
+
+    @staticmethod
+    def category_totals_by_name(categories: List[Dict]) -> Dict[str, float]:
+        """{category name: total}, merging categories that share a name"""
+        totals = {}
+        for category in categories:
+            totals[category["name"]] = totals.get(category["name"], 0) + category["total"]
+        return totals
+
+    @staticmethod
+    def usage_status(usage_percentage: float, subject: str = "Budget") -> Dict[str, str]:
+        """Status band for a usage percentage"""
+        if usage_percentage >= 90:
+            return {"status": "critical", "status_message": f"{subject} critically low"}
+        if usage_percentage >= 75:
+            return {"status": "warning", "status_message": f"{subject} usage high"}
+        if usage_percentage >= 50:
+            return {"status": "moderate", "status_message": f"{subject} usage moderate"}
+        return {"status": "healthy", "status_message": f"{subject} usage healthy"}
@@ -0,0 +1,146 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import func, insert
+from database import db
+from models import Tasks, ProjectStatusSnapshot
+from task_history import TaskHistory
+from status_catalog import StatusCatalog
+
+
+class FlowSnapshots:
+    """
+    Cumulative Flow and Burndown Time Series
+
+    A nightly job (scheduled_jobs.snapshot_project_status) stores one row per
+    project, day and status with the task count and summed effort_score, from
+    a single grouped query over the tasks table. Charts are then a range scan
+    over ix_status_snapshots_project_date instead of replaying history:
+    1. Cumulative flow: task count per status per day, in workflow order
+    2. Burndown: remaining (not completed) effort and tasks per day, with the
+       total scope, so scope changes are visible
+
+    Ranges that include today get a live point for today if the job has not
+    captured it yet.
+    """
+
+    MAX_RANGE_DAYS = 366
+
+    @staticmethod
+    def _counts(project_id: Optional[int] = None):
+        """(project_id, status_id, tasks, effort) for the current task table"""
+        query = db.session.query(
+            Tasks.project_id,
+            Tasks.status_id,
+            func.count(Tasks.id),
+            func.coalesce(func.sum(Tasks.effort_score), 0)
+        ).filter(Tasks.status_id.isnot(None))
+        if project_id is not None:
+            query = query.filter(Tasks.project_id == project_id)
+        return query.group_by(Tasks.project_id, Tasks.status_id).all()
+
+    @classmethod
+    def capture(cls, snapshot_date: Optional[date] = None) -> int:
+        """
+        Store today's (or snapshot_date's) counts for every project
+
+        Re-running for the same day replaces that day's rows. Returns the
+        number of rows written.
+        """
+        snapshot_date = snapshot_date or datetime.utcnow().date()
+        rows = cls._counts()
+
+        ProjectStatusSnapshot.query.filter(
+            ProjectStatusSnapshot.snapshot_date == snapshot_date
+        ).delete(synchronize_session=False)
+        if rows:
+            db.session.execute(insert(ProjectStatusSnapshot), [{
+                "project_id": project_id,
+                "snapshot_date": snapshot_date,
+                "status_id": status_id,
+                "task_count": int(count),
+                "effort": int(effort),
+            } for project_id, status_id, count, effort in rows])
+        db.session.commit()
+        return len(rows)
+
+    @classmethod
+    def _series(cls, project_id: int, start: date, end: date) -> Dict[date, Dict[int, tuple]]:
+        """date -> {status_id: (tasks, effort)} for the stored days in range"""
+        rows = db.session.query(
+            ProjectStatusSnapshot.snapshot_date,
+            ProjectStatusSnapshot.status_id,
+            ProjectStatusSnapshot.task_count,
+            ProjectStatusSnapshot.effort
+        ).filter(
+            ProjectStatusSnapshot.project_id == project_id,
+            ProjectStatusSnapshot.snapshot_date >= start,
+            ProjectStatusSnapshot.snapshot_date <= end
+        ).all()
+
+        days = {}
+        for snapshot_date, status_id, count, effort in rows:
+            days.setdefault(snapshot_date, {})[status_id] = (count, effort)
+
+        today = datetime.utcnow().date()
+        if start <= today <= end and today not in days:
+            days[today] = {status_id: (count, effort) for _, status_id, count, effort in cls._counts(project_id)}
+        return dict(sorted(days.items()))
+
+    @classmethod
+    def cumulative_flow(cls, project_id: int, start: date, end: date) -> Dict:
+        """
+        Returns:
+            Dict: dates and one series per status (workflow order) with the
+            task count on each date
+        """
+        days = cls._series(project_id, start, end)
+        statuses = StatusCatalog.statuses(project_id)
+
+        status_ids = [s["id"] for s in statuses]
+        # Statuses deleted since they were snapshotted still show up in history
+        status_ids += sorted({sid for counts in days.values() for sid in counts} - set(status_ids))
+        names = {s["id"]: (s["name"], s["color"]) for s in statuses}
+
+        return {
+            "dates": [d.isoformat() for d in days],
+            "series": [{
+                "status_id": status_id,
+                "status": names.get(status_id, (f"Status {status_id}", None))[0],
+                "color": names.get(status_id, (None, '#6B7280'))[1],
+                "counts": [counts.get(status_id, (0, 0))[0] for counts in days.values()],
+            } for status_id in status_ids],
+        }
+
+    @classmethod
+    def burndown(cls, project_id: int, start: date, end: date, target_date: Optional[date] = None) -> Dict:
+        """
+        Returns:
+            Dict: points [{date, remaining_effort, remaining_tasks,
+            completed_tasks, total_effort}] and, with a target_date, the
+            ideal line from the first day's remaining effort to zero
+        """
+        days = cls._series(project_id, start, end)
+        done_ids = TaskHistory.done_status_ids(project_id)
+
+        points = []
+        for day, counts in days.items():
+            remaining = [v for sid, v in counts.items() if sid not in done_ids]
+            completed = [v for sid, v in counts.items() if sid in done_ids]
+            points.append({
+                "date": day.isoformat(),
+                "remaining_effort": sum(effort for _, effort in remaining),
+                "remaining_tasks": sum(count for count, _ in remaining),
+                "completed_tasks": sum(count for count, _ in completed),
+                "total_effort": sum(effort for _, effort in counts.values()),
+            })
+
+        result = {"points": points, "ideal": []}
+        if target_date and points:
+            first_day = date.fromisoformat(points[0]["date"])
+            span = max((target_date - first_day).days, 1)
+            initial = points[0]["remaining_effort"]
+            result["ideal"] = [{
+                "date": (first_day + timedelta(days=offset)).isoformat(),
+                "remaining_effort": round(initial * (1 - offset / span), 2),
+            } for offset in range(0, span + 1)]
+        return result
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Bulk-import expenses from a CSV or NDJSON file (see expense_import.py).
+
+Usage:
+    python import_expenses.py card-2024-03.csv --user finance@example.com --project 3
+    python import_expenses.py export.ndjson --user finance@example.com --chunk-size 5000
+    python import_expenses.py card-2024-03.csv --user finance@example.com --project 3 --dry-run
+
+Rows are attributed to --user, who must be a member of every project they
+belong to. Invalid rows are listed and skipped.
+"""
+
+import argparse
+import sys
+
+from app import create_app
+from expense_import import ExpenseImporter
+from models import Users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import expenses from CSV or NDJSON")
+    parser.add_argument('path', help="file to import, or - for stdin")
+    parser.add_argument('--user', required=True, help="email of the user the expenses are recorded for")
+    parser.add_argument('--project', type=int, help="project for rows without project_id/task_id")
+    parser.add_argument('--format', choices=ExpenseImporter.FORMATS,
+                        help="default: from the file extension (.ndjson/.jsonl, else csv)")
+    parser.add_argument('--chunk-size', type=int, help="rows per transaction (default EXPENSE_IMPORT_CHUNK_SIZE)")
+    parser.add_argument('--dry-run', action='store_true', help="validate only, insert nothing")
+    args = parser.parse_args()
+
+    fmt = args.format or ('ndjson' if args.path.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    app = create_app('script')
+    with app.app_context():
+        user = Users.query.filter_by(email=args.user).first()
+        if not user:
+            print(f"❌ No user with email {args.user}")
+            raise SystemExit(1)
+
+        importer = ExpenseImporter(user.id, default_project_id=args.project,
+                                   chunk_size=args.chunk_size, dry_run=args.dry_run)
+        source = sys.stdin if args.path == '-' else open(args.path, newline='', encoding='utf-8-sig')
+        with source:
+            summary = importer.run(ExpenseImporter.parse(source, fmt))
+
+    verb = "Validated" if args.dry_run else "Imported"
+    print(f"✅ {verb} {summary['imported']} expense(s) in {summary['chunks']} chunk(s)")
+    if summary['failed']:
+        print(f"⚠️  {summary['failed']} row(s) skipped:")
+        for error in summary['errors']:
+            print(f"   line {error['row']}: {error['error']}")
+        if summary['failed'] > len(summary['errors']):
+            print(f"   ... and {summary['failed'] - len(summary['errors'])} more")
+        raise SystemExit(2 if summary['imported'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+import threading
+import time
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LLMGatewayError(Exception):
+    """Base class for calls the gateway refused or gave up on"""
+
+
+class CircuitOpenError(LLMGatewayError):
+    """The circuit breaker is open; the provider is not being called"""
+
+
+class GatewayBusyError(LLMGatewayError):
+    """Too many calls are already running or queued"""
+
+
+class LLMTimeoutError(LLMGatewayError):
+    """The call did not finish before its deadline"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed: calls flow; failure_threshold failures in a row open the circuit.
+    open: calls are refused until reset_timeout seconds have passed.
+    half_open: one probe call is let through; success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may start now (claims the probe slot when half open)"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("LLM circuit breaker closed")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give back a probe slot claimed by a call that never reached the provider"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"LLM circuit breaker opened after {self.consecutive_failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class LLMGateway:
+    """
+    Bounded, deadline-aware executor for LLM provider calls
+
+    Every call runs on the gateway's own worker pool, so the Flask worker
+    that asked for it waits at most `timeout` seconds and no more than
+    `max_concurrency` provider calls are in flight per process. Calls beyond
+    that queue up to `max_queue`, after which they are refused. Failures,
+    including calls that finish after their deadline, feed a circuit breaker
+    that stops calling the provider after repeated failures.
+
+    Args:
+        max_concurrency: Provider calls running at once
+        timeout: Default per-call deadline in seconds (includes queueing)
+        max_queue: Calls allowed to wait for a worker
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before a probe call
+    """
+
+    LATENCY_WINDOW = 500
+
+    def __init__(self, max_concurrency: int = 4, timeout: float = 10.0, max_queue: int = 100,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm-gateway')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._counters = {
+            'calls': 0, 'successes': 0, 'failures': 0, 'timeouts': 0,
+            'rejected_open': 0, 'rejected_busy': 0,
+        }
+
+    @classmethod
+    def from_config(cls) -> 'LLMGateway':
+        return cls(
+            max_concurrency=Config.NL_LLM_MAX_CONCURRENCY,
+            timeout=Config.NL_LLM_TIMEOUT,
+            max_queue=Config.NL_LLM_MAX_QUEUE,
+            failure_threshold=Config.NL_LLM_FAILURE_THRESHOLD,
+            reset_timeout=Config.NL_LLM_RESET_TIMEOUT,
+        )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def submit(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Schedule fn(*args, **kwargs) on the gateway pool
+
+        The caller decides how long to wait on the returned future; the
+        gateway only uses `timeout` to classify a late finish as a failure.
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            GatewayBusyError: max_concurrency + max_queue calls are pending
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise CircuitOpenError("LLM provider circuit is open")
+
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self._counters['rejected_busy'] += 1
+                self.breaker.release_probe()
+                raise GatewayBusyError("Too many LLM calls in progress")
+            self._pending += 1
+            self._counters['calls'] += 1
+
+        def run():
+            started_at = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                self._count('failures')
+                self.breaker.record_failure()
+                raise
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    self._latencies.append(time.monotonic() - started_at)
+
+            if time.monotonic() - started_at > timeout:
+                # The provider took longer than the deadline; the caller has given up
+                self._count('timeouts')
+                self.breaker.record_failure()
+            else:
+                self._count('successes')
+                self.breaker.record_success()
+            return result
+
+        return self._executor.submit(run)
+
+    def call(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run fn on the gateway pool and wait for it
+
+        Raises:
+            CircuitOpenError, GatewayBusyError: The call was not started
+            LLMTimeoutError: No result within `timeout` seconds
+            Exception: Whatever fn raised
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(fn, *args, timeout=timeout, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.cancel(future)
+            raise LLMTimeoutError(f"LLM call exceeded {timeout}s deadline")
+
+    def cancel(self, future) -> bool:
+        """
+        Drop a call that is still queued (a running call cannot be stopped;
+        it finishes in the background and is counted as a timeout)
+        """
+        if not future.cancel():
+            return False
+        # Never reached the provider: free its slot without blaming the provider
+        with self._lock:
+            self._pending -= 1
+            self._counters['timeouts'] += 1
+        self.breaker.release_probe()
+        return True
+
+    def stats(self) -> Dict:
+        """Counters, breaker state and latency percentiles (ms) over recent calls"""
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = sorted(self._latencies)
+            pending = self._pending
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            **counters,
+            'circuit_state': self.breaker.state,
+            'consecutive_failures': self.breaker.consecutive_failures,
+            'pending': pending,
+            'max_concurrency': self.max_concurrency,
+            'timeout_seconds': self.timeout,
+            'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0)},
+        }
@@ -1,14 +1,20 @@
 import os
+import re
 import json
+import hashlib
+import time
 import logging
+from concurrent.futures import wait, FIRST_COMPLETED
 from datetime import datetime, date, timedelta
-from dateutil.parser import parse as parse_date
-from dateutil.relativedelta import relativedelta
-import re
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import HumanMessage, SystemMessage
-from models import Users, TeamMembers
+from cache import make_cache
+from config import Config
+from llm_gateway import LLMGateway, LLMGatewayError, CircuitOpenError, GatewayBusyError, LLMTimeoutError
+from team_directory import get_team_directory
+from rule_task_parser import get_rule_parser, parse_relative_date
+
+# LangChain and the Google client are imported inside the parser so that
+# importing this module (or the app) does not load the LLM stack.
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,21 +26,60 @@ class NaturalLanguageTaskParser:
     Extracts structured task information from natural language input
     """
     
-    def __init__(self):
-        """Initialize the parser with Gemini configuration"""
+    def __init__(self, llm=None):
+        """
+        Initialize the parser with Gemini configuration
+
+        Args:
+            llm: Optional chat model to use instead of Gemini (e.g. FakeLLM)
+        """
         self.api_key = os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-        
-        # Initialize Gemini LLM with LangChain
-        self.llm = ChatGoogleGenerativeAI(
-            google_api_key=self.api_key,
-            model="gemini-1.5-flash",  # Updated to current model name
-            temperature=0.1,  # Low temperature for consistent parsing
-            convert_system_message_to_human=True
+
+        # Deterministic fast path tried before every LLM call
+        self.rule_parser = get_rule_parser()
+
+        # The Gemini client is created on the first low-confidence parse
+        self._llm = llm
+
+        # Deadlines, concurrency limit and circuit breaker for provider calls
+        self.gateway = LLMGateway.from_config()
+
+        # Raw LLM extractions; assignees are still resolved on every parse
+        self.parse_cache = make_cache(
+            'nl_parse', maxsize=Config.NL_PARSE_CACHE_SIZE, ttl=Config.NL_PARSE_CACHE_TTL
         )
-        
-        logger.info("Natural Language Task Parser initialized with Gemini")
+
+    @property
+    def llm(self):
+        """Gemini LLM via LangChain (or the configured fake), created on first use"""
+        if self._llm is None:
+            if Config.NL_LLM_BACKEND == 'fake':
+                from fake_llm import FakeLLM
+                self._llm = FakeLLM(latency=Config.NL_FAKE_LLM_LATENCY)
+                logger.info("Natural Language Task Parser using fake LLM backend")
+                return self._llm
+
+            if Config.NL_LLM_BACKEND == 'stub':
+                from fake_llm import StubServerLLM
+                self._llm = StubServerLLM(Config.NL_STUB_LLM_URL, timeout=Config.NL_LLM_TIMEOUT)
+                logger.info(f"Natural Language Task Parser using stub LLM server at {Config.NL_STUB_LLM_URL}")
+                return self._llm
+
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY environment variable is required")
+
+            # Initialize Gemini LLM with LangChain
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            self._llm = ChatGoogleGenerativeAI(
+                google_api_key=self.api_key,
+                model="gemini-1.5-flash",  # Updated to current model name
+                temperature=0.1,  # Low temperature for consistent parsing
+                convert_system_message_to_human=True,
+                max_retries=Config.NL_LLM_MAX_RETRIES  # Retries must fit in the gateway deadline
+            )
+
+            logger.info("Natural Language Task Parser initialized with Gemini")
+        return self._llm
 
     def _get_system_prompt(self):
         """Get the system prompt for task parsing"""
@@ -75,141 +120,212 @@ Output: {"title": "Create user documentation for the new feature", "assignee_nam
 
     def _parse_relative_date(self, date_str, reference_date=None):
         """Parse relative dates like 'Friday', 'next week', 'tomorrow'"""
-        if not date_str:
-            return None
-            
-        if reference_date is None:
-            reference_date = datetime.now()
-            
-        date_str = date_str.lower().strip()
-        
-        # Today/Tomorrow/Yesterday
-        if 'today' in date_str:
-            return reference_date.date()
-        elif 'tomorrow' in date_str:
-            return (reference_date + timedelta(days=1)).date()
-        elif 'yesterday' in date_str:
-            return (reference_date - timedelta(days=1)).date()
-        
-        # Days of the week
-        weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        for i, day in enumerate(weekdays):
-            if day in date_str:
-                days_ahead = i - reference_date.weekday()
-                if days_ahead <= 0:  # Target day already happened this week
-                    if 'next' in date_str:
-                        days_ahead += 7  # Next week
-                    elif days_ahead == 0 and 'this' not in date_str:
-                        days_ahead += 7  # Default to next occurrence
-                return (reference_date + timedelta(days=days_ahead)).date()
-        
-        # Week-based
-        if 'this week' in date_str:
-            # End of this week (Friday)
-            days_until_friday = (4 - reference_date.weekday()) % 7
-            return (reference_date + timedelta(days=days_until_friday)).date()
-        elif 'next week' in date_str:
-            # End of next week
-            days_until_next_friday = (4 - reference_date.weekday()) % 7 + 7
-            return (reference_date + timedelta(days=days_until_next_friday)).date()
-        
-        # Month-based
-        if 'this month' in date_str:
-            # End of this month
-            next_month = reference_date.replace(day=28) + timedelta(days=4)
-            return (next_month - timedelta(days=next_month.day)).date()
-        elif 'next month' in date_str:
-            # End of next month
-            next_month = reference_date + relativedelta(months=1)
-            return (next_month.replace(day=28) + timedelta(days=4) - timedelta(days=(next_month.replace(day=28) + timedelta(days=4)).day)).date()
-        
-        # Try standard date parsing
-        try:
-            parsed_date = parse_date(date_str, fuzzy=True)
-            return parsed_date.date()
-        except:
-            logger.warning(f"Could not parse date: {date_str}")
-            return None
+        return parse_relative_date(date_str, reference_date)
 
     def _find_team_member_by_name(self, name, project_id):
-        """Find team member by name within the project"""
+        """
+        Resolve a name to a team member of the project via the cached name index
+
+        Returns:
+            dict: {'user_id', 'match', 'candidates'} (see TeamNameIndex.resolve)
+        """
         if not name:
-            return None
-            
-        logger.info(f"Looking for team member '{name}' in project {project_id}")
-        
-        # Get all team members for the project
-        team_members = Users.query.join(TeamMembers).filter(
-            TeamMembers.project_id == project_id
-        ).all()
-        
-        name_lower = name.lower().strip()
-        
-        # Exact match first
-        for user in team_members:
-            if user.name and user.name.lower() == name_lower:
-                logger.info(f"Found exact match: {user.name} (ID: {user.id})")
-                return user.id
-        
-        # Partial match (first name, last name, or contains)
-        for user in team_members:
-            if user.name:
-                user_name_lower = user.name.lower()
-                name_parts = name_lower.split()
-                user_parts = user_name_lower.split()
-                
-                # Check if any part of the search name matches any part of user name
-                if any(part in user_parts for part in name_parts) or any(part in name_parts for part in user_parts):
-                    logger.info(f"Found partial match: {user.name} (ID: {user.id})")
-                    return user.id
-        
-        logger.warning(f"No team member found matching '{name}' in project {project_id}")
-        return None
+            return {'user_id': None, 'match': None, 'candidates': []}
+
+        match = get_team_directory().resolve(name, project_id)
+        if match['user_id']:
+            logger.info(f"Found {match['match']} match for '{name}': user {match['user_id']}")
+        elif match['candidates']:
+            logger.warning(f"'{name}' is ambiguous in project {project_id}: users {match['candidates']}")
+        else:
+            logger.warning(f"No team member found matching '{name}' in project {project_id}")
+        return match
+
+    @staticmethod
+    def _parse_cache_key(text, project_id, reference_date=None):
+        """
+        Cache key for an LLM extraction
 
-    def parse_natural_language_task(self, text, project_id=None):
+        Text is case-folded with whitespace, quotes and trailing punctuation
+        normalized so retries and templated inputs share an entry. The day is
+        part of the key because relative dates depend on "today".
+        """
+        normalized = text.casefold().replace('\u2019', "'").replace('\u201c', '"').replace('\u201d', '"')
+        normalized = re.sub(r'\s+', ' ', normalized).strip(' .!,;')
+        day = (reference_date or datetime.now()).date().isoformat()
+        digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        return f"{project_id or 0}:{day}:{digest}"
+
+    def parse_natural_language_task(self, text, project_id=None, reference_date=None):
         """
         Parse natural language input into structured task data
         
         Args:
             text (str): Natural language task description
             project_id (int): Project ID for team member lookup
+            reference_date (datetime): "Today" for relative dates (defaults to now)
             
         Returns:
             dict: Structured task data with extracted fields
         """
-        try:
-            logger.info(f"Parsing natural language task: '{text}'")
-            
-            # Prepare messages for Gemini
-            system_message = SystemMessage(content=self._get_system_prompt())
-            human_message = HumanMessage(content=f"Parse this task: {text}")
-            
-            # Call Gemini via LangChain
-            response = self.llm([system_message, human_message])
-            
-            logger.info(f"Raw Gemini response: {response.content}")
-            
-            # Parse JSON response
+        logger.info(f"Parsing natural language task: '{text}'")
+
+        parsed_data = self._extract_local(text, project_id, reference_date)
+        if parsed_data is None:
+            # Raises ValueError when no LLM backend is configured
+            llm = self.llm
             try:
-                parsed_data = json.loads(response.content.strip())
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                logger.error(f"Response content: {response.content}")
-                # Return basic parsing fallback
-                return self._fallback_parsing(text)
-            
-            # Post-process the parsed data
-            result = self._post_process_parsed_data(parsed_data, project_id)
-            
-            logger.info(f"Final parsed result: {result}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error parsing natural language task: {e}")
-            # Return fallback parsing
-            return self._fallback_parsing(text)
+                # Runs on the gateway pool; this thread waits at most the call deadline
+                parsed_data = self.gateway.call(self._call_llm, llm, text)
+                self._cache_llm_extraction(parsed_data, text, project_id, reference_date)
+            except Exception as e:
+                parsed_data = self._llm_fallback(text, e, reference_date)
+
+        result = self._post_process_parsed_data(parsed_data, project_id, reference_date)
+        logger.info(f"Final parsed result: {result}")
+        return result
+
+    def iter_parse_batch(self, texts, project_id=None, reference_date=None, item_timeout=None):
+        """
+        Parse several inputs, yielding (index, result) as each one finishes
+
+        Inputs the rule parser or the cache can answer are yielded first.
+        The rest are submitted to the LLM gateway, which bounds how many run
+        at once. An item whose LLM call has been running longer than
+        item_timeout seconds is answered with the fallback parse; its late
+        response is discarded. Only the LLM calls run on worker threads, so
+        assignee resolution (database access) stays on the caller's thread.
+
+        Args:
+            texts (list): Natural language task descriptions
+            project_id (int): Project ID for team member lookup
+            reference_date (datetime): "Today" for relative dates
+            item_timeout (float): Seconds per LLM call (defaults to Config.NL_BATCH_ITEM_TIMEOUT)
+
+        Yields:
+            tuple: (index into texts, structured task data)
+        """
+        item_timeout = item_timeout or Config.NL_BATCH_ITEM_TIMEOUT
+        pending = []
+        for index, text in enumerate(texts):
+            parsed_data = self._extract_local(text, project_id, reference_date)
+            if parsed_data is None:
+                pending.append(index)
+            else:
+                yield index, self._post_process_parsed_data(parsed_data, project_id, reference_date)
+
+        if not pending:
+            return
+
+        # Raises ValueError when no LLM backend is configured
+        llm = self.llm
+        started = {}
+
+        def run(index):
+            started[index] = time.monotonic()
+            return self._call_llm(llm, texts[index])
+
+        futures = {}
+        for index in pending:
+            try:
+                futures[self.gateway.submit(run, index, timeout=item_timeout)] = index
+            except LLMGatewayError as e:
+                parsed_data = self._llm_fallback(texts[index], e, reference_date)
+                yield index, self._post_process_parsed_data(parsed_data, project_id, reference_date)
+
+        while futures:
+            # Wake up for the next completion or the earliest running deadline
+            now = time.monotonic()
+            deadlines = [started[i] + item_timeout for i in futures.values() if i in started]
+            wait_for = max(0.0, min(deadlines) - now) if deadlines else item_timeout
+            done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = futures.pop(future)
+                try:
+                    parsed_data = future.result()
+                    self._cache_llm_extraction(parsed_data, texts[index], project_id, reference_date)
+                except Exception as e:
+                    parsed_data = self._llm_fallback(texts[index], e, reference_date)
+                yield index, self._post_process_parsed_data(parsed_data, project_id, reference_date)
+
+            now = time.monotonic()
+            for future, index in list(futures.items()):
+                if index in started and now - started[index] >= item_timeout:
+                    del futures[future]
+                    error = LLMTimeoutError(f"Batch item {index} exceeded {item_timeout}s")
+                    parsed_data = self._llm_fallback(texts[index], error, reference_date)
+                    yield index, self._post_process_parsed_data(parsed_data, project_id, reference_date)
+
+    def _extract_local(self, text, project_id=None, reference_date=None):
+        """
+        Extraction that needs no LLM call: a confident rule-based parse or a
+        cached LLM result. Returns None when the LLM has to be asked.
+        """
+        # Answer simple, unambiguous inputs locally without a network round trip
+        local_result = self.rule_parser.parse(text, reference_date)
+        if local_result['extracted_info']['confidence'] == 'high':
+            logger.info("Parsed with rule-based fast path")
+            return local_result
 
-    def _post_process_parsed_data(self, parsed_data, project_id=None):
+        # Identical inputs today reuse the previous extraction
+        cached = self.parse_cache.get(self._parse_cache_key(text, project_id, reference_date))
+        if cached is not None:
+            logger.info("Parsed from LLM result cache")
+            return cached
+
+        return None
+
+    def _call_llm(self, llm, text):
+        """
+        Ask the LLM for a raw extraction. Runs on a gateway worker: no database
+        access, and errors (including malformed JSON) are raised so the
+        gateway's circuit breaker sees them.
+        """
+        # Prepare messages for Gemini (the offline backends take plain ones)
+        if getattr(llm, 'plain_messages', False):
+            from fake_llm import HumanMessage, SystemMessage
+        else:
+            from langchain.schema import HumanMessage, SystemMessage
+        system_message = SystemMessage(content=self._get_system_prompt())
+        human_message = HumanMessage(content=f"Parse this task: {text}")
+        
+        # Call Gemini via LangChain
+        response = llm([system_message, human_message])
+        
+        logger.info(f"Raw Gemini response: {response.content}")
+        
+        # Parse JSON response
+        parsed_data = json.loads(response.content.strip())
+        parsed_data['extracted_info'] = {**(parsed_data.get('extracted_info') or {}), 'source': 'llm'}
+        return parsed_data
+
+    def _cache_llm_extraction(self, parsed_data, text, project_id=None, reference_date=None):
+        """Cache the extraction only (before assignee resolution)"""
+        self.parse_cache.set(self._parse_cache_key(text, project_id, reference_date), {
+            **parsed_data,
+            'extracted_info': {**parsed_data['extracted_info'], 'source': 'llm_cache'}
+        })
+
+    def _llm_fallback(self, text, error, reference_date=None):
+        """Fallback parse for an LLM call that failed, timed out or was refused"""
+        if isinstance(error, CircuitOpenError):
+            reason = 'circuit_open'
+        elif isinstance(error, LLMTimeoutError):
+            reason = 'timeout'
+        elif isinstance(error, GatewayBusyError):
+            reason = 'busy'
+        else:
+            reason = 'error'
+        logger.error(f"Error parsing natural language task ({reason}): {error}")
+
+        parsed_data = self._fallback_parsing(text, reference_date)
+        parsed_data['extracted_info']['fallback_reason'] = reason
+        if reason == 'timeout':
+            parsed_data['extracted_info']['timed_out'] = True
+        return parsed_data
+
+    def _post_process_parsed_data(self, parsed_data, project_id=None, reference_date=None):
         """Post-process the parsed data from Gemini"""
         result = parsed_data.copy()
         
@@ -217,7 +333,7 @@ Output: {"title": "Create user documentation for the new feature", "assignee_nam
         if result.get('due_date'):
             try:
                 # Try to parse the date string
-                parsed_date = self._parse_relative_date(result['due_date'])
+                parsed_date = self._parse_relative_date(result['due_date'], reference_date)
                 if parsed_date:
                     result['due_date'] = parsed_date.strftime('%Y-%m-%d')
                 else:
@@ -228,8 +344,10 @@ Output: {"title": "Create user documentation for the new feature", "assignee_nam
         
         # Find team member if assignee name is provided
         if result.get('assignee_name') and project_id:
-            user_id = self._find_team_member_by_name(result['assignee_name'], project_id)
-            result['assigned_to'] = user_id
+            match = self._find_team_member_by_name(result['assignee_name'], project_id)
+            result['assigned_to'] = match['user_id']
+            if match['candidates']:
+                result['assignee_candidates'] = match['candidates']
         else:
             result['assigned_to'] = None
         
@@ -256,66 +374,21 @@ Output: {"title": "Create user documentation for the new feature", "assignee_nam
         
         return result
 
-    def _fallback_parsing(self, text):
+    def _fallback_parsing(self, text, reference_date=None):
         """Simple fallback parsing if Gemini fails"""
         logger.info("Using fallback parsing")
-        
-        # Basic title extraction (use the whole text, cleaned up)
-        title = text.strip()
-        if len(title) > 150:
-            title = title[:147] + "..."
-        
-        # Try to extract simple patterns
-        assignee_name = None
-        due_date = None
-        
-        # Look for name patterns (e.g., "John", "Sarah needs to", "remind Alex")
-        name_patterns = [
-            r'remind\s+(\w+)',
-            r'(\w+)\s+(?:needs to|should|must)',
-            r'assign(?:ed)?\s+to\s+(\w+)',
-            r'for\s+(\w+)\s+to'
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                assignee_name = match.group(1)
-                break
-        
-        # Look for date patterns
-        date_patterns = [
-            r'by\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
-            r'by\s+(tomorrow|today)',
-            r'(this|next)\s+week',
-            r'by\s+(\d{4}-\d{2}-\d{2})',
-            r'due\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                date_str = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                parsed_date = self._parse_relative_date(date_str)
-                if parsed_date:
-                    due_date = parsed_date.strftime('%Y-%m-%d')
-                break
-        
-        return {
-            'title': title,
-            'description': None,
-            'assignee_name': assignee_name,
-            'assigned_to': None,  # Will be resolved later
-            'due_date': due_date,
-            'priority': None,
-            'effort_score': None,
-            'impact_score': None,
-            'extracted_info': {
-                'confidence': 'low',
-                'date_context': 'fallback parsing',
-                'assignee_context': 'fallback parsing'
-            }
-        }
+
+        # Reuse the rule-based extraction, but never report it as confident
+        result = self.rule_parser.parse(text, reference_date)
+        if not result['title']:
+            title = text.strip()
+            result['title'] = title[:147] + "..." if len(title) > 150 else title
+        result['assigned_to'] = None  # Resolved in post-processing
+        result['extracted_info'].update({
+            'confidence': 'low',
+            'source': 'fallback'
+        })
+        return result
 
 
 # Global parser instance (can be reused)
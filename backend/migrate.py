@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Apply versioned schema migrations (see db_migrations.py and migrations/).
+
+Usage:
+    python migrate.py                   # apply every pending migration
+    python migrate.py status            # list migrations and when they ran
+    python migrate.py upgrade --to 0004 # apply up to a version
+    python migrate.py new "add task events"
+
+Safe to run while the app is serving traffic: DDL backs off when a table is
+busy, indexes build concurrently on PostgreSQL and backfills run in short
+batches.
+"""
+
+import argparse
+import os
+import re
+
+from app import create_app
+from db_migrations import SchemaMigrator, MigrationError, MIGRATIONS_DIR
+
+TEMPLATE = '''"""
+{description}
+"""
+
+import sqlalchemy as sa
+
+
+def upgrade(op):
+    pass
+'''
+
+
+def new_migration(description):
+    """Create the next NNNN_description.py file and return its path"""
+    versions = [int(name[:4]) for name in os.listdir(MIGRATIONS_DIR) if re.match(r'^\d{4}_', name)]
+    slug = re.sub(r'\W+', '_', description.lower()).strip('_')
+    path = os.path.join(MIGRATIONS_DIR, f"{max(versions, default=0) + 1:04d}_{slug}.py")
+    with open(path, 'w') as f:
+        f.write(TEMPLATE.format(description=description[:1].upper() + description[1:] + '.'))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    subcommands = parser.add_subparsers(dest='command')
+    upgrade_parser = subcommands.add_parser('upgrade', help="apply pending migrations (default)")
+    upgrade_parser.add_argument('--to', dest='target', help="stop after this version")
+    subcommands.add_parser('status', help="list migrations")
+    new_parser = subcommands.add_parser('new', help="create a new migration file")
+    new_parser.add_argument('description')
+    args = parser.parse_args()
+
+    if args.command == 'new':
+        print(f"📝 Created {new_migration(args.description)}")
+        return
+
+    app = create_app('script')
+    with app.app_context():
+        migrator = SchemaMigrator(log=lambda message: print(f"   {message}"))
+
+        if args.command == 'status':
+            print("🗄️  Schema migrations")
+            for version, name, applied_at in migrator.status():
+                state = f"✅ {str(applied_at)[:16]}" if applied_at else "⏳ pending"
+                print(f"   {version} {name:<32} {state}")
+            return
+
+        pending = migrator.pending()
+        if not pending:
+            print("✅ Database schema is up to date")
+            return
+
+        print(f"🔄 Applying {len(pending)} migration(s)...")
+        try:
+            applied = migrator.upgrade(target=getattr(args, 'target', None))
+        except MigrationError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        print(f"🎉 Applied {len(applied)} migration(s): {', '.join(applied)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Baseline: create the core tables that do not exist yet.
+
+Tables come from migrations/schema_0015.py, not from the models. On an
+empty database this builds users, projects, statuses, tasks, discussions and
+notifications; on databases created by the old setup scripts it only adds
+the missing ones (e.g. notifications). Missing columns on existing tables are
+added by the migrations that follow.
+"""
+
+from migrations.schema_0015 import BASELINE_TABLES
+
+
+def upgrade(op):
+    op.create_tables(*BASELINE_TABLES)
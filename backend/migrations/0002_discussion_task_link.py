@@ -0,0 +1,10 @@
+"""
+Link discussions to tasks (replaces migrate_discussions_table.py and
+migrations/add_task_discussions.py).
+"""
+
+import sqlalchemy as sa
+
+
+def upgrade(op):
+    op.add_column('discussions', sa.Column('task_id', sa.Integer, sa.ForeignKey('tasks.id')))
@@ -0,0 +1,16 @@
+"""
+Discussion feed cursors: updated_at plus the feed indexes (replaces
+migrations/add_discussion_feed_cursor.py).
+"""
+
+import sqlalchemy as sa
+
+
+def upgrade(op):
+    op.add_column('discussions', sa.Column('updated_at', sa.DateTime))
+    # Existing messages were last written when they were posted
+    op.backfill('discussions', 'updated_at = timestamp', 'updated_at IS NULL')
+    op.create_index('ix_discussions_project_feed', 'discussions', ['project_id', 'timestamp', 'id'])
+    op.create_index('ix_discussions_task_feed', 'discussions', ['task_id', 'timestamp', 'id'])
+    op.create_index('ix_discussions_project_updated', 'discussions', ['project_id', 'updated_at'])
+    op.create_index('ix_discussions_task_updated', 'discussions', ['task_id', 'updated_at'])
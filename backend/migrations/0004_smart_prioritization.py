@@ -0,0 +1,16 @@
+"""
+Smart prioritization fields on tasks (replaces migrate_smart_prioritization.py).
+"""
+
+import sqlalchemy as sa
+
+from db_compat import JSONList
+
+
+def upgrade(op):
+    op.add_column('tasks', sa.Column('effort_score', sa.Integer, server_default=sa.text('3')))
+    op.add_column('tasks', sa.Column('impact_score', sa.Integer, server_default=sa.text('3')))
+    op.add_column('tasks', sa.Column('dependency_map', JSONList))
+    op.add_column('tasks', sa.Column('blocked_by', JSONList))
+    op.backfill('tasks', "dependency_map = '[]'", 'dependency_map IS NULL')
+    op.backfill('tasks', "blocked_by = '[]'", 'blocked_by IS NULL')
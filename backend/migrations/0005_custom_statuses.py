@@ -0,0 +1,49 @@
+"""
+Per-project custom statuses (replaces migrate_to_custom_status.py,
+create_tables.py and fix_database.py).
+
+Projects without statuses get the default To-Do / In Progress / Done set.
+Tasks from the old schema keep their rows: status_id is added next to the
+legacy status string and filled by matching the status name, falling back to
+the project's default status. The legacy column is left in place.
+"""
+
+import sqlalchemy as sa
+
+DEFAULT_STATUSES = [
+    ('To-Do', 'Tasks that need to be started', '#FACC15', 1, True),
+    ('In Progress', 'Tasks currently being worked on', '#3B82F6', 2, False),
+    ('Done', 'Completed tasks', '#22C55E', 3, False),
+]
+
+DEFAULT_STATUS_SQL = (
+    "(SELECT cs.id FROM custom_status cs WHERE cs.project_id = tasks.project_id "
+    "ORDER BY cs.is_default DESC, cs.position, cs.id LIMIT 1)"
+)
+
+
+def upgrade(op):
+    op.add_column('tasks', sa.Column('status_id', sa.Integer, sa.ForeignKey('custom_status.id')))
+
+    project_ids = op.scalars(
+        "SELECT p.id FROM projects p WHERE NOT EXISTS (SELECT 1 FROM custom_status cs WHERE cs.project_id = p.id)"
+    )
+    if project_ids:
+        op.execute(
+            "INSERT INTO custom_status (name, description, color, position, is_default, project_id, created_at) "
+            "VALUES (:name, :description, :color, :position, :is_default, :project_id, CURRENT_TIMESTAMP)",
+            [{'name': name, 'description': description, 'color': color, 'position': position,
+              'is_default': is_default, 'project_id': project_id}
+             for project_id in project_ids
+             for name, description, color, position, is_default in DEFAULT_STATUSES],
+        )
+        op.log(f"created default statuses for {len(project_ids)} projects")
+
+    if op.has_column('tasks', 'status'):
+        status_sql = (
+            "COALESCE((SELECT cs.id FROM custom_status cs WHERE cs.project_id = tasks.project_id "
+            f"AND cs.name = tasks.status), {DEFAULT_STATUS_SQL})"
+        )
+    else:
+        status_sql = DEFAULT_STATUS_SQL
+    op.backfill('tasks', f"status_id = {status_sql}", 'status_id IS NULL')
@@ -0,0 +1,31 @@
+"""
+Budgets, expenses and the default expense categories (replaces
+create_budget_tables.py, migrations/add_budget_and_expenses.py and the
+category seeding in create_all_tables.py).
+"""
+
+from migrations.schema_0015 import budgets, expense_categories, expenses
+
+DEFAULT_CATEGORIES = [
+    ('Labor', 'Employee wages and contractor fees'),
+    ('Materials', 'Raw materials and supplies'),
+    ('Equipment', 'Hardware and equipment purchases'),
+    ('Software', 'Software licenses and subscriptions'),
+    ('Travel', 'Business travel and transportation'),
+    ('Marketing', 'Advertising and promotional expenses'),
+    ('Office', 'Office rent, utilities, and supplies'),
+    ('Training', 'Employee training and development'),
+    ('Consulting', 'External consulting services'),
+    ('Other', 'Miscellaneous expenses'),
+]
+
+
+def upgrade(op):
+    op.create_tables(budgets, expense_categories, expenses)
+    if op.scalars("SELECT id FROM expense_categories LIMIT 1"):
+        return
+    op.execute(
+        "INSERT INTO expense_categories (name, description, created_at) VALUES (:name, :description, CURRENT_TIMESTAMP)",
+        [{'name': name, 'description': description} for name, description in DEFAULT_CATEGORIES],
+    )
+    op.log(f"created {len(DEFAULT_CATEGORIES)} default expense categories")
@@ -0,0 +1,57 @@
+"""
+Full-text search tables and their sync triggers (SQLite only).
+
+Tables, triggers and the initial build go in one transaction, since a trigger
+firing for a row the index has never seen corrupts the FTS table. A second
+rebuild after commit picks up writes from connections that started their
+statement before the triggers existed.
+
+The DDL is written out here rather than taken from search_index.py, so this
+migration keeps building the same index if SearchIndex changes later.
+"""
+
+from sqlalchemy import text
+
+# fts table -> (source table, indexed columns)
+SOURCES = {
+    'search_tasks': ('tasks', ['title', 'description']),
+    'search_discussions': ('discussions', ['message']),
+    'search_projects': ('projects', ['name', 'description']),
+    'search_notifications': ('notifications', ['title', 'message']),
+}
+
+
+def schema_statements():
+    statements = []
+    for fts_table, (source, columns) in SOURCES.items():
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{c}' for c in columns)
+        old_values = ', '.join(f'old.{c}' for c in columns)
+        statements += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+            f"{column_list}, content='{source}', content_rowid='id', "
+            f"tokenize='porter unicode61', prefix='2 3')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {source} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END",
+        ]
+    return statements
+
+
+def upgrade(op):
+    if op.dialect != 'sqlite' or all(op.has_table(fts_table) for fts_table in SOURCES):
+        return
+    with op.engine.begin() as connection:
+        for statement in schema_statements():
+            connection.execute(text(statement))
+        for fts_table in SOURCES:
+            connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+    with op.engine.begin() as connection:
+        for fts_table in SOURCES:
+            connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+            connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('optimize')"))
+    op.log("built full-text search index")
@@ -0,0 +1,22 @@
+"""
+Indexes for the per-request lookups: team membership, tasks by project and
+status, tasks by assignee and due date, unread notifications, and budgets and
+expenses by project/task. Built concurrently on PostgreSQL.
+"""
+
+INDEXES = [
+    ('ix_team_members_project_user', 'team_members', ['project_id', 'user_id']),
+    ('ix_team_members_user', 'team_members', ['user_id']),
+    ('ix_tasks_project_status', 'tasks', ['project_id', 'status_id']),
+    ('ix_tasks_assigned_due', 'tasks', ['assigned_to', 'due_date']),
+    ('ix_notifications_user_read', 'notifications', ['user_id', 'is_read', 'created_at']),
+    ('ix_budgets_project', 'budgets', ['project_id']),
+    ('ix_budgets_task', 'budgets', ['task_id']),
+    ('ix_expenses_project_date', 'expenses', ['project_id', 'date']),
+    ('ix_expenses_task', 'expenses', ['task_id']),
+]
+
+
+def upgrade(op):
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
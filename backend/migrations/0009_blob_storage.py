@@ -0,0 +1,11 @@
+"""
+Content-addressed blob storage for receipts and project images (see
+blob_store.py). Files live on disk under BLOB_STORAGE_DIR; this table records
+each distinct upload once.
+"""
+
+from migrations.schema_0015 import blobs
+
+
+def upgrade(op):
+    op.create_tables(blobs)
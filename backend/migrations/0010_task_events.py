@@ -0,0 +1,53 @@
+"""
+Append-only task history (see task_history.py).
+
+Creates task_events and seeds it for existing tasks, which have no recorded
+history: a "created" event at created_at with the current status, except for
+completed tasks, which get a "created" event without a status and a status
+change to their completed status at updated_at (the best completion time
+available before the log existed). Seeding runs in task-id batches and skips
+tasks that already have events, so it is resumable.
+"""
+
+import time
+
+from config import Config
+from migrations.schema_0015 import task_events
+
+# task_events.kind values (TaskEvent.CREATED, TaskEvent.STATUS)
+CREATED, STATUS = 1, 2
+
+DONE_SQL = "LOWER(cs.name) IN ('done', 'completed', 'finished')"
+
+SEED_SQL = f"""
+INSERT INTO task_events (project_id, task_id, kind, old_value, new_value, actor_id, ts)
+SELECT project_id, task_id, kind, old_value, new_value, actor_id, ts FROM (
+    SELECT t.id AS task_id, t.project_id AS project_id, {CREATED} AS kind, CAST(NULL AS INTEGER) AS old_value,
+           CASE WHEN {DONE_SQL} THEN NULL ELSE t.status_id END AS new_value, CAST(NULL AS INTEGER) AS actor_id,
+           COALESCE(t.created_at, t.updated_at, CURRENT_TIMESTAMP) AS ts
+    FROM tasks t LEFT JOIN custom_status cs ON cs.id = t.status_id
+    WHERE t.id BETWEEN :first AND :last
+      AND NOT EXISTS (SELECT 1 FROM task_events e WHERE e.task_id = t.id)
+    UNION ALL
+    SELECT t.id, t.project_id, {STATUS}, NULL, t.status_id, NULL,
+           COALESCE(t.updated_at, t.created_at, CURRENT_TIMESTAMP)
+    FROM tasks t JOIN custom_status cs ON cs.id = t.status_id
+    WHERE t.id BETWEEN :first AND :last AND {DONE_SQL}
+      AND NOT EXISTS (SELECT 1 FROM task_events e WHERE e.task_id = t.id)
+) seed
+ORDER BY task_id, kind
+"""
+
+
+def upgrade(op):
+    op.create_tables(task_events)
+
+    first, last = op.scalars("SELECT MIN(id) FROM tasks")[0], op.scalars("SELECT MAX(id) FROM tasks")[0]
+    if first is None:
+        return
+    seeded = 0
+    for start in range(first, last + 1, Config.MIGRATION_BATCH_SIZE):
+        seeded += op.execute(SEED_SQL, {'first': start, 'last': start + Config.MIGRATION_BATCH_SIZE - 1})
+        time.sleep(Config.MIGRATION_BATCH_PAUSE)
+    if seeded:
+        op.log(f"seeded {seeded} task events for existing tasks")
@@ -0,0 +1,10 @@
+"""
+Daily per-project, per-status task counts and effort for cumulative flow and
+burndown charts (see flow_snapshots.py). Filled nightly from today on.
+"""
+
+from migrations.schema_0015 import project_status_snapshots
+
+
+def upgrade(op):
+    op.create_tables(project_status_snapshots)
@@ -0,0 +1,64 @@
+"""
+Progress value and terminal flag on custom statuses, so completed / open
+tasks are found by status id instead of matching status names.
+
+Existing statuses are filled from their names: an exact key, then the first
+key found as a whole word that is not negated ("Not Done" and "Undone" stay
+open); terminal means progress 1.0. The table and matching below are a copy
+of models.progress_for_status_name as it was then, so the backfill does not
+change when the model's heuristics do.
+"""
+
+import re
+
+import sqlalchemy as sa
+
+STATUS_NAME_PROGRESS = {
+    'to-do': 0.0,
+    'todo': 0.0,
+    'backlog': 0.0,
+    'planned': 0.1,
+    'in progress': 0.5,
+    'in-progress': 0.5,
+    'working': 0.5,
+    'active': 0.5,
+    'development': 0.4,
+    'testing': 0.7,
+    'review': 0.8,
+    'qa': 0.7,
+    'done': 1.0,
+    'completed': 1.0,
+    'finished': 1.0,
+    'closed': 1.0,
+    'deployed': 1.0
+}
+UNKNOWN_STATUS_PROGRESS = 0.2
+NEGATED = re.compile(r'\b(?:not|non|never|no)(?:\s+yet)?[\s-]*$')
+
+
+def progress_for_status_name(name):
+    name = ' '.join((name or '').lower().split())
+    if name in STATUS_NAME_PROGRESS:
+        return STATUS_NAME_PROGRESS[name]
+    for key, progress in STATUS_NAME_PROGRESS.items():
+        pattern = re.compile(r'(?<![\w-])' + re.escape(key) + r'(?![\w-])')
+        if any(not NEGATED.search(name[:m.start()]) for m in pattern.finditer(name)):
+            return progress
+    return UNKNOWN_STATUS_PROGRESS
+
+
+def upgrade(op):
+    op.add_column('custom_status', sa.Column('progress', sa.Float))
+    op.add_column('custom_status', sa.Column('is_terminal', sa.Boolean))
+
+    # Few distinct names, so match them here and update one name at a time
+    names = op.scalars("SELECT DISTINCT name FROM custom_status WHERE progress IS NULL")
+    if names:
+        progress = {name: progress_for_status_name(name) for name in names}
+        op.execute(
+            "UPDATE custom_status SET progress = :progress, is_terminal = :terminal "
+            "WHERE name = :name AND progress IS NULL",
+            [{'name': name, 'progress': value, 'terminal': value >= 1.0} for name, value in progress.items()],
+        )
+        op.log(f"backfilled progress for {len(names)} status names")
+    op.create_index('ix_custom_status_terminal', 'custom_status', ['is_terminal', 'project_id'])
@@ -0,0 +1,10 @@
+"""
+Per-project smart-priority weights (see TaskPrioritizationEngine.weights_for).
+Existing projects keep the built-in weights until a profile is saved.
+"""
+
+from migrations.schema_0015 import priority_weight_profiles
+
+
+def upgrade(op):
+    op.create_tables(priority_weight_profiles)
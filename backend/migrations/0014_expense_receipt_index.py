@@ -0,0 +1,8 @@
+"""
+Index expenses by receipt_url: blob downloads check that the file is the
+receipt of an expense the user can see (BlobStore.can_read).
+"""
+
+
+def upgrade(op):
+    op.create_index('ix_expenses_receipt_url', 'expenses', ['receipt_url'])
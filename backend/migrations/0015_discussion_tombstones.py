@@ -0,0 +1,10 @@
+"""
+Soft-deleted discussions: deleted_at marks a tombstone that since= syncs
+report in deleted_ids (see routes/discussion.py).
+"""
+
+import sqlalchemy as sa
+
+
+def upgrade(op):
+    op.add_column('discussions', sa.Column('deleted_at', sa.DateTime))
@@ -0,0 +1,11 @@
+"""
+Project images: the /api/blobs/<sha256> URL of the image uploaded with a
+project, which its team members may download (BlobStore.can_read).
+"""
+
+import sqlalchemy as sa
+
+
+def upgrade(op):
+    op.add_column('projects', sa.Column('image_url', sa.String(500)))
+    op.create_index('ix_projects_image_url', 'projects', ['image_url'])
@@ -0,0 +1,8 @@
+"""
+Reply feed index: (parent_id, updated_at) for /replies syncs and the grouped
+replies_count lookup on root feeds.
+"""
+
+
+def upgrade(op):
+    op.create_index('ix_discussions_parent_updated', 'discussions', ['parent_id', 'updated_at'])
@@ -0,0 +1,10 @@
+"""
+Versioned schema migrations, applied in order by migrate.py.
+
+One file per migration, NNNN_description.py, defining upgrade(op) with the
+operations from db_migrations.Operations. Every step must be safe to run
+again (add-if-missing), because a migration is not one transaction.
+
+Migrations never import models.py: tables they create come from a snapshot
+frozen at a revision (schema_0015.py), never edited afterwards.
+"""
@@ -0,0 +1,228 @@
+"""
+Table definitions frozen at migration 0015, for the migrations up to 0015
+that create tables.
+
+Written out column by column so that migrations never depend on models.py:
+a migration must build the same tables today as on the day it was written,
+whatever the models look like later. This file describes revision 0015 and
+is never edited. A later migration that creates tables defines them itself,
+or adds its own snapshot (schema_NNNN.py for its revision); column and index
+changes go through add_column / create_index, with models.py updated
+alongside.
+
+Python-side defaults (created_at = utcnow, ...) live on the models and are
+not part of the DDL. Not a migration itself: discovery only picks up
+NNNN_description.py files.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+metadata = sa.MetaData()
+
+JSON_LIST = sa.JSON().with_variant(JSONB(), 'postgresql')
+
+roles = sa.Table(
+    'roles', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(80), unique=True, nullable=False),
+    sa.Column('description', sa.String(255)),
+)
+
+users = sa.Table(
+    'users', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('email', sa.String(255), unique=True, nullable=False),
+    sa.Column('password', sa.String(255), nullable=False),
+    sa.Column('active', sa.Boolean),
+    sa.Column('fs_uniquifier', sa.String(255), unique=True, nullable=False),
+    sa.Column('fs_token_uniquifier', sa.String(255), unique=True),
+    sa.Column('name', sa.String(100)),
+)
+
+user_roles = sa.Table(
+    'user_roles', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id')),
+    sa.Column('role_id', sa.Integer, sa.ForeignKey('roles.id')),
+)
+
+projects = sa.Table(
+    'projects', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(150), nullable=False),
+    sa.Column('description', sa.Text),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('created_by', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+)
+
+custom_status = sa.Table(
+    'custom_status', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(100), nullable=False),
+    sa.Column('description', sa.Text),
+    sa.Column('color', sa.String(7)),
+    sa.Column('position', sa.Integer),
+    sa.Column('is_default', sa.Boolean),
+    sa.Column('progress', sa.Float),
+    sa.Column('is_terminal', sa.Boolean),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id'), nullable=False),
+    sa.Column('created_at', sa.DateTime),
+    sa.UniqueConstraint('name', 'project_id', name='unique_status_per_project'),
+    sa.Index('ix_custom_status_terminal', 'is_terminal', 'project_id'),
+)
+
+team_members = sa.Table(
+    'team_members', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id'), nullable=False),
+    sa.Index('ix_team_members_project_user', 'project_id', 'user_id'),
+    sa.Index('ix_team_members_user', 'user_id'),
+)
+
+tasks = sa.Table(
+    'tasks', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('title', sa.String(150), nullable=False),
+    sa.Column('description', sa.Text),
+    sa.Column('status_id', sa.Integer, sa.ForeignKey('custom_status.id')),
+    sa.Column('due_date', sa.Date),
+    sa.Column('priority', sa.String(20)),
+    sa.Column('priority_score', sa.Float),
+    sa.Column('effort_score', sa.Integer),
+    sa.Column('impact_score', sa.Integer),
+    sa.Column('dependency_map', JSON_LIST),
+    sa.Column('blocked_by', JSON_LIST),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id'), nullable=False),
+    sa.Column('assigned_to', sa.Integer, sa.ForeignKey('users.id')),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime),
+    sa.Index('ix_tasks_project_status', 'project_id', 'status_id'),
+    sa.Index('ix_tasks_assigned_due', 'assigned_to', 'due_date'),
+)
+
+task_events = sa.Table(
+    'task_events', metadata,
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer, 'sqlite'), primary_key=True),
+    sa.Column('project_id', sa.Integer, nullable=False),
+    sa.Column('task_id', sa.Integer, nullable=False),
+    sa.Column('kind', sa.SmallInteger, nullable=False),
+    sa.Column('old_value', sa.Integer),
+    sa.Column('new_value', sa.Integer),
+    sa.Column('actor_id', sa.Integer),
+    sa.Column('ts', sa.DateTime, nullable=False),
+    sa.Index('ix_task_events_project_ts', 'project_id', 'ts'),
+    sa.Index('ix_task_events_task_ts', 'task_id', 'ts'),
+)
+
+project_status_snapshots = sa.Table(
+    'project_status_snapshots', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('project_id', sa.Integer, nullable=False),
+    sa.Column('snapshot_date', sa.Date, nullable=False),
+    sa.Column('status_id', sa.Integer, nullable=False),
+    sa.Column('task_count', sa.Integer, nullable=False),
+    sa.Column('effort', sa.Integer, nullable=False),
+    sa.Index('ix_status_snapshots_project_date', 'project_id', 'snapshot_date', 'status_id', unique=True),
+)
+
+priority_weight_profiles = sa.Table(
+    'priority_weight_profiles', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id'), nullable=False, unique=True),
+    sa.Column('urgency', sa.Float, nullable=False),
+    sa.Column('effort', sa.Float, nullable=False),
+    sa.Column('dependency', sa.Float, nullable=False),
+    sa.Column('impact', sa.Float, nullable=False),
+    sa.Column('updated_by', sa.Integer, sa.ForeignKey('users.id')),
+    sa.Column('updated_at', sa.DateTime),
+)
+
+discussions = sa.Table(
+    'discussions', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('message', sa.Text, nullable=False),
+    sa.Column('timestamp', sa.DateTime),
+    sa.Column('parent_id', sa.Integer, sa.ForeignKey('discussions.id')),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id'), nullable=False),
+    sa.Column('task_id', sa.Integer, sa.ForeignKey('tasks.id')),
+    sa.Column('updated_at', sa.DateTime),
+    sa.Column('deleted_at', sa.DateTime),
+    sa.Index('ix_discussions_project_feed', 'project_id', 'timestamp', 'id'),
+    sa.Index('ix_discussions_task_feed', 'task_id', 'timestamp', 'id'),
+    sa.Index('ix_discussions_project_updated', 'project_id', 'updated_at'),
+    sa.Index('ix_discussions_task_updated', 'task_id', 'updated_at'),
+)
+
+notifications = sa.Table(
+    'notifications', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('title', sa.String(200), nullable=False),
+    sa.Column('message', sa.Text, nullable=False),
+    sa.Column('type', sa.String(50), nullable=False),
+    sa.Column('is_read', sa.Boolean),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('task_id', sa.Integer, sa.ForeignKey('tasks.id')),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id')),
+    sa.Column('priority', sa.String(20)),
+    sa.Column('next_reminder_at', sa.DateTime),
+    sa.Index('ix_notifications_user_read', 'user_id', 'is_read', 'created_at'),
+)
+
+budgets = sa.Table(
+    'budgets', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('amount', sa.Float, nullable=False),
+    sa.Column('start_date', sa.DateTime, nullable=False),
+    sa.Column('end_date', sa.DateTime, nullable=False),
+    sa.Column('notes', sa.Text),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id')),
+    sa.Column('task_id', sa.Integer, sa.ForeignKey('tasks.id')),
+    sa.Column('created_by', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Index('ix_budgets_project', 'project_id'),
+    sa.Index('ix_budgets_task', 'task_id'),
+)
+
+expense_categories = sa.Table(
+    'expense_categories', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(100), nullable=False),
+    sa.Column('description', sa.Text),
+    sa.Column('created_at', sa.DateTime),
+)
+
+expenses = sa.Table(
+    'expenses', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('amount', sa.Float, nullable=False),
+    sa.Column('date', sa.DateTime, nullable=False),
+    sa.Column('notes', sa.Text),
+    sa.Column('receipt_url', sa.String(500)),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('projects.id')),
+    sa.Column('task_id', sa.Integer, sa.ForeignKey('tasks.id')),
+    sa.Column('category_id', sa.Integer, sa.ForeignKey('expense_categories.id'), nullable=False),
+    sa.Column('created_by', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Index('ix_expenses_project_date', 'project_id', 'date'),
+    sa.Index('ix_expenses_task', 'task_id'),
+    sa.Index('ix_expenses_receipt_url', 'receipt_url'),
+)
+
+blobs = sa.Table(
+    'blobs', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('sha256', sa.String(64), unique=True, nullable=False),
+    sa.Column('size', sa.Integer, nullable=False),
+    sa.Column('content_type', sa.String(100), nullable=False),
+    sa.Column('created_by', sa.Integer, sa.ForeignKey('users.id')),
+    sa.Column('created_at', sa.DateTime),
+)
+
+# Tables the baseline (0001) creates; later migrations create the rest
+BASELINE_TABLES = [roles, users, user_roles, projects, custom_status, team_members, tasks, discussions, notifications]
@@ -1,6 +1,8 @@
 from database import db
+from db_compat import JSONList
 from flask_security import UserMixin, RoleMixin
 from datetime import datetime
+import re
 
 # ------------------ ROLES ------------------
 class Roles(db.Model, RoleMixin):
@@ -51,6 +53,7 @@ class Projects(db.Model):
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    image_url = db.Column(db.String(500))  # /api/blobs/<sha256> of the uploaded project image
 
     # Relationships
     tasks = db.relationship('Tasks', backref='project', lazy=True)
@@ -58,8 +61,62 @@ class Projects(db.Model):
     discussions = db.relationship('Discussions', backref='project', lazy=True)
     custom_statuses = db.relationship('CustomStatus', backref='project', lazy=True, cascade='all, delete-orphan')
 
+    # Blob downloads check that an image belongs to a project the user is on
+    __table_args__ = (
+        db.Index('ix_projects_image_url', 'image_url'),
+    )
+
 
 # ------------------ CUSTOM STATUS ------------------
+# Progress implied by common status names; used to default new statuses
+# (exact name first, then the first key found as a whole word that is not
+# negated, so "Not Done" and "Undone" stay open)
+STATUS_NAME_PROGRESS = {
+    'to-do': 0.0,
+    'todo': 0.0,
+    'backlog': 0.0,
+    'planned': 0.1,
+    'in progress': 0.5,
+    'in-progress': 0.5,
+    'working': 0.5,
+    'active': 0.5,
+    'development': 0.4,
+    'testing': 0.7,
+    'review': 0.8,
+    'qa': 0.7,
+    'done': 1.0,
+    'completed': 1.0,
+    'finished': 1.0,
+    'closed': 1.0,
+    'deployed': 1.0
+}
+UNKNOWN_STATUS_PROGRESS = 0.2
+_STATUS_KEY_WORDS = [(re.compile(r'(?<![\w-])' + re.escape(key) + r'(?![\w-])'), progress)
+                     for key, progress in STATUS_NAME_PROGRESS.items()]
+_NEGATED = re.compile(r'\b(?:not|non|never|no)(?:\s+yet)?[\s-]*$')
+
+
+def progress_for_status_name(name):
+    """Progress (0.0 to 1.0) a status name suggests"""
+    name = ' '.join((name or '').lower().split())
+    if name in STATUS_NAME_PROGRESS:
+        return STATUS_NAME_PROGRESS[name]
+    for pattern, progress in _STATUS_KEY_WORDS:
+        if any(not _NEGATED.search(name[:m.start()]) for m in pattern.finditer(name)):
+            return progress
+    return UNKNOWN_STATUS_PROGRESS
+
+
+def _default_status_progress(context):
+    return progress_for_status_name(context.get_current_parameters().get('name'))
+
+
+def _default_status_terminal(context):
+    params = context.get_current_parameters()
+    progress = params.get('progress')
+    return (progress if progress is not None else progress_for_status_name(params.get('name'))) >= 1.0
+
+
 class CustomStatus(db.Model):
     __tablename__ = 'custom_status'
 
@@ -69,14 +126,20 @@ class CustomStatus(db.Model):
     color = db.Column(db.String(7), default='#6B7280')  # Hex color code
     position = db.Column(db.Integer, default=0)  # For ordering statuses
     is_default = db.Column(db.Boolean, default=False)  # Mark default status for new tasks
+    progress = db.Column(db.Float, default=_default_status_progress)  # 0.0 (not started) to 1.0
+    is_terminal = db.Column(db.Boolean, default=_default_status_terminal)  # Tasks here are finished
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
     tasks = db.relationship('Tasks', backref='custom_status', lazy=True)
 
-    # Unique constraint: status name must be unique per project
-    __table_args__ = (db.UniqueConstraint('name', 'project_id', name='unique_status_per_project'),)
+    __table_args__ = (
+        # Unique constraint: status name must be unique per project
+        db.UniqueConstraint('name', 'project_id', name='unique_status_per_project'),
+        # Completed / open status id sets
+        db.Index('ix_custom_status_terminal', 'is_terminal', 'project_id'),
+    )
 
 
 # ------------------ TEAM MEMBERS ------------------
@@ -87,6 +150,12 @@ class TeamMembers(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
 
+    # Membership checks run on almost every request
+    __table_args__ = (
+        db.Index('ix_team_members_project_user', 'project_id', 'user_id'),
+        db.Index('ix_team_members_user', 'user_id'),
+    )
+
 
 # ------------------ TASKS ------------------
 class Tasks(db.Model):
@@ -106,8 +175,8 @@ class Tasks(db.Model):
     # Smart Task Prioritization Engine fields
     effort_score = db.Column(db.Integer, default=3)  # 1=Very Easy, 2=Easy, 3=Medium, 4=Hard, 5=Very Hard
     impact_score = db.Column(db.Integer, default=3)  # 1=Low, 2=Medium-Low, 3=Medium, 4=High, 5=Critical
-    dependency_map = db.Column(db.JSON, default=list)  # List of task IDs that depend on this task
-    blocked_by = db.Column(db.JSON, default=list)  # List of task IDs that block this task
+    dependency_map = db.Column(JSONList, default=list)  # List of task IDs that depend on this task
+    blocked_by = db.Column(JSONList, default=list)  # List of task IDs that block this task
     
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     assigned_to = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -118,6 +187,77 @@ class Tasks(db.Model):
     # Relationship to discussions/comments
     discussions = db.relationship('Discussions', backref='task', lazy=True)
 
+    # Board/analytics queries filter by project and status; "my tasks" and
+    # deadline scans by assignee and due date
+    __table_args__ = (
+        db.Index('ix_tasks_project_status', 'project_id', 'status_id'),
+        db.Index('ix_tasks_assigned_due', 'assigned_to', 'due_date'),
+    )
+
+
+# ------------------ TASK EVENTS (append-only history) ------------------
+class TaskEvent(db.Model):
+    __tablename__ = 'task_events'
+
+    # Event kinds
+    CREATED = 1  # new_value = status_id
+    STATUS = 2  # old/new_value = status_id
+    ASSIGNEE = 3  # old/new_value = user id
+    DUE_DATE = 4  # old/new_value = date ordinal (date.toordinal())
+    DELETED = 5
+
+    # Written by task_history.py in the same transaction as the task change.
+    # No foreign keys: history outlives deleted tasks and inserts stay cheap.
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    project_id = db.Column(db.Integer, nullable=False)
+    task_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.SmallInteger, nullable=False)
+    old_value = db.Column(db.Integer)
+    new_value = db.Column(db.Integer)
+    actor_id = db.Column(db.Integer)
+    ts = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Rollups read a project's events in order; task timelines one task's
+    __table_args__ = (
+        db.Index('ix_task_events_project_ts', 'project_id', 'ts'),
+        db.Index('ix_task_events_task_ts', 'task_id', 'ts'),
+    )
+
+
+# ------------------ PROJECT STATUS SNAPSHOTS (daily time series) ------------------
+class ProjectStatusSnapshot(db.Model):
+    __tablename__ = 'project_status_snapshots'
+
+    # One row per project, day and status, written by the nightly
+    # snapshot_project_status job (see flow_snapshots.py)
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, nullable=False)
+    snapshot_date = db.Column(db.Date, nullable=False)
+    status_id = db.Column(db.Integer, nullable=False)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+    effort = db.Column(db.Integer, nullable=False, default=0)  # Sum of effort_score
+
+    # Charts read one project's date range
+    __table_args__ = (
+        db.Index('ix_status_snapshots_project_date', 'project_id', 'snapshot_date', 'status_id', unique=True),
+    )
+
+
+# ------------------ PRIORITY WEIGHT PROFILES ------------------
+class PriorityWeightProfile(db.Model):
+    __tablename__ = 'priority_weight_profiles'
+
+    # A project's smart-priority factor weights (normalized to sum to 1);
+    # projects without a profile use TaskPrioritizationEngine.WEIGHTS
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, unique=True)
+    urgency = db.Column(db.Float, nullable=False)
+    effort = db.Column(db.Float, nullable=False)
+    dependency = db.Column(db.Float, nullable=False)
+    impact = db.Column(db.Float, nullable=False)
+    updated_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 # ------------------ DISCUSSIONS ------------------
 class Discussions(db.Model):
@@ -132,8 +272,23 @@ class Discussions(db.Model):
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=True)  # Optional task reference
 
+    # Bumped on every edit so open panels can fetch only what changed (see routes/discussion.py)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Deleted messages stay as tombstones so since= syncs can report them
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
+    # The task relationship comes from the Tasks.discussions backref
     replies = db.relationship('Discussions', backref=db.backref('parent', remote_side=[id]), lazy=True)
-    task = db.relationship('Tasks', backref='discussions', lazy=True)  # Add relationship to Tasks
+
+    # Feed indexes: (scope, timestamp, id) for cursor pagination, (scope, updated_at) for since= syncs
+    # (the parent_id one also serves reply counts)
+    __table_args__ = (
+        db.Index('ix_discussions_project_feed', 'project_id', 'timestamp', 'id'),
+        db.Index('ix_discussions_task_feed', 'task_id', 'timestamp', 'id'),
+        db.Index('ix_discussions_project_updated', 'project_id', 'updated_at'),
+        db.Index('ix_discussions_task_updated', 'task_id', 'updated_at'),
+        db.Index('ix_discussions_parent_updated', 'parent_id', 'updated_at'),
+    )
 
 
 # ------------------ NOTIFICATIONS ------------------
@@ -163,6 +318,11 @@ class Notifications(db.Model):
     task = db.relationship('Tasks', backref='notifications', lazy=True)
     project = db.relationship('Projects', backref='notifications', lazy=True)
 
+    # Unread badge and notification list per user
+    __table_args__ = (
+        db.Index('ix_notifications_user_read', 'user_id', 'is_read', 'created_at'),
+    )
+
 
 # ------------------ BUDGET ------------------
 class Budget(db.Model):
@@ -185,6 +345,11 @@ class Budget(db.Model):
     task = db.relationship('Tasks', backref='budgets')
     creator = db.relationship('Users', backref='created_budgets')
 
+    __table_args__ = (
+        db.Index('ix_budgets_project', 'project_id'),
+        db.Index('ix_budgets_task', 'task_id'),
+    )
+
     def __repr__(self):
         return f'<Budget {self.id}: {self.amount}>'
 
@@ -225,5 +390,28 @@ class Expense(db.Model):
     category = db.relationship('ExpenseCategory', backref='expenses')
     creator = db.relationship('Users', backref='created_expenses')
 
+    # Funds-usage reports aggregate a project's expenses by date
+    __table_args__ = (
+        db.Index('ix_expenses_project_date', 'project_id', 'date'),
+        db.Index('ix_expenses_task', 'task_id'),
+        # Receipt access checks (BlobStore.can_read)
+        db.Index('ix_expenses_receipt_url', 'receipt_url'),
+    )
+
     def __repr__(self):
         return f'<Expense {self.id}: {self.amount}>'
+
+
+# ------------------ BLOBS (content-addressed uploads) ------------------
+class Blob(db.Model):
+    __tablename__ = 'blobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)  # Content address; file lives at blob_store path
+    size = db.Column(db.Integer, nullable=False)
+    content_type = db.Column(db.String(100), nullable=False)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Blob {self.sha256[:12]}: {self.size} bytes>'
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Create (if needed) and rebuild the full-text search index.
+Safe to run repeatedly; use it after restoring a backup or bulk-loading data
+outside the app.
+"""
+
+from app import create_app
+from search_index import SearchIndex
+
+def rebuild_search_index():
+    app = create_app()
+    with app.app_context():
+        if not SearchIndex.is_supported():
+            print("❌ Full-text search needs an SQLite database with FTS5")
+            return
+
+        print("🔎 Rebuilding full-text search index...")
+        counts = SearchIndex.rebuild()
+        for fts_table, count in counts.items():
+            print(f"   ✅ {fts_table}: {count} rows indexed")
+        print("🎉 Search index ready!")
+
+if __name__ == "__main__":
+    rebuild_search_index()
@@ -1,12 +1,22 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_security import login_required, current_user
 from database import db
-from models import Projects, Tasks, Budget, Expense, TeamMembers, CustomStatus, Users
+from models import Tasks, TeamMembers, CustomStatus, Users
 from datetime import datetime, timedelta
 from sqlalchemy import func
+from db_routing import use_replica_for
+from finance import FinanceAggregator
+from task_history import TaskHistory
+from flow_snapshots import FlowSnapshots
+from status_catalog import StatusCatalog
+from delivery_forecast import DeliveryForecaster
+from config import Config
 
 analytics_bp = Blueprint('analytics', __name__)
 
+# Read-only reporting endpoints: serve them from the read pool
+use_replica_for(analytics_bp)
+
 @analytics_bp.route("/project/<int:project_id>/overview", methods=["GET"])
 @login_required
 def get_project_overview(project_id):
@@ -18,34 +28,23 @@ def get_project_overview(project_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
-    # Get task statistics
+    # Get task statistics (status names come from the cached catalog)
+    statuses = StatusCatalog.by_id(project_id)
     task_stats = db.session.query(
-        CustomStatus.name.label('status'),
-        func.count(Tasks.id).label('count')
-    ).join(Tasks.custom_status).filter(
-        Tasks.project_id == project_id
-    ).group_by(CustomStatus.name).all()
-
-    # Get budget vs expenses
-    total_budget = db.session.query(func.sum(Budget.amount)).filter_by(project_id=project_id).scalar() or 0
-    total_expenses = db.session.query(func.sum(Expense.amount)).filter_by(project_id=project_id).scalar() or 0
-
-    # Get expense breakdown by category
-    expense_by_category = db.session.query(
-        Expense.category_id,
-        func.sum(Expense.amount).label('total')
-    ).filter_by(project_id=project_id).group_by(Expense.category_id).all()
-
-    # Get task completion trend (last 30 days) - using updated_at as proxy for completion
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    completion_trend = db.session.query(
-        func.date(Tasks.updated_at).label('date'),
+        Tasks.status_id,
         func.count(Tasks.id).label('count')
-    ).join(Tasks.custom_status).filter(
+    ).filter(
         Tasks.project_id == project_id,
-        CustomStatus.name == 'Done',
-        Tasks.updated_at >= thirty_days_ago
-    ).group_by(func.date(Tasks.updated_at)).all()
+        Tasks.status_id.isnot(None)
+    ).group_by(Tasks.status_id).all()
+
+    # Get budget vs expenses and the expense breakdown by category
+    finance = FinanceAggregator.summarize(project_id=project_id)
+    total_budget = finance["total_budget"]
+    total_expenses = finance["total_expenses"]
+
+    # Completion trend (last 30 days) and time in status come from the task event log
+    flow = TaskHistory.flow_metrics(project_id, days=30)
 
     # Get task priority distribution
     priority_stats = db.session.query(
@@ -53,31 +52,24 @@ def get_project_overview(project_id):
         func.count(Tasks.id).label('count')
     ).filter_by(project_id=project_id).group_by(Tasks.priority).all()
 
-    # Get bottleneck analysis (tasks stuck in status for long time)
-    bottleneck_analysis = db.session.query(
-        CustomStatus.name.label('status'),
-        func.avg(
-            func.julianday('now') - func.julianday(Tasks.updated_at)
-        ).label('avg_days')
-    ).join(Tasks.custom_status).filter(
-        Tasks.project_id == project_id
-    ).group_by(CustomStatus.name).all()
+    # Get bottleneck analysis (average time tasks spend in each status)
+    status_names = {status_id: status["name"] for status_id, status in statuses.items()}
 
     # Get team productivity (tasks completed per team member)
     team_productivity = db.session.query(
         Tasks.assigned_to.label('assignee_id'),
         func.count(Tasks.id).label('completed_tasks')
-    ).join(Tasks.custom_status).filter(
+    ).filter(
         Tasks.project_id == project_id,
-        CustomStatus.name == 'Done'
+        Tasks.status_id.in_(TaskHistory.done_status_ids(project_id))
     ).group_by(Tasks.assigned_to).all()
 
     return jsonify({
         "task_stats": {
             "by_status": [{
-                "status": stat.status,
+                "status": status_names[stat.status_id],
                 "count": stat.count
-            } for stat in task_stats]
+            } for stat in task_stats if stat.status_id in status_names]
         },
         "budget_overview": {
             "total_budget": total_budget,
@@ -85,21 +77,26 @@ def get_project_overview(project_id):
             "remaining": total_budget - total_expenses
         },
         "expense_breakdown": [{
-            "category_id": cat.category_id,
-            "total": float(cat.total)
-        } for cat in expense_by_category],
-        "completion_trend": [{
-            "date": str(trend.date),
-            "count": trend.count
-        } for trend in completion_trend],
+            "category_id": cat["category_id"],
+            "category_name": cat["name"],
+            "total": cat["total"]
+        } for cat in finance["categories"]],
+        "completion_trend": flow["completion_trend"],
         "priority_distribution": [{
             "priority": stat.priority,
             "count": stat.count
         } for stat in priority_stats],
         "bottleneck_analysis": [{
-            "status": stat.status,
-            "avg_days": float(stat.avg_days) if stat.avg_days else 0
-        } for stat in bottleneck_analysis],
+            "status": status_names[status_id],
+            "avg_days": stat["avg_days"],
+            "current_tasks": stat["current_tasks"],
+            "current_avg_days": stat["current_avg_days"]
+        } for status_id, stat in flow["time_in_status"].items() if status_id in status_names],
+        "flow_metrics": {
+            "completed_tasks": flow["completed_tasks"],
+            "lead_time_days": flow["lead_time"],
+            "cycle_time_days": flow["cycle_time"]
+        },
         "team_productivity": [{
             "assignee_id": prod.assignee_id,
             "completed_tasks": prod.completed_tasks
@@ -117,19 +114,21 @@ def get_project_timeline(project_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
-    # Get task timeline data
+    # Get task timeline data; completion times come from the task event log
     tasks = Tasks.query.filter_by(project_id=project_id).all()
+    completed_at = TaskHistory.flow_metrics(project_id)["completed_at"]
+    statuses = StatusCatalog.by_id(project_id)
     timeline_data = []
 
     for task in tasks:
         assignee_name = task.assignee.name if task.assignee else "Unassigned"
-        status_name = task.custom_status.name if task.custom_status else "No Status"
+        status_name = StatusCatalog.summary(statuses.get(task.status_id))["name"]
         
         timeline_data.append({
             "id": task.id,
             "title": task.title,
             "start_date": task.created_at.isoformat() if task.created_at else None,
-            "end_date": task.updated_at.isoformat() if task.updated_at and status_name == 'Done' else None,
+            "end_date": completed_at.get(task.id),
             "status": status_name,
             "assignee": assignee_name
         })
@@ -188,83 +187,121 @@ def get_project_deadline_risk(project_id):
         if not team_membership:
             return jsonify({"error": "Not authorized"}), 403
 
-        # Get project tasks
-        tasks = Tasks.query.filter_by(project_id=project_id).all()
-        
-        if not tasks:
-            return jsonify({
-                "risk_level": "low",
-                "progress_percentage": 0,
-                "days_remaining": 999,
-                "total_tasks": 0,
-                "completed_tasks": 0
-            }), 200
-
-        # Calculate progress
-        completed_statuses = CustomStatus.query.filter(
-            CustomStatus.project_id == project_id,
-            CustomStatus.name.in_(["Done", "Completed", "Finished"])
-        ).all()
-        completed_status_ids = [s.id for s in completed_statuses]
-        
-        completed_tasks = [t for t in tasks if t.status_id in completed_status_ids]
-        progress_percentage = round((len(completed_tasks) / len(tasks)) * 100) if tasks else 0
+        # Risk comes from the Monte Carlo forecast of the open work
+        forecast = DeliveryForecaster.forecast(project_id)
+        total_tasks = forecast["total_tasks"]
+        progress_percentage = round((forecast["completed_tasks"] / total_tasks) * 100) if total_tasks else 0
 
-        # Find earliest deadline
-        upcoming_tasks = [t for t in tasks if t.due_date and t.status_id not in completed_status_ids]
-        
-        if not upcoming_tasks:
-            return jsonify({
-                "risk_level": "low",
-                "progress_percentage": progress_percentage,
-                "days_remaining": 999,
-                "total_tasks": len(tasks),
-                "completed_tasks": len(completed_tasks)
-            }), 200
-
-        # Get the earliest deadline
-        earliest_deadline = min(upcoming_tasks, key=lambda t: t.due_date).due_date
-        today = datetime.now().date()
-        days_remaining = (earliest_deadline - today).days
-
-        # Determine risk level based on progress and time remaining
-        risk_level = "low"
-        
-        if days_remaining < 0:  # Overdue
-            risk_level = "critical"
-        elif days_remaining <= 1:  # Due today/tomorrow
-            if progress_percentage < 80:
-                risk_level = "critical"
-            elif progress_percentage < 90:
-                risk_level = "high"
-            else:
-                risk_level = "medium"
-        elif days_remaining <= 3:  # Due in 2-3 days
-            if progress_percentage < 60:
-                risk_level = "high"
-            elif progress_percentage < 80:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
-        elif days_remaining <= 7:  # Due in a week
-            if progress_percentage < 40:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
-        else:  # More than a week
-            if progress_percentage < 20 and days_remaining <= 14:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
-
-        return jsonify({
-            "risk_level": risk_level,
+        result = {
+            "risk_level": forecast["risk_level"],
             "progress_percentage": progress_percentage,
-            "days_remaining": days_remaining,
-            "total_tasks": len(tasks),
-            "completed_tasks": len(completed_tasks),
-            "earliest_deadline": earliest_deadline.isoformat()
-        }), 200
+            "days_remaining": 999,
+            "total_tasks": total_tasks,
+            "completed_tasks": forecast["completed_tasks"],
+            "on_time_probability": forecast["probability"],
+            "at_risk_deadline": forecast["at_risk_deadline"],
+            "forecast_status": forecast["status"]
+        }
+        if forecast["deadlines"]:
+            earliest = forecast["deadlines"][0]
+            result["days_remaining"] = earliest["days_remaining"]
+            result["earliest_deadline"] = earliest["date"]
+        return jsonify(result), 200
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500 
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@analytics_bp.route("/project/<int:project_id>/delivery-forecast", methods=["GET"])
+@login_required
+def get_delivery_forecast(project_id):
+    """
+    Monte Carlo forecast per deadline. Query params: trials (1000 to
+    DELIVERY_FORECAST_MAX_TRIALS, rounded down to a multiple of 1000)
+    """
+    team_membership = TeamMembers.query.filter_by(
+        project_id=project_id,
+        user_id=current_user.id
+    ).first()
+    if not team_membership:
+        return jsonify({"error": "Not authorized"}), 403
+
+    try:
+        trials = int(request.args.get("trials", Config.DELIVERY_FORECAST_TRIALS))
+    except ValueError:
+        return jsonify({"error": "trials must be an integer"}), 400
+    if not 1000 <= trials <= Config.DELIVERY_FORECAST_MAX_TRIALS:
+        return jsonify({"error": f"trials must be between 1000 and {Config.DELIVERY_FORECAST_MAX_TRIALS}"}), 400
+
+    return jsonify(DeliveryForecaster.forecast(project_id, trials)), 200
+
+
+# ---------- CUMULATIVE FLOW AND BURNDOWN ----------
+def _snapshot_range():
+    """(start, end, error) from ?start&end, defaulting to the last 30 days"""
+    try:
+        end = datetime.strptime(request.args["end"], "%Y-%m-%d").date() if request.args.get("end") else datetime.utcnow().date()
+        start = datetime.strptime(request.args["start"], "%Y-%m-%d").date() if request.args.get("start") else end - timedelta(days=29)
+    except ValueError:
+        return None, None, "start/end must be YYYY-MM-DD"
+    if start > end:
+        return None, None, "start must not be after end"
+    if (end - start).days >= FlowSnapshots.MAX_RANGE_DAYS:
+        return None, None, f"Range is limited to {FlowSnapshots.MAX_RANGE_DAYS} days"
+    return start, end, None
+
+
+@analytics_bp.route("/project/<int:project_id>/cumulative-flow", methods=["GET"])
+@login_required
+def get_cumulative_flow(project_id):
+    """Task count per status per day. Query params: start, end (YYYY-MM-DD, default last 30 days)"""
+    team_membership = TeamMembers.query.filter_by(
+        project_id=project_id,
+        user_id=current_user.id
+    ).first()
+    if not team_membership:
+        return jsonify({"error": "Not authorized"}), 403
+
+    start, end, error = _snapshot_range()
+    if error:
+        return jsonify({"error": error}), 400
+
+    return jsonify({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        **FlowSnapshots.cumulative_flow(project_id, start, end)
+    }), 200
+
+
+@analytics_bp.route("/project/<int:project_id>/burndown", methods=["GET"])
+@login_required
+def get_burndown(project_id):
+    """
+    Remaining effort and tasks per day
+
+    Query params: start, end (YYYY-MM-DD, default last 30 days), target_date
+    (YYYY-MM-DD) to include the ideal burndown line
+    """
+    team_membership = TeamMembers.query.filter_by(
+        project_id=project_id,
+        user_id=current_user.id
+    ).first()
+    if not team_membership:
+        return jsonify({"error": "Not authorized"}), 403
+
+    start, end, error = _snapshot_range()
+    if error:
+        return jsonify({"error": error}), 400
+    try:
+        target_date = datetime.strptime(request.args["target_date"], "%Y-%m-%d").date() if request.args.get("target_date") else None
+    except ValueError:
+        return jsonify({"error": "target_date must be YYYY-MM-DD"}), 400
+    if target_date and (target_date - start).days >= FlowSnapshots.MAX_RANGE_DAYS * 2:
+        return jsonify({"error": "target_date is too far from start"}), 400
+
+    return jsonify({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "target_date": target_date.isoformat() if target_date else None,
+        **FlowSnapshots.burndown(project_id, start, end, target_date)
+    }), 200
@@ -0,0 +1,93 @@
+from flask import Blueprint, request, jsonify
+from flask_security import login_required, current_user
+from database import db
+from models import TeamMembers, Users
+from workload import WorkloadBalancer
+from config import Config
+
+assignment_bp = Blueprint('assignment', __name__)
+
+
+def _require_member(project_id):
+    """403 response unless the current user is on the project's team"""
+    team_membership = TeamMembers.query.filter_by(project_id=project_id, user_id=current_user.id).first()
+    if not team_membership:
+        return jsonify({"error": "Project not found or user not authorized"}), 403
+    return None
+
+
+# ---------- TEAM LOAD ----------
+@assignment_bp.route("/project/<int:project_id>/load", methods=["GET"])
+@login_required
+def get_team_load(project_id):
+    """Current load per team member, least loaded first"""
+    denied = _require_member(project_id)
+    if denied:
+        return denied
+
+    loads = WorkloadBalancer.member_loads(project_id)
+    names = dict(db.session.query(Users.id, Users.name).filter(Users.id.in_(loads))) if loads else {}
+    return jsonify({
+        "project_id": project_id,
+        "crowding_days": Config.WORKLOAD_CROWDING_DAYS,
+        "blocked_weight": Config.WORKLOAD_BLOCKED_WEIGHT,
+        "members": [{"user_id": user_id, "name": names.get(user_id), **load}
+                    for user_id, load in sorted(loads.items(), key=lambda item: item[1]["load"])],
+    }), 200
+
+
+# ---------- SUGGEST ASSIGNEES ----------
+@assignment_bp.route("/project/<int:project_id>/suggest", methods=["POST"])
+@login_required
+def suggest_assignees(project_id):
+    """
+    Balanced assignees for tasks about to be created
+
+    Expected input:
+    {
+        "tasks": [{"effort_score": 3, "due_date": "2025-01-31", "blocked_by": []}, ...]
+    }
+
+    Drafts are placed together, so a batch is spread over the team rather
+    than all landing on whoever is least loaded right now.
+    """
+    denied = _require_member(project_id)
+    if denied:
+        return denied
+
+    drafts = (request.get_json() or {}).get("tasks")
+    if not isinstance(drafts, list) or not drafts or not all(isinstance(d, dict) for d in drafts):
+        return jsonify({"error": "tasks must be a non-empty list of objects"}), 400
+
+    try:
+        suggestions = WorkloadBalancer.suggest(project_id, drafts)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid task draft: effort_score must be a number, due_date YYYY-MM-DD"}), 400
+
+    return jsonify({"project_id": project_id, "suggestions": suggestions}), 200
+
+
+# ---------- AUTO-ASSIGN ----------
+@assignment_bp.route("/project/<int:project_id>/auto-assign", methods=["POST"])
+@login_required
+def auto_assign_tasks(project_id):
+    """
+    Assign open, unassigned tasks across the team
+
+    Expected input (all optional):
+    {
+        "task_ids": [12, 13, 14],   # default: every open unassigned task
+        "dry_run": false            # true: return the plan without saving it
+    }
+    """
+    denied = _require_member(project_id)
+    if denied:
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    task_ids = data.get("task_ids")
+    if task_ids is not None and (not isinstance(task_ids, list) or not all(isinstance(t, int) for t in task_ids)):
+        return jsonify({"error": "task_ids must be a list of task ids"}), 400
+
+    result = WorkloadBalancer.auto_assign(project_id, task_ids, dry_run=bool(data.get("dry_run")))
+    return jsonify(result), 200
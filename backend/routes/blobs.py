@@ -0,0 +1,81 @@
+from flask import Blueprint, request, jsonify, send_file
+from flask_security import login_required, current_user
+from models import Blob
+from blob_store import BlobStore, BlobError
+from config import Config
+
+blobs_bp = Blueprint('blobs', __name__)
+
+
+def _upload_stream():
+    """The uploaded file: multipart "file" field, else the raw request body"""
+    upload = request.files.get("file")
+    return upload.stream if upload else request.stream
+
+
+def _readable_blob(sha256):
+    """The blob if it exists and the current user may read it, else None (404 either way)"""
+    if not BlobStore.is_valid_hash(sha256):
+        return None
+    blob = Blob.query.filter_by(sha256=sha256).first()
+    if not blob or not BlobStore.can_read(blob, current_user.id):
+        return None
+    return blob
+
+
+def _send_immutable(path, mimetype, etag):
+    """
+    Serve a stored file; send_file answers Range and If-None-Match /
+    If-Modified-Since requests (206 / 304) itself
+    """
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=etag, max_age=Config.BLOB_CACHE_MAX_AGE)
+    # Content never changes under a hash, but files are only for signed-in users
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    response.headers.setdefault("Accept-Ranges", "bytes")
+    return response
+
+
+# ---------- UPLOAD ----------
+@blobs_bp.route("/", methods=["POST"])
+@login_required
+def upload_blob():
+    """
+    Store a receipt or image (multipart "file" field, or the raw body)
+
+    Identical content is stored once; uploading it again returns the
+    existing blob with deduplicated=true.
+    """
+    try:
+        blob, deduplicated = BlobStore.save(_upload_stream(), current_user.id)
+    except BlobError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(BlobStore.describe(blob, deduplicated)), 200 if deduplicated else 201
+
+
+# ---------- DOWNLOAD ----------
+@blobs_bp.route("/<sha256>", methods=["GET"])
+@login_required
+def get_blob(sha256):
+    blob = _readable_blob(sha256)
+    if not blob:
+        return jsonify({"error": "Not found"}), 404
+    return _send_immutable(BlobStore.path_for(sha256), blob.content_type, sha256)
+
+
+# ---------- THUMBNAIL ----------
+@blobs_bp.route("/<sha256>/thumbnail", methods=["GET"])
+@login_required
+def get_blob_thumbnail(sha256):
+    """Query params: size (128, 256 or 512; default 256)"""
+    blob = _readable_blob(sha256)
+    if not blob or not blob.content_type.startswith("image/"):
+        return jsonify({"error": "No thumbnail for this file"}), 404
+
+    try:
+        size = int(request.args.get("size", BlobStore.DEFAULT_THUMBNAIL_SIZE))
+        path = BlobStore.thumbnail(sha256, size)
+    except ValueError as e:  # BlobError included
+        return jsonify({"error": str(e) if isinstance(e, BlobError) else "size must be an integer"}), 400
+    return _send_immutable(path, "image/jpeg", f"{sha256}-{size}")
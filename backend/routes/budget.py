@@ -3,6 +3,9 @@ from flask_security import login_required, current_user
 from database import db
 from models import Budget, Projects, Tasks, TeamMembers
 from datetime import datetime
+from db_routing import replica_view
+from finance import FinanceAggregator
+from burn_rate import BurnRateForecaster
 
 budget_bp = Blueprint('budget', __name__)
 
@@ -78,6 +81,7 @@ def create_budget():
 
     db.session.add(budget)
     db.session.commit()
+    BurnRateForecaster.invalidate(budget.project_id)
 
     return jsonify({
         "message": "Budget created",
@@ -166,6 +170,7 @@ def update_budget(budget_id):
         budget.notes = data["notes"]
 
     db.session.commit()
+    BurnRateForecaster.invalidate(budget.project_id)
     return jsonify({"message": "Budget updated"}), 200
 
 # ---------- DELETE BUDGET ----------
@@ -185,19 +190,18 @@ def delete_budget(budget_id):
 
     db.session.delete(budget)
     db.session.commit()
+    BurnRateForecaster.invalidate(project_id)
     return jsonify({"message": "Budget deleted"}), 200
 
 # ---------- GET FUNDS USAGE ANALYSIS ----------
 @budget_bp.route("/funds-usage/project/<int:project_id>", methods=["GET"])
 @login_required
+@replica_view
 def get_project_funds_usage(project_id):
     """
     Calculate and return funds usage analysis for a project.
     Combines budget and expense data to show how much funds have been used.
     """
-    print(f"DEBUG: Funds usage API called for project {project_id}")
-    from models import Expense
-    
     # Verify user is a team member
     team_membership = TeamMembers.query.filter_by(
         project_id=project_id,
@@ -206,83 +210,60 @@ def get_project_funds_usage(project_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
-    # Get all budgets for the project
-    budgets = Budget.query.filter_by(project_id=project_id).all()
-    
-    # Get all expenses for the project
-    expenses = Expense.query.filter_by(project_id=project_id).all()
-    
-    # Calculate totals
-    total_budget = sum(b.amount for b in budgets)
-    total_expenses = sum(e.amount for e in expenses)
-    remaining_funds = total_budget - total_expenses
-    usage_percentage = (total_expenses / total_budget * 100) if total_budget > 0 else 0
-    
-    # Calculate budget utilization over time (monthly breakdown)
-    from collections import defaultdict
-    monthly_breakdown = defaultdict(lambda: {"budget": 0, "expenses": 0})
-    
-    for budget in budgets:
-        month_key = budget.start_date.strftime("%Y-%m")
-        monthly_breakdown[month_key]["budget"] += budget.amount
-    
-    for expense in expenses:
-        month_key = expense.date.strftime("%Y-%m")
-        monthly_breakdown[month_key]["expenses"] += expense.amount
-    
-    # Sort monthly data
-    monthly_data = []
-    for month in sorted(monthly_breakdown.keys()):
-        data = monthly_breakdown[month]
-        monthly_data.append({
-            "month": month,
-            "budget": data["budget"],
-            "expenses": data["expenses"],
-            "remaining": data["budget"] - data["expenses"]
-        })
-    
-    # Calculate category-wise expense breakdown
-    category_breakdown = defaultdict(float)
-    for expense in expenses:
-        category_breakdown[expense.category.name] += expense.amount
-    
-    # Determine status based on usage
-    if usage_percentage >= 90:
-        status = "critical"
-        status_message = "Budget critically low"
-    elif usage_percentage >= 75:
-        status = "warning"
-        status_message = "Budget usage high"
-    elif usage_percentage >= 50:
-        status = "moderate"
-        status_message = "Budget usage moderate"
-    else:
-        status = "healthy"
-        status_message = "Budget usage healthy"
-    
+    # Totals, monthly breakdown and category breakdown are aggregated in SQL
+    summary = FinanceAggregator.summarize(project_id=project_id)
+    forecast = BurnRateForecaster.forecast(project_id)
+
+    status = FinanceAggregator.usage_status(summary["usage_percentage"], "Budget")
+    if forecast["status"] == "overrun_likely" and status["status"] in ("healthy", "moderate"):
+        # Spending pace will exhaust the budget before it ends
+        status = {"status": "warning", "status_message": f"Budget projected to run out on {forecast['exhaustion_date']}"}
+
     return jsonify({
         "project_id": project_id,
-        "total_budget": total_budget,
-        "total_expenses": total_expenses,
-        "remaining_funds": remaining_funds,
-        "usage_percentage": round(usage_percentage, 2),
-        "status": status,
-        "status_message": status_message,
-        "monthly_breakdown": monthly_data,
-        "category_breakdown": dict(category_breakdown),
-        "budget_count": len(budgets),
-        "expense_count": len(expenses)
+        "total_budget": summary["total_budget"],
+        "total_expenses": summary["total_expenses"],
+        "remaining_funds": summary["remaining_funds"],
+        "usage_percentage": round(summary["usage_percentage"], 2),
+        **status,
+        "monthly_breakdown": summary["monthly_breakdown"],
+        "category_breakdown": FinanceAggregator.category_totals_by_name(summary["categories"]),
+        "budget_count": summary["budget_count"],
+        "expense_count": summary["expense_count"],
+        "forecast": {
+            "daily_burn_rate": forecast["daily_burn_rate"],
+            "exhaustion_date": forecast["exhaustion_date"],
+            "budget_end_date": forecast["budget_end_date"],
+            "status": forecast["status"]
+        }
     }), 200
 
+# ---------- GET BUDGET BURN-RATE FORECAST ----------
+@budget_bp.route("/forecast/project/<int:project_id>", methods=["GET"])
+@login_required
+@replica_view
+def get_project_budget_forecast(project_id):
+    """
+    Burn rate, projected exhaustion date (with confidence band) and overrun
+    probability against the budget end date. Cached per project per day.
+    """
+    team_membership = TeamMembers.query.filter_by(
+        project_id=project_id,
+        user_id=current_user.id
+    ).first()
+    if not team_membership:
+        return jsonify({"error": "Not authorized"}), 403
+
+    return jsonify(BurnRateForecaster.forecast(project_id)), 200
+
 # ---------- GET FUNDS USAGE FOR TASK ----------
 @budget_bp.route("/funds-usage/task/<int:task_id>", methods=["GET"])
 @login_required  
+@replica_view
 def get_task_funds_usage(task_id):
     """
     Calculate and return funds usage analysis for a specific task.
     """
-    from models import Expense
-    
     task = Tasks.query.get_or_404(task_id)
     
     # Verify user is a team member
@@ -292,48 +273,18 @@ def get_task_funds_usage(task_id):
     ).first()
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
-    
-    # Get all budgets for the task
-    budgets = Budget.query.filter_by(task_id=task_id).all()
-    
-    # Get all expenses for the task  
-    expenses = Expense.query.filter_by(task_id=task_id).all()
-    
-    # Calculate totals
-    total_budget = sum(b.amount for b in budgets)
-    total_expenses = sum(e.amount for e in expenses)
-    remaining_funds = total_budget - total_expenses
-    usage_percentage = (total_expenses / total_budget * 100) if total_budget > 0 else 0
-    
-    # Calculate category-wise expense breakdown
-    category_breakdown = defaultdict(float)
-    for expense in expenses:
-        category_breakdown[expense.category.name] += expense.amount
-    
-    # Determine status based on usage
-    if usage_percentage >= 90:
-        status = "critical"
-        status_message = "Task budget critically low"
-    elif usage_percentage >= 75:
-        status = "warning" 
-        status_message = "Task budget usage high"
-    elif usage_percentage >= 50:
-        status = "moderate"
-        status_message = "Task budget usage moderate"
-    else:
-        status = "healthy"
-        status_message = "Task budget usage healthy"
-    
+
+    summary = FinanceAggregator.summarize(task_id=task_id)
+
     return jsonify({
         "task_id": task_id,
         "task_title": task.title,
-        "total_budget": total_budget,
-        "total_expenses": total_expenses,
-        "remaining_funds": remaining_funds,
-        "usage_percentage": round(usage_percentage, 2),
-        "status": status,
-        "status_message": status_message,
-        "category_breakdown": dict(category_breakdown),
-        "budget_count": len(budgets),
-        "expense_count": len(expenses)
-    }), 200 
\ No newline at end of file
+        "total_budget": summary["total_budget"],
+        "total_expenses": summary["total_expenses"],
+        "remaining_funds": summary["remaining_funds"],
+        "usage_percentage": round(summary["usage_percentage"], 2),
+        **FinanceAggregator.usage_status(summary["usage_percentage"], "Task budget"),
+        "category_breakdown": FinanceAggregator.category_totals_by_name(summary["categories"]),
+        "budget_count": summary["budget_count"],
+        "expense_count": summary["expense_count"]
+    }), 200
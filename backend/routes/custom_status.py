@@ -1,11 +1,31 @@
 from flask import Blueprint, request, jsonify
 from flask_security import login_required, current_user
 from database import db
-from models import CustomStatus, Projects
+from models import CustomStatus, Projects, progress_for_status_name
+from status_catalog import StatusCatalog
 from datetime import datetime
 
 custom_status_bp = Blueprint('custom_status', __name__)
 
+
+def _progress_fields(data):
+    """(fields, error) for the optional progress / is_terminal values in a request"""
+    fields = {}
+    if data.get("progress") is not None:
+        try:
+            progress = float(data["progress"])
+        except (TypeError, ValueError):
+            return None, "progress must be a number between 0 and 1"
+        if not 0.0 <= progress <= 1.0:
+            return None, "progress must be a number between 0 and 1"
+        fields["progress"] = progress
+    if data.get("is_terminal") is not None:
+        if not isinstance(data["is_terminal"], bool):
+            return None, "is_terminal must be true or false"
+        fields["is_terminal"] = data["is_terminal"]
+    return fields, None
+
+
 # ---------- CREATE CUSTOM STATUS ----------
 @custom_status_bp.route("/", methods=["POST"])
 @login_required
@@ -20,6 +40,10 @@ def create_custom_status():
 
     if not name or not project_id:
         return jsonify({"error": "Status name and project_id are required"}), 400
+    # Progress and terminal flag default from the status name
+    progress_fields, error = _progress_fields(data)
+    if error:
+        return jsonify({"error": error}), 400
 
     # Check project ownership
     project = Projects.query.filter_by(id=project_id, created_by=current_user.id).first()
@@ -41,11 +65,13 @@ def create_custom_status():
         color=color,
         position=position,
         is_default=is_default,
-        project_id=project_id
+        project_id=project_id,
+        **progress_fields
     )
     
     db.session.add(custom_status)
     db.session.commit()
+    StatusCatalog.invalidate(project_id)
 
     return jsonify({
         "message": "Custom status created",
@@ -55,7 +81,9 @@ def create_custom_status():
             "description": custom_status.description,
             "color": custom_status.color,
             "position": custom_status.position,
-            "is_default": custom_status.is_default
+            "is_default": custom_status.is_default,
+            "progress": custom_status.progress,
+            "is_terminal": custom_status.is_terminal
         }
     }), 201
 
@@ -77,6 +105,8 @@ def get_custom_statuses(project_id):
         "color": s.color,
         "position": s.position,
         "is_default": s.is_default,
+        "progress": s.progress,
+        "is_terminal": s.is_terminal,
         "task_count": len(s.tasks)
     } for s in statuses]
 
@@ -95,6 +125,9 @@ def update_custom_status(status_id):
         return jsonify({"error": "Unauthorized"}), 403
 
     data = request.get_json()
+    progress_fields, error = _progress_fields(data)
+    if error:
+        return jsonify({"error": error}), 400
     
     # Check if new name conflicts with existing status in same project
     new_name = data.get("name", custom_status.name)
@@ -115,13 +148,22 @@ def update_custom_status(status_id):
         ).update({'is_default': False})
 
     # Update fields
+    previous_name = custom_status.name
     custom_status.name = new_name
     custom_status.description = data.get("description", custom_status.description)
     custom_status.color = data.get("color", custom_status.color)
     custom_status.position = data.get("position", custom_status.position)
     custom_status.is_default = is_default
+    # A rename re-derives progress and terminal flag from the new name
+    # unless the request sets them
+    if new_name != previous_name:
+        progress_fields.setdefault("progress", progress_for_status_name(new_name))
+        progress_fields.setdefault("is_terminal", progress_fields["progress"] >= 1.0)
+    for field, value in progress_fields.items():
+        setattr(custom_status, field, value)
 
     db.session.commit()
+    StatusCatalog.invalidate(custom_status.project_id)
     return jsonify({"message": "Custom status updated"}), 200
 
 # ---------- DELETE CUSTOM STATUS ----------
@@ -142,8 +184,10 @@ def delete_custom_status(status_id):
             "error": f"Cannot delete status. {len(custom_status.tasks)} tasks are using this status. Please reassign them first."
         }), 400
 
+    project_id = custom_status.project_id
     db.session.delete(custom_status)
     db.session.commit()
+    StatusCatalog.invalidate(project_id)
     return jsonify({"message": "Custom status deleted"}), 200
 
 # ---------- CREATE DEFAULT STATUSES FOR NEW PROJECT ----------
@@ -181,6 +225,7 @@ def create_default_statuses(project_id):
         created_statuses.append(status_data["name"])
 
     db.session.commit()
+    StatusCatalog.invalidate(project_id)
     return jsonify({
         "message": "Default statuses created",
         "statuses": created_statuses
@@ -3,9 +3,134 @@ from flask_security import login_required, current_user
 from database import db
 from models import Discussions, Projects, Tasks, TeamMembers
 from datetime import datetime
+from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import joinedload
+import base64
 
 discussion_bp = Blueprint('discussion', __name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# ---------- FEED CURSORS ----------
+# Feeds are paged newest-first on (timestamp, id) so that messages sharing a
+# timestamp are never skipped or repeated. Incremental refreshes walk
+# (updated_at, id) forward so that edits show up alongside new messages.
+# Deleting a message keeps it as a tombstone (deleted_at, message cleared):
+# feeds skip it and incremental refreshes list its id in deleted_ids.
+# Posting, editing or deleting a reply also moves its parent's updated_at, so
+# root feeds resend the parent with a fresh replies_count.
+
+def _live(query):
+    return query.filter(Discussions.deleted_at.is_(None))
+
+def _touch_parent(discussion):
+    """Bump the parent's updated_at when one of its replies changes"""
+    if discussion.parent_id:
+        _live(Discussions.query).filter_by(id=discussion.parent_id).update(
+            {Discussions.updated_at: datetime.utcnow()}, synchronize_session=False
+        )
+
+def _encode_cursor(moment, row_id):
+    raw = f"{moment.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor):
+    """Return (datetime, id) for a cursor string, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        moment, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(moment), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _feed_params():
+    """Read limit/cursor/since query args; returns None when the caller wants the legacy full list"""
+    args = request.args
+    if not any(key in args for key in ("limit", "cursor", "since")):
+        return None
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("Invalid limit")
+    return {
+        "limit": max(1, min(limit, MAX_PAGE_SIZE)),
+        "cursor": _decode_cursor(args["cursor"]) if args.get("cursor") else None,
+        "since": _decode_cursor(args["since"]) if args.get("since") else None,
+    }
+
+def _sync_cursor(scope_query):
+    """Cursor pointing at the most recently written (or deleted) message in scope"""
+    latest = scope_query.with_entities(Discussions.updated_at, Discussions.id).order_by(
+        Discussions.updated_at.desc(), Discussions.id.desc()
+    ).first()
+    return _encode_cursor(latest.updated_at, latest.id) if latest and latest.updated_at else None
+
+def _page(scope_query, params):
+    """
+    Apply either an incremental (since) or a backwards (cursor) page to a feed query.
+
+    Returns:
+        tuple: (rows, envelope) where envelope holds the cursors for the response;
+        incremental pages move deleted messages from rows to envelope["deleted_ids"]
+    """
+    limit = params["limit"]
+
+    if params["since"]:
+        since_at, since_id = params["since"]
+        rows = scope_query.filter(or_(
+            Discussions.updated_at > since_at,
+            and_(Discussions.updated_at == since_at, Discussions.id > since_id)
+        )).order_by(Discussions.updated_at.asc(), Discussions.id.asc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        envelope = {
+            "has_more": has_more,
+            "sync_cursor": _encode_cursor(rows[-1].updated_at, rows[-1].id) if rows else request.args["since"],
+            "deleted_ids": [r.id for r in rows if r.deleted_at]
+        }
+        return [r for r in rows if not r.deleted_at], envelope
+
+    query = _live(scope_query)
+    if params["cursor"]:
+        before_at, before_id = params["cursor"]
+        query = query.filter(or_(
+            Discussions.timestamp < before_at,
+            and_(Discussions.timestamp == before_at, Discussions.id < before_id)
+        ))
+    rows = query.order_by(Discussions.timestamp.desc(), Discussions.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    envelope = {
+        "has_more": has_more,
+        "next_cursor": _encode_cursor(rows[-1].timestamp, rows[-1].id) if has_more else None,
+        "sync_cursor": _sync_cursor(scope_query)
+    }
+    return rows, envelope
+
+def _reply_counts(discussion_ids):
+    """Reply counts for a page of discussions in one grouped query"""
+    if not discussion_ids:
+        return {}
+    counts = _live(db.session.query(
+        Discussions.parent_id, func.count(Discussions.id)
+    )).filter(Discussions.parent_id.in_(discussion_ids)).group_by(Discussions.parent_id).all()
+    return dict(counts)
+
+def _serialize_discussion(d, replies_count=None):
+    data = {
+        "id": d.id,
+        "message": d.message,
+        "timestamp": d.timestamp.isoformat(),
+        "updated_at": d.updated_at.isoformat() if d.updated_at else None,
+        "user_id": d.user_id,
+        "author_name": d.author.name,
+        "parent_id": d.parent_id
+    }
+    if replies_count is not None:
+        data["replies_count"] = replies_count
+    return data
+
 @discussion_bp.route('/test-discussion')
 def test_discussion():
     return {"message": "Discussion route working!"}
@@ -39,7 +164,7 @@ def create_discussion():
 
     # If parent_id provided, verify it exists and belongs to same project
     if parent_id:
-        parent = Discussions.query.filter_by(id=parent_id, project_id=project_id).first()
+        parent = _live(Discussions.query).filter_by(id=parent_id, project_id=project_id).first()
         if not parent:
             return jsonify({"error": "Parent discussion not found"}), 404
 
@@ -52,6 +177,7 @@ def create_discussion():
     )
 
     db.session.add(discussion)
+    _touch_parent(discussion)
     db.session.commit()
 
     return jsonify({
@@ -71,21 +197,32 @@ def get_project_discussions(project_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
+    try:
+        params = _feed_params()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     # Get root-level discussions (no parent_id)
-    discussions = Discussions.query.filter_by(
+    scope = Discussions.query.options(joinedload(Discussions.author)).filter_by(
         project_id=project_id,
         parent_id=None,
         task_id=None  # Exclude task-specific discussions
-    ).order_by(Discussions.timestamp.desc()).all()
+    )
+    return _discussion_feed_response(scope, params)
 
-    return jsonify([{
-        "id": d.id,
-        "message": d.message,
-        "timestamp": d.timestamp.isoformat(),
-        "user_id": d.user_id,
-        "author_name": d.author.name,
-        "replies_count": len(d.replies)
-    } for d in discussions]), 200
+def _discussion_feed_response(scope, params):
+    """Shared response for the project and task root-level feeds"""
+    if params is None:
+        discussions = _live(scope).order_by(Discussions.timestamp.desc(), Discussions.id.desc()).all()
+        counts = _reply_counts([d.id for d in discussions])
+        return jsonify([_serialize_discussion(d, counts.get(d.id, 0)) for d in discussions]), 200
+
+    discussions, envelope = _page(scope, params)
+    counts = _reply_counts([d.id for d in discussions])
+    return jsonify({
+        "discussions": [_serialize_discussion(d, counts.get(d.id, 0)) for d in discussions],
+        **envelope
+    }), 200
 
 # ---------- GET TASK DISCUSSIONS ----------
 @discussion_bp.route("/task/<int:task_id>", methods=["GET"])
@@ -101,26 +238,23 @@ def get_task_discussions(task_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
+    try:
+        params = _feed_params()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     # Get root-level discussions for the task
-    discussions = Discussions.query.filter_by(
+    scope = Discussions.query.options(joinedload(Discussions.author)).filter_by(
         task_id=task_id,
         parent_id=None
-    ).order_by(Discussions.timestamp.desc()).all()
-
-    return jsonify([{
-        "id": d.id,
-        "message": d.message,
-        "timestamp": d.timestamp.isoformat(),
-        "user_id": d.user_id,
-        "author_name": d.author.name,
-        "replies_count": len(d.replies)
-    } for d in discussions]), 200
+    )
+    return _discussion_feed_response(scope, params)
 
 # ---------- GET DISCUSSION REPLIES ----------
 @discussion_bp.route("/<int:discussion_id>/replies", methods=["GET"])
 @login_required
 def get_discussion_replies(discussion_id):
-    discussion = Discussions.query.get_or_404(discussion_id)
+    discussion = _live(Discussions.query).filter_by(id=discussion_id).first_or_404()
 
     # Verify user is a team member
     team_membership = TeamMembers.query.filter_by(
@@ -130,19 +264,32 @@ def get_discussion_replies(discussion_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
-    return jsonify([{
-        "id": d.id,
-        "message": d.message,
-        "timestamp": d.timestamp.isoformat(),
-        "user_id": d.user_id,
-        "author_name": d.author.name
-    } for d in discussion.replies]), 200
+    try:
+        params = _feed_params()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if params is None:
+        return jsonify([{
+            "id": d.id,
+            "message": d.message,
+            "timestamp": d.timestamp.isoformat(),
+            "user_id": d.user_id,
+            "author_name": d.author.name
+        } for d in discussion.replies if not d.deleted_at]), 200
+
+    scope = Discussions.query.options(joinedload(Discussions.author)).filter_by(parent_id=discussion_id)
+    replies, envelope = _page(scope, params)
+    return jsonify({
+        "replies": [_serialize_discussion(d) for d in replies],
+        **envelope
+    }), 200
 
 # ---------- UPDATE DISCUSSION ----------
 @discussion_bp.route("/<int:discussion_id>", methods=["PUT"])
 @login_required
 def update_discussion(discussion_id):
-    discussion = Discussions.query.get_or_404(discussion_id)
+    discussion = _live(Discussions.query).filter_by(id=discussion_id).first_or_404()
 
     # Only allow the author to update
     if discussion.user_id != current_user.id:
@@ -154,6 +301,7 @@ def update_discussion(discussion_id):
         return jsonify({"error": "Message is required"}), 400
 
     discussion.message = message
+    _touch_parent(discussion)
     db.session.commit()
 
     return jsonify({"message": "Discussion updated"}), 200
@@ -162,13 +310,16 @@ def update_discussion(discussion_id):
 @discussion_bp.route("/<int:discussion_id>", methods=["DELETE"])
 @login_required
 def delete_discussion(discussion_id):
-    discussion = Discussions.query.get_or_404(discussion_id)
+    discussion = _live(Discussions.query).filter_by(id=discussion_id).first_or_404()
 
     # Only allow the author to delete
     if discussion.user_id != current_user.id:
         return jsonify({"error": "Not authorized"}), 403
 
-    db.session.delete(discussion)
+    # Tombstone: the row stays (with a new updated_at) so since= syncs see the delete
+    discussion.deleted_at = datetime.utcnow()
+    discussion.message = ""
+    _touch_parent(discussion)
     db.session.commit()
 
     return jsonify({"message": "Discussion deleted"}), 200
@@ -202,6 +353,7 @@ def create_task_thread(task_id):
     )
 
     db.session.add(discussion)
+    _touch_parent(discussion)
     db.session.commit()
 
     return jsonify({
@@ -222,26 +374,63 @@ def get_task_threads(task_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
+    try:
+        params = _feed_params()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    task_messages = Discussions.query.options(joinedload(Discussions.author)).filter_by(task_id=task_id)
+
+    # Incremental refresh: every new or edited message in the task, roots and
+    # replies alike, flat and oldest-first so the client can merge by id/parent_id
+    if params and params["since"]:
+        messages, envelope = _page(task_messages, params)
+        return jsonify({
+            "messages": [_serialize_discussion(m) for m in messages],
+            **envelope
+        }), 200
+
     # Get all threads for the task
-    threads = Discussions.query.filter_by(
-        task_id=task_id,
-        parent_id=None
-    ).order_by(Discussions.timestamp.desc()).all()
+    roots = task_messages.filter(Discussions.parent_id.is_(None))
+    if params is None:
+        threads = _live(roots).order_by(Discussions.timestamp.desc(), Discussions.id.desc()).all()
+        envelope = None
+    else:
+        threads, envelope = _page(roots, params)
+        # Replies also count as activity in the thread view
+        envelope["sync_cursor"] = _sync_cursor(task_messages)
+
+    # Load the replies for this page of threads in one query
+    replies_by_thread = {t.id: [] for t in threads}
+    if threads:
+        replies = _live(task_messages).filter(
+            Discussions.parent_id.in_(list(replies_by_thread))
+        ).order_by(Discussions.timestamp.asc(), Discussions.id.asc()).all()
+        for reply in replies:
+            replies_by_thread[reply.parent_id].append(reply)
 
     def serialize_thread(thread):
         return {
             "id": thread.id,
             "message": thread.message,
             "timestamp": thread.timestamp.isoformat(),
+            "updated_at": thread.updated_at.isoformat() if thread.updated_at else None,
             "user_id": thread.user_id,
             "author_name": thread.author.name,
             "replies": [{
                 "id": reply.id,
                 "message": reply.message,
                 "timestamp": reply.timestamp.isoformat(),
+                "updated_at": reply.updated_at.isoformat() if reply.updated_at else None,
                 "user_id": reply.user_id,
                 "author_name": reply.author.name
-            } for reply in thread.replies]
+            } for reply in replies_by_thread[thread.id]]
         }
 
-    return jsonify([serialize_thread(t) for t in threads]), 200
+    if envelope is None:
+        return jsonify([serialize_thread(t) for t in threads]), 200
+
+    return jsonify({
+        "threads": [serialize_thread(t) for t in threads],
+        **envelope
+    }), 200
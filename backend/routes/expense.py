@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_security import login_required, current_user
+from sqlalchemy.orm import joinedload
 from database import db
 from models import Expense, ExpenseCategory, Projects, Tasks, TeamMembers
 from datetime import datetime
+from burn_rate import BurnRateForecaster
+from expense_import import ExpenseImporter
+from blob_store import BlobStore, BlobError
 
 expense_bp = Blueprint('expense', __name__)
 
@@ -47,6 +51,10 @@ def create_expense():
     if not project_id and not task_id:
         return jsonify({"error": "Either project_id or task_id is required"}), 400
 
+    # Blob receipts are attached through /<id>/receipt; only files the user can read may be linked
+    if not BlobStore.may_attach(receipt_url, current_user.id):
+        return jsonify({"error": "Receipt not found"}), 400
+
     # Verify user is a team member
     if project_id:
         team_membership = TeamMembers.query.filter_by(
@@ -77,12 +85,49 @@ def create_expense():
 
     db.session.add(expense)
     db.session.commit()
+    BurnRateForecaster.invalidate(expense.project_id)
 
     return jsonify({
         "message": "Expense created",
         "expense_id": expense.id
     }), 201
 
+# ---------- BULK IMPORT EXPENSES ----------
+@expense_bp.route("/import", methods=["POST"])
+@login_required
+def import_expenses():
+    """
+    Import many expenses from a CSV or NDJSON upload
+
+    Body: the file itself (Content-Type text/csv or application/x-ndjson) or
+    a multipart form with a "file" field. Query params: format (csv or ndjson,
+    default from the content type), project_id (for rows without one),
+    chunk_size, dry_run (validate only). Valid rows are imported; invalid
+    rows are reported with their line number.
+    """
+    upload = request.files.get("file")
+    content_type = (upload.mimetype if upload else request.mimetype) or ""
+    fmt = request.args.get("format") or ("ndjson" if "ndjson" in content_type or "json" in content_type else "csv")
+    if fmt not in ExpenseImporter.FORMATS:
+        return jsonify({"error": f"Invalid format. Use: {', '.join(ExpenseImporter.FORMATS)}"}), 400
+
+    try:
+        project_id = int(request.args["project_id"]) if request.args.get("project_id") else None
+        chunk_size = int(request.args["chunk_size"]) if request.args.get("chunk_size") else None
+    except ValueError:
+        return jsonify({"error": "project_id and chunk_size must be integers"}), 400
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+
+    # Decode line by line as the body is read; the upload is never held whole
+    stream = upload.stream if upload else request.stream
+    lines = (line.decode("utf-8", errors="replace") for line in stream)
+
+    importer = ExpenseImporter(current_user.id, default_project_id=project_id,
+                               chunk_size=chunk_size, dry_run=dry_run)
+    summary = importer.run(ExpenseImporter.parse(lines, fmt))
+    status_code = 200 if summary["imported"] or not summary["failed"] else 400
+    return jsonify(summary), status_code
+
 # ---------- GET PROJECT EXPENSES ----------
 @expense_bp.route("/project/<int:project_id>", methods=["GET"])
 @login_required
@@ -95,7 +140,9 @@ def get_project_expenses(project_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
-    expenses = Expense.query.filter_by(project_id=project_id).all()
+    expenses = Expense.query.options(
+        joinedload(Expense.category), joinedload(Expense.creator)
+    ).filter_by(project_id=project_id).all()
     return jsonify([{
         "id": e.id,
         "amount": e.amount,
@@ -124,7 +171,9 @@ def get_task_expenses(task_id):
     if not team_membership:
         return jsonify({"error": "Not authorized"}), 403
 
-    expenses = Expense.query.filter_by(task_id=task_id).all()
+    expenses = Expense.query.options(
+        joinedload(Expense.category), joinedload(Expense.creator)
+    ).filter_by(task_id=task_id).all()
     return jsonify([{
         "id": e.id,
         "amount": e.amount,
@@ -161,13 +210,37 @@ def update_expense(expense_id):
     if "notes" in data:
         expense.notes = data["notes"]
     if "receipt_url" in data:
+        if not BlobStore.may_attach(data["receipt_url"], current_user.id):
+            return jsonify({"error": "Receipt not found"}), 400
         expense.receipt_url = data["receipt_url"]
     if "category_id" in data:
         expense.category_id = data["category_id"]
 
     db.session.commit()
+    BurnRateForecaster.invalidate(expense.project_id)
     return jsonify({"message": "Expense updated"}), 200
 
+# ---------- UPLOAD EXPENSE RECEIPT ----------
+@expense_bp.route("/<int:expense_id>/receipt", methods=["POST"])
+@login_required
+def upload_expense_receipt(expense_id):
+    """Store a receipt file (multipart "file" field, or the raw body) and attach it"""
+    expense = Expense.query.get_or_404(expense_id)
+
+    # Only allow the creator to update
+    if expense.created_by != current_user.id:
+        return jsonify({"error": "Not authorized"}), 403
+
+    upload = request.files.get("file")
+    try:
+        blob, deduplicated = BlobStore.save(upload.stream if upload else request.stream, current_user.id)
+    except BlobError as e:
+        return jsonify({"error": str(e)}), 400
+
+    expense.receipt_url = BlobStore.url_for(blob.sha256)
+    db.session.commit()
+    return jsonify({"message": "Receipt attached", "receipt": BlobStore.describe(blob, deduplicated)}), 200
+
 # ---------- DELETE EXPENSE ----------
 @expense_bp.route("/<int:expense_id>", methods=["DELETE"])
 @login_required
@@ -178,6 +251,8 @@ def delete_expense(expense_id):
     if expense.created_by != current_user.id:
         return jsonify({"error": "Not authorized"}), 403
 
+    project_id = expense.project_id
     db.session.delete(expense)
     db.session.commit()
+    BurnRateForecaster.invalidate(project_id)
     return jsonify({"message": "Expense deleted"}), 200 
\ No newline at end of file
@@ -0,0 +1,60 @@
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_security import login_required, current_user
+from models import TeamMembers
+from exporter import DataExporter
+from db_routing import replica_reads
+
+export_bp = Blueprint('export', __name__)
+
+# ---------- STREAMING PROJECT EXPORT ----------
+@export_bp.route("/<dataset>/project/<int:project_id>", methods=["GET"])
+@login_required
+def export_project_data(dataset, project_id):
+    """
+    Stream a project's expenses, budgets or tasks as CSV or NDJSON
+
+    Query params: format (csv or ndjson, default csv), start and end
+    (YYYY-MM-DD, inclusive), category_id (comma separated; expense categories,
+    or status ids for tasks)
+    """
+    if dataset not in DataExporter.DATASETS:
+        return jsonify({"error": f"Invalid dataset. Use: {', '.join(DataExporter.DATASETS)}"}), 404
+
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in DataExporter.FORMATS:
+        return jsonify({"error": f"Invalid format. Use: {', '.join(DataExporter.FORMATS)}"}), 400
+
+    try:
+        start = datetime.strptime(request.args["start"], "%Y-%m-%d").date() if request.args.get("start") else None
+        end = datetime.strptime(request.args["end"], "%Y-%m-%d").date() if request.args.get("end") else None
+        category_ids = request.args.get("category_id")
+        category_ids = [int(c) for c in category_ids.split(",") if c.strip()] if category_ids else None
+    except ValueError:
+        return jsonify({"error": "start/end must be YYYY-MM-DD and category_id integers"}), 400
+    if start and end and start > end:
+        return jsonify({"error": "start must not be after end"}), 400
+
+    team_membership = TeamMembers.query.filter_by(
+        project_id=project_id,
+        user_id=current_user.id
+    ).first()
+    if not team_membership:
+        return jsonify({"error": "Not authorized"}), 403
+
+    def generate():
+        # Rows are read while the response streams, after the view returned
+        with replica_reads():
+            yield from DataExporter.export(dataset, project_id, fmt, start, end, category_ids)
+
+    filename = DataExporter.filename(dataset, project_id, fmt)
+    return Response(
+        stream_with_context(generate()),
+        mimetype=DataExporter.FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+            # Don't let a reverse proxy buffer the whole export
+            "X-Accel-Buffering": "no",
+        }
+    )
@@ -0,0 +1,297 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_security import login_required, current_user
+from models import Projects, TeamMembers, Users
+from status_catalog import StatusCatalog
+from config import Config
+import json
+import re
+import logging
+
+# Natural-language task parsing lives in its own blueprint so that the LLM
+# stack (LangChain + Google client) is only imported the first time a parse
+# is requested, not when the app or a one-off script calls create_app().
+nl_task_bp = Blueprint('nl_task', __name__)
+
+logger = logging.getLogger(__name__)
+
+
+def get_task_parser():
+    """Import the LLM-backed parser lazily and return its shared instance"""
+    from llm_task_parser import get_task_parser as _get_task_parser
+    return _get_task_parser()
+
+
+# List markers stripped from batch lines: "-", "*", "•", "1.", "2)", "[ ]", "[x]"
+_LIST_MARKER = re.compile(r'^\s*(?:(?:[-*\u2022]+|\d+[.)]|\[[ xX]?\])\s*)+')
+
+
+def _split_batch_input(text):
+    """Split pasted meeting notes / checklists into one task text per line"""
+    items = []
+    for line in text.splitlines():
+        line = _LIST_MARKER.sub('', line).strip()
+        # Skip blank lines and headings such as "Action items:"
+        if line and not line.endswith(':'):
+            items.append(line)
+    return items
+
+
+def _get_default_status(project_id):
+    """Default status for new tasks, or the project's first status"""
+    return StatusCatalog.default_status(project_id)
+
+
+def _build_parse_response(parsed_result, text, project_id, default_status):
+    """Shape a parser result into the task draft returned to the client"""
+    # Prepare structured task data for response
+    task_data = {
+        "title": parsed_result.get("title", "").strip(),
+        "description": parsed_result.get("description"),
+        "assigned_to": parsed_result.get("assigned_to"),
+        "due_date": parsed_result.get("due_date"),
+        "status_id": default_status["id"],
+        "project_id": project_id,
+        "priority": parsed_result.get("priority", "Medium"),
+        "effort_score": parsed_result.get("effort_score", 3),
+        "impact_score": parsed_result.get("impact_score", 3)
+    }
+    
+    # Additional parsing information for debugging/transparency
+    parsing_info = {
+        "confidence": parsed_result.get("extracted_info", {}).get("confidence", "unknown"),
+        "source": parsed_result.get("extracted_info", {}).get("source", "llm"),
+        "assignee_name": parsed_result.get("assignee_name"),
+        "date_context": parsed_result.get("extracted_info", {}).get("date_context"),
+        "assignee_context": parsed_result.get("extracted_info", {}).get("assignee_context"),
+        "original_text": text,
+        "extracted_info": parsed_result.get("extracted_info", {})
+    }
+    
+    # Include assignee information if found
+    if task_data["assigned_to"]:
+        assignee = Users.query.get(task_data["assigned_to"])
+        if assignee:
+            parsing_info["resolved_assignee"] = {
+                "id": assignee.id,
+                "name": assignee.name,
+                "email": assignee.email
+            }
+    
+    # Warnings for missing or uncertain information
+    warnings = []
+    if not task_data["title"]:
+        warnings.append("Could not extract clear task title")
+    if parsed_result.get("assignee_candidates"):
+        parsing_info["assignee_candidates"] = [
+            {"id": user.id, "name": user.name, "email": user.email}
+            for user in Users.query.filter(Users.id.in_(parsed_result["assignee_candidates"])).all()
+        ]
+        warnings.append(f"'{parsed_result.get('assignee_name')}' matches several team members - please choose one")
+    elif parsed_result.get("assignee_name") and not task_data["assigned_to"]:
+        warnings.append(f"Could not find team member '{parsed_result.get('assignee_name')}' in project")
+    if parsing_info["confidence"] == "low":
+        warnings.append("Low confidence in parsing results - please review")
+    if parsing_info["extracted_info"].get("timed_out"):
+        warnings.append("Parsing timed out - showing a basic parse")
+        
+    response = {
+        **task_data,
+        "parsing_info": parsing_info,
+        "default_status": StatusCatalog.summary(default_status)
+    }
+    
+    if warnings:
+        response["warnings"] = warnings
+    return response
+
+
+# ---------- NATURAL LANGUAGE TASK PARSING ----------
+@nl_task_bp.route("/parse-nl-task", methods=["POST"])
+@login_required
+def parse_natural_language_task():
+    """
+    Parse natural language task input, using the rule-based fast path when it
+    is confident and Gemini + LangChain otherwise
+    
+    Expected input:
+    {
+        "text": "Remind John to finalize the pitch deck by Friday",
+        "project_id": 2
+    }
+    
+    Returns:
+    {
+        "title": "Finalize the pitch deck",
+        "assigned_to": 5,  # User ID
+        "due_date": "2024-01-26",
+        "status_id": 1,  # Default status ID
+        "project_id": 2,
+        "priority": "Medium",
+        "effort_score": 3,
+        "impact_score": 3,
+        "parsing_info": {
+            "confidence": "high",
+            "assignee_name": "John",
+            "extracted_info": {...}
+        }
+    }
+    """
+    try:
+        data = request.get_json()
+        text = data.get("text")
+        project_id = data.get("project_id")
+        
+        if not text:
+            return jsonify({"error": "Text input required"}), 400
+        
+        if not project_id:
+            return jsonify({"error": "Project ID required"}), 400
+        
+        logger.info(f"Parsing natural language task: '{text}' for project {project_id}")
+        
+        # Validate user is a team member of the project
+        team_membership = TeamMembers.query.filter_by(
+            project_id=project_id, 
+            user_id=current_user.id
+        ).first()
+        if not team_membership:
+            return jsonify({"error": "Project not found or user not authorized"}), 403
+
+        # Validate project exists
+        project = Projects.query.get(project_id)
+        if not project:
+            return jsonify({"error": "Project not found"}), 404
+
+        # Get the task parser instance (loads the LLM stack on first use)
+        parser = get_task_parser()
+        
+        # Parse the natural language input
+        parsed_result = parser.parse_natural_language_task(text, project_id)
+        
+        logger.info(f"Parsed result: {parsed_result}")
+        
+        default_status = _get_default_status(project_id)
+        if not default_status:
+            return jsonify({
+                "error": "No status found for project. Please create custom statuses first."
+            }), 400
+
+        response = _build_parse_response(parsed_result, text, project_id, default_status)
+        
+        logger.info(f"Returning parsed task data: {response}")
+        return jsonify(response), 200
+        
+    except ValueError as ve:
+        logger.error(f"Validation error: {ve}")
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Error parsing natural language task: {e}")
+        return jsonify({
+            "error": "Failed to parse natural language task",
+            "details": str(e)
+        }), 500
+
+
+@nl_task_bp.route("/parse-nl-batch", methods=["POST"])
+@login_required
+def parse_natural_language_batch():
+    """
+    Parse several natural language tasks in one request
+    
+    Expected input (either "text", split into one task per line with list
+    markers and "Heading:" lines dropped, or an explicit "items" list):
+    {
+        "text": "- John to finalize the pitch deck by Friday\n- Sarah reviews budget tomorrow",
+        "items": ["...", "..."],
+        "project_id": 2,
+        "stream": false
+    }
+    
+    Inputs the rule-based parser is confident about (or that were parsed
+    recently) are answered locally; the rest go to the LLM concurrently
+    with a per-item timeout.
+    
+    Returns:
+        {"results": [{"index": 0, ...same fields as /parse-nl-task}, ...], "count": 2}
+        in input order, or with "stream": true an NDJSON response with one
+        result line per item in completion order.
+    """
+    try:
+        data = request.get_json() or {}
+        project_id = data.get("project_id")
+        stream = bool(data.get("stream")) or request.args.get("stream") == "true"
+        
+        items = data.get("items")
+        if items is None:
+            items = _split_batch_input(data.get("text") or "")
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            return jsonify({"error": "items must be a list of strings"}), 400
+        items = [item.strip() for item in items if item and item.strip()]
+        
+        if not items:
+            return jsonify({"error": "Text input required"}), 400
+        
+        if len(items) > Config.NL_BATCH_MAX_ITEMS:
+            return jsonify({"error": f"At most {Config.NL_BATCH_MAX_ITEMS} tasks can be parsed per request"}), 400
+        
+        if not project_id:
+            return jsonify({"error": "Project ID required"}), 400
+        
+        # Validate user is a team member of the project
+        team_membership = TeamMembers.query.filter_by(
+            project_id=project_id, 
+            user_id=current_user.id
+        ).first()
+        if not team_membership:
+            return jsonify({"error": "Project not found or user not authorized"}), 403
+        
+        default_status = _get_default_status(project_id)
+        if not default_status:
+            return jsonify({
+                "error": "No status found for project. Please create custom statuses first."
+            }), 400
+        
+        logger.info(f"Parsing batch of {len(items)} natural language tasks for project {project_id}")
+        
+        parser = get_task_parser()
+        results = parser.iter_parse_batch(items, project_id)
+        
+        if stream:
+            def generate():
+                try:
+                    for index, parsed_result in results:
+                        response = _build_parse_response(parsed_result, items[index], project_id, default_status)
+                        yield json.dumps({"index": index, **response}) + "\n"
+                except Exception as e:
+                    logger.error(f"Error streaming batch parse: {e}")
+                    yield json.dumps({"error": "Failed to parse natural language tasks", "details": str(e)}) + "\n"
+            
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+        
+        ordered = [None] * len(items)
+        for index, parsed_result in results:
+            ordered[index] = {"index": index, **_build_parse_response(parsed_result, items[index], project_id, default_status)}
+        
+        return jsonify({"results": ordered, "count": len(ordered)}), 200
+        
+    except ValueError as ve:
+        logger.error(f"Validation error: {ve}")
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Error parsing natural language tasks: {e}")
+        return jsonify({
+            "error": "Failed to parse natural language tasks",
+            "details": str(e)
+        }), 500
+
+
+@nl_task_bp.route("/parse-nl-status", methods=["GET"])
+@login_required
+def get_parser_status():
+    """LLM gateway metrics (calls, failures, timeouts, circuit state, latency) and cache stats"""
+    parser = get_task_parser()
+    return jsonify({
+        "backend": Config.NL_LLM_BACKEND,
+        "gateway": parser.gateway.stats(),
+        "cache": parser.parse_cache.stats()
+    }), 200
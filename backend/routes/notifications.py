@@ -3,6 +3,7 @@ from flask_security import login_required, current_user
 from database import db
 from models import Notifications, Tasks, Projects, TeamMembers
 from deadline_warnings import DeadlineWarningEngine
+from status_catalog import StatusCatalog
 from datetime import datetime, timedelta
 
 notifications_bp = Blueprint('notifications', __name__)
@@ -75,7 +76,8 @@ def get_user_notifications():
         # Add related task/project info if available
         if notification.task:
             data["task_title"] = notification.task.title
-            data["task_status"] = notification.task.custom_status.name if notification.task.custom_status else None
+            status = StatusCatalog.status(notification.task.project_id, notification.task.status_id)
+            data["task_status"] = status["name"] if status else None
         
         if notification.project:
             data["project_name"] = notification.project.name
@@ -1,7 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_security import login_required, current_user
 from database import db
-from models import Users, Projects, TeamMembers
+from models import Users, Projects, TeamMembers, PriorityWeightProfile
+from team_directory import get_team_directory
+from status_catalog import StatusCatalog
+from workload import WorkloadBalancer
+from blob_store import BlobStore, BlobError
 from datetime import datetime
 
 
@@ -36,19 +40,21 @@ def create_project():
         return jsonify({"error": "Project name is required"}), 400
     
     try:
-        # Handle image upload if present
+        # Handle image upload if present (stored once per distinct image)
         image_path = None
         if image_file and image_file.filename:
-            # For now, we'll just log that an image was uploaded
-            # In a production app, you'd save this to a file storage service
-            print(f"DEBUG: Image uploaded: {image_file.filename}")
-            image_path = f"uploads/{image_file.filename}"  # Placeholder path
+            try:
+                blob, _ = BlobStore.save(image_file.stream, current_user.id)
+            except BlobError as e:
+                return jsonify({"error": f"Invalid project image: {e}"}), 400
+            image_path = BlobStore.url_for(blob.sha256)
         
         # Create project with the current user as creator
         project = Projects(
             name=name.strip(),
             description=description.strip() if description else "",
-            created_by=current_user.id
+            created_by=current_user.id,
+            image_url=image_path
         )
         
         db.session.add(project)
@@ -61,6 +67,7 @@ def create_project():
         )
         db.session.add(team_member)
         db.session.commit()
+        get_team_directory().invalidate(project.id)
 
         print(f"DEBUG: Project created successfully - ID: {project.id}, Name: {project.name}")
 
@@ -104,6 +111,7 @@ def get_user_projects():
                 "name": project.name,
                 "description": project.description or "",
                 "created_at": project.created_at.isoformat(),
+                "image_path": project.image_url,
                 "is_owner": project.created_by == current_user.id
             })
 
@@ -167,6 +175,7 @@ def get_project_details(project_id):
             "description": project.description or "",
             "created_at": project.created_at.isoformat(),
             "created_by": project.created_by,
+            "image_path": project.image_url,
             "owner": {
                 "id": owner.id,
                 "name": owner.name,
@@ -196,12 +205,16 @@ def delete_project(project_id):
         if not project:
             return jsonify({"error": "Project not found or unauthorized"}), 404
 
-        # Delete associated team members first
+        # Delete associated team members and weight profile first
         TeamMembers.query.filter_by(project_id=project_id).delete()
+        PriorityWeightProfile.query.filter_by(project_id=project_id).delete()
         
         # Delete the project
         db.session.delete(project)
         db.session.commit()
+        get_team_directory().invalidate(project_id)
+        StatusCatalog.invalidate(project_id)
+        WorkloadBalancer.invalidate(project_id)
 
         return jsonify({"message": "Project deleted successfully"}), 200
 
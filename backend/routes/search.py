@@ -0,0 +1,46 @@
+from flask import Blueprint, request, jsonify
+from flask_security import login_required, current_user
+from search_index import SearchIndex
+
+search_bp = Blueprint('search', __name__)
+
+# ---------- FULL-TEXT SEARCH ----------
+@search_bp.route("/", methods=["GET"])
+@login_required
+def search():
+    """
+    Search tasks, discussions, projects and notifications visible to the user
+
+    Query params: q (required), types (comma separated: task,discussion,project,notification),
+    project_id, limit (max 100), offset
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Search query 'q' is required"}), 400
+
+    types = request.args.get("types")
+    types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    if types and any(t not in SearchIndex.TYPES for t in types):
+        return jsonify({"error": f"Invalid types. Use: {', '.join(SearchIndex.TYPES)}"}), 400
+
+    try:
+        project_id = int(request.args["project_id"]) if request.args.get("project_id") else None
+        limit = min(max(int(request.args.get("limit", 20)), 1), 100)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return jsonify({"error": "project_id, limit and offset must be integers"}), 400
+
+    if not SearchIndex.is_installed():
+        return jsonify({"error": "Search index not initialized. Run rebuild_search_index.py"}), 503
+
+    results = SearchIndex.search(
+        current_user.id, query, types=types, project_id=project_id, limit=limit, offset=offset
+    )
+
+    return jsonify({
+        "query": query,
+        "results": results["results"],
+        "limit": limit,
+        "offset": offset,
+        "has_more": results["has_more"]
+    }), 200
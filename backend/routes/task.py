@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
 from flask_security import login_required, current_user
+from sqlalchemy.exc import IntegrityError
 from database import db
-from models import Tasks, Projects, CustomStatus, TeamMembers, Users
-from datetime import datetime, timedelta
+from models import Tasks, Projects, TeamMembers
+from datetime import datetime
 from task_prioritization import TaskPrioritizationEngine
 from deadline_warnings import DeadlineWarningEngine
-from llm_task_parser import get_task_parser
+from status_catalog import StatusCatalog
+from delivery_forecast import DeliveryForecaster
+from workload import WorkloadBalancer
+from config import Config
 import logging
 
 task_bp = Blueprint('task', __name__)
@@ -26,6 +30,15 @@ def calculate_priority(due_date):
     else:
         return "Low"
 
+def _stale_status(project_id):
+    """
+    400 for a status the catalog still listed but another process deleted
+    (possible for up to STATUS_CATALOG_TTL with CACHE_BACKEND=memory)
+    """
+    db.session.rollback()
+    StatusCatalog.invalidate(project_id)
+    return jsonify({"error": "Invalid status_id for this project"}), 400
+
 # ---------- CREATE TASK ----------
 @task_bp.route("/", methods=["POST"])
 @login_required
@@ -39,14 +52,24 @@ def create_task():
     assigned_to = data.get("assigned_to")
     
     # Smart prioritization fields
-    effort_score = data.get("effort_score", 3)  # Default: Medium effort
-    impact_score = data.get("impact_score", 3)  # Default: Medium impact
-    dependency_map = data.get("dependency_map", [])
-    blocked_by = data.get("blocked_by", [])
+    effort_score = data.get("effort_score")
+    effort_score = 3 if effort_score is None else effort_score  # Default: Medium effort
+    impact_score = data.get("impact_score")
+    impact_score = 3 if impact_score is None else impact_score  # Default: Medium impact
+    dependency_map = data.get("dependency_map") or []
+    blocked_by = data.get("blocked_by") or []
 
     if not title or not project_id:
         return jsonify({"error": "Task title and project_id required"}), 400
 
+    # Scores may arrive as strings ("3"); the workload balancer needs numbers
+    try:
+        effort_score, impact_score = int(effort_score), int(impact_score)
+    except (TypeError, ValueError):
+        return jsonify({"error": "effort_score and impact_score must be integers"}), 400
+    if not isinstance(dependency_map, list) or not isinstance(blocked_by, list):
+        return jsonify({"error": "dependency_map and blocked_by must be lists of task ids"}), 400
+
     # Convert due date
     due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date() if due_date_str else None
 
@@ -64,16 +87,15 @@ def create_task():
 
     # Handle status_id - if not provided, use default status for the project
     if not status_id:
-        default_status = CustomStatus.query.filter_by(project_id=project_id, is_default=True).first()
+        default_status = StatusCatalog.default_status(project_id, fallback_to_first=False)
         if default_status:
-            status_id = default_status.id
+            status_id = default_status["id"]
         else:
             # If no default status exists, create default statuses first
             return jsonify({"error": "No status found for project. Please create custom statuses first."}), 400
     else:
         # Validate that the status belongs to this project
-        custom_status = CustomStatus.query.filter_by(id=status_id, project_id=project_id).first()
-        if not custom_status:
+        if not StatusCatalog.status(project_id, status_id):
             return jsonify({"error": "Invalid status_id for this project"}), 400
 
     # Validate assignee if provided
@@ -84,6 +106,14 @@ def create_task():
         ).first()
         if not assignee_membership:
             return jsonify({"error": "Assigned user is not a team member of this project"}), 400
+    elif data.get("auto_assign"):
+        # Hand the task to the least loaded team member
+        try:
+            assigned_to = WorkloadBalancer.suggest(project_id, [{
+                "effort_score": effort_score, "due_date": due_date, "blocked_by": blocked_by
+            }])[0]["assigned_to"]
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid task draft: effort_score must be a number, due_date YYYY-MM-DD"}), 400
 
     # Validate dependency tasks exist and belong to same project
     if dependency_map:
@@ -113,7 +143,10 @@ def create_task():
     )
     
     db.session.add(task)
-    db.session.flush()  # Flush to get task ID for priority calculation
+    try:
+        db.session.flush()  # Flush to get task ID for priority calculation
+    except IntegrityError:
+        return _stale_status(project_id)
     
     # Calculate smart priority
     priority_label = TaskPrioritizationEngine.update_task_priority(task)
@@ -138,161 +171,16 @@ def create_task():
                 TaskPrioritizationEngine.update_task_priority(blocking_task)
     
     db.session.commit()
+    DeliveryForecaster.invalidate(project_id)
 
     return jsonify({
         "message": "Task created", 
         "task_id": task.id, 
+        "assigned_to": task.assigned_to,
         "priority": task.priority,
         "priority_score": task.priority_score
     }), 201
 
-# ---------- NATURAL LANGUAGE TASK PARSING ----------
-@task_bp.route("/parse-nl-task", methods=["POST"])
-@login_required
-def parse_natural_language_task():
-    """
-    Parse natural language task input using Gemini + LangChain
-    
-    Expected input:
-    {
-        "text": "Remind John to finalize the pitch deck by Friday",
-        "project_id": 2
-    }
-    
-    Returns:
-    {
-        "title": "Finalize the pitch deck",
-        "assigned_to": 5,  # User ID
-        "due_date": "2024-01-26",
-        "status_id": 1,  # Default status ID
-        "project_id": 2,
-        "priority": "Medium",
-        "effort_score": 3,
-        "impact_score": 3,
-        "parsing_info": {
-            "confidence": "high",
-            "assignee_name": "John",
-            "extracted_info": {...}
-        }
-    }
-    """
-    try:
-        data = request.get_json()
-        text = data.get("text")
-        project_id = data.get("project_id")
-        
-        if not text:
-            return jsonify({"error": "Text input required"}), 400
-        
-        if not project_id:
-            return jsonify({"error": "Project ID required"}), 400
-        
-        logger.info(f"Parsing natural language task: '{text}' for project {project_id}")
-        
-        # Validate user is a team member of the project
-        team_membership = TeamMembers.query.filter_by(
-            project_id=project_id, 
-            user_id=current_user.id
-        ).first()
-        if not team_membership:
-            return jsonify({"error": "Project not found or user not authorized"}), 403
-
-        # Validate project exists
-        project = Projects.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Project not found"}), 404
-
-        # Get the task parser instance
-        parser = get_task_parser()
-        
-        # Parse the natural language input
-        parsed_result = parser.parse_natural_language_task(text, project_id)
-        
-        logger.info(f"Parsed result: {parsed_result}")
-        
-        # Get default status for the project
-        default_status = CustomStatus.query.filter_by(
-            project_id=project_id, 
-            is_default=True
-        ).first()
-        
-        if not default_status:
-            # If no default status exists, get the first status for the project
-            default_status = CustomStatus.query.filter_by(project_id=project_id).first()
-            
-        if not default_status:
-            return jsonify({
-                "error": "No status found for project. Please create custom statuses first."
-            }), 400
-        
-        # Prepare structured task data for response
-        task_data = {
-            "title": parsed_result.get("title", "").strip(),
-            "description": parsed_result.get("description"),
-            "assigned_to": parsed_result.get("assigned_to"),
-            "due_date": parsed_result.get("due_date"),
-            "status_id": default_status.id,
-            "project_id": project_id,
-            "priority": parsed_result.get("priority", "Medium"),
-            "effort_score": parsed_result.get("effort_score", 3),
-            "impact_score": parsed_result.get("impact_score", 3)
-        }
-        
-        # Additional parsing information for debugging/transparency
-        parsing_info = {
-            "confidence": parsed_result.get("extracted_info", {}).get("confidence", "unknown"),
-            "assignee_name": parsed_result.get("assignee_name"),
-            "date_context": parsed_result.get("extracted_info", {}).get("date_context"),
-            "assignee_context": parsed_result.get("extracted_info", {}).get("assignee_context"),
-            "original_text": text,
-            "extracted_info": parsed_result.get("extracted_info", {})
-        }
-        
-        # Include assignee information if found
-        if task_data["assigned_to"]:
-            assignee = Users.query.get(task_data["assigned_to"])
-            if assignee:
-                parsing_info["resolved_assignee"] = {
-                    "id": assignee.id,
-                    "name": assignee.name,
-                    "email": assignee.email
-                }
-        
-        # Warnings for missing or uncertain information
-        warnings = []
-        if not task_data["title"]:
-            warnings.append("Could not extract clear task title")
-        if parsed_result.get("assignee_name") and not task_data["assigned_to"]:
-            warnings.append(f"Could not find team member '{parsed_result.get('assignee_name')}' in project")
-        if parsing_info["confidence"] == "low":
-            warnings.append("Low confidence in parsing results - please review")
-            
-        response = {
-            **task_data,
-            "parsing_info": parsing_info,
-            "default_status": {
-                "id": default_status.id,
-                "name": default_status.name,
-                "color": default_status.color
-            }
-        }
-        
-        if warnings:
-            response["warnings"] = warnings
-        
-        logger.info(f"Returning parsed task data: {response}")
-        return jsonify(response), 200
-        
-    except ValueError as ve:
-        logger.error(f"Validation error: {ve}")
-        return jsonify({"error": str(ve)}), 400
-    except Exception as e:
-        logger.error(f"Error parsing natural language task: {e}")
-        return jsonify({
-            "error": "Failed to parse natural language task",
-            "details": str(e)
-        }), 500
-
 # ---------- GET TASKS BY PROJECT ----------
 @task_bp.route("/project/<int:project_id>", methods=["GET"])
 @login_required
@@ -354,15 +242,12 @@ def get_tasks_for_project(project_id):
     else:
         tasks = query.order_by(Tasks.created_at.desc()).all()
 
+    statuses = StatusCatalog.by_id(project_id)
     results = [{
         "id": t.id,
         "title": t.title,
         "description": t.description,
-        "status": {
-            "id": t.custom_status.id if t.custom_status else None,
-            "name": t.custom_status.name if t.custom_status else "No Status",
-            "color": t.custom_status.color if t.custom_status else "#6B7280"
-        },
+        "status": StatusCatalog.summary(statuses.get(t.status_id)),
         "due_date": str(t.due_date) if t.due_date else None,
         "priority": t.priority,
         "priority_score": t.priority_score,
@@ -490,16 +375,20 @@ def update_task(task_id):
     status_id = data.get("status_id")
     if status_id is not None:
         # Validate that the status belongs to this project
-        custom_status = CustomStatus.query.filter_by(id=status_id, project_id=task.project_id).first()
-        if not custom_status:
+        if not StatusCatalog.status(task.project_id, status_id):
             return jsonify({"error": "Invalid status_id for this project"}), 400
         task.status_id = status_id
+        try:
+            db.session.flush()
+        except IntegrityError:
+            return _stale_status(task.project_id)
 
     # Recalculate smart priority after all updates
     TaskPrioritizationEngine.update_task_priority(task)
     
     task.updated_at = datetime.utcnow()
     db.session.commit()
+    DeliveryForecaster.invalidate(task.project_id)
     
     # Check for deadline risk and create notification if needed
     deadline_warning = None
@@ -545,8 +434,10 @@ def delete_task(task_id):
     if not team_membership:
         return jsonify({"error": "Unauthorized"}), 403
 
+    project_id = task.project_id
     db.session.delete(task)
     db.session.commit()
+    DeliveryForecaster.invalidate(project_id)
     return jsonify({"message": "Task deleted"}), 200
 
 # ---------- GET MY TASKS ----------
@@ -586,15 +477,12 @@ def get_my_tasks():
     else:
         tasks = query.order_by(Tasks.created_at.desc()).all()
 
+    statuses = StatusCatalog.lookup(t.project_id for t in tasks)
     results = [{
         "id": t.id,
         "title": t.title,
         "description": t.description,
-        "status": {
-            "id": t.custom_status.id if t.custom_status else None,
-            "name": t.custom_status.name if t.custom_status else "No Status",
-            "color": t.custom_status.color if t.custom_status else "#6B7280"
-        },
+        "status": StatusCatalog.summary(statuses.get(t.status_id)),
         "due_date": str(t.due_date) if t.due_date else None,
         "priority": t.priority,
         "priority_score": t.priority_score,
@@ -655,12 +543,70 @@ def get_task_priority_insights(task_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@task_bp.route("/priority/insights", methods=["POST"])
+@login_required
+def get_batch_priority_insights():
+    """
+    Priority calculation breakdowns for many tasks in one request
+
+    Expected input (one of):
+    {"task_ids": [12, 13, 14]}    # at most PRIORITY_INSIGHTS_MAX_TASKS
+    {"project_id": 2}             # every task in the project
+
+    Returns:
+        {"insights": [...same fields as /priority/insights/<task_id>...],
+         "count": 3, "not_found": [ids that don't exist or aren't visible]}
+    """
+    data = request.get_json() or {}
+    task_ids = data.get("task_ids")
+    project_id = data.get("project_id")
+
+    if task_ids is not None:
+        if not isinstance(task_ids, list) or not all(isinstance(t, int) for t in task_ids):
+            return jsonify({"error": "task_ids must be a list of task ids"}), 400
+        if len(task_ids) > Config.PRIORITY_INSIGHTS_MAX_TASKS:
+            return jsonify({"error": f"At most {Config.PRIORITY_INSIGHTS_MAX_TASKS} task_ids per request"}), 400
+        user_projects = db.session.query(TeamMembers.project_id).filter_by(user_id=current_user.id)
+        rows = TaskPrioritizationEngine.scoring_rows(Tasks.id.in_(task_ids), Tasks.project_id.in_(user_projects))
+        # Answer in the order asked
+        position = {task_id: i for i, task_id in reversed(list(enumerate(task_ids)))}
+        rows.sort(key=lambda row: position[row.id])
+        found = {row.id for row in rows}
+        not_found = [task_id for task_id in dict.fromkeys(task_ids) if task_id not in found]
+    elif project_id:
+        team_membership = TeamMembers.query.filter_by(
+            project_id=project_id,
+            user_id=current_user.id
+        ).first()
+        if not team_membership:
+            return jsonify({"error": "Project not found or user not authorized"}), 403
+        rows = TaskPrioritizationEngine.scoring_rows(Tasks.project_id == project_id)
+        not_found = []
+    else:
+        return jsonify({"error": "task_ids or project_id required"}), 400
+
+    insights = TaskPrioritizationEngine.get_priority_insights_batch(rows)
+    return jsonify({"insights": insights, "count": len(insights), "not_found": not_found}), 200
+
 @task_bp.route("/priority/weights", methods=["GET"])
 @login_required
 def get_priority_weights():
-    """Get current priority calculation weights"""
+    """Get priority calculation weights (a project's profile with ?project_id=, else the defaults)"""
+    project_id = request.args.get("project_id", type=int)
+    profile = {"source": "default", "weights": TaskPrioritizationEngine.WEIGHTS}
+    if project_id:
+        team_membership = TeamMembers.query.filter_by(
+            project_id=project_id,
+            user_id=current_user.id
+        ).first()
+        if not team_membership:
+            return jsonify({"error": "Project not found or user not authorized"}), 403
+        profile = TaskPrioritizationEngine.weight_profile(project_id)
+
     return jsonify({
-        "weights": TaskPrioritizationEngine.WEIGHTS,
+        "project_id": project_id,
+        "source": profile["source"],
+        "weights": profile["weights"],
         "description": {
             "urgency": "Days until deadline (weighted)",
             "effort": "Task complexity estimation (inverse)",
@@ -669,6 +615,77 @@ def get_priority_weights():
         }
     }), 200
 
+def _queue_priority_rescore(project_id):
+    """Re-score the project's tasks on a Celery worker; returns the job id, or None if it couldn't be queued"""
+    try:
+        from scheduled_jobs import rescore_project_priorities  # Celery is loaded on first profile change
+        return rescore_project_priorities.apply_async(args=[project_id], retry=False).id
+    except Exception as e:
+        logger.warning(f"Could not queue priority re-score for project {project_id}: {e}")
+        return None
+
+@task_bp.route("/priority/weights/<int:project_id>", methods=["PUT", "DELETE"])
+@login_required
+def set_priority_weights(project_id):
+    """
+    Save (PUT) or reset to the defaults (DELETE) a project's priority weights
+
+    Expected input for PUT (normalized to sum to 1):
+    {"weights": {"urgency": 0.5, "effort": 0.1, "dependency": 0.2, "impact": 0.2}}
+
+    Stored scores are updated by a background re-score job rather than in
+    this request.
+    """
+    project = Projects.query.filter_by(id=project_id, created_by=current_user.id).first()
+    if not project:
+        return jsonify({"error": "Project not found or not owned by you"}), 403
+
+    if request.method == "DELETE":
+        changed = TaskPrioritizationEngine.reset_weights(project_id)
+    else:
+        try:
+            TaskPrioritizationEngine.save_weights(
+                project_id, (request.get_json() or {}).get("weights"), user_id=current_user.id
+            )
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        changed = True
+
+    job_id = _queue_priority_rescore(project_id) if changed else None
+    profile = TaskPrioritizationEngine.weight_profile(project_id)
+    return jsonify({
+        "project_id": project_id,
+        "source": profile["source"],
+        "weights": profile["weights"],
+        "rescore": "queued" if job_id else "not_needed" if not changed else "failed_to_queue",
+        "rescore_job_id": job_id
+    }), 202 if job_id else 200
+
+@task_bp.route("/priority/what-if/<int:project_id>", methods=["POST"])
+@login_required
+def simulate_priority_weights(project_id):
+    """
+    Re-rank a project's open tasks under candidate weights without saving anything
+
+    Expected input:
+    {"weights": {"urgency": 0.5, "effort": 0.1, "dependency": 0.2, "impact": 0.2}, "include_completed": false}
+    """
+    team_membership = TeamMembers.query.filter_by(
+        project_id=project_id,
+        user_id=current_user.id
+    ).first()
+    if not team_membership:
+        return jsonify({"error": "Project not found or user not authorized"}), 403
+
+    data = request.get_json() or {}
+    try:
+        result = TaskPrioritizationEngine.simulate_weights(
+            project_id, data.get("weights"), include_completed=bool(data.get("include_completed"))
+        )
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    return jsonify(result), 200
+
 @task_bp.route("/dependencies/<int:project_id>", methods=["GET"])
 @login_required
 def get_project_dependencies(project_id):
@@ -717,6 +734,7 @@ def get_blocked_tasks():
     # Filter to only tasks that actually have blocking tasks
     truly_blocked = [task for task in blocked_tasks if task.blocked_by and len(task.blocked_by) > 0]
     
+    statuses = StatusCatalog.lookup(task.project_id for task in truly_blocked)
     results = []
     for task in truly_blocked:
         blocking_tasks = Tasks.query.filter(Tasks.id.in_(task.blocked_by)).all()
@@ -730,7 +748,7 @@ def get_blocked_tasks():
             "blocking_tasks": [{
                 "id": bt.id,
                 "title": bt.title,
-                "status": bt.custom_status.name if bt.custom_status else "No Status",
+                "status": StatusCatalog.summary(statuses.get(bt.status_id))["name"],
                 "assignee": bt.assignee.name if bt.assignee else "Unassigned"
             } for bt in blocking_tasks]
         })
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_security import login_required, current_user
 from database import db
 from models import TeamMembers, Projects, Users
+from team_directory import get_team_directory
 
 team_bp = Blueprint('team', __name__)
 
@@ -99,6 +100,7 @@ def add_team_member_by_email():
     member = TeamMembers(user_id=user.id, project_id=project_id)
     db.session.add(member)
     db.session.commit()
+    get_team_directory().invalidate(project_id)
 
     return jsonify({
         "message": "User added to project team",
@@ -136,6 +138,7 @@ def add_team_member():
     member = TeamMembers(user_id=user_id, project_id=project_id)
     db.session.add(member)
     db.session.commit()
+    get_team_directory().invalidate(project_id)
 
     return jsonify({"message": "User added to project team"}), 201
 
@@ -184,6 +187,7 @@ def remove_team_member():
     # Remove from team
     db.session.delete(member)
     db.session.commit()
+    get_team_directory().invalidate(project_id)
 
     return jsonify({"message": "User removed from project team"}), 200
 
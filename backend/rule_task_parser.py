@@ -0,0 +1,351 @@
+import re
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from dateutil.parser import parse as parse_date
+from dateutil.relativedelta import relativedelta
+
+logger = logging.getLogger(__name__)
+
+
+def parse_relative_date(date_str, reference_date=None):
+    """Parse relative dates like 'Friday', 'next week', 'tomorrow'"""
+    if not date_str:
+        return None
+
+    if reference_date is None:
+        reference_date = datetime.now()
+
+    date_str = date_str.lower().strip()
+
+    # Today/Tomorrow/Yesterday
+    if 'today' in date_str:
+        return reference_date.date()
+    elif 'tomorrow' in date_str:
+        return (reference_date + timedelta(days=1)).date()
+    elif 'yesterday' in date_str:
+        return (reference_date - timedelta(days=1)).date()
+
+    # Days of the week
+    weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+    for i, day in enumerate(weekdays):
+        if day in date_str:
+            days_ahead = i - reference_date.weekday()
+            if days_ahead <= 0:  # Target day already happened this week
+                if 'next' in date_str:
+                    days_ahead += 7  # Next week
+                elif days_ahead == 0 and 'this' not in date_str:
+                    days_ahead += 7  # Default to next occurrence
+            return (reference_date + timedelta(days=days_ahead)).date()
+
+    # Week-based
+    if 'this week' in date_str:
+        # End of this week (Friday)
+        days_until_friday = (4 - reference_date.weekday()) % 7
+        return (reference_date + timedelta(days=days_until_friday)).date()
+    elif 'next week' in date_str:
+        # End of next week
+        days_until_next_friday = (4 - reference_date.weekday()) % 7 + 7
+        return (reference_date + timedelta(days=days_until_next_friday)).date()
+
+    # Month-based
+    if 'this month' in date_str:
+        # End of this month
+        next_month = reference_date.replace(day=28) + timedelta(days=4)
+        return (next_month - timedelta(days=next_month.day)).date()
+    elif 'next month' in date_str:
+        # End of next month
+        next_month = reference_date + relativedelta(months=1)
+        return (next_month.replace(day=28) + timedelta(days=4) - timedelta(days=(next_month.replace(day=28) + timedelta(days=4)).day)).date()
+
+    # Try standard date parsing
+    try:
+        parsed_date = parse_date(date_str, fuzzy=True)
+        return parsed_date.date()
+    except:
+        logger.warning(f"Could not parse date: {date_str}")
+        return None
+
+
+class RuleBasedTaskParser:
+    """
+    Deterministic fast-path parser for natural language tasks
+
+    Recognises the common shapes ("Remind John to X by Friday", "Sarah needs
+    to X next week", "Urgent: X tomorrow") with precompiled patterns and a
+    small date grammar layered on parse_relative_date. Each result carries a
+    confidence; only 'high' results are answered locally, everything else
+    is escalated to the LLM.
+    """
+
+    # Minimum score for a result to skip the LLM
+    HIGH_CONFIDENCE = 0.8
+    MEDIUM_CONFIDENCE = 0.5
+
+    # Abbreviations (sun, sat, wed, mar, sept...) are also ordinary words, so
+    # they only count as dates after a lead-in ("by sat", "next wed") and
+    # never make a parse confident on their own
+    _WEEKDAY = r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)'
+    _WEEKDAY_ABBR = r'(?:mon|tues?|wed|thu(?:rs?)?|fri|sat|sun)'
+    _MONTH = r'(?:january|february|march|april|may|june|july|august|september|october|november|december)'
+    _MONTH_ABBR = r'(?:jan|feb|mar|apr|jun|jul|aug|sept?|oct|nov|dec)'
+    ABBREVIATION_PENALTY = 0.3
+    # A date inside the sentence ("Prepare Friday demo", "Review the tomorrow
+    # release plan") may belong to the title; only a date that ends the text
+    # or follows a deadline word ("by", "due", ...) is trusted
+    MID_SENTENCE_PENALTY = 0.3
+    _NUMBER_WORDS = {
+        'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+        'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+    }
+    _WEEKDAY_ALIASES = {
+        'mon': 'monday', 'tue': 'tuesday', 'tues': 'tuesday', 'wed': 'wednesday',
+        'thu': 'thursday', 'thur': 'thursday', 'thurs': 'thursday', 'fri': 'friday',
+        'sat': 'saturday', 'sun': 'sunday'
+    }
+
+    # Date grammar: (kind, score penalty, pattern). An optional lead-in
+    # preposition is part of the match so it is removed from the title
+    # together with the date; abbreviated names require one.
+    _LEAD_WORDS = r'(?:by|before|due(?:\s+(?:on|by))?|on|until|till|no later than)'
+    _LEAD = r'(?:\b' + _LEAD_WORDS + r'\s+)?'
+    _ABBR_LEAD = r'\b' + _LEAD_WORDS + r'\s+'
+    _HAS_LEAD = re.compile(_LEAD_WORDS + r'\s', re.I)
+    DATE_PATTERNS = [
+        ('iso', 0.0, re.compile(_LEAD + r'\b(\d{4}-\d{2}-\d{2})\b', re.I)),
+        ('month_day', 0.0, re.compile(
+            _LEAD + r'\b(' + _MONTH + r')\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b', re.I)),
+        ('month_day', ABBREVIATION_PENALTY, re.compile(
+            _ABBR_LEAD + r'(' + _MONTH_ABBR + r')\.?\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b', re.I)),
+        ('day_month', 0.0, re.compile(
+            _LEAD + r'\b(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(' + _MONTH + r')\b(?:,?\s+(\d{4}))?', re.I)),
+        ('day_month', ABBREVIATION_PENALTY, re.compile(
+            _ABBR_LEAD + r'(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(' + _MONTH_ABBR + r')\b\.?(?:,?\s+(\d{4}))?',
+            re.I)),
+        ('offset', 0.0, re.compile(
+            _LEAD + r'\b(?:in|within)\s+(\d{1,3}|a|an|one|two|three|four|five|six|seven|eight|nine|ten)\s+'
+            r'(days?|weeks?|months?)\b', re.I)),
+        ('end_of', 0.0, re.compile(_LEAD + r'\b(?:the\s+)?end\s+of\s+(?:the\s+|this\s+)?(day|week|month)\b', re.I)),
+        ('eod', 0.0, re.compile(_LEAD + r'\b(eod|cob|tonight)\b', re.I)),
+        ('relative_day', 0.0, re.compile(_LEAD + r'\b(today|tomorrow)\b', re.I)),
+        ('weekday', 0.0, re.compile(_LEAD + r'\b((?:this|next)\s+)?(' + _WEEKDAY + r')\b', re.I)),
+        ('weekday', ABBREVIATION_PENALTY, re.compile(
+            r'(?:' + _ABBR_LEAD + r'|(?=\b(?:this|next)\s))((?:this|next)\s+)?(' + _WEEKDAY_ABBR + r')\b\.?', re.I)),
+        ('period', 0.0, re.compile(_LEAD + r'\b(this|next)\s+(week|month)\b', re.I)),
+    ]
+
+    # Assignee grammar: (score penalty, pattern); group 'name' holds the person.
+    # "for X" may mean "on behalf of X", so it is never answered locally alone.
+    ASSIGNEE_PATTERNS = [
+        (0.0, re.compile(r'^\s*(?:please\s+)?(?:remind|ask|tell)\s+(?P<name>@?[A-Za-z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)?)\s+(?:to\s+)?', re.I)),
+        # "get"/"have" also start ordinary tasks ("Get lunch", "Have a look"):
+        # "get X to ..." only, and "have X ..." only for a capitalised name
+        (0.0, re.compile(r'^\s*(?:please\s+)?get\s+(?P<name>@?[A-Za-z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)?)\s+to\s+', re.I)),
+        (0.0, re.compile(r'^\s*(?:(?i:please)\s+)?(?i:have)\s+(?P<name>@?[A-Z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)?)\s+')),
+        (0.0, re.compile(r'^\s*(?P<name>@?[A-Za-z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)?)\s+(?:needs\s+to|should|must|has\s+to|will|is\s+going\s+to)\s+', re.I)),
+        (0.0, re.compile(r'[\s,;-]*\b(?:assign(?:ed)?\s+to|owner:?)\s+(?P<name>@?[A-Za-z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)?)\s*(?=$|[,.;])', re.I)),
+        (0.0, re.compile(r'(?:^|\s)@(?P<name>[A-Za-z][\w.-]*)')),
+        (0.3, re.compile(r'[\s,;-]*\bfor\s+(?P<name>[A-Za-z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)?)\s*(?=$|[,.;])', re.I)),
+    ]
+    NON_NAMES = {
+        'i', 'me', 'we', 'us', 'you', 'they', 'them', 'someone', 'somebody', 'anyone', 'everyone',
+        'team', 'the', 'this', 'that', 'it', 'he', 'she', 'all', 'please', 'review', 'today', 'tomorrow', 'a', 'an'
+    }
+
+    PRIORITY_PATTERNS = [
+        ('urgent', re.compile(r'[\s,;:!-]*\b(?:urgent(?:ly)?|asap|immediately|critical)\b[\s,;:!-]*', re.I)),
+        ('high', re.compile(r'[\s,;:!-]*\b(?:high[\s-]+priority|important)\b(?:\s+task)?[\s,;:!-]*', re.I)),
+        ('low', re.compile(r'[\s,;:!-]*\b(?:low[\s-]+priority|whenever\s+possible|no\s+rush)\b(?:\s+task)?[\s,;:!-]*', re.I)),
+        ('medium', re.compile(r'[\s,;:!-]*\b(?:medium|normal)[\s-]+priority\b(?:\s+task)?[\s,;:!-]*', re.I)),
+    ]
+
+    # Signals that the text needs a real language model
+    _AMBIGUOUS = re.compile(
+        r'\?|\n|;|\b(?:and\s+then|also|maybe|perhaps|either|unless|depending|if|or\s+else)\b', re.I
+    )
+    _LEFTOVER_DATE = re.compile(
+        r'\b(?:' + _WEEKDAY + r'|' + _MONTH + r'|today|tomorrow|tonight|morning|afternoon|evening|next|last|week|month|year|days?|before|after|until|deadline)\b|\d',
+        re.I
+    )
+    # Includes self-reminders ("Remind me to", "I need to"): the task has no assignee
+    _LEADING_FILLER = re.compile(
+        r'^\s*(?:to|please|pls|todo:?|task:?|[-:,]|remind\s+(?:me|us)(?:\s+to)?|don\'?t\s+forget\s+to'
+        r'|(?:i|we)\s+(?:need|have|want)\s+to)\s+', re.I
+    )
+
+    # "Prepare slides for Friday": "for" also names people, so it is not a
+    # date lead-in, but it goes with a date that ends the text
+    _TRAILING_FOR = re.compile(r'\s+for$', re.I)
+
+    def parse(self, text: str, reference_date: Optional[datetime] = None) -> Dict:
+        """
+        Parse text into the same structure the LLM returns
+
+        Args:
+            text: Natural language task description
+            reference_date: "Today" for relative dates (defaults to now)
+
+        Returns:
+            Dict: Task fields plus extracted_info with confidence and score
+        """
+        reference_date = reference_date or datetime.now()
+        score = 1.0
+        remaining = ' '.join((text or '').split())
+
+        if not remaining:
+            return self._result('', None, None, None, 0.0, 'none', 'none')
+        if len(remaining) > 200:
+            score -= 0.4
+        if self._AMBIGUOUS.search(remaining):
+            score -= 0.5
+
+        priority = None
+        for level, pattern in self.PRIORITY_PATTERNS:
+            match = pattern.search(remaining)
+            if match:
+                priority = level
+                remaining = self._cut(remaining, match)
+                break
+
+        due_date, date_context = None, 'none'
+        for kind, penalty, pattern in self.DATE_PATTERNS:
+            match = pattern.search(remaining)
+            if not match:
+                continue
+            due_date = self._resolve_date(kind, match, reference_date)
+            if due_date is None:
+                score -= 0.5
+                continue
+            score -= penalty
+            ends_text = not remaining[match.end():].strip(' .!,;:')
+            if not ends_text and not self._HAS_LEAD.match(match.group(0)):
+                score -= self.MID_SENTENCE_PENALTY
+            date_context = match.group(0).strip()
+            remaining = self._cut(remaining, match)
+            if ends_text:
+                remaining = self._TRAILING_FOR.sub('', remaining)
+            break
+
+        assignee_name, assignee_context = None, 'none'
+        for penalty, pattern in self.ASSIGNEE_PATTERNS:
+            match = pattern.search(remaining)
+            if not match:
+                continue
+            name = match.group('name').lstrip('@')
+            if name.split()[0].lower() in self.NON_NAMES:
+                continue
+            # Keep a second token only when it looks like a surname
+            parts = name.split()
+            if len(parts) > 1 and not parts[1][:1].isupper():
+                name = parts[0]
+            assignee_name = name
+            score -= penalty
+            assignee_context = match.group(0).strip()
+            remaining = self._cut(remaining, match)
+            break
+
+        title = self._clean_title(remaining)
+        words = title.split()
+        if not words:
+            score -= 1.0
+        elif len(words) < 2 or len(words) > 14:
+            score -= 0.3
+        if self._LEFTOVER_DATE.search(title):
+            # A date-ish fragment the grammar did not consume
+            score -= 0.4
+
+        return self._result(title, assignee_name, due_date, priority, score, date_context, assignee_context)
+
+    def _resolve_date(self, kind: str, match: re.Match, reference_date: datetime):
+        """Turn a matched date phrase into a date (None if it is not a valid date)"""
+        today = reference_date.date()
+        try:
+            if kind == 'iso':
+                return datetime.strptime(match.group(1), '%Y-%m-%d').date()
+            if kind in ('month_day', 'day_month'):
+                if kind == 'month_day':
+                    month_name, day, year = match.group(1), match.group(2), match.group(3)
+                else:
+                    day, month_name, year = match.group(1), match.group(2), match.group(3)
+                parsed = parse_date(f"{month_name} {day} {year or today.year}").date()
+                if not year and parsed < today:
+                    parsed = parsed.replace(year=parsed.year + 1)
+                return parsed
+            if kind == 'offset':
+                amount = match.group(1).lower()
+                amount = self._NUMBER_WORDS.get(amount) or int(amount)
+                unit = match.group(2).lower()
+                if unit.startswith('day'):
+                    return today + timedelta(days=amount)
+                if unit.startswith('week'):
+                    return today + timedelta(weeks=amount)
+                return today + relativedelta(months=amount)
+            if kind == 'end_of':
+                unit = match.group(1).lower()
+                if unit == 'day':
+                    return today
+                return parse_relative_date(f"this {unit}", reference_date)
+            if kind == 'eod':
+                return today
+            if kind == 'relative_day':
+                return parse_relative_date(match.group(1), reference_date)
+            if kind == 'weekday':
+                modifier = (match.group(1) or '').strip().lower()
+                day = match.group(2).lower()
+                day = self._WEEKDAY_ALIASES.get(day, day)
+                return parse_relative_date(f"{modifier} {day}".strip(), reference_date)
+            if kind == 'period':
+                return parse_relative_date(f"{match.group(1)} {match.group(2)}", reference_date)
+        except (ValueError, OverflowError):
+            return None
+        return None
+
+    @staticmethod
+    def _cut(text: str, match: re.Match) -> str:
+        return ' '.join((text[:match.start()] + ' ' + text[match.end():]).split())
+
+    def _clean_title(self, text: str) -> str:
+        title = text.strip(' \t,.;:!-')
+        while True:
+            stripped = self._LEADING_FILLER.sub('', title, count=1)
+            if stripped == title:
+                break
+            title = stripped
+        title = title.strip(' \t,.;:!-')
+        if len(title) > 150:
+            title = title[:147] + "..."
+        return title[:1].upper() + title[1:]
+
+    def _result(self, title, assignee_name, due_date, priority, score, date_context, assignee_context) -> Dict:
+        score = round(max(0.0, min(score, 1.0)), 2)
+        if score >= self.HIGH_CONFIDENCE:
+            confidence = 'high'
+        elif score >= self.MEDIUM_CONFIDENCE:
+            confidence = 'medium'
+        else:
+            confidence = 'low'
+
+        return {
+            'title': title,
+            'description': None,
+            'assignee_name': assignee_name,
+            'due_date': due_date.strftime('%Y-%m-%d') if due_date else None,
+            'priority': priority,
+            'effort_score': None,
+            'impact_score': None,
+            'extracted_info': {
+                'confidence': confidence,
+                'score': score,
+                'source': 'rules',
+                'date_context': date_context,
+                'assignee_context': assignee_context
+            }
+        }
+
+
+# Shared instance; the parser is stateless
+_rule_parser = RuleBasedTaskParser()
+
+def get_rule_parser():
+    """Get the shared rule-based parser"""
+    return _rule_parser
@@ -1,8 +1,13 @@
 from celery_app import celery
 from database import db
-from models import Users, Tasks, Projects, CustomStatus, TeamMembers
+from models import Users, Tasks, Projects, TeamMembers
 from datetime import datetime, date, timedelta
 from sqlalchemy import func, and_
+from db_compat import stream_query
+from db_routing import replica_reads
+from task_history import TaskHistory
+from flow_snapshots import FlowSnapshots
+from task_prioritization import TaskPrioritizationEngine
 import logging
 import smtplib
 import base64
@@ -215,6 +220,7 @@ def render_daily_reminder_email(user, task_summary):
 
 
 @celery.task(bind=True)
+@replica_reads()  # reporting reads stay off the primary
 def send_daily_reminders(self):
     """
     Send daily task reminders to all users
@@ -223,8 +229,8 @@ def send_daily_reminders(self):
     logger.info("Starting daily task reminders job")
     
     try:
-        # Get all active users
-        users = Users.query.filter_by(active=True).all()
+        # Stream active users rather than loading them all at once
+        users = stream_query(Users.query.filter_by(active=True).order_by(Users.id))
         
         sent_count = 0
         skipped_count = 0
@@ -288,14 +294,17 @@ def generate_user_activity_data(user_id):
     ).all()
     
     # Calculate completion metrics
-    completed_tasks = [t for t in user_tasks if t.custom_status and 'done' in t.custom_status.name.lower()]
+    completed_tasks = [t for t in user_tasks if t.custom_status and t.custom_status.is_terminal]
     total_tasks = len(user_tasks)
     
-    # Calculate average completion time for completed tasks
+    # Calculate average completion time (lead time) from the task event log
+    completed_at = TaskHistory.completion_times(
+        [t.id for t in completed_tasks], {t.status_id for t in completed_tasks}
+    )
     completion_times = []
     for task in completed_tasks:
-        if task.created_at and task.updated_at:
-            time_diff = (task.updated_at - task.created_at).days
+        if task.created_at and task.id in completed_at:
+            time_diff = (completed_at[task.id] - task.created_at).days
             completion_times.append(max(1, time_diff))  # Minimum 1 day
     
     avg_completion_time = sum(completion_times) / len(completion_times) if completion_times else 0
@@ -462,6 +471,7 @@ def render_monthly_report_email(user, activity_data):
 
 
 @celery.task(bind=True)
+@replica_reads()  # reporting reads stay off the primary
 def send_monthly_reports(self):
     """
     Send monthly activity reports to all users
@@ -470,8 +480,8 @@ def send_monthly_reports(self):
     logger.info("Starting monthly activity reports job")
     
     try:
-        # Get all active users
-        users = Users.query.filter_by(active=True).all()
+        # Stream active users rather than loading them all at once
+        users = stream_query(Users.query.filter_by(active=True).order_by(Users.id))
         
         sent_count = 0
         skipped_count = 0
@@ -511,6 +521,49 @@ def send_monthly_reports(self):
         raise self.retry(countdown=600, max_retries=3)  # Retry after 10 minutes
 
 
+@celery.task(bind=True)
+def snapshot_project_status(self):
+    """
+    Store today's per-project, per-status task counts and effort
+    Scheduled to run nightly; feeds the cumulative flow and burndown charts
+    """
+    logger.info("Starting project status snapshot job")
+
+    try:
+        rows = FlowSnapshots.capture()
+        result_message = f"Project status snapshot completed. Rows: {rows}"
+        logger.info(result_message)
+        return result_message
+
+    except Exception as e:
+        db.session.rollback()
+        error_message = f"Project status snapshot failed: {str(e)}"
+        logger.error(error_message)
+        raise self.retry(countdown=300, max_retries=3)  # Retry after 5 minutes
+
+
+@celery.task(bind=True)
+def rescore_project_priorities(self, project_id):
+    """
+    Re-score every task in a project with its current priority weights
+    Queued when a project's weight profile changes
+    """
+    logger.info(f"Re-scoring task priorities for project {project_id}")
+
+    try:
+        updated = TaskPrioritizationEngine.update_project_task_priorities(project_id)
+        changed = sum(1 for t in updated if (t['old_priority'], t['old_score']) != (t['new_priority'], t['new_score']))
+        result_message = f"Priority re-score completed for project {project_id}. Tasks: {len(updated)}, changed: {changed}"
+        logger.info(result_message)
+        return result_message
+
+    except Exception as e:
+        db.session.rollback()
+        error_message = f"Priority re-score failed for project {project_id}: {str(e)}"
+        logger.error(error_message)
+        raise self.retry(countdown=60, max_retries=3)  # Retry after 1 minute
+
+
 # Manual trigger functions for testing
 @celery.task
 def test_daily_reminders():
@@ -0,0 +1,260 @@
+from typing import List, Dict, Optional
+from html import escape
+from sqlalchemy import text
+from database import db
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndex:
+    """
+    Full-Text Search Index (SQLite FTS5)
+
+    Keeps one external-content FTS5 table per searchable model. Triggers on
+    the source tables keep the index in sync inside the writing transaction,
+    so searches never scan the base tables:
+    1. Tasks: title, description
+    2. Discussions: message
+    3. Projects: name, description
+    4. Notifications: title, message (only ever visible to their owner)
+
+    bm25 depends on each table's own term statistics, so raw ranks from
+    different tables are not comparable. Results are ordered by relevance:
+    a hit's bm25 relative to the best hit of its type for the query (1.0 =
+    best of its type). Snippets are HTML-escaped, with matches wrapped in
+    <mark>.
+    """
+
+    # fts table -> (source table, indexed columns)
+    SOURCES = {
+        'search_tasks': ('tasks', ['title', 'description']),
+        'search_discussions': ('discussions', ['message']),
+        'search_projects': ('projects', ['name', 'description']),
+        'search_notifications': ('notifications', ['title', 'message']),
+    }
+
+    # Public result type -> fts table
+    TYPES = {
+        'task': 'search_tasks',
+        'discussion': 'search_discussions',
+        'project': 'search_projects',
+        'notification': 'search_notifications',
+    }
+
+    # Per-type result projection. :user_id limits every branch to rows the
+    # user can see; each branch is ranked by bm25 (lower = better match).
+    # Snippets come from whichever column matched best (-1) and mark matches
+    # with control characters, replaced by <mark> once the text is escaped.
+    _RESULT_SQL = {
+        'task': """
+            SELECT 'task' AS type, t.id AS id, t.project_id AS project_id, t.id AS task_id,
+                   t.title AS title,
+                   snippet(search_tasks, -1, char(2), char(3), '…', 12) AS snippet,
+                   bm25(search_tasks, 5.0, 1.0) AS rank
+            FROM search_tasks
+            JOIN tasks t ON t.id = search_tasks.rowid
+            WHERE search_tasks MATCH :query
+              AND t.project_id IN (SELECT project_id FROM team_members WHERE user_id = :user_id)
+              {project_filter}
+        """,
+        'discussion': """
+            SELECT 'discussion' AS type, d.id AS id, d.project_id AS project_id, d.task_id AS task_id,
+                   NULL AS title,
+                   snippet(search_discussions, -1, char(2), char(3), '…', 12) AS snippet,
+                   bm25(search_discussions) AS rank
+            FROM search_discussions
+            JOIN discussions d ON d.id = search_discussions.rowid
+            WHERE search_discussions MATCH :query
+              AND d.project_id IN (SELECT project_id FROM team_members WHERE user_id = :user_id)
+              {project_filter}
+        """,
+        'project': """
+            SELECT 'project' AS type, p.id AS id, p.id AS project_id, NULL AS task_id,
+                   p.name AS title,
+                   snippet(search_projects, -1, char(2), char(3), '…', 12) AS snippet,
+                   bm25(search_projects, 5.0, 1.0) AS rank
+            FROM search_projects
+            JOIN projects p ON p.id = search_projects.rowid
+            WHERE search_projects MATCH :query
+              AND p.id IN (SELECT project_id FROM team_members WHERE user_id = :user_id)
+              {project_filter}
+        """,
+        'notification': """
+            SELECT 'notification' AS type, n.id AS id, n.project_id AS project_id, n.task_id AS task_id,
+                   n.title AS title,
+                   snippet(search_notifications, -1, char(2), char(3), '…', 12) AS snippet,
+                   bm25(search_notifications, 3.0, 1.0) AS rank
+            FROM search_notifications
+            JOIN notifications n ON n.id = search_notifications.rowid
+            WHERE search_notifications MATCH :query
+              AND n.user_id = :user_id
+              {project_filter}
+        """,
+    }
+
+    _HIGHLIGHT = re.compile('\x02(.*?)\x03', re.S)
+
+    _PROJECT_COLUMN = {'task': 't.project_id', 'discussion': 'd.project_id', 'project': 'p.id', 'notification': 'n.project_id'}
+
+    @staticmethod
+    def is_supported(engine=None) -> bool:
+        """FTS5 tables only exist on SQLite"""
+        engine = engine or db.engine
+        return engine.dialect.name == 'sqlite'
+
+    @classmethod
+    def schema_statements(cls) -> List[str]:
+        """DDL for the FTS tables and the triggers that keep them in sync"""
+        statements = []
+        for fts_table, (source, columns) in cls.SOURCES.items():
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f'new.{c}' for c in columns)
+            old_values = ', '.join(f'old.{c}' for c in columns)
+
+            statements.append(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+                f"{column_list}, content='{source}', content_rowid='id', "
+                f"tokenize='porter unicode61', prefix='2 3')"
+            )
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+                f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            # Only text edits touch the index; priority/status updates on tasks skip it
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {source} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+        return statements
+
+    @classmethod
+    def install(cls) -> bool:
+        """
+        Create the FTS tables and sync triggers if they are missing
+
+        Returns:
+            bool: False when the database does not support FTS5
+        """
+        if not cls.is_supported():
+            logger.warning("Full-text search index requires SQLite FTS5; skipping install")
+            return False
+
+        with db.engine.begin() as connection:
+            for statement in cls.schema_statements():
+                connection.execute(text(statement))
+        return True
+
+    @classmethod
+    def is_installed(cls) -> bool:
+        """Check that every FTS table exists"""
+        if not cls.is_supported():
+            return False
+        existing = db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'search_%'"
+        )).scalars().all()
+        return all(name in existing for name in cls.SOURCES)
+
+    @classmethod
+    def rebuild(cls) -> Dict[str, int]:
+        """
+        Repopulate every FTS table from its source table
+
+        Returns:
+            Dict[str, int]: Indexed row count per FTS table
+        """
+        cls.install()
+        counts = {}
+        with db.engine.begin() as connection:
+            for fts_table, (source, _) in cls.SOURCES.items():
+                connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+                connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('optimize')"))
+                counts[fts_table] = connection.execute(text(f"SELECT COUNT(*) FROM {source}")).scalar()
+        return counts
+
+    @classmethod
+    def highlight(cls, snippet: Optional[str]) -> Optional[str]:
+        """HTML for a raw snippet: the text escaped, matches wrapped in <mark>"""
+        if snippet is None:
+            return None
+        marked = cls._HIGHLIGHT.sub(lambda m: '<mark>' + escape(m.group(1)) + '</mark>', escape(snippet))
+        # Stray markers (the indexed text itself contained one) are dropped
+        return marked.replace('\x02', '').replace('\x03', '')
+
+    @staticmethod
+    def build_match_query(raw_query: str) -> Optional[str]:
+        """
+        Turn free user input into a safe FTS5 MATCH expression
+
+        Every term is quoted (so FTS operators in user input are inert) and
+        the last term gets a prefix match so search-as-you-type works.
+        """
+        terms = re.findall(r'\w+', raw_query or '', re.UNICODE)
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms[:16]]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    @classmethod
+    def search(cls, user_id: int, raw_query: str, types: Optional[List[str]] = None,
+               project_id: Optional[int] = None, limit: int = 20, offset: int = 0) -> Dict:
+        """
+        Ranked, membership-filtered search across the indexed models
+
+        Args:
+            user_id: Searching user; results are limited to their projects/notifications
+            raw_query: Free-text query
+            types: Subset of TYPES to search (default: all)
+            project_id: Optional project to restrict results to
+            limit: Page size
+            offset: Page offset
+
+        Returns:
+            Dict: {'results': [...], 'has_more': bool}; each result's score is
+            its relevance (0-1, see class docstring)
+        """
+        match_query = cls.build_match_query(raw_query)
+        if not match_query:
+            return {'results': [], 'has_more': False}
+
+        selected = [t for t in (types or cls.TYPES) if t in cls.TYPES]
+        branches = []
+        for result_type in selected:
+            project_filter = f"AND {cls._PROJECT_COLUMN[result_type]} = :project_id" if project_id else ""
+            branches.append(cls._RESULT_SQL[result_type].format(project_filter=project_filter))
+
+        # bm25 is negative; rank / best rank is 1.0 for the best hit of each type
+        sql = (
+            " UNION ALL ".join(
+                f"SELECT *, CASE WHEN MIN(rank) OVER () < 0 THEN rank / MIN(rank) OVER () ELSE 1.0 END AS relevance "
+                f"FROM ({branch})" for branch in branches
+            )
+            + " ORDER BY relevance DESC, rank, type, id LIMIT :limit OFFSET :offset"
+        )
+        rows = db.session.execute(text(sql), {
+            'query': match_query,
+            'user_id': user_id,
+            'project_id': project_id,
+            'limit': limit + 1,
+            'offset': offset,
+        }).mappings().all()
+
+        return {
+            'results': [{
+                'type': row['type'],
+                'id': row['id'],
+                'project_id': row['project_id'],
+                'task_id': row['task_id'],
+                'title': row['title'],
+                'snippet': cls.highlight(row['snippet']),
+                'score': round(row['relevance'], 6)
+            } for row in rows[:limit]],
+            'has_more': len(rows) > limit
+        }
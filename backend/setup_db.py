@@ -1,8 +1,8 @@
 from app import create_app
-from database import db
+from db_migrations import SchemaMigrator
 
-app = create_app()
+app = create_app('script')
 
 with app.app_context():
-    db.create_all()
-    print("✅ Database tables created.")
+    applied = SchemaMigrator(log=print).upgrade()
+    print(f"✅ Database tables created ({len(applied)} migrations applied).")
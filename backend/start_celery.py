@@ -33,7 +33,7 @@ def start_worker():
         '--concurrency=2',
         '--queues=scheduled,celery'
     ]
-    return subprocess.Popen(cmd)
+    return subprocess.Popen(cmd, env={**os.environ, 'DB_PROCESS_TYPE': 'worker'})
 
 
 def start_beat():
@@ -45,7 +45,7 @@ def start_beat():
         'beat',
         '--loglevel=info'
     ]
-    return subprocess.Popen(cmd)
+    return subprocess.Popen(cmd, env={**os.environ, 'DB_PROCESS_TYPE': 'beat'})
 
 
 def check_redis():
@@ -0,0 +1,115 @@
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from database import db
+from models import CustomStatus
+from cache import make_cache
+from config import Config
+
+# Serialized in place of a missing status
+NO_STATUS = {"id": None, "name": "No Status", "color": "#6B7280"}
+
+
+class StatusCatalog:
+    """
+    Per-Project Status Catalog
+
+    A project's statuses change rarely but are read on every task request
+    (default status, status_id validation, status name/color per serialized
+    task). The catalog keeps them per project in the application cache:
+    1. get() returns {version, statuses} with statuses in workflow order,
+       each {id, name, color, position, is_default, progress, is_terminal}
+    2. The routes/custom_status.py write handlers call invalidate(); the next
+       read rebuilds the catalog with a new version, so anything derived from
+       it can be cached per (project, version)
+    3. A status id the catalog doesn't know triggers one rebuild before it is
+       rejected, in case another process created it
+
+    With CACHE_BACKEND=memory other processes see status edits within
+    STATUS_CATALOG_TTL; with redis they are shared immediately.
+    """
+
+    _cache = make_cache('status_catalog', maxsize=4096, ttl=Config.STATUS_CATALOG_TTL)
+
+    @classmethod
+    def get(cls, project_id: int, refresh: bool = False) -> Dict:
+        catalog = None if refresh else cls._cache.get(str(project_id))
+        if catalog is None:
+            catalog = cls._load(project_id)
+            cls._cache.set(str(project_id), catalog)
+        return catalog
+
+    @staticmethod
+    def _load(project_id: int) -> Dict:
+        rows = db.session.query(
+            CustomStatus.id, CustomStatus.name, CustomStatus.color, CustomStatus.position,
+            CustomStatus.is_default, CustomStatus.progress, CustomStatus.is_terminal
+        ).filter(CustomStatus.project_id == project_id).order_by(CustomStatus.position, CustomStatus.id).all()
+        return {
+            "version": time.time_ns(),
+            "statuses": [{
+                "id": row.id,
+                "name": row.name,
+                "color": row.color,
+                "position": row.position,
+                "is_default": bool(row.is_default),
+                "progress": row.progress,
+                "is_terminal": bool(row.is_terminal),
+            } for row in rows],
+        }
+
+    @classmethod
+    def invalidate(cls, project_id: int) -> None:
+        cls._cache.delete(str(project_id))
+
+    # ---------- lookups ----------
+
+    @classmethod
+    def version(cls, project_id: int) -> int:
+        return cls.get(project_id)["version"]
+
+    @classmethod
+    def statuses(cls, project_id: int) -> List[Dict]:
+        return cls.get(project_id)["statuses"]
+
+    @classmethod
+    def by_id(cls, project_id: int) -> Dict[int, Dict]:
+        return {s["id"]: s for s in cls.statuses(project_id)}
+
+    @classmethod
+    def status(cls, project_id: int, status_id) -> Optional[Dict]:
+        """The project's status with this id, or None if it has none"""
+        try:
+            status_id = int(status_id)
+        except (TypeError, ValueError):
+            return None
+        for refresh in (False, True):
+            for status in cls.get(project_id, refresh=refresh)["statuses"]:
+                if status["id"] == status_id:
+                    return status
+        return None
+
+    @classmethod
+    def default_status(cls, project_id: int, fallback_to_first: bool = True) -> Optional[Dict]:
+        """The status marked default, else (with fallback_to_first) the first one in workflow order"""
+        statuses = cls.statuses(project_id)
+        fallback = statuses[0] if statuses and fallback_to_first else None
+        return next((s for s in statuses if s["is_default"]), fallback)
+
+    @classmethod
+    def terminal_ids(cls, project_id: int) -> Set[int]:
+        return {s["id"] for s in cls.statuses(project_id) if s["is_terminal"]}
+
+    @classmethod
+    def lookup(cls, project_ids: Iterable[int]) -> Dict[int, Dict]:
+        """status_id -> status for every status of the given projects"""
+        statuses = {}
+        for project_id in set(project_ids):
+            statuses.update(cls.by_id(project_id))
+        return statuses
+
+    @staticmethod
+    def summary(status: Optional[Dict]) -> Dict:
+        """{id, name, color} as task payloads embed it"""
+        if not status:
+            return dict(NO_STATUS)
+        return {"id": status["id"], "name": status["name"], "color": status["color"]}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Local stub LLM server for exercising the NL parser without network access.
+
+Answers POST /v1/chat with the JSON extraction the parser expects (built by
+FakeLLM from the rule parser). Latency and failures can be injected to test
+the LLM gateway's deadlines and circuit breaker:
+
+    python stub_llm_server.py --port 8765 --latency 2 --fail-rate 0.3
+    NL_LLM_BACKEND=stub NL_STUB_LLM_URL=http://127.0.0.1:8765 python app.py
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from fake_llm import FakeLLM
+
+
+def make_handler(latency=0.0, fail_rate=0.0):
+    fake_llm = FakeLLM()
+
+    class StubLLMHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok', 'calls': fake_llm.calls})
+            else:
+                self._send_json(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            if self.path != '/v1/chat':
+                self._send_json(404, {'error': 'Not found'})
+                return
+
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            messages = [SimpleNamespace(content=m.get('content', '')) for m in payload.get('messages', [])]
+
+            if latency:
+                time.sleep(latency)
+            if fail_rate and random.random() < fail_rate:
+                self._send_json(503, {'error': 'Injected failure'})
+                return
+            if not messages:
+                self._send_json(400, {'error': 'messages required'})
+                return
+
+            self._send_json(200, {'content': fake_llm(messages).content})
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubLLMHandler
+
+
+def serve(host='127.0.0.1', port=8765, latency=0.0, fail_rate=0.0):
+    server = ThreadingHTTPServer((host, port), make_handler(latency, fail_rate))
+    print(f"🤖 Stub LLM server on http://{host}:{port} (latency {latency}s, fail rate {fail_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub LLM server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Fraction of calls answered with HTTP 503")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.latency, args.fail_rate)
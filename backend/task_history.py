@@ -0,0 +1,286 @@
+import copy
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from flask import has_request_context
+from sqlalchemy import event, func, inspect
+from database import db
+from db_compat import stream_query
+from db_routing import RoutingSession
+from models import Tasks, TaskEvent, CustomStatus
+from cache import TTLCache
+from status_catalog import StatusCatalog
+from config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Task attribute -> event kind recorded when it changes
+_TRACKED = (
+    ('status_id', TaskEvent.STATUS),
+    ('assigned_to', TaskEvent.ASSIGNEE),
+    ('due_date', TaskEvent.DUE_DATE),
+)
+
+
+class TaskHistory:
+    """
+    Task History and Flow Metrics
+
+    Every status, assignee and due-date change is appended to task_events in
+    the same transaction as the change itself (see _record_task_events), so
+    history can't drift from the tasks table. Flow metrics are folded from
+    that log incrementally:
+    1. Per project, a rollup keeps each task's current status, when it
+       entered it, when it was created, started (first status change) and
+       completed, plus total time spent in every status so far
+    2. Each call only reads events newer than the rollup's cursor
+    3. Lead time = completed - created, cycle time = completed - started,
+       time in status = finished visits plus the current visit up to now
+
+    Rollups live in process memory. They are a deterministic fold of an
+    append-only log, so every process converges on the same numbers. Events
+    from the last TASK_HISTORY_SETTLE_SECONDS are applied on top of the
+    cached rollup but not folded into it yet, so a transaction that commits
+    late can't be skipped by the cursor.
+    """
+
+    _rollups = TTLCache(maxsize=512, ttl=24 * 3600)
+    _lock = threading.Lock()
+
+    # ---------- status helpers ----------
+
+    @classmethod
+    def done_status_ids(cls, project_id: Optional[int] = None) -> Set[int]:
+        """Ids of terminal (completed) statuses, for one project (cached) or all of them"""
+        if project_id is not None:
+            return StatusCatalog.terminal_ids(project_id)
+        query = db.session.query(CustomStatus.id).filter(CustomStatus.is_terminal == True)  # noqa: E712 (indexed)
+        return {row.id for row in query}
+
+    @staticmethod
+    def completion_times(task_ids: Iterable[int], done_status_ids: Set[int]) -> Dict[int, datetime]:
+        """task_id -> when it last moved into a completed status"""
+        task_ids = list(task_ids)
+        if not task_ids or not done_status_ids:
+            return {}
+        rows = db.session.query(TaskEvent.task_id, func.max(TaskEvent.ts)).filter(
+            TaskEvent.task_id.in_(task_ids),
+            TaskEvent.kind.in_((TaskEvent.CREATED, TaskEvent.STATUS)),
+            TaskEvent.new_value.in_(done_status_ids)
+        ).group_by(TaskEvent.task_id).all()
+        return {task_id: ts for task_id, ts in rows}
+
+    # ---------- rollups ----------
+
+    @classmethod
+    def rollup(cls, project_id: int, now: Optional[datetime] = None) -> Dict:
+        """
+        Up-to-date fold of a project's events
+
+        Returns:
+            Dict: cursor, done_ids, tasks {task_id: [status_id, since,
+            created, started, completed]} (epoch seconds) and dwell
+            {status_id: [seconds, visits]} for finished visits
+        """
+        now = now or datetime.utcnow()
+        settled_before = now - timedelta(seconds=Config.TASK_HISTORY_SETTLE_SECONDS)
+        done_ids = cls.done_status_ids(project_id)
+
+        with cls._lock:
+            state = cls._rollups.get(str(project_id))
+            if state is None or state['done_ids'] != done_ids:
+                # Completed statuses changed (or first use): fold from the start
+                state = {'cursor': 0, 'done_ids': done_ids, 'tasks': {}, 'dwell': {}}
+                events = cls._events(project_id, 0, until=settled_before)
+            else:
+                # Published rollups are never mutated; readers may still hold them
+                events = list(cls._events(project_id, state['cursor'], until=settled_before))
+                if events:
+                    state = copy.deepcopy(state)
+            for ev in events:
+                cls._apply(state, ev)
+                state['cursor'] = ev.id
+            cls._rollups.set(str(project_id), state)
+
+            recent = list(cls._events(project_id, state['cursor'], since=settled_before))
+            if not recent:
+                return state
+            state = copy.deepcopy(state)
+        for ev in sorted(recent, key=lambda e: e.id):
+            cls._apply(state, ev)
+        return state
+
+    @staticmethod
+    def _events(project_id: int, after_id: int, until: Optional[datetime] = None, since: Optional[datetime] = None):
+        query = db.session.query(
+            TaskEvent.id, TaskEvent.task_id, TaskEvent.kind, TaskEvent.new_value, TaskEvent.ts
+        ).filter(TaskEvent.project_id == project_id, TaskEvent.id > after_id)
+        if until is not None:
+            query = query.filter(TaskEvent.ts <= until)
+        if since is not None:
+            query = query.filter(TaskEvent.ts > since)
+        return stream_query(query.order_by(TaskEvent.id))
+
+    @staticmethod
+    def _apply(state: Dict, ev) -> None:
+        tasks, dwell, done_ids = state['tasks'], state['dwell'], state['done_ids']
+        ts = (ev.ts - _EPOCH).total_seconds()
+
+        if ev.kind == TaskEvent.CREATED:
+            tasks[ev.task_id] = [ev.new_value, ts, ts, None, ts if ev.new_value in done_ids else None]
+        elif ev.kind == TaskEvent.STATUS:
+            task = tasks.get(ev.task_id)
+            if task is None:
+                # History starts mid-life (task predates the log)
+                task = tasks[ev.task_id] = [None, ts, ts, None, None]
+            if task[0] is not None:
+                spent = dwell.setdefault(task[0], [0.0, 0])
+                spent[0] += max(0.0, ts - task[1])
+                spent[1] += 1
+            task[0], task[1] = ev.new_value, ts
+            if task[3] is None:
+                task[3] = ts
+            task[4] = ts if ev.new_value in done_ids else None
+        elif ev.kind == TaskEvent.DELETED:
+            tasks.pop(ev.task_id, None)
+
+    # ---------- metrics ----------
+
+    @classmethod
+    def flow_metrics(cls, project_id: int, days: int = 30, now: Optional[datetime] = None) -> Dict:
+        """
+        Lead/cycle time, completion trend and time in status for a project
+
+        Returns:
+            Dict: completed_tasks, lead_time and cycle_time ({avg, median,
+            p85} in days), completion_trend ([{date, count}] for the last
+            `days` days), time_in_status ({status_id: {avg_days,
+            current_tasks, current_avg_days}}) and completed_at
+            ({task_id: ISO timestamp})
+        """
+        now = now or datetime.utcnow()
+        state = cls.rollup(project_id, now)
+        now_ts = (now - _EPOCH).total_seconds()
+        window_start = (now.date() - timedelta(days=days))
+
+        lead, cycle, trend, completed_at = [], [], {}, {}
+        open_age = {}  # status_id -> [seconds, tasks]
+        for task_id, (status_id, since, created, started, completed) in state['tasks'].items():
+            if completed is not None:
+                lead.append((completed - created) / 86400)
+                cycle.append((completed - (started if started is not None else completed)) / 86400)
+                completed_on = _EPOCH + timedelta(seconds=completed)
+                completed_at[task_id] = completed_on.isoformat()
+                if completed_on.date() > window_start:
+                    day = completed_on.date().isoformat()
+                    trend[day] = trend.get(day, 0) + 1
+            elif status_id is not None:
+                age = open_age.setdefault(status_id, [0.0, 0])
+                age[0] += max(0.0, now_ts - since)
+                age[1] += 1
+
+        time_in_status = {}
+        for status_id in set(state['dwell']) | set(open_age):
+            spent, visits = state['dwell'].get(status_id, (0.0, 0))
+            current, current_tasks = open_age.get(status_id, (0.0, 0))
+            time_in_status[status_id] = {
+                "avg_days": round((spent + current) / (visits + current_tasks) / 86400, 2),
+                "current_tasks": current_tasks,
+                "current_avg_days": round(current / current_tasks / 86400, 2) if current_tasks else 0,
+            }
+
+        return {
+            "completed_tasks": len(lead),
+            "lead_time": _distribution(lead),
+            "cycle_time": _distribution(cycle),
+            "completion_trend": [{"date": d, "count": trend[d]} for d in sorted(trend)],
+            "time_in_status": time_in_status,
+            "completed_at": completed_at,
+        }
+
+    @classmethod
+    def invalidate(cls, project_id: int) -> None:
+        """Drop a project's rollup (it is rebuilt from the log on next use)"""
+        cls._rollups.delete(str(project_id))
+
+
+def _distribution(values: List[float]) -> Dict:
+    if not values:
+        return {"avg": None, "median": None, "p85": None}
+    values = sorted(values)
+    return {
+        "avg": round(sum(values) / len(values), 2),
+        "median": round(_percentile(values, 0.5), 2),
+        "p85": round(_percentile(values, 0.85), 2),
+    }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+# ---------- event capture ----------
+
+def _event_value(value):
+    if isinstance(value, date):
+        return value.toordinal()
+    return value
+
+
+def _current_actor_id() -> Optional[int]:
+    if not has_request_context():
+        return None
+    from flask_login import current_user
+    try:
+        return current_user.id if current_user.is_authenticated else None
+    except Exception:
+        return None
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _record_task_events(session, flush_context):
+    """Append task_events rows for this flush's task changes, on the flush's own connection"""
+    rows = []
+    now = datetime.utcnow()
+    actor_id = None
+
+    for obj in session.new:
+        if isinstance(obj, Tasks):
+            actor_id = actor_id or _current_actor_id()
+            rows.append(dict(project_id=obj.project_id, task_id=obj.id, kind=TaskEvent.CREATED,
+                             old_value=None, new_value=obj.status_id, actor_id=actor_id, ts=now))
+            for attr, kind in _TRACKED[1:]:
+                value = _event_value(getattr(obj, attr))
+                if value is not None:
+                    rows.append(dict(project_id=obj.project_id, task_id=obj.id, kind=kind,
+                                     old_value=None, new_value=value, actor_id=actor_id, ts=now))
+
+    for obj in session.dirty:
+        if not isinstance(obj, Tasks):
+            continue
+        state = inspect(obj)
+        for attr, kind in _TRACKED:
+            history = state.attrs[attr].history
+            if not history.has_changes():
+                continue
+            old = _event_value(history.deleted[0]) if history.deleted else None
+            new = _event_value(history.added[0]) if history.added else None
+            if old != new:
+                actor_id = actor_id or _current_actor_id()
+                rows.append(dict(project_id=obj.project_id, task_id=obj.id, kind=kind,
+                                 old_value=old, new_value=new, actor_id=actor_id, ts=now))
+
+    for obj in session.deleted:
+        if isinstance(obj, Tasks):
+            actor_id = actor_id or _current_actor_id()
+            rows.append(dict(project_id=obj.project_id, task_id=obj.id, kind=TaskEvent.DELETED,
+                             old_value=obj.status_id, new_value=None, actor_id=actor_id, ts=now))
+
+    if rows:
+        session.connection().execute(TaskEvent.__table__.insert(), rows)
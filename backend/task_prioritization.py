@@ -1,8 +1,13 @@
 from datetime import datetime, date
 from typing import List, Dict, Optional
-from models import Tasks, Projects
+from sqlalchemy import update
+from models import Tasks, Projects, PriorityWeightProfile
 from database import db
+from status_catalog import StatusCatalog
+from cache import make_cache
+from config import Config
 import json
+import math
 
 class TaskPrioritizationEngine:
     """
@@ -13,6 +18,10 @@ class TaskPrioritizationEngine:
     2. Effort Score: Task complexity estimation  
     3. Dependency Score: Number of blocked tasks
     4. Impact Score: Project criticality
+    
+    WEIGHTS are the defaults; a project can store its own weight profile
+    (see weights_for). Project-wide scoring goes through score_rows(), which
+    scores a column-projected task query as numpy arrays in one pass.
     """
     
     # Configuration weights for different factors
@@ -22,6 +31,10 @@ class TaskPrioritizationEngine:
         'dependency': 0.25, # 25% weight for tasks blocking others
         'impact': 0.20      # 20% weight for project impact
     }
+    FACTORS = ('urgency', 'effort', 'dependency', 'impact')
+    
+    # Project weight profiles, cached per project (JSON-safe dicts)
+    _profiles = make_cache('priority_weights', maxsize=4096, ttl=Config.PRIORITY_WEIGHTS_CACHE_TTL)
     
     @staticmethod
     def calculate_urgency_score(due_date: Optional[date]) -> float:
@@ -123,16 +136,18 @@ class TaskPrioritizationEngine:
         return impact_mapping.get(impact_level, 6.0)
     
     @classmethod
-    def calculate_priority_score(cls, task: Tasks) -> float:
+    def calculate_priority_score(cls, task: Tasks, weights: Optional[Dict[str, float]] = None) -> float:
         """
         Calculate comprehensive priority score for a task
         
         Args:
             task: Task object
+            weights: Factor weights (default: the task's project profile)
             
         Returns:
             float: Priority score (higher = more important)
         """
+        weights = weights or cls.weights_for(task.project_id)
         urgency_score = cls.calculate_urgency_score(task.due_date)
         effort_score = cls.calculate_effort_score(task.effort_score or 3)
         dependency_score = cls.calculate_dependency_score(task.id, task.dependency_map or [])
@@ -140,14 +155,26 @@ class TaskPrioritizationEngine:
         
         # Calculate weighted priority score
         priority_score = (
-            urgency_score * cls.WEIGHTS['urgency'] +
-            effort_score * cls.WEIGHTS['effort'] +
-            dependency_score * cls.WEIGHTS['dependency'] +
-            impact_score * cls.WEIGHTS['impact']
+            urgency_score * weights['urgency'] +
+            effort_score * weights['effort'] +
+            dependency_score * weights['dependency'] +
+            impact_score * weights['impact']
         )
         
         return round(priority_score, 2)
     
+    @staticmethod
+    def priority_label(priority_score: float) -> str:
+        """Priority label (Low, Medium, High, Urgent) for a score"""
+        if priority_score >= 8.0:
+            return "Urgent"
+        elif priority_score >= 6.5:
+            return "High"
+        elif priority_score >= 4.0:
+            return "Medium"
+        else:
+            return "Low"
+    
     @classmethod
     def update_task_priority(cls, task: Tasks) -> str:
         """
@@ -161,52 +188,229 @@ class TaskPrioritizationEngine:
         """
         priority_score = cls.calculate_priority_score(task)
         task.priority_score = priority_score
-        
-        # Determine priority label based on score
-        if priority_score >= 8.0:
-            priority_label = "Urgent"
-        elif priority_score >= 6.5:
-            priority_label = "High"
-        elif priority_score >= 4.0:
-            priority_label = "Medium"
-        else:
-            priority_label = "Low"
-        
-        task.priority = priority_label
-        return priority_label
+        task.priority = cls.priority_label(priority_score)
+        return task.priority
     
     @classmethod
     def update_project_task_priorities(cls, project_id: int) -> List[Dict]:
         """
         Update priority scores for all tasks in a project
         
+        Scores the whole project in one batch and writes only the tasks
+        whose score or label changed, as one executemany UPDATE.
+        
         Args:
             project_id: Project ID
             
         Returns:
             List[Dict]: Updated task priority information
         """
-        tasks = Tasks.query.filter_by(project_id=project_id).all()
-        updated_tasks = []
+        rows = cls.scoring_rows(Tasks.project_id == project_id)
+        scores = cls.score_rows(rows, cls.weights_for(project_id))
+        updated_tasks, changed = [], []
         
-        for task in tasks:
-            old_priority = task.priority
-            old_score = task.priority_score
-            
-            new_priority = cls.update_task_priority(task)
-            
+        for row, score in zip(rows, scores):
+            new_priority = cls.priority_label(score)
             updated_tasks.append({
-                'task_id': task.id,
-                'title': task.title,
-                'old_priority': old_priority,
+                'task_id': row.id,
+                'title': row.title,
+                'old_priority': row.priority,
                 'new_priority': new_priority,
-                'old_score': old_score,
-                'new_score': task.priority_score
+                'old_score': row.priority_score,
+                'new_score': score
             })
+            if (row.priority, row.priority_score) != (new_priority, score):
+                changed.append({'id': row.id, 'priority': new_priority, 'priority_score': score})
         
+        if changed:
+            db.session.execute(update(Tasks), changed)
         db.session.commit()
         return updated_tasks
     
+    # ---------- project weight profiles ----------
+    
+    @classmethod
+    def weight_profile(cls, project_id: int) -> Dict:
+        """{source: 'project' or 'default', weights} for a project (cached)"""
+        profile = cls._profiles.get(str(project_id))
+        if profile is None:
+            row = PriorityWeightProfile.query.filter_by(project_id=project_id).first()
+            profile = {
+                "source": "project" if row else "default",
+                "weights": {f: getattr(row, f) for f in cls.FACTORS} if row else dict(cls.WEIGHTS),
+            }
+            cls._profiles.set(str(project_id), profile)
+        return profile
+    
+    @classmethod
+    def weights_for(cls, project_id: Optional[int]) -> Dict[str, float]:
+        """The project's weight profile, or the default WEIGHTS"""
+        if project_id is None:
+            return dict(cls.WEIGHTS)
+        return cls.weight_profile(project_id)["weights"]
+    
+    @classmethod
+    def validate_weights(cls, weights) -> Dict[str, float]:
+        """
+        Check candidate weights and normalize them to sum to 1
+        
+        Raises:
+            ValueError: unless weights has exactly the four factors as
+            non-negative numbers with a positive total
+        """
+        if not isinstance(weights, dict) or set(weights) != set(cls.FACTORS):
+            raise ValueError(f"weights must set exactly: {', '.join(cls.FACTORS)}")
+        try:
+            values = {f: float(weights[f]) for f in cls.FACTORS}
+        except (TypeError, ValueError):
+            raise ValueError("weights must be numbers")
+        if not all(math.isfinite(v) and v >= 0 for v in values.values()):
+            raise ValueError("weights must be non-negative")
+        total = sum(values.values())
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+        return {f: round(v / total, 4) for f, v in values.items()}
+    
+    @classmethod
+    def save_weights(cls, project_id: int, weights: Dict, user_id: Optional[int] = None) -> Dict[str, float]:
+        """Store (or replace) a project's weight profile; returns the normalized weights"""
+        weights = cls.validate_weights(weights)
+        profile = PriorityWeightProfile.query.filter_by(project_id=project_id).first()
+        if profile is None:
+            profile = PriorityWeightProfile(project_id=project_id)
+            db.session.add(profile)
+        for factor, weight in weights.items():
+            setattr(profile, factor, weight)
+        profile.updated_by = user_id
+        db.session.commit()
+        cls._profiles.delete(str(project_id))
+        return weights
+    
+    @classmethod
+    def reset_weights(cls, project_id: int) -> bool:
+        """Drop a project's profile (back to WEIGHTS); False if it had none"""
+        deleted = PriorityWeightProfile.query.filter_by(project_id=project_id).delete()
+        db.session.commit()
+        cls._profiles.delete(str(project_id))
+        return bool(deleted)
+    
+    # ---------- batch scoring ----------
+    
+    @staticmethod
+    def scoring_rows(*criteria) -> list:
+        """Just the task columns scoring and insights need"""
+        return db.session.query(
+            Tasks.id, Tasks.title, Tasks.project_id, Tasks.status_id, Tasks.due_date, Tasks.effort_score,
+            Tasks.impact_score, Tasks.dependency_map, Tasks.blocked_by, Tasks.priority, Tasks.priority_score
+        ).filter(*criteria).order_by(Tasks.id).all()
+    
+    @staticmethod
+    def factor_matrix(rows, today: Optional[date] = None):
+        """
+        Factor values for many tasks at once
+        
+        Same values as the calculate_*_score methods, computed as numpy
+        arrays.
+        
+        Returns:
+            numpy.ndarray: (tasks x 4), columns in FACTORS order
+        """
+        import numpy as np  # Loaded on first batch, not at app startup
+        
+        today = today or datetime.utcnow().date()
+        days = np.array([(r.due_date - today).days if r.due_date else np.nan for r in rows], dtype=float)
+        urgency = np.select(
+            [np.isnan(days), days < 0, days == 0, days == 1, days <= 3, days <= 7, days <= 14, days <= 30],
+            [2.0, 10.0, 9.5, 9.0, 8.0, 6.0, 4.0, 2.5],
+            default=1.0
+        )
+        
+        # Effort is inverse, impact direct; anything outside 1-5 scores as Medium
+        levels = np.array([(r.effort_score or 3, r.impact_score or 3) for r in rows], dtype=float).reshape(-1, 2)
+        in_range = (levels >= 1) & (levels <= 5) & (levels == np.round(levels))
+        effort = np.where(in_range[:, 0], 12.0 - 2 * levels[:, 0], 6.0)
+        impact = np.where(in_range[:, 1], 2 * levels[:, 1], 6.0)
+        
+        blocked = np.array([len(r.dependency_map or []) for r in rows], dtype=float)
+        dependency = np.select([blocked >= 5, blocked >= 3, blocked >= 2, blocked == 1], [10.0, 8.0, 6.0, 4.0],
+                               default=1.0)
+        
+        return np.column_stack([urgency, effort, dependency, impact])
+    
+    @classmethod
+    def weighted_scores(cls, factors, weights: Dict[str, float]) -> List[float]:
+        """Rounded priority scores for a factor matrix (summed in calculate_priority_score's order)"""
+        total = factors[:, 0] * weights['urgency']
+        for column, factor in enumerate(cls.FACTORS[1:], start=1):
+            total = total + factors[:, column] * weights[factor]
+        return [round(score, 2) for score in total.tolist()]
+    
+    @classmethod
+    def score_rows(cls, rows, weights: Dict[str, float], today: Optional[date] = None) -> List[float]:
+        if not rows:
+            return []
+        return cls.weighted_scores(cls.factor_matrix(rows, today), weights)
+    
+    @classmethod
+    def simulate_weights(cls, project_id: int, weights: Dict, include_completed: bool = False,
+                         today: Optional[date] = None) -> Dict:
+        """
+        Re-rank a project's tasks under candidate weights, without writing
+        
+        Both rankings are computed from today's factor values, so rank
+        deltas reflect only the weight change. Ties rank by task id.
+        
+        Returns:
+            Dict: current and candidate weights, counts of tasks that moved
+            or changed label, and per task (new rank order) both scores,
+            ranks and labels with rank_delta (positive = moves up)
+        """
+        import numpy as np
+        
+        candidate = cls.validate_weights(weights)
+        current = cls.weights_for(project_id)
+        rows = cls.scoring_rows(Tasks.project_id == project_id)
+        if not include_completed:
+            terminal_ids = StatusCatalog.terminal_ids(project_id)
+            rows = [r for r in rows if r.status_id not in terminal_ids]
+        
+        result = {
+            "project_id": project_id,
+            "current_weights": current,
+            "candidate_weights": candidate,
+            "total_tasks": len(rows),
+            "moved_tasks": 0,
+            "label_changes": 0,
+            "tasks": [],
+        }
+        if not rows:
+            return result
+        
+        factors = cls.factor_matrix(rows, today)
+        ids = np.array([r.id for r in rows])
+        before = cls.weighted_scores(factors, current)
+        after = cls.weighted_scores(factors, candidate)
+        rank_before, rank_after = _ranks(before, ids), _ranks(after, ids)
+        
+        tasks = []
+        for i, row in enumerate(rows):
+            tasks.append({
+                "task_id": row.id,
+                "title": row.title,
+                "current_score": before[i],
+                "new_score": after[i],
+                "current_rank": int(rank_before[i]),
+                "new_rank": int(rank_after[i]),
+                "rank_delta": int(rank_before[i] - rank_after[i]),
+                "current_priority": cls.priority_label(before[i]),
+                "new_priority": cls.priority_label(after[i]),
+            })
+        tasks.sort(key=lambda t: t["new_rank"])
+        result["tasks"] = tasks
+        result["moved_tasks"] = sum(1 for t in tasks if t["rank_delta"])
+        result["label_changes"] = sum(1 for t in tasks if t["current_priority"] != t["new_priority"])
+        return result
+    
     @classmethod
     def get_priority_insights(cls, task: Tasks) -> Dict:
         """
@@ -218,38 +422,65 @@ class TaskPrioritizationEngine:
         Returns:
             Dict: Priority calculation breakdown
         """
+        weights = cls.weights_for(task.project_id)
         urgency_score = cls.calculate_urgency_score(task.due_date)
         effort_score = cls.calculate_effort_score(task.effort_score or 3)
         dependency_score = cls.calculate_dependency_score(task.id, task.dependency_map or [])
         impact_score = cls.calculate_impact_score(task.impact_score or 3)
         
+        values = [urgency_score, effort_score, dependency_score, impact_score]
+        weighted = [value * weights[factor] for value, factor in zip(values, cls.FACTORS)]
+        return cls._insight(task, values, [weights[f] for f in cls.FACTORS], weighted)
+    
+    @classmethod
+    def get_priority_insights_batch(cls, rows, today: Optional[date] = None) -> List[Dict]:
+        """
+        get_priority_insights() for many tasks in one scoring pass
+        
+        Args:
+            rows: Tasks or scoring_rows() results, from any mix of projects
+            
+        Returns:
+            List[Dict]: One breakdown per row, in order
+        """
+        import numpy as np
+        
+        if not rows:
+            return []
+        factors = cls.factor_matrix(rows, today)
+        
+        # Each row's project weights, looked up once per project
+        project_ids, row_project = np.unique([r.project_id for r in rows], return_inverse=True)
+        table = np.array([[cls.weights_for(int(pid))[f] for f in cls.FACTORS] for pid in project_ids])
+        weights = table[row_project.reshape(-1)]
+        
+        return [cls._insight(row, values, row_weights, weighted) for row, values, row_weights, weighted
+                in zip(rows, factors.tolist(), weights.tolist(), (factors * weights).tolist())]
+    
+    @classmethod
+    def _insight(cls, task, values: List[float], weights: List[float], weighted: List[float]) -> Dict:
         return {
             'task_id': task.id,
             'title': task.title,
             'scores': {
-                'urgency': {
-                    'value': urgency_score,
-                    'weight': cls.WEIGHTS['urgency'],
-                    'weighted': urgency_score * cls.WEIGHTS['urgency']
-                },
-                'effort': {
-                    'value': effort_score,
-                    'weight': cls.WEIGHTS['effort'],
-                    'weighted': effort_score * cls.WEIGHTS['effort']
-                },
-                'dependency': {
-                    'value': dependency_score,
-                    'weight': cls.WEIGHTS['dependency'],
-                    'weighted': dependency_score * cls.WEIGHTS['dependency']
-                },
-                'impact': {
-                    'value': impact_score,
-                    'weight': cls.WEIGHTS['impact'],
-                    'weighted': impact_score * cls.WEIGHTS['impact']
+                factor: {
+                    'value': values[i],
+                    'weight': weights[i],
+                    'weighted': weighted[i]
                 }
+                for i, factor in enumerate(cls.FACTORS)
             },
             'total_score': task.priority_score,
             'priority_label': task.priority,
             'blocking_tasks': len(task.dependency_map or []),
             'blocked_by_tasks': len(task.blocked_by or [])
-        } 
\ No newline at end of file
+        }
+
+def _ranks(scores: List[float], ids):
+    """1-based rank per position: highest score first, ties by lower task id"""
+    import numpy as np
+    
+    order = np.lexsort((ids, -np.asarray(scores)))
+    ranks = np.empty(len(order), dtype=int)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
@@ -0,0 +1,271 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+import re
+import unicodedata
+import logging
+
+from sqlalchemy import event, inspect
+
+from cache import TTLCache
+from config import Config
+from db_routing import RoutingSession
+from models import Users, TeamMembers
+
+logger = logging.getLogger(__name__)
+
+# Common English nicknames -> formal first names. Members are indexed under
+# every nickname of their first name and vice versa.
+NICKNAMES = {
+    'alex': ['alexander', 'alexandra', 'alexis'],
+    'andy': ['andrew'],
+    'ben': ['benjamin'],
+    'beth': ['elizabeth'],
+    'bill': ['william'],
+    'bob': ['robert'],
+    'bobby': ['robert'],
+    'chris': ['christopher', 'christine', 'christina'],
+    'dan': ['daniel'],
+    'danny': ['daniel'],
+    'dave': ['david'],
+    'ed': ['edward'],
+    'jim': ['james'],
+    'jimmy': ['james'],
+    'joe': ['joseph'],
+    'jon': ['jonathan'],
+    'kate': ['katherine', 'catherine'],
+    'katie': ['katherine', 'catherine'],
+    'liz': ['elizabeth'],
+    'matt': ['matthew'],
+    'mike': ['michael'],
+    'nick': ['nicholas'],
+    'pat': ['patrick', 'patricia'],
+    'rob': ['robert'],
+    'sam': ['samuel', 'samantha'],
+    'steve': ['steven', 'stephen'],
+    'sue': ['susan'],
+    'tom': ['thomas'],
+    'tony': ['anthony'],
+    'will': ['william'],
+}
+
+# Formal name -> nicknames
+_FORMAL_TO_NICKNAMES = defaultdict(list)
+for _nickname, _formal_names in NICKNAMES.items():
+    for _formal in _formal_names:
+        _FORMAL_TO_NICKNAMES[_formal].append(_nickname)
+
+# Single letters are indexed so "John S" matches "John Smith"
+MIN_PREFIX_LENGTH = 1
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    value = re.sub(r"[^\w\s]|_", ' ', value.casefold())
+    return ' '.join(value.split())
+
+
+def _deletes(token: str) -> Set[str]:
+    """The token with each single character removed (symmetric-delete keys)"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def edit_distance(a: str, b: str, limit: int = 2) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, capped at limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _fuzzy_limit(token: str) -> int:
+    """Allowed typos: none for initials, 1 for short words, 2 for long ones"""
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 6 else 2
+
+
+class TeamNameIndex:
+    """
+    Name lookup structure for the members of one project
+
+    Built once from the project's members and then answered with dict
+    lookups, tried from strictest to loosest; the first tier that matches
+    anyone decides:
+    1. exact: full name, email or email local part
+    2. token: every query word is a name/email word or one of its nicknames
+    3. prefix: every query word starts a name word ("Sam" -> "Samantha")
+    4. fuzzy: as 3, but words may also be within a small edit distance of a
+       name word ("Jon Doe" -> "John Doe")
+
+    A tier that matches more than one member is ambiguous and resolves to
+    nobody; the candidates are returned so the caller can ask the user.
+    """
+
+    def __init__(self, project_id: int, members: List[Dict]):
+        self.project_id = project_id
+        self.members = {m['id']: m for m in members}
+        self.exact = defaultdict(set)
+        self.tokens = defaultdict(set)
+        self.prefixes = defaultdict(set)
+        self.deletes = defaultdict(set)  # symmetric-delete key -> indexed tokens
+
+        for member in members:
+            user_id = member['id']
+            name = normalize_name(member.get('name'))
+            email = (member.get('email') or '').casefold().strip()
+            local_part = email.split('@')[0]
+
+            for key in filter(None, [name, email, local_part, normalize_name(local_part)]):
+                self.exact[key].add(user_id)
+
+            words = set(name.split()) | set(normalize_name(local_part).split())
+            for word in list(words):
+                words.update(NICKNAMES.get(word, []))
+                words.update(_FORMAL_TO_NICKNAMES.get(word, []))
+
+            for word in words:
+                self.tokens[word].add(user_id)
+                for length in range(MIN_PREFIX_LENGTH, len(word)):
+                    self.prefixes[word[:length]].add(user_id)
+                self.deletes[word].add(word)
+                for key in _deletes(word):
+                    self.deletes[key].add(word)
+
+    def _fuzzy_ids(self, word: str) -> Set[int]:
+        limit = _fuzzy_limit(word)
+        if not limit:
+            return set()
+        candidates = set(self.deletes.get(word, ()))
+        for key in _deletes(word) | {word}:
+            candidates.update(self.deletes.get(key, ()))
+        ids = set()
+        for token in candidates:
+            if edit_distance(word, token, limit) <= limit:
+                ids.update(self.tokens[token])
+        return ids
+
+    def _match_all(self, words: List[str], lookup) -> Set[int]:
+        """Members matched by every query word"""
+        matched = None
+        for word in words:
+            ids = lookup(word)
+            matched = set(ids) if matched is None else matched & ids
+            if not matched:
+                return set()
+        return matched or set()
+
+    def resolve(self, name: Optional[str]) -> Dict:
+        """
+        Resolve a free-text name to one member
+
+        Returns:
+            Dict: {'user_id': int or None, 'match': tier name or None,
+                   'candidates': [user ids] when ambiguous}
+        """
+        result = {'user_id': None, 'match': None, 'candidates': []}
+        query = normalize_name(name)
+        if not query:
+            return result
+
+        raw = name.casefold().strip()
+        words = query.split()
+        tiers = [
+            ('exact', lambda: self.exact.get(query, set()) | self.exact.get(raw, set())),
+            ('token', lambda: self._match_all(words, lambda w: self.tokens.get(w, set()))),
+            ('prefix', lambda: self._match_all(words, lambda w: self.prefixes.get(w, set()) | self.tokens.get(w, set()))),
+            ('fuzzy', lambda: self._match_all(words, lambda w: self._fuzzy_ids(w) | self.prefixes.get(w, set()) | self.tokens.get(w, set()))),
+        ]
+        for tier, lookup in tiers:
+            ids = lookup()
+            if len(ids) == 1:
+                result.update(user_id=next(iter(ids)), match=tier)
+                return result
+            if ids:
+                result.update(match=tier, candidates=sorted(ids))
+                return result
+        return result
+
+
+class TeamDirectory:
+    """
+    Per-process cache of TeamNameIndex objects, one per project
+
+    Indexes are rebuilt lazily after invalidate() (called by the team and
+    project routes when membership changes, and on commit when a user's name
+    or email changes). The TTL bounds how long another process can serve a
+    stale index, since invalidation is process-local.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._indexes = TTLCache(maxsize=maxsize or Config.TEAM_DIRECTORY_SIZE,
+                                 ttl=ttl or Config.TEAM_DIRECTORY_TTL)
+
+    def get_index(self, project_id: int) -> TeamNameIndex:
+        index = self._indexes.get(project_id)
+        if index is None:
+            rows = (Users.query
+                    .join(TeamMembers, TeamMembers.user_id == Users.id)
+                    .filter(TeamMembers.project_id == project_id)
+                    .with_entities(Users.id, Users.name, Users.email)
+                    .all())
+            index = TeamNameIndex(project_id, [{'id': r.id, 'name': r.name, 'email': r.email} for r in rows])
+            self._indexes.set(project_id, index)
+        return index
+
+    def resolve(self, name: Optional[str], project_id: int) -> Dict:
+        return self.get_index(project_id).resolve(name)
+
+    def invalidate(self, project_id: Optional[int] = None) -> None:
+        """Drop one project's index, or every index when project_id is None"""
+        if project_id is None:
+            self._indexes.clear()
+        else:
+            self._indexes.delete(project_id)
+
+
+_directory = TeamDirectory()
+
+
+def get_team_directory() -> TeamDirectory:
+    """Shared team directory for this process"""
+    return _directory
+
+
+# ---------- invalidation on user renames ----------
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _collect_renamed_users(session, flush_context):
+    """Remember that a flush changed a user's name or email until the transaction commits"""
+    for obj in session.dirty:
+        if isinstance(obj, Users):
+            state = inspect(obj)
+            if state.attrs.name.history.has_changes() or state.attrs.email.history.has_changes():
+                session.info['team_directory_stale'] = True
+                return
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _drop_renamed_users(session):
+    # A user may sit on many teams, and renames are rare: drop every index
+    if session.info.pop('team_directory_stale', False):
+        _directory.invalidate()
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_renamed_users(session):
+    session.info.pop('team_directory_stale', None)
@@ -0,0 +1,81 @@
+"""
+Speed check for workload-aware assignment.
+
+Builds a load index for a synthetic project (500 members, 30,000 open tasks)
+and places a bulk import of 20,000 new tasks with the heap allocator. Both
+have to stay well inside the budget. Run directly or with pytest.
+
+    python test_assignment_speed.py
+    ASSIGNMENT_TASKS=50000 ASSIGNMENT_BUDGET_MS=500 python test_assignment_speed.py
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date
+
+from workload import WorkloadBalancer, WorkloadIndex
+
+ASSIGNMENT_MEMBERS = int(os.getenv('ASSIGNMENT_MEMBERS', '500'))
+ASSIGNMENT_TASKS = int(os.getenv('ASSIGNMENT_TASKS', '20000'))
+ASSIGNMENT_BUDGET_MS = float(os.getenv('ASSIGNMENT_BUDGET_MS', '250'))
+OPEN_TASKS = 30000
+RUNS = 3
+
+
+def _scenario():
+    rng = random.Random(7)
+    today = date.today().toordinal()
+    index = WorkloadIndex(1, 0, terminal_ids=())
+    for task_id in range(OPEN_TASKS):
+        index.apply(task_id, (rng.randrange(ASSIGNMENT_MEMBERS), rng.randint(1, 5),
+                              today + rng.randint(-5, 60) if rng.random() < 0.7 else None, rng.random() < 0.1))
+    costs = [(i, WorkloadBalancer.task_cost(rng.randint(1, 5))) for i in range(ASSIGNMENT_TASKS)]
+    return index, costs
+
+
+def measure_assignment():
+    """Best wall time (ms) of RUNS loads + allocations, and the last result"""
+    index, costs = _scenario()
+    today = date.today().toordinal()
+    timings, loads, assignment = [], None, None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        loads = {user_id: WorkloadBalancer.member_load(index, user_id, today)["load"]
+                 for user_id in range(ASSIGNMENT_MEMBERS)}
+        assignment = WorkloadBalancer.allocate(loads, costs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), loads, costs, assignment
+
+
+def _spread(loads, costs, assignment):
+    final = dict(loads)
+    for key, cost in costs:
+        final[assignment[key]] += cost
+    return max(final.values()) - min(final.values())
+
+
+def test_assignment_within_budget():
+    best, loads, costs, assignment = measure_assignment()
+    assert len(assignment) == ASSIGNMENT_TASKS
+    # Greedy placement ends with every member within one task of each other
+    assert _spread(loads, costs, assignment) <= max(cost for _, cost in costs)
+    assert best <= ASSIGNMENT_BUDGET_MS, (
+        f"{ASSIGNMENT_TASKS} tasks over {ASSIGNMENT_MEMBERS} members took {best:.1f}ms "
+        f"(budget {ASSIGNMENT_BUDGET_MS:.0f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    print("⚖️  Workload-Aware Assignment Speed")
+    print("=" * 50)
+    best, loads, costs, assignment = measure_assignment()
+    print(f"   {ASSIGNMENT_TASKS} tasks over {ASSIGNMENT_MEMBERS} members ({OPEN_TASKS} open tasks indexed)")
+    print(f"   Best of {RUNS}: {best:.1f}ms (budget {ASSIGNMENT_BUDGET_MS:.0f}ms)")
+    print(f"   Load spread after placement: {_spread(loads, costs, assignment):.2f}")
+    if best <= ASSIGNMENT_BUDGET_MS:
+        print("🎉 Assignment within budget!")
+    else:
+        print("⚠️ Assignment budget exceeded")
+        sys.exit(1)
@@ -0,0 +1,138 @@
+"""
+Receipt and image download checks (/api/blobs).
+
+A file is readable by its uploader, the creator of an expense it is the
+receipt of, that expense's project team (also for task-only expenses) and,
+for project images, the project's team; anyone else who knows the hash gets
+404, and cannot link the hash to an expense of their own either.
+
+    python test_blobs.py
+"""
+
+import io
+import json
+import tempfile
+from datetime import datetime
+
+from testing_support import app, db, seed_project, make_user, add_member, client_for, reset_schema, drop_schema, run_checks
+from models import Expense, ExpenseCategory, Projects
+from config import Config
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def _png(color=(200, 40, 40)):
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.new('RGB', (40, 30), color).save(out, 'PNG')
+    return out.getvalue()
+
+
+def _upload(client, data):
+    return client.post('/api/blobs/', data=data, content_type='application/octet-stream').get_json()['url']
+
+
+def test_blob_access_follows_expense_projects():
+    Config.BLOB_STORAGE_DIR = tempfile.mkdtemp()
+    with app.app_context():
+        owner, project, _ = seed_project()
+        member, outsider = make_user('Blob Member'), make_user('Blob Outsider')
+        add_member(project, member)
+        category = ExpenseCategory(name='Blob check')
+        db.session.add(category)
+        db.session.commit()
+        owner_client, member_client, outsider_client = client_for(owner), client_for(member), client_for(outsider)
+        project_id, category_id = project.id, category.id
+
+    upload = owner_client.post('/api/blobs/', data=_png(), content_type='application/octet-stream')
+    assert upload.status_code == 201
+    url, thumbnail_url = upload.get_json()['url'], upload.get_json()['thumbnail_url']
+    assert owner_client.get(url).status_code == 200
+
+    # Not attached yet: only the uploader can read it
+    assert member_client.get(url).status_code == 404
+    assert member_client.get(thumbnail_url).status_code == 404
+
+    with app.app_context():
+        db.session.add(Expense(amount=12.5, date=datetime.utcnow(), project_id=project_id, category_id=category_id,
+                               created_by=owner.id, receipt_url=url))
+        db.session.commit()
+
+    assert member_client.get(url).status_code == 200
+    assert member_client.get(thumbnail_url).status_code == 200
+    assert outsider_client.get(url).status_code == 404
+    assert outsider_client.get(thumbnail_url).status_code == 404
+
+    # Uploading identical bytes is not a way in either
+    again = outsider_client.post('/api/blobs/', data=_png(), content_type='application/octet-stream')
+    assert again.get_json()['deduplicated'] is True
+    assert outsider_client.get(url).status_code == 404
+
+
+
+def test_blob_urls_cannot_be_linked_without_access():
+    Config.BLOB_STORAGE_DIR = tempfile.mkdtemp()
+    with app.app_context():
+        owner, project, _ = seed_project('Receipt Owner')
+        thief, own_project, own_tasks = seed_project('Receipt Thief')
+        category = ExpenseCategory(name='Blob link check')
+        db.session.add(category)
+        db.session.commit()
+        owner_client, thief_client = client_for(owner), client_for(thief)
+        own_project_id, own_task_id, category_id = own_project.id, own_tasks[0].id, category.id
+
+    url = _upload(owner_client, _png((10, 120, 10)))
+    expense = {'amount': 5, 'date': '2026-10-19', 'category_id': category_id, 'project_id': own_project_id}
+
+    # Linking someone else's hash to your own expense is refused everywhere
+    assert thief_client.post('/api/expenses/', json={**expense, 'receipt_url': url}).status_code == 400
+    created = thief_client.post('/api/expenses/', json={**expense, 'receipt_url': 'https://example.com/r.pdf'})
+    assert created.status_code == 201
+    expense_id = created.get_json()['expense_id']
+    assert thief_client.put(f'/api/expenses/{expense_id}', json={'receipt_url': url}).status_code == 400
+    rows = '\n'.join(json.dumps({**expense, 'receipt_url': receipt})
+                     for receipt in (url, url.upper().replace('/API/BLOBS/', '/api/blobs/'), None))
+    body = thief_client.post(f'/api/expenses/import?project_id={own_project_id}', data=rows,
+                             content_type='application/x-ndjson').get_json()
+    assert (body['imported'], body['failed']) == (1, 2)
+    assert {e['error'] for e in body['errors']} == {'Receipt not found'}
+    assert thief_client.get(url).status_code == 404
+
+    # A file of your own can be linked, and a task-only expense shares it with the task's project
+    own_url = _upload(thief_client, _png((10, 10, 120)))
+    task_expense = {'amount': 7, 'date': '2026-10-19', 'category_id': category_id, 'task_id': own_task_id}
+    assert thief_client.post('/api/expenses/', json={**task_expense, 'receipt_url': own_url}).status_code == 201
+    with app.app_context():
+        teammate = make_user('Task Teammate')
+        add_member(db.session.get(Projects, own_project_id), teammate)
+        db.session.commit()
+        teammate_client = client_for(teammate)
+    assert teammate_client.get(own_url).status_code == 200
+    assert owner_client.get(own_url).status_code == 404
+
+
+def test_project_images_are_shared_with_the_team():
+    Config.BLOB_STORAGE_DIR = tempfile.mkdtemp()
+    with app.app_context():
+        owner, member, outsider = make_user('Image Owner'), make_user('Image Member'), make_user('Image Outsider')
+        db.session.commit()
+        owner_client, member_client, outsider_client = client_for(owner), client_for(member), client_for(outsider)
+        member_id = member.id
+
+    response = owner_client.post('/api/projects/', data={'name': 'Pictured', 'image': (io.BytesIO(_png((90, 90, 0))), 'logo.png')},
+                                 content_type='multipart/form-data')
+    assert response.status_code == 201
+    project_id, image_url = response.get_json()['project_id'], response.get_json()['project']['image_path']
+    assert image_url and owner_client.get(f'/api/projects/{project_id}').get_json()['image_path'] == image_url
+
+    assert member_client.get(image_url).status_code == 404
+    assert owner_client.post('/api/team/add', json={'project_id': project_id, 'user_id': member_id}).status_code == 201
+    assert member_client.get(image_url).status_code == 200
+    assert member_client.get(f'{image_url}/thumbnail').status_code == 200
+    assert outsider_client.get(image_url).status_code == 404
+
+
+if __name__ == "__main__":
+    run_checks("🧾 Blob access checks", globals())
@@ -0,0 +1,45 @@
+"""
+Budget burn-rate forecast checks (burn_rate.py).
+
+Seeds two months of daily spending against a budget and checks the
+forecast exhaustion date and its band.
+
+    python test_burn_rate.py
+"""
+
+from datetime import date, datetime, timedelta
+
+from testing_support import app, db, seed_project, reset_schema, drop_schema, run_checks
+from burn_rate import BurnRateForecaster
+from models import Budget, Expense, ExpenseCategory
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_burn_rate_forecast():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        category = ExpenseCategory(name='Burn rate')
+        db.session.add(category)
+        db.session.flush()
+        today = date(2026, 3, 1)
+        db.session.add(Budget(amount=1000.0, start_date=datetime(2026, 1, 1), end_date=datetime(2026, 6, 30),
+                              project_id=project.id, created_by=user.id))
+        db.session.add_all([
+            Expense(amount=10.0, date=datetime(2026, 1, 1, 12) + timedelta(days=i), project_id=project.id,
+                    category_id=category.id, created_by=user.id)
+            for i in range(59)
+        ])
+        db.session.commit()
+
+        forecast = BurnRateForecaster.compute(project.id, today)
+        assert (forecast['spent'], forecast['history_days']) == (590.0, 60)
+        assert 9.0 < forecast['daily_burn_rate'] <= 10.0
+        assert forecast['exhaustion_date_earliest'] <= forecast['exhaustion_date'] <= forecast['exhaustion_date_latest']
+        assert forecast['exhaustion_date'] < forecast['budget_end_date'] == '2026-06-30'
+        assert forecast['status'] == 'overrun_likely'
+
+
+if __name__ == "__main__":
+    run_checks("🔥 Burn-rate forecast checks", globals())
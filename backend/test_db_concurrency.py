@@ -0,0 +1,153 @@
+"""
+Concurrency benchmark for the SQLite connection profile.
+
+Seeds a throwaway database, runs the nightly deadline job
+(DeadlineWarningEngine.analyze_all_tasks) while reader threads keep running
+dashboard-style queries, and reports reader latency and "database is locked"
+errors. Each profile runs in a fresh interpreter:
+
+- default: bare SQLite as before (rollback journal, no pragmas, default pool)
+- production: db_profile.py (WAL, busy_timeout, cache/mmap, pooled connections)
+
+Run directly or with pytest:
+
+    python test_db_concurrency.py
+    BENCH_TASKS=20000 python test_db_concurrency.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_TASKS = int(os.getenv('BENCH_TASKS', '3500'))
+READERS = int(os.getenv('BENCH_READERS', '4'))
+
+# Readers must never wait this long for a query under the production profile
+MAX_READER_LATENCY_MS = float(os.getenv('BENCH_MAX_READER_LATENCY_MS', '250'))
+
+PROBE = r"""
+import json, os, sys, tempfile, threading, time, uuid
+from datetime import date, timedelta
+
+profile, task_count, reader_count = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+
+import config
+config.Config.SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+import db_profile
+if profile == 'default':
+    # Behave like the app did before db_profile existed
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    event.remove(Engine, 'connect', db_profile._set_sqlite_pragmas)
+    db_profile.engine_options = lambda *args, **kwargs: {}
+
+from sqlalchemy import text
+from app import create_app
+from database import db
+from models import Users, Projects, TeamMembers, CustomStatus, Tasks
+from deadline_warnings import DeadlineWarningEngine
+
+app = create_app('web')
+with app.app_context():
+    db.create_all()
+    users = [Users(email=f'u{i}@bench.test', password='x', name=f'User {i}',
+                   fs_uniquifier=uuid.uuid4().hex, active=True) for i in range(3)]
+    db.session.add_all(users)
+    db.session.flush()
+    project = Projects(name='Bench', created_by=users[0].id)
+    db.session.add(project)
+    db.session.flush()
+    db.session.add_all([TeamMembers(user_id=u.id, project_id=project.id) for u in users])
+    todo = CustomStatus(name='To Do', position=1, is_default=True, project_id=project.id)
+    db.session.add(todo)
+    db.session.flush()
+    # Overdue, unassigned tasks: every one produces a notification per member
+    db.session.add_all([Tasks(title=f'Task {i}', project_id=project.id, status_id=todo.id,
+                              due_date=date.today() - timedelta(days=1 + i % 5))
+                        for i in range(task_count)])
+    db.session.commit()
+    project_id = project.id
+    journal_mode = db.session.execute(text('PRAGMA journal_mode')).scalar()
+
+latencies, errors = [], []
+job_done = threading.Event()
+
+def reader():
+    with app.app_context():
+        while not job_done.is_set():
+            start = time.perf_counter()
+            try:
+                with db.engine.connect() as connection:
+                    connection.execute(text(
+                        "SELECT status_id, COUNT(*) FROM tasks WHERE project_id = :p GROUP BY status_id"
+                    ), {'p': project_id}).all()
+                    connection.execute(text(
+                        "SELECT COUNT(*) FROM notifications WHERE user_id = :u AND is_read = 0"
+                    ), {'u': 1}).scalar()
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(type(e).__name__ + ': ' + str(e).splitlines()[0])
+            time.sleep(0.01)
+
+threads = [threading.Thread(target=reader) for _ in range(reader_count)]
+for thread in threads:
+    thread.start()
+
+job_start = time.perf_counter()
+with app.app_context():
+    summary = DeadlineWarningEngine.analyze_all_tasks()
+job_seconds = time.perf_counter() - job_start
+job_done.set()
+for thread in threads:
+    thread.join()
+
+latencies.sort()
+def pct(p):
+    return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2) if latencies else None
+
+print(json.dumps({
+    'profile': profile,
+    'journal_mode': journal_mode,
+    'job_seconds': round(job_seconds, 3),
+    'notifications_created': summary['notifications_created'],
+    'reads': len(latencies),
+    'errors': len(errors),
+    'error_sample': errors[:1],
+    'p50_ms': pct(0.5), 'p95_ms': pct(0.95), 'max_ms': pct(1.0),
+}))
+"""
+
+
+def run_profile(profile, tasks=BENCH_TASKS, readers=READERS):
+    """Run the benchmark for one profile in a fresh interpreter and return its stats"""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, profile, str(tasks), str(readers)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_readers_not_blocked_by_nightly_job():
+    result = run_profile('production')
+    assert result['journal_mode'] == 'wal'
+    assert result['errors'] == 0, result['error_sample']
+    assert result['reads'] > 0
+    assert result['max_ms'] <= MAX_READER_LATENCY_MS, (
+        f"Slowest read took {result['max_ms']}ms while the nightly job ran (limit {MAX_READER_LATENCY_MS}ms)"
+    )
+
+
+if __name__ == "__main__":
+    print("🗄️  SQLite Concurrency Benchmark")
+    print("=" * 50)
+    print(f"   {BENCH_TASKS} overdue tasks, {READERS} reader threads during analyze_all_tasks()\n")
+
+    for profile in ('default', 'production'):
+        r = run_profile(profile)
+        print(f"📊 {profile} (journal_mode={r['journal_mode']})")
+        print(f"   Nightly job: {r['job_seconds']}s, {r['notifications_created']} notifications")
+        print(f"   Reads: {r['reads']}, errors: {r['errors']} {r['error_sample'] or ''}")
+        print(f"   Read latency p50 {r['p50_ms']}ms, p95 {r['p95_ms']}ms, max {r['max_ms']}ms\n")
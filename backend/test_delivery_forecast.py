@@ -0,0 +1,66 @@
+"""
+Monte Carlo delivery forecast checks (delivery_forecast.py).
+
+A seeded forecast over a known completion history, and the deadline-risk
+and delivery-forecast endpoints built on it. Simulation speed is checked
+separately in test_delivery_forecast_speed.py.
+
+    python test_delivery_forecast.py
+"""
+
+from datetime import datetime, timedelta
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from delivery_forecast import DeliveryForecaster
+from models import TaskEvent
+from config import Config
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_delivery_forecast():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        # Tasks 1, 3 and 5 were finished 2, 6 and 10 days into a 20-day history
+        for task in tasks:
+            task.created_at = datetime.utcnow() - timedelta(days=20)
+        for i, days_ago in ((1, 18), (3, 14), (5, 10)):
+            TaskEvent.query.filter_by(task_id=tasks[i].id).update({'ts': datetime.utcnow() - timedelta(days=days_ago)})
+        db.session.commit()
+
+        forecast = DeliveryForecaster.compute(project.id, trials=5000, seed=1)
+        assert (forecast['status'], forecast['history_days'], forecast['remaining_tasks']) == ('ok', 21, 3)
+        assert [d['effort_due'] for d in forecast['deadlines']] == [3, 6, 9]
+        # 3 active days out of 21: one task's effort in a day is rare, three in five days rarer
+        probabilities = [d['probability'] for d in forecast['deadlines']]
+        assert 0.05 < probabilities[0] < 0.3 and probabilities[2] < probabilities[0]
+        assert forecast['risk_level'] == 'critical' and forecast['at_risk_deadline'] == forecast['deadlines'][2]['date']
+        client, project_id, task_id, done_id = client_for(user), project.id, tasks[0].id, tasks[1].status_id
+
+    body = client.get(f'/api/analytics/project/{project_id}/deadline-risk').get_json()
+    assert (body['risk_level'], body['days_remaining'], body['completed_tasks']) == ('critical', 0, 3)
+    assert client.put(f'/api/tasks/{task_id}', json={'status_id': done_id}).status_code == 200
+    body = client.get(f'/api/analytics/project/{project_id}/delivery-forecast').get_json()
+    assert (body['trials'], body['remaining_tasks'], len(body['deadlines'])) == (10000, 2, 2)
+    assert client.get(f'/api/analytics/project/{project_id}/delivery-forecast?trials=12345').get_json()['trials'] == 12000
+    assert client.get(f'/api/analytics/project/{project_id}/delivery-forecast?trials=100000').status_code == 400
+
+
+def test_simulation_runs_in_chunks():
+    history, days_remaining, effort_due = [0, 0, 3, 0, 6, 0, 3], [0, 4, 30], [3, 9, 30]
+    chunk_trials = Config.DELIVERY_FORECAST_CHUNK_TRIALS
+    Config.DELIVERY_FORECAST_CHUNK_TRIALS = 300
+    try:
+        probabilities, finish_days = DeliveryForecaster.simulate(history, days_remaining, effort_due, 30, 1000, 60, seed=3)
+        again = DeliveryForecaster.simulate(history, days_remaining, effort_due, 30, 1000, 60, seed=3)
+    finally:
+        Config.DELIVERY_FORECAST_CHUNK_TRIALS = chunk_trials
+    assert len(finish_days) == 1000 and (probabilities == again[0]).all()
+    # 3 days in 7 finish at least 3 points; at 12/7 points a day, 30 take about 17 days
+    assert 0.35 < probabilities[0] < 0.51 and probabilities[1] < probabilities[2]
+    assert 10 < float(sorted(finish_days)[500]) < 25
+
+
+if __name__ == "__main__":
+    run_checks("🎲 Delivery forecast checks", globals())
@@ -0,0 +1,68 @@
+"""
+Speed check for the Monte Carlo delivery forecast.
+
+Times DeliveryForecaster.simulate() on a synthetic project: 90 days of
+throughput history, 40 deadlines spread over six months, 10,000 trials. The
+simulation is a few vectorized numpy passes over fixed-size trial chunks, so
+it has to stay well inside the budget. Run directly or with pytest.
+
+    python test_delivery_forecast_speed.py
+    FORECAST_TRIALS=50000 FORECAST_BUDGET_MS=250 python test_delivery_forecast_speed.py
+"""
+
+import os
+import sys
+import time
+
+from delivery_forecast import DeliveryForecaster
+
+FORECAST_TRIALS = int(os.getenv('FORECAST_TRIALS', '10000'))
+FORECAST_BUDGET_MS = float(os.getenv('FORECAST_BUDGET_MS', '100'))
+HORIZON_DAYS = 180
+RUNS = 5
+
+
+def _scenario():
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    # About 6 effort points a day, with idle days
+    history = rng.poisson(6, size=90) * (rng.random(90) > 0.25)
+    days_remaining = sorted(rng.integers(0, HORIZON_DAYS, size=40).tolist())
+    effort_due = np.cumsum(rng.integers(1, 60, size=40)).tolist()
+    return history, days_remaining, effort_due, effort_due[-1]
+
+
+def measure_forecast():
+    """Best wall time (ms) of RUNS simulations and the last result"""
+    history, days_remaining, effort_due, total = _scenario()
+    timings, result = [], None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = DeliveryForecaster.simulate(history, days_remaining, effort_due, total,
+                                             FORECAST_TRIALS, HORIZON_DAYS)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def test_forecast_within_budget():
+    best, (probabilities, finish_days) = measure_forecast()
+    assert len(probabilities) == 40 and len(finish_days) == FORECAST_TRIALS
+    assert 0.0 <= probabilities.min() <= probabilities.max() <= 1.0
+    assert best <= FORECAST_BUDGET_MS, (
+        f"{FORECAST_TRIALS} trials took {best:.1f}ms (budget {FORECAST_BUDGET_MS:.0f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    print("🎲 Monte Carlo Delivery Forecast Speed")
+    print("=" * 50)
+    best, (probabilities, _) = measure_forecast()
+    print(f"   {FORECAST_TRIALS} trials x {HORIZON_DAYS} days, 40 deadlines")
+    print(f"   Best of {RUNS}: {best:.1f}ms (budget {FORECAST_BUDGET_MS:.0f}ms)")
+    print(f"   On-time probability range: {probabilities.min():.2f} - {probabilities.max():.2f}")
+    if best <= FORECAST_BUDGET_MS:
+        print("🎉 Forecast within budget!")
+    else:
+        print("⚠️ Forecast budget exceeded")
+        sys.exit(1)
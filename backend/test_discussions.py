@@ -0,0 +1,121 @@
+"""
+Discussion feed checks (/api/discussions).
+
+Cursor paging over messages that share a timestamp, and since= syncs that
+pick up new, edited and deleted messages, replies included.
+
+    python test_discussions.py
+"""
+
+from datetime import datetime
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from models import Discussions
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_cursor_pages_through_timestamp_ties():
+    with app.app_context():
+        user, project, _ = seed_project()
+        # Five messages in the same instant: only the id breaks the tie
+        moment = datetime(2026, 10, 1, 9, 0, 0)
+        messages = [Discussions(message=f'Message {i}', user_id=user.id, project_id=project.id,
+                                timestamp=moment, updated_at=moment) for i in range(5)]
+        db.session.add_all(messages)
+        db.session.commit()
+        client, project_id = client_for(user), project.id
+        ids = [m.id for m in messages]
+
+    seen, cursor = [], None
+    while True:
+        url = f'/api/discussions/project/{project_id}?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url).get_json()
+        seen += [d['id'] for d in body['discussions']]
+        cursor = body['next_cursor']
+        if not body['has_more']:
+            break
+    assert seen == sorted(ids, reverse=True)
+    assert len(client.get(f'/api/discussions/project/{project_id}').get_json()) == 5
+
+
+def test_since_reports_new_edited_and_deleted_messages():
+    with app.app_context():
+        user, project, _ = seed_project()
+        client, project_id = client_for(user), project.id
+
+    def post(message):
+        return client.post('/api/discussions/', json={'message': message, 'project_id': project_id}).get_json()['discussion_id']
+
+    first, second = post('First'), post('Second')
+    sync = client.get(f'/api/discussions/project/{project_id}?limit=10').get_json()['sync_cursor']
+    body = client.get(f'/api/discussions/project/{project_id}?since={sync}').get_json()
+    assert (body['discussions'], body['deleted_ids'], body['sync_cursor']) == ([], [], sync)
+
+    third = post('Third')
+    assert client.put(f'/api/discussions/{first}', json={'message': 'First, edited'}).status_code == 200
+    assert client.delete(f'/api/discussions/{second}').status_code == 200
+
+    body = client.get(f'/api/discussions/project/{project_id}?since={sync}').get_json()
+    assert [d['id'] for d in body['discussions']] == [third, first]
+    assert body['discussions'][1]['message'] == 'First, edited'
+    assert body['deleted_ids'] == [second]
+
+    # A page boundary inside the changes still hands over every one of them exactly once
+    ids, deleted, cursor = [], [], sync
+    while True:
+        page = client.get(f'/api/discussions/project/{project_id}?since={cursor}&limit=1').get_json()
+        ids += [d['id'] for d in page['discussions']]
+        deleted += page['deleted_ids']
+        cursor = page['sync_cursor']
+        if not page['has_more']:
+            break
+    assert (ids, deleted) == ([third, first], [second])
+
+    # Tombstones are gone from every other view
+    feed = client.get(f'/api/discussions/project/{project_id}').get_json()
+    assert [d['id'] for d in feed] == [third, first]
+    assert client.delete(f'/api/discussions/{second}').status_code == 404
+    assert client.get(f'/api/discussions/{second}/replies').status_code == 404
+
+
+def test_reply_changes_reach_since_syncs():
+    with app.app_context():
+        user, project, _ = seed_project()
+        client, project_id = client_for(user), project.id
+
+    def post(message, parent_id=None):
+        return client.post('/api/discussions/', json={'message': message, 'project_id': project_id,
+                                                      'parent_id': parent_id}).get_json()['discussion_id']
+
+    def root_changes(since):
+        body = client.get(f'/api/discussions/project/{project_id}?since={since}').get_json()
+        return [(d['id'], d['replies_count']) for d in body['discussions']], body['sync_cursor']
+
+    root = post('Root')
+    root_sync = client.get(f'/api/discussions/project/{project_id}?limit=10').get_json()['sync_cursor']
+
+    # Each reply change resends the parent with its new count
+    first = post('First reply', root)
+    changes, root_sync = root_changes(root_sync)
+    assert changes == [(root, 1)]
+    reply_sync = client.get(f'/api/discussions/{root}/replies?limit=10').get_json()['sync_cursor']
+
+    second = post('Second reply', root)
+    assert client.put(f'/api/discussions/{first}', json={'message': 'First reply, edited'}).status_code == 200
+    changes, root_sync = root_changes(root_sync)
+    assert changes == [(root, 2)]
+
+    assert client.delete(f'/api/discussions/{second}').status_code == 200
+    changes, root_sync = root_changes(root_sync)
+    assert changes == [(root, 1)]
+
+    # The replies themselves sync through /replies
+    body = client.get(f'/api/discussions/{root}/replies?since={reply_sync}').get_json()
+    assert [(d['id'], d['message']) for d in body['replies']] == [(first, 'First reply, edited')]
+    assert body['deleted_ids'] == [second]
+    assert [d['id'] for d in client.get(f'/api/discussions/{root}/replies').get_json()] == [first]
+
+if __name__ == "__main__":
+    run_checks("💬 Discussion feed checks", globals())
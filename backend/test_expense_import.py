@@ -0,0 +1,35 @@
+"""
+Bulk expense import checks (expense_import.py).
+
+Imports a CSV in chunks and checks per-row errors and the rows written.
+
+    python test_expense_import.py
+"""
+
+from testing_support import app, db, seed_project, reset_schema, drop_schema, run_checks
+from expense_import import ExpenseImporter
+from models import Expense, ExpenseCategory
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_bulk_expense_import():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        category = ExpenseCategory(name='Import check')
+        db.session.add(category)
+        db.session.commit()
+
+        lines = ['amount,date,category,task_id,notes']
+        lines += [f'{i + 1},2026-05-{i % 28 + 1:02d},import check,,row {i}' for i in range(25)]
+        lines += ['x,2026-05-01,Import check,,', f'1,2026-05-01,Import check,{tasks[0].id},', '1,2026-05-01,Missing,,']
+        summary = ExpenseImporter(user.id, default_project_id=project.id, chunk_size=10).run(
+            ExpenseImporter.parse(lines, 'csv'))
+        assert (summary['imported'], summary['failed'], summary['chunks']) == (26, 2, 3)
+        assert [e['row'] for e in summary['errors']] == [27, 29]
+        assert Expense.query.filter_by(project_id=project.id, category_id=category.id).count() == 25
+
+
+if __name__ == "__main__":
+    run_checks("📥 Expense import checks", globals())
@@ -0,0 +1,50 @@
+"""
+Streaming export checks (exporter.py, /api/export).
+
+CSV and NDJSON exports with date and category filters, including
+spreadsheet formula escaping.
+
+    python test_export.py
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from exporter import DataExporter
+from models import Expense, ExpenseCategory
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_export_streams_filtered_rows():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        travel, food = ExpenseCategory(name='Export travel'), ExpenseCategory(name='Export food')
+        db.session.add_all([travel, food])
+        db.session.flush()
+        db.session.add_all([
+            Expense(amount=float(i), date=datetime(2026, 4, 1) + timedelta(days=i), notes='=SUM(A1)' if i == 0 else None,
+                    project_id=project.id, category_id=(travel if i % 2 else food).id, created_by=user.id)
+            for i in range(10)
+        ])
+        db.session.commit()
+
+        client = client_for(user)
+        response = client.get(f'/api/export/expenses/project/{project.id}?start=2026-04-01&end=2026-04-05')
+        lines = response.get_data(as_text=True).splitlines()
+        assert response.status_code == 200 and len(lines) == 6
+        assert lines[0].startswith('id,date,amount,category_id,category') and "'=SUM(A1)" in lines[1]
+
+        chunks = list(DataExporter.export('expenses', project.id, 'ndjson', category_ids=[travel.id]))
+        rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert [row['amount'] for row in rows] == [1.0, 3.0, 5.0, 7.0, 9.0]
+        assert rows[0]['category'] == 'Export travel' and rows[0]['created_by'] == 'Test User'
+
+        response = client.get(f'/api/export/tasks/project/{project.id}?format=ndjson')
+        assert len(response.get_data(as_text=True).splitlines()) == len(tasks)
+
+
+if __name__ == "__main__":
+    run_checks("📤 Export checks", globals())
@@ -0,0 +1,44 @@
+"""
+Funds usage aggregation checks (finance.py).
+
+Budget and expense totals, the monthly breakdown and per-category totals
+computed in SQL on the database in DATABASE_URL.
+
+    python test_finance.py
+"""
+
+from datetime import datetime
+
+from testing_support import app, db, seed_project, reset_schema, drop_schema, run_checks
+from finance import FinanceAggregator
+from models import Budget, Expense, ExpenseCategory
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_funds_usage_aggregates():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        category = ExpenseCategory(name='Finance check')
+        db.session.add(category)
+        db.session.flush()
+        db.session.add(Budget(amount=100.0, start_date=datetime(2026, 1, 10), end_date=datetime(2026, 12, 31),
+                              project_id=project.id, created_by=user.id))
+        db.session.add_all([
+            Expense(amount=amount, date=when, project_id=project.id, task_id=tasks[0].id,
+                    category_id=category.id, created_by=user.id)
+            for amount, when in [(10.0, datetime(2026, 1, 31, 23)), (5.0, datetime(2026, 2, 1)), (2.5, datetime(2026, 2, 20))]
+        ])
+        db.session.commit()
+
+        summary = FinanceAggregator.summarize(project_id=project.id)
+        assert (summary['total_budget'], summary['total_expenses'], summary['expense_count']) == (100.0, 17.5, 3)
+        assert [(m['month'], m['budget'], m['expenses']) for m in summary['monthly_breakdown']] == [
+            ('2026-01', 100.0, 10.0), ('2026-02', 0, 7.5)]
+        assert summary['categories'] == [{'category_id': category.id, 'name': 'Finance check', 'total': 17.5}]
+        assert FinanceAggregator.summarize(task_id=tasks[0].id)['budget_count'] == 0
+
+
+if __name__ == "__main__":
+    run_checks("💰 Funds usage checks", globals())
@@ -0,0 +1,46 @@
+"""
+Status snapshot checks (flow_snapshots.py).
+
+Nightly captures plus the live point for today feed the cumulative flow
+and burndown endpoints.
+
+    python test_flow_snapshots.py
+"""
+
+from datetime import date, timedelta
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from flow_snapshots import FlowSnapshots
+from models import ProjectStatusSnapshot
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_flow_snapshots():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        yesterday = date.today() - timedelta(days=1)
+        FlowSnapshots.capture(yesterday)
+        FlowSnapshots.capture(yesterday)  # Re-running a day replaces it
+        assert ProjectStatusSnapshot.query.filter_by(project_id=project.id, snapshot_date=yesterday).count() == 2
+        tasks[0].status_id = tasks[1].status_id
+        db.session.commit()
+        client, project_id = client_for(user), project.id
+
+    response = client.get(f'/api/analytics/project/{project_id}/cumulative-flow?start={yesterday}')
+    assert response.status_code == 200, response.get_data(as_text=True)
+    body = response.get_json()
+    assert body['dates'] == [yesterday.isoformat(), date.today().isoformat()]
+    assert [s['counts'] for s in body['series']] == [[3, 2], [3, 4]]
+
+    target = date.today() + timedelta(days=1)
+    body = client.get(f'/api/analytics/project/{project_id}/burndown?start={yesterday}&target_date={target}').get_json()
+    assert [p['remaining_tasks'] for p in body['points']] == [3, 2]
+    assert [p['completed_tasks'] for p in body['points']] == [3, 4]
+    assert len(body['ideal']) == 3 and body['ideal'][-1]['remaining_effort'] == 0
+    assert client.get(f'/api/analytics/project/{project_id}/burndown?start=2020-01-01').status_code == 400
+
+
+if __name__ == "__main__":
+    run_checks("📈 Flow snapshot checks", globals())
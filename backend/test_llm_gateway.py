@@ -0,0 +1,125 @@
+"""
+LLM gateway checks (llm_gateway.py and /api/tasks/parse-nl-status).
+
+The circuit breaker's open / half-open probe / close cycle, calls refused
+when the gateway is full, a queued call dropped at its deadline, and the
+parser going through a local stub LLM server (stub_llm_server.py) that fails
+until the breaker opens.
+
+    python test_llm_gateway.py
+"""
+
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from testing_support import app, seed_project, client_for, reset_schema, drop_schema, run_checks
+import llm_task_parser
+from llm_task_parser import NaturalLanguageTaskParser
+from llm_gateway import CircuitBreaker, LLMGateway, CircuitOpenError, GatewayBusyError, LLMTimeoutError
+from fake_llm import StubServerLLM
+from stub_llm_server import make_handler
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def _stub_server(fail_rate=0.0):
+    """Stub LLM server on a free port, serving from a daemon thread"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(fail_rate=fail_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_circuit_breaker_cycle():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    # After reset_timeout exactly one probe goes through; its failure reopens
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    # A successful probe closes it
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.consecutive_failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_busy_gateway_and_queued_timeout():
+    gateway = LLMGateway(max_concurrency=1, timeout=5.0, max_queue=1)
+    release = threading.Event()
+    running = gateway.submit(release.wait)
+
+    # Queued behind the running call: dropped at its deadline without reaching the provider
+    started = time.monotonic()
+    try:
+        gateway.call(lambda: 'never runs', timeout=0.05)
+        assert False, "expected LLMTimeoutError"
+    except LLMTimeoutError:
+        pass
+    assert time.monotonic() - started < 1.0
+    stats = gateway.stats()
+    assert (stats['timeouts'], stats['pending'], stats['consecutive_failures']) == (1, 1, 0)
+
+    queued = gateway.submit(lambda: 'queued')
+    try:
+        gateway.submit(lambda: 'refused')
+        assert False, "expected GatewayBusyError"
+    except GatewayBusyError:
+        pass
+    assert gateway.stats()['rejected_busy'] == 1
+
+    release.set()
+    assert running.result(timeout=1) is True and queued.result(timeout=1) == 'queued'
+    assert gateway.stats()['pending'] == 0
+
+
+def test_parser_through_failing_stub_server():
+    failing, failing_url = _stub_server(fail_rate=1.0)
+    healthy, healthy_url = _stub_server()
+    try:
+        parser = NaturalLanguageTaskParser(llm=StubServerLLM(failing_url, timeout=2.0))
+        parser.gateway = LLMGateway(max_concurrency=2, timeout=2.0, failure_threshold=2, reset_timeout=0.2)
+        text = "Maybe tidy up the onboarding docs"
+
+        reasons = [parser.parse_natural_language_task(f"{text} {i}")['extracted_info']['fallback_reason']
+                   for i in range(3)]
+        assert reasons == ['error', 'error', 'circuit_open']
+        try:
+            parser.gateway.call(lambda: None)
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError:
+            pass
+
+        # The provider recovers: after reset_timeout the probe succeeds and closes the circuit
+        parser._llm = StubServerLLM(healthy_url, timeout=2.0)
+        time.sleep(0.25)
+        result = parser.parse_natural_language_task(f"{text} again")
+        assert result['extracted_info']['source'] == 'llm'
+        assert parser.gateway.stats()['circuit_state'] == CircuitBreaker.CLOSED
+
+        llm_task_parser._parser_instance = parser
+        with app.app_context():
+            client = client_for(seed_project()[0])
+        body = client.get('/api/tasks/parse-nl-status').get_json()
+        gateway = body['gateway']
+        assert (gateway['calls'], gateway['failures'], gateway['successes'], gateway['rejected_open']) == (3, 2, 1, 2)
+        assert gateway['circuit_state'] == 'closed' and gateway['latency_ms']['max'] is not None
+        assert 'cache' in body and 'backend' in body
+    finally:
+        llm_task_parser._parser_instance = None
+        for server in (failing, healthy):
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    run_checks("🛡️  LLM gateway checks", globals())
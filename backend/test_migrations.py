@@ -0,0 +1,172 @@
+"""
+Schema migration checks (SQLite and PostgreSQL).
+
+Runs every migration in migrations/ against the database in DATABASE_URL (a
+throwaway SQLite file when unset): once on an empty database, once more to
+prove re-runs are no-ops, and once on a database shaped like the pre-
+migration schema (legacy tasks.status strings, discussions without task_id).
+
+    python test_migrations.py
+"""
+
+import os
+import tempfile
+
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'migrations.db')
+
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app import create_app
+from database import db
+from db_migrations import SchemaMigrator, Operations, VERSION_TABLE
+
+app = create_app('script')
+
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id {pk}, email VARCHAR(255) UNIQUE NOT NULL, password VARCHAR(255) NOT NULL, "
+    "active BOOLEAN, fs_uniquifier VARCHAR(255) UNIQUE NOT NULL, fs_token_uniquifier VARCHAR(255), name VARCHAR(100))",
+    "CREATE TABLE projects (id {pk}, name VARCHAR(150) NOT NULL, description TEXT, created_at TIMESTAMP, "
+    "created_by INTEGER NOT NULL REFERENCES users(id))",
+    "CREATE TABLE custom_status (id {pk}, name VARCHAR(100) NOT NULL, description TEXT, color VARCHAR(7), "
+    "position INTEGER, is_default BOOLEAN, project_id INTEGER NOT NULL REFERENCES projects(id), created_at TIMESTAMP)",
+    "CREATE TABLE tasks (id {pk}, title VARCHAR(150) NOT NULL, description TEXT, status VARCHAR(50), due_date DATE, "
+    "priority VARCHAR(20), priority_score FLOAT, project_id INTEGER NOT NULL REFERENCES projects(id), "
+    "assigned_to INTEGER REFERENCES users(id), created_at TIMESTAMP, updated_at TIMESTAMP)",
+    "CREATE TABLE discussions (id {pk}, message TEXT NOT NULL, timestamp TIMESTAMP, parent_id INTEGER, "
+    "user_id INTEGER NOT NULL, project_id INTEGER NOT NULL)",
+]
+
+
+def _reset():
+    db.session.remove()
+    with db.engine.begin() as connection:
+        inspector = sa.inspect(connection)
+        if db.engine.dialect.name == 'sqlite':
+            for name in inspector.get_table_names():
+                if name.startswith('search_'):
+                    connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {VERSION_TABLE}"))
+    db.drop_all()
+    with db.engine.begin() as connection:
+        for name in ('discussions', 'tasks', 'custom_status', 'projects', 'users'):
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+
+def _model_indexes():
+    return {index.name for table in db.metadata.sorted_tables for index in table.indexes}
+
+
+def _missing_columns():
+    """Model columns the migrated database does not have"""
+    inspector = sa.inspect(db.engine)
+    return {f"{table.name}.{column.name}" for table in db.metadata.sorted_tables
+            for column in table.columns
+            if column.name not in {c['name'] for c in inspector.get_columns(table.name)}}
+
+
+def _database_indexes():
+    inspector = sa.inspect(db.engine)
+    return {i['name'] for table in inspector.get_table_names() for i in inspector.get_indexes(table)}
+
+
+def teardown_module(module=None):
+    with app.app_context():
+        _reset()
+
+
+def test_fresh_database_and_rerun():
+    with app.app_context():
+        _reset()
+        migrator = SchemaMigrator()
+        applied = migrator.upgrade()
+        assert applied == [m.version for m in migrator.discover()]
+        assert set(db.metadata.tables) <= set(sa.inspect(db.engine).get_table_names())
+        assert _model_indexes() <= _database_indexes()
+        # Migrations build their tables from frozen definitions; they must still add up to the models
+        assert _missing_columns() == set()
+        assert migrator.upgrade() == []
+        assert all(applied_at for _, _, applied_at in migrator.status())
+
+
+def test_legacy_database_is_upgraded_in_place():
+    with app.app_context():
+        _reset()
+        pk = 'SERIAL PRIMARY KEY' if db.engine.dialect.name == 'postgresql' else 'INTEGER PRIMARY KEY AUTOINCREMENT'
+        with db.engine.begin() as connection:
+            for statement in LEGACY_SCHEMA:
+                connection.execute(text(statement.format(pk=pk)))
+            connection.execute(text(
+                "INSERT INTO users (email, password, active, fs_uniquifier, name) VALUES ('legacy@example.com', 'x', true, 'legacy', 'Legacy')"
+            ))
+            connection.execute(text("INSERT INTO projects (name, created_by) VALUES ('Legacy', 1)"))
+            connection.execute(text(
+                "INSERT INTO tasks (title, status, project_id) VALUES (:title, :status, 1)"
+            ), [{'title': f'Task {i}', 'status': status}
+                for i, status in enumerate(['To-Do', 'In Progress', 'Done', 'Unknown'] * 5)])
+            connection.execute(text(
+                "INSERT INTO discussions (message, timestamp, user_id, project_id) VALUES ('hi', CURRENT_TIMESTAMP, 1, 1)"
+            ))
+
+        # Statuses teams had added by the time progress was introduced
+        SchemaMigrator().upgrade(target='0011')
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO custom_status (name, position, is_default, project_id) VALUES (:name, :position, false, 1)"
+            ), [{'name': name, 'position': 10 + i} for i, name in enumerate(['Not Done', 'Undone', 'Code Review'])])
+        SchemaMigrator().upgrade()
+
+        with db.engine.connect() as connection:
+            mapped = dict(connection.execute(text(
+                "SELECT t.status, MIN(cs.name) FROM tasks t JOIN custom_status cs ON cs.id = t.status_id GROUP BY t.status"
+            )).all())
+            assert mapped == {'To-Do': 'To-Do', 'In Progress': 'In Progress', 'Done': 'Done', 'Unknown': 'To-Do'}
+            assert connection.execute(text("SELECT COUNT(*) FROM discussions WHERE updated_at IS NULL")).scalar() == 0
+            assert connection.execute(text("SELECT COUNT(*) FROM expense_categories")).scalar() > 0
+            # One "created" event per task, plus a completion event for the 5 done tasks
+            assert dict(connection.execute(text(
+                "SELECT kind, COUNT(*) FROM task_events GROUP BY kind"
+            )).all()) == {1: 20, 2: 5}
+            # Status progress and terminal flag are filled from the status names
+            assert {name: (progress, bool(terminal)) for name, progress, terminal in connection.execute(text(
+                "SELECT name, progress, is_terminal FROM custom_status"
+            ))} == {'To-Do': (0.0, False), 'In Progress': (0.5, False), 'Done': (1.0, True),
+                    'Not Done': (0.2, False), 'Undone': (0.2, False), 'Code Review': (0.8, False)}
+        assert {'task_id', 'updated_at'} <= {c['name'] for c in sa.inspect(db.engine).get_columns('discussions')}
+        assert _model_indexes() <= _database_indexes()
+        assert _missing_columns() == set()
+
+
+def test_backfill_runs_in_batches():
+    with app.app_context():
+        _reset()
+        SchemaMigrator().upgrade()
+        with db.engine.begin() as connection:
+            connection.execute(text("INSERT INTO users (email, password, active, fs_uniquifier) VALUES ('b@example.com', 'x', true, 'b')"))
+            connection.execute(text("INSERT INTO projects (name, created_by) VALUES ('Batches', 1)"))
+            connection.execute(text("INSERT INTO tasks (title, project_id, priority) VALUES (:title, 1, NULL)"),
+                               [{'title': f'Task {i}'} for i in range(25)])
+        logged = []
+        op = Operations(db.engine, log=logged.append)
+        assert op.backfill('tasks', "priority = 'Medium'", 'priority IS NULL', batch_size=10) == 25
+        assert op.backfill('tasks', "priority = 'Medium'", 'priority IS NULL', batch_size=10) == 0
+
+
+if __name__ == "__main__":
+    print(f"🗄️  Schema migration checks ({os.environ['DATABASE_URL'].split(':')[0]})")
+    print("=" * 50)
+    failures = 0
+    try:
+        for name, check in [(n, f) for n, f in list(globals().items()) if n.startswith('test_') and callable(f)]:
+            try:
+                check()
+                print(f"   ✅ {name}")
+            except Exception as e:
+                failures += 1
+                print(f"   ❌ {name}: {e}")
+    finally:
+        teardown_module()
+    if failures:
+        raise SystemExit(1)
+    print("🎉 All migration checks passed!")
@@ -0,0 +1,129 @@
+"""
+Batch natural language parsing checks (/api/tasks/parse-nl-batch).
+
+Runs on FakeLLM, so no API key, network or LangChain is needed: results come
+back in input order, a failed or slow item only affects itself, and the LLM
+gateway never runs more calls at once than it allows.
+
+    python test_nl_batch.py
+"""
+
+import json
+import sys
+import threading
+
+from testing_support import app, seed_project, client_for, reset_schema, drop_schema, run_checks
+import llm_task_parser
+from llm_task_parser import NaturalLanguageTaskParser
+from llm_gateway import LLMGateway
+from fake_llm import FakeLLM
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+# Confident rule parses alternate with inputs the rules hand to the LLM
+ITEMS = [
+    "Remind John to send the report by Friday",
+    "Maybe tidy up the onboarding docs",
+    "Send the invoice tomorrow",
+    "Perhaps rework the pricing page",
+    "Either fix or drop the flaky export",
+    "Maybe archive last quarter's boards",
+]
+LLM_ITEMS = [1, 3, 4, 5]
+
+
+class CountingLLM(FakeLLM):
+    """FakeLLM that records the most calls it was ever inside at once"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = self.peak = 0
+        self._active_lock = threading.Lock()
+
+    def __call__(self, messages):
+        with self._active_lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return super().__call__(messages)
+        finally:
+            with self._active_lock:
+                self.active -= 1
+
+
+def _parser(llm, max_concurrency=2):
+    parser = NaturalLanguageTaskParser(llm=llm)
+    parser.gateway = LLMGateway(max_concurrency=max_concurrency, timeout=5.0, failure_threshold=100)
+    llm_task_parser._parser_instance = parser
+    return parser
+
+
+def _client():
+    with app.app_context():
+        user, project, _ = seed_project()
+        return client_for(user), project.id
+
+
+def test_results_keep_input_order_under_a_concurrency_bound():
+    llm = CountingLLM(latency=0.05)
+    _parser(llm, max_concurrency=2)
+    client, project_id = _client()
+
+    body = client.post('/api/tasks/parse-nl-batch', json={'items': ITEMS, 'project_id': project_id}).get_json()
+    assert body['count'] == len(ITEMS)
+    assert [r['index'] for r in body['results']] == list(range(len(ITEMS)))
+    assert [r['parsing_info']['original_text'] for r in body['results']] == ITEMS
+    sources = [r['parsing_info']['source'] for r in body['results']]
+    assert [i for i, source in enumerate(sources) if source == 'llm'] == LLM_ITEMS
+    assert llm.calls == len(LLM_ITEMS) and llm.peak == 2
+
+    # Streamed: one line per item, local answers before the LLM ones
+    response = client.post('/api/tasks/parse-nl-batch?stream=true',
+                           json={'items': ['Please ' + text for text in ITEMS], 'project_id': project_id})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(line['index'] for line in lines) == list(range(len(ITEMS)))
+    assert [line['index'] for line in lines][:2] == [0, 2]
+    assert llm.peak == 2
+
+
+def test_errors_and_timeouts_stay_with_their_item():
+    _parser(FakeLLM(fail_every=2))
+    client, project_id = _client()
+    items = [f"Please {text}" for text in ITEMS]
+
+    body = client.post('/api/tasks/parse-nl-batch', json={'items': items, 'project_id': project_id}).get_json()
+    reasons = [r['parsing_info']['extracted_info'].get('fallback_reason') for r in body['results']]
+    failed = [i for i, reason in enumerate(reasons) if reason == 'error']
+    assert len(failed) == 2 and set(failed) <= set(LLM_ITEMS)
+    assert all(body['results'][i]['title'] for i in range(len(items)))
+
+    # Only the slow items time out; the batch still answers every item
+    parser = _parser(FakeLLM(latency=0.5), max_concurrency=4)
+    results = dict(parser.iter_parse_batch([ITEMS[0], ITEMS[1] + ' again'], item_timeout=0.1))
+    assert results[0]['extracted_info']['source'] == 'rules'
+    assert results[1]['extracted_info']['fallback_reason'] == 'timeout'
+    assert results[1]['extracted_info']['timed_out'] is True
+
+
+def test_fake_backend_needs_no_langchain():
+    hidden = {name: sys.modules.get(name) for name in ('langchain', 'langchain.schema')}
+    sys.modules.update({name: None for name in hidden})
+    try:
+        parsed = NaturalLanguageTaskParser(llm=FakeLLM())._call_llm(FakeLLM(), ITEMS[1])
+    finally:
+        for name, module in hidden.items():
+            if module is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = module
+    assert parsed['title'] == 'Maybe tidy up the onboarding docs'
+    assert parsed['extracted_info']['source'] == 'llm'
+
+
+def teardown_function(function=None):
+    llm_task_parser._parser_instance = None
+
+
+if __name__ == "__main__":
+    run_checks("🧠 Batch NL parsing checks", globals())
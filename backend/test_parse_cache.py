@@ -0,0 +1,92 @@
+"""
+LLM extraction cache checks (cache.py and NaturalLanguageTaskParser's parse cache).
+
+Cache keys ignore case, spacing, quote style and trailing punctuation but not
+the project or the day; entries expire after their TTL and the in-process
+cache evicts least recently used entries. Runs on FakeLLM with no database;
+run directly or with pytest.
+
+    python test_parse_cache.py
+"""
+
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault('NL_LLM_BACKEND', 'fake')
+
+from cache import TTLCache, make_cache
+from llm_task_parser import NaturalLanguageTaskParser
+from fake_llm import FakeLLM
+
+REFERENCE = datetime(2026, 10, 19, 9, 30)
+key = NaturalLanguageTaskParser._parse_cache_key
+
+
+def test_cache_key_normalization():
+    base = key("Maybe tidy up the onboarding docs", 7, REFERENCE)
+    assert key("  maybe TIDY up\tthe   onboarding docs!! ", 7, REFERENCE) == base
+    assert key("Maybe tidy up the onboarding docs.", 7, REFERENCE.replace(hour=23)) == base
+    assert key("Fix the “login” page’s copy", 7, REFERENCE) == key('fix the "login" page\'s copy', 7, REFERENCE)
+
+    # Project and day are part of the key; inner punctuation is not normalized away
+    assert key("Maybe tidy up the onboarding docs", 8, REFERENCE) != base
+    assert key("Maybe tidy up the onboarding docs", 7, REFERENCE.replace(day=20)) != base
+    assert key("Maybe tidy up the onboarding, docs", 7, REFERENCE) != base
+    assert key("Maybe tidy up the onboarding docs", None, REFERENCE).startswith('0:2026-10-19:')
+
+
+def test_ttl_cache_expiry_and_lru():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.set('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+    # Evicts 'a'; the expired entry is dropped when it is read
+    cache.set('short', 'soon gone', ttl=0.05)
+    time.sleep(0.06)
+    assert cache.get('short', 'missing') == 'missing'
+    stats = cache.stats()
+    assert (stats['backend'], stats['size'], stats['hits'], stats['misses']) == ('memory', 1, 3, 2)
+
+    assert isinstance(make_cache('parse_cache_check', maxsize=5, ttl=1, backend='memory'), TTLCache)
+
+
+def test_parser_reuses_extractions_until_they_expire():
+    llm = FakeLLM()
+    parser = NaturalLanguageTaskParser(llm=llm)
+    parser.parse_cache = make_cache('parse_cache_check', maxsize=16, ttl=60, backend='memory')
+    text = "Maybe tidy up the onboarding docs"
+
+    first = parser.parse_natural_language_task(text, reference_date=REFERENCE)
+    again = parser.parse_natural_language_task(f"  {text.upper()}. ", reference_date=REFERENCE)
+    assert first['extracted_info']['source'] == 'llm' and llm.calls == 1
+    assert again['title'] == first['title']
+
+    # Relative dates depend on the day, so tomorrow asks again
+    parser.parse_natural_language_task(text, reference_date=REFERENCE.replace(day=20))
+    assert llm.calls == 2
+
+    parser.parse_cache = make_cache('parse_cache_check', maxsize=16, ttl=0.05, backend='memory')
+    parser.parse_natural_language_task(text, reference_date=REFERENCE)
+    time.sleep(0.06)
+    parser.parse_natural_language_task(text, reference_date=REFERENCE)
+    assert llm.calls == 4
+
+
+if __name__ == "__main__":
+    print("🗃️  Parse cache checks")
+    print("=" * 50)
+    failures = 0
+    for name, check in [(n, f) for n, f in list(globals().items()) if n.startswith('test_') and callable(f)]:
+        try:
+            check()
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e}")
+    if failures:
+        raise SystemExit(1)
+    print("🎉 All checks passed!")
@@ -0,0 +1,52 @@
+"""
+Batch priority insights checks (/api/tasks/priority/insights).
+
+One query for any number of tasks, answers in request order and identical
+to the single-task endpoint.
+
+    python test_priority_insights.py
+"""
+
+from sqlalchemy import event
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from task_prioritization import TaskPrioritizationEngine
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_batch_priority_insights():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        tasks[3].dependency_map = [tasks[0].id, tasks[1].id, tasks[2].id]
+        tasks[3].effort_score, tasks[0].impact_score = 5, 1
+        hidden = seed_project()[2][0]
+        db.session.commit()
+        TaskPrioritizationEngine.update_project_task_priorities(project.id)
+        client, project_id = client_for(user), project.id
+        ids, hidden_id = [t.id for t in tasks], hidden.id
+    client.post('/api/tasks/priority/insights', json={'project_id': project_id})
+
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            body = client.post('/api/tasks/priority/insights',
+                               json={'task_ids': [ids[3], ids[0], hidden_id, ids[3], 999999]}).get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    assert len([s for s in statements if 'FROM tasks' in s]) == 1
+    assert [i['task_id'] for i in body['insights']] == [ids[3], ids[0]]
+    assert body['not_found'] == [hidden_id, 999999]
+    for insight in body['insights']:
+        assert insight == client.get(f"/api/tasks/priority/insights/{insight['task_id']}").get_json()
+
+    body = client.post('/api/tasks/priority/insights', json={'project_id': project_id}).get_json()
+    assert [i['task_id'] for i in body['insights']] == ids
+    assert client.post('/api/tasks/priority/insights', json={}).status_code == 400
+
+
+if __name__ == "__main__":
+    run_checks("🔍 Priority insights checks", globals())
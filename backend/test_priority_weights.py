@@ -0,0 +1,75 @@
+"""
+Priority weight profile checks (task_prioritization.py).
+
+Batch scoring parity with the per-task factor functions, the what-if
+re-ranking endpoint, and saving a profile with its background re-score
+(run eagerly here).
+
+    python test_priority_weights.py
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from task_prioritization import TaskPrioritizationEngine
+from models import Tasks, PriorityWeightProfile
+from celery_app import celery
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_batch_scoring_matches_factor_functions():
+    rows = [SimpleNamespace(id=i, due_date=date.today() + timedelta(days=i % 45 - 5) if i % 7 else None,
+                            effort_score=i % 7, impact_score=(i * 3) % 7, dependency_map=list(range(i % 7)))
+            for i in range(200)]
+    factors = TaskPrioritizationEngine.factor_matrix(rows)
+    for row, (urgency, effort, dependency, impact) in zip(rows, factors.tolist()):
+        assert (urgency, effort, dependency, impact) == (
+            TaskPrioritizationEngine.calculate_urgency_score(row.due_date),
+            TaskPrioritizationEngine.calculate_effort_score(row.effort_score or 3),
+            TaskPrioritizationEngine.calculate_dependency_score(row.id, row.dependency_map),
+            TaskPrioritizationEngine.calculate_impact_score(row.impact_score or 3))
+    assert TaskPrioritizationEngine.score_rows(rows, TaskPrioritizationEngine.WEIGHTS) == [
+        TaskPrioritizationEngine.calculate_priority_score(row, TaskPrioritizationEngine.WEIGHTS) for row in rows]
+
+
+def test_priority_weight_profiles():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        for i, task in enumerate(tasks):
+            task.impact_score = 1 + i % 5
+        db.session.commit()
+        TaskPrioritizationEngine.update_project_task_priorities(project.id)
+        stored = {t.id: t.priority_score for t in tasks}
+        client, project_id = client_for(user), project.id
+
+    urgent_only = {'urgency': 1, 'effort': 0, 'dependency': 0, 'impact': 0}
+    body = client.post(f'/api/tasks/priority/what-if/{project_id}', json={'weights': urgent_only}).get_json()
+    # Open tasks 0, 2, 4 are due today, in 2 and in 4 days with rising impact, so the
+    # default weights rank them 4, 2, 0 and urgency alone by due date
+    assert [t['task_id'] for t in body['tasks']] == sorted(stored)[0:6:2]
+    assert body['moved_tasks'] == 2 and [t['rank_delta'] for t in body['tasks']] == [2, 0, -2]
+    assert client.post(f'/api/tasks/priority/what-if/{project_id}',
+                       json={'weights': {'urgency': -1}}).status_code == 400
+
+    celery.conf.task_always_eager = True
+    try:
+        response = client.put(f'/api/tasks/priority/weights/{project_id}', json={'weights': urgent_only})
+    finally:
+        celery.conf.task_always_eager = False
+    assert response.status_code == 202 and response.get_json()['rescore'] == 'queued'
+    body = client.get(f'/api/tasks/priority/weights?project_id={project_id}').get_json()
+    assert (body['source'], body['weights']) == ('project', {k: float(v) for k, v in urgent_only.items()})
+
+    with app.app_context():
+        rescored = {t.id: t.priority_score for t in Tasks.query.filter_by(project_id=project_id)}
+        assert rescored != stored and rescored[min(stored)] == 9.5
+        assert TaskPrioritizationEngine.reset_weights(project_id)
+        assert TaskPrioritizationEngine.weights_for(project_id) == TaskPrioritizationEngine.WEIGHTS
+        assert PriorityWeightProfile.query.filter_by(project_id=project_id).count() == 0
+
+
+if __name__ == "__main__":
+    run_checks("⚖️  Priority weight checks", globals())
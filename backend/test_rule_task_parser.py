@@ -0,0 +1,110 @@
+"""
+Rule-based NL task parser checks.
+
+Only confident parses skip the LLM, so the fast path must not read ordinary
+words as dates or people. All dates are relative to Monday 2026-10-19. No
+database or LLM needed; run directly or with pytest.
+
+    python test_rule_task_parser.py
+"""
+
+import os
+from datetime import datetime
+
+os.environ.setdefault('NL_LLM_BACKEND', 'fake')
+
+from rule_task_parser import get_rule_parser
+from llm_task_parser import NaturalLanguageTaskParser
+from llm_gateway import LLMTimeoutError
+
+REFERENCE = datetime(2026, 10, 19)
+
+
+def _parse(text):
+    result = get_rule_parser().parse(text, REFERENCE)
+    return result, result['extracted_info']
+
+
+def test_common_shapes_are_confident():
+    result, info = _parse("Remind John to send the report by Friday")
+    assert (result['title'], result['assignee_name'], result['due_date']) == ('Send the report', 'John', '2026-10-23')
+    assert info['confidence'] == 'high'
+
+    result, info = _parse("Get John to fix the login bug tomorrow")
+    assert (result['title'], result['assignee_name'], result['due_date']) == ('Fix the login bug', 'John', '2026-10-20')
+    assert info['confidence'] == 'high'
+
+    result, info = _parse("Have Sarah review the PR by October 30")
+    assert (result['title'], result['assignee_name'], result['due_date']) == ('Review the PR', 'Sarah', '2026-10-30')
+    assert info['confidence'] == 'high'
+
+
+def test_abbreviations_are_not_dates_without_a_lead_in():
+    for text in ("Update the sun icon on the homepage", "Plan the sat prep course", "Fix the wed mockups"):
+        result, _ = _parse(text)
+        assert result['due_date'] is None, text
+        assert result['title'] == text, text
+
+
+def test_abbreviated_dates_are_never_confident():
+    for text, due in (("Ship the release by sat", '2026-10-24'), ("Review budget next wed", '2026-10-21'),
+                      ("Pay the invoice by sept 5", '2027-09-05'), ("Close the books due on 3 mar", '2027-03-03')):
+        result, info = _parse(text)
+        assert result['due_date'] == due, text
+        assert info['confidence'] != 'high', text
+
+
+def test_dates_inside_the_sentence_are_never_confident():
+    # The date may be part of the title, so these go to the LLM
+    for text in ("Book room for Tuesday standup", "Prepare Friday demo", "Fix bug in 2 days or so",
+                 "Review the tomorrow release plan", "Buy milk today and eggs tomorrow",
+                 "Call the bank on Monday morning"):
+        _, info = _parse(text)
+        assert info['confidence'] != 'high', text
+
+    # A final date or one after a deadline word still is, with a trailing "for" dropped
+    for text, title, due in (("Prepare slides for Friday", 'Prepare slides', '2026-10-23'),
+                             ("Send the deck by Friday to finance", 'Send the deck to finance', '2026-10-23')):
+        result, info = _parse(text)
+        assert (result['title'], result['due_date'], info['confidence']) == (title, due, 'high'), text
+
+
+def test_ordinary_verbs_are_not_assignees():
+    result, info = _parse("Get lunch with Tom tomorrow")
+    assert (result['title'], result['assignee_name'], result['due_date']) == ('Get lunch with Tom', None, '2026-10-20')
+
+    result, _ = _parse("have a look at the logs today")
+    assert (result['title'], result['assignee_name']) == ('Have a look at the logs', None)
+
+
+def test_self_reminders_drop_the_lead_in():
+    for text in ("Remind me to send invoice tomorrow", "I need to send invoice tomorrow"):
+        result, info = _parse(text)
+        assert (result['title'], result['assignee_name'], result['due_date']) == ('Send invoice', None, '2026-10-20')
+        assert info['confidence'] == 'high'
+
+
+def test_fallback_and_post_processing_use_the_reference_date():
+    parser = NaturalLanguageTaskParser()
+    fallback = parser._llm_fallback("Send invoice tomorrow", LLMTimeoutError("slow"), REFERENCE)
+    assert fallback['due_date'] == '2026-10-20'
+    assert fallback['extracted_info']['fallback_reason'] == 'timeout'
+
+    result = parser._post_process_parsed_data({'title': 'Send invoice', 'due_date': 'tomorrow'}, None, REFERENCE)
+    assert result['due_date'] == '2026-10-20'
+
+
+if __name__ == "__main__":
+    print("🧩 Rule-based task parser checks")
+    print("=" * 50)
+    failures = 0
+    for name, check in [(n, f) for n, f in list(globals().items()) if n.startswith('test_') and callable(f)]:
+        try:
+            check()
+            print(f"   ✅ {name}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {name}: {e}")
+    if failures:
+        raise SystemExit(1)
+    print("🎉 All checks passed!")
@@ -0,0 +1,81 @@
+"""
+Full-text search checks (/api/search).
+
+Needs SQLite FTS5; on other databases the endpoint must answer 503.
+
+    python test_search.py
+"""
+
+from sqlalchemy import text
+
+from testing_support import app, db, seed_project, make_user, client_for, reset_schema, drop_schema, run_checks
+from search_index import SearchIndex
+from models import Discussions, Notifications
+
+
+def setup_module(module=None):
+    reset_schema()
+    with app.app_context():
+        if SearchIndex.is_supported():
+            SearchIndex.install()
+
+
+def teardown_module(module=None):
+    drop_schema()
+    with app.app_context():
+        if SearchIndex.is_supported():
+            with db.engine.begin() as connection:
+                for fts_table in SearchIndex.SOURCES:
+                    connection.execute(text(f"DROP TABLE IF EXISTS {fts_table}"))
+
+
+def _search(client, **params):
+    return client.get('/api/search/', query_string=params)
+
+
+def test_search_results():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        tasks[0].title = '<script>alert(1)</script> Pitch deck'
+        tasks[1].description = 'Collect the numbers for the quarterly roadmap'
+        tasks[2].title = 'Roadmap'
+        db.session.add(Discussions(message='Roadmap draft is ready for review', user_id=user.id, project_id=project.id))
+        db.session.add(Notifications(user_id=user.id, title='Roadmap review', message='Roadmap roadmap roadmap',
+                                     type='general', project_id=project.id))
+        outsider = make_user('Search Outsider')
+        db.session.commit()
+        client, outsider = client_for(user), client_for(outsider)
+        task_ids, supported = [t.id for t in tasks], SearchIndex.is_supported()
+
+    if not supported:
+        assert _search(client, q='pitch').status_code == 503
+        return
+
+    body = _search(client, q='pitch').get_json()
+    [hit] = body['results']
+    assert hit['id'] == task_ids[0]
+    assert '<script>' not in hit['snippet'] and '&lt;script&gt;' in hit['snippet']
+    assert '<mark>Pitch</mark>' in hit['snippet']
+
+    # The snippet comes from the column that matched (description, not title)
+    [hit] = _search(client, q='quarterly').get_json()['results']
+    assert hit['id'] == task_ids[1] and '<mark>quarterly</mark>' in hit['snippet']
+
+    # Each type's best hit scores 1.0, whatever its table's bm25 scale
+    results = _search(client, q='roadmap').get_json()['results']
+    assert sorted(r['type'] for r in results[:3]) == ['discussion', 'notification', 'task']
+    assert all(r['score'] == 1.0 for r in results[:3])
+    assert results[3]['id'] == task_ids[1] and 0 < results[3]['score'] < 1.0
+    assert [r['type'] for r in _search(client, q='roadmap', types='discussion').get_json()['results']] == ['discussion']
+
+    page = _search(client, q='roadmap', limit=2).get_json()
+    assert len(page['results']) == 2 and page['has_more'] is True
+
+    assert _search(outsider, q='roadmap').get_json()['results'] == []
+    assert _search(client, q='').status_code == 400
+    assert _search(client, q='roadmap', types='task,nope').status_code == 400
+    assert _search(client, q='roadmap', limit='x').status_code == 400
+
+
+if __name__ == "__main__":
+    run_checks("🔎 Search checks", globals())
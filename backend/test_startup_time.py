@@ -0,0 +1,81 @@
+"""
+Import-time budget check for create_app().
+
+Starts a fresh interpreter (so nothing is cached in sys.modules), times
+`from app import create_app; create_app()` and verifies the LLM stack is
+not loaded at startup. Run directly or with pytest.
+
+    python test_startup_time.py
+    STARTUP_BUDGET_SECONDS=0.8 python test_startup_time.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_BUDGET_SECONDS = float(os.getenv('STARTUP_BUDGET_SECONDS', '1.0'))
+RUNS = 3
+
+# Modules that must only load when a feature that needs them is used
+LAZY_MODULES = ['langchain', 'langchain_core', 'langchain_google_genai', 'google.generativeai', 'matplotlib', 'numpy']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_cold_start():
+    """Run create_app() in a fresh interpreter and return (seconds, loaded module names)"""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['elapsed'], set(result['modules'])
+
+
+def test_llm_stack_not_imported_at_startup():
+    _, modules = measure_cold_start()
+    loaded = [name for name in LAZY_MODULES if name in modules]
+    assert not loaded, f"create_app() imported lazy modules: {loaded}"
+
+
+def test_create_app_within_budget():
+    # Best of a few runs so one noisy run does not fail the budget
+    best = min(measure_cold_start()[0] for _ in range(RUNS))
+    assert best <= STARTUP_BUDGET_SECONDS, (
+        f"create_app() cold start took {best:.3f}s (budget {STARTUP_BUDGET_SECONDS:.3f}s)"
+    )
+
+
+if __name__ == "__main__":
+    print("⏱️  create_app() Cold Start Budget")
+    print("=" * 50)
+
+    timings = []
+    for run in range(RUNS):
+        elapsed, modules = measure_cold_start()
+        timings.append(elapsed)
+        print(f"   Run {run + 1}: {elapsed:.3f}s")
+
+    loaded = [name for name in LAZY_MODULES if name in modules]
+    best = min(timings)
+
+    print(f"\n   Best: {best:.3f}s (budget {STARTUP_BUDGET_SECONDS:.3f}s)")
+    if loaded:
+        print(f"❌ Lazy modules imported at startup: {', '.join(loaded)}")
+    else:
+        print("✅ LLM stack not imported at startup")
+
+    if best <= STARTUP_BUDGET_SECONDS and not loaded:
+        print("🎉 Startup within budget!")
+    else:
+        print("⚠️ Startup budget exceeded")
+        sys.exit(1)
@@ -0,0 +1,77 @@
+"""
+Status catalog checks (status_catalog.py).
+
+Warm task listings read statuses from the catalog, and status writes
+reach it immediately.
+
+    python test_status_catalog.py
+"""
+
+from sqlalchemy import event, text
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from status_catalog import StatusCatalog
+from models import CustomStatus
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_status_catalog_follows_status_writes():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        client, project_id, todo_id = client_for(user), project.id, tasks[0].status_id
+    assert client.get(f'/api/tasks/project/{project_id}').status_code == 200
+
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            body = client.get(f'/api/tasks/project/{project_id}').get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    assert {t['status']['name'] for t in body} == {'To Do', 'Done'}
+    assert not [s for s in statements if 'custom_status' in s]
+
+    assert client.put(f'/api/custom-status/{todo_id}', json={'name': 'Backlog'}).status_code == 200
+    body = client.get(f'/api/tasks/project/{project_id}').get_json()
+    assert {t['status']['name'] for t in body} == {'Backlog', 'Done'}
+    with app.app_context():
+        version = StatusCatalog.version(project_id)
+        StatusCatalog.invalidate(project_id)
+        assert StatusCatalog.version(project_id) != version
+        assert StatusCatalog.default_status(project_id)['id'] == todo_id
+
+
+def test_task_writes_without_a_usable_status():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        client, project_id, todo_id = client_for(user), project.id, tasks[0].status_id
+        spare = CustomStatus(name='Spare', position=3, project_id=project_id)
+        db.session.add(spare)
+        db.session.commit()
+        spare_id = spare.id
+        assert StatusCatalog.status(project_id, spare_id)
+
+        # Deleted behind the catalog's back, as by another process with CACHE_BACKEND=memory
+        db.session.execute(text("DELETE FROM custom_status WHERE id = :id"), {'id': spare_id})
+        db.session.commit()
+        foreign_keys_enforced = db.engine.dialect.name == 'postgresql'
+
+    if foreign_keys_enforced:
+        draft = {'title': 'Stale status', 'project_id': project_id}
+        assert client.post('/api/tasks/', json={**draft, 'status_id': spare_id}).status_code == 400
+        with app.app_context():
+            assert StatusCatalog.status(project_id, spare_id) is None
+
+    # Without a default status, new tasks still need an explicit status_id
+    assert client.put(f'/api/custom-status/{todo_id}', json={'is_default': False}).status_code == 200
+    with app.app_context():
+        assert StatusCatalog.default_status(project_id, fallback_to_first=False) is None
+        assert StatusCatalog.default_status(project_id)['id'] == todo_id
+    assert client.post('/api/tasks/', json={'title': 'No default', 'project_id': project_id}).status_code == 400
+
+
+if __name__ == "__main__":
+    run_checks("🗂️  Status catalog checks", globals())
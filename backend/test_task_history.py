@@ -0,0 +1,43 @@
+"""
+Task history checks (task_history.py).
+
+Task writes append task_events rows in the same transaction, and flow
+metrics are folded from that log.
+
+    python test_task_history.py
+"""
+
+from datetime import timedelta
+
+from testing_support import app, db, seed_project, reset_schema, drop_schema, run_checks
+from task_history import TaskHistory
+from models import TaskEvent
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_task_events_follow_task_writes():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        done_id = tasks[1].status_id
+        todo_id = tasks[0].status_id
+        tasks[0].status_id = done_id
+        tasks[2].due_date = tasks[2].due_date + timedelta(days=3)
+        db.session.delete(tasks[4])
+        db.session.commit()
+
+        kinds = [row.kind for row in TaskEvent.query.filter_by(project_id=project.id).order_by(TaskEvent.id)]
+        assert kinds.count(TaskEvent.CREATED) == 6
+        assert {TaskEvent.STATUS, TaskEvent.DUE_DATE, TaskEvent.DELETED} <= set(kinds[6:])
+        change = TaskEvent.query.filter_by(task_id=tasks[0].id, kind=TaskEvent.STATUS).one()
+        assert (change.old_value, change.new_value) == (todo_id, done_id)
+
+        flow = TaskHistory.flow_metrics(project.id)
+        # Tasks 1, 3 and 5 were created done, task 0 completed later; task 4 is deleted
+        assert flow['completed_tasks'] == 4
+        assert set(flow['completed_at']) == {tasks[i].id for i in (0, 1, 3, 5)}
+
+
+if __name__ == "__main__":
+    run_checks("📜 Task history checks", globals())
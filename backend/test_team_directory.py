@@ -0,0 +1,106 @@
+"""
+Team name resolution checks (team_directory.py).
+
+Each TeamNameIndex tier (exact, token/nickname, prefix, fuzzy) and ambiguity
+on a small in-memory team, then the shared directory following team adds,
+removals through /api/team and user renames.
+
+    python test_team_directory.py
+"""
+
+from testing_support import app, db, seed_project, make_user, client_for, reset_schema, drop_schema, run_checks
+from team_directory import TeamNameIndex, get_team_directory, edit_distance
+from models import Users
+from config import Config
+
+teardown_module = drop_schema
+
+
+def setup_module(module=None):
+    reset_schema()
+    # Project ids restart with the schema; drop indexes cached by earlier test modules
+    get_team_directory().invalidate()
+
+
+MEMBERS = [
+    {'id': 1, 'name': 'John Smith', 'email': 'jsmith@example.com'},
+    {'id': 2, 'name': 'Samantha Jones', 'email': 'sam.j@example.com'},
+    {'id': 3, 'name': 'José Álvarez', 'email': 'jose@example.com'},
+    {'id': 4, 'name': 'Robert Brown', 'email': 'rb@example.com'},
+    {'id': 5, 'name': 'Johanna Smythe', 'email': 'jo@example.com'},
+]
+
+
+def _resolve(index, name):
+    result = index.resolve(name)
+    return result['user_id'], result['match']
+
+
+def test_name_index_tiers():
+    index = TeamNameIndex(1, MEMBERS)
+
+    assert _resolve(index, 'John Smith') == (1, 'exact')
+    assert _resolve(index, 'JSMITH@example.com') == (1, 'exact')
+    assert _resolve(index, 'jose alvarez') == (3, 'exact')
+    assert _resolve(index, 'Bob') == (4, 'token')
+    assert _resolve(index, 'jones') == (2, 'token')
+    assert _resolve(index, 'Samanth') == (2, 'prefix')
+    assert _resolve(index, 'John S') == (1, 'prefix')
+    assert _resolve(index, 'Robret') == (4, 'fuzzy')  # transposition
+    assert _resolve(index, 'Samanta Jnes') == (2, 'fuzzy')
+    assert _resolve(index, 'Nobody Here') == (None, None)
+    assert _resolve(index, '') == (None, None)
+
+    # A tier matching several members stops there and reports them
+    ambiguous = index.resolve('Sm')
+    assert (ambiguous['user_id'], ambiguous['match'], ambiguous['candidates']) == (None, 'prefix', [1, 5])
+
+    assert edit_distance('robert', 'robret') == 1 and edit_distance('smith', 'smythe', limit=1) == 2
+
+
+def test_directory_follows_team_changes():
+    with app.app_context():
+        owner, project, _ = seed_project('Olivia Owner')
+        newcomer = make_user('Priya Patel')
+        db.session.commit()
+        client, project_id, owner_id, newcomer_id = client_for(owner), project.id, owner.id, newcomer.id
+        directory = get_team_directory()
+        assert directory.resolve('Olivia', project_id)['user_id'] == owner_id
+        assert directory.resolve('Priya', project_id)['user_id'] is None
+
+    assert client.post('/api/team/add', json={'project_id': project_id, 'user_id': newcomer_id}).status_code == 201
+    with app.app_context():
+        assert directory.resolve('Priya', project_id) == {'user_id': newcomer_id, 'match': 'token', 'candidates': []}
+
+    assert client.post('/api/team/remove', json={'project_id': project_id, 'user_id': newcomer_id}).status_code == 200
+    with app.app_context():
+        assert directory.resolve('Priya', project_id)['user_id'] is None
+        assert directory.resolve('Olivia Owner', project_id)['user_id'] == owner_id
+
+
+def test_directory_follows_user_renames():
+    directory = get_team_directory()
+    assert directory._indexes.ttl == Config.TEAM_DIRECTORY_TTL
+    with app.app_context():
+        owner, project, _ = seed_project('Quentin Quill')
+        db.session.commit()
+        project_id, owner_id = project.id, owner.id
+        assert directory.resolve('Quentin', project_id)['user_id'] == owner_id
+
+        owner.name = 'Rosa Reyes'
+        db.session.flush()
+        # Not dropped until the rename commits
+        assert directory.resolve('Quentin', project_id)['user_id'] == owner_id
+        db.session.commit()
+        assert directory.resolve('Quentin', project_id)['user_id'] is None
+        assert directory.resolve('Rosa', project_id)['user_id'] == owner_id
+
+        # A rolled back rename leaves the index alone
+        db.session.get(Users, owner_id).name = 'Sam Stone'
+        db.session.flush()
+        db.session.rollback()
+        assert directory.resolve('Rosa', project_id)['user_id'] == owner_id
+
+
+if __name__ == "__main__":
+    run_checks("📇 Team directory checks", globals())
@@ -0,0 +1,70 @@
+"""
+Terminal status checks (CustomStatus.progress / is_terminal).
+
+Completion, progress and deadline risk follow the is_terminal flag rather
+than status names.
+
+    python test_terminal_statuses.py
+"""
+
+from testing_support import app, db, seed_project, client_for, reset_schema, drop_schema, run_checks
+from task_history import TaskHistory
+from deadline_warnings import DeadlineWarningEngine
+from models import Tasks, CustomStatus
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_terminal_statuses_drive_completion():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        todo, done = tasks[0].custom_status, tasks[1].custom_status
+        assert (todo.progress, todo.is_terminal, done.progress, done.is_terminal) == (0.2, False, 1.0, True)
+        client, project_id, task_id = client_for(user), project.id, tasks[0].id
+
+    response = client.post('/api/custom-status/', json={'name': 'Shipped', 'project_id': project_id, 'is_terminal': True, 'progress': 1})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    shipped_id = response.get_json()['status']['id']
+    assert client.post('/api/custom-status/', json={'name': 'Odd', 'project_id': project_id, 'progress': 2}).status_code == 400
+
+    with app.app_context():
+        assert TaskHistory.done_status_ids(project_id) == {tasks[1].status_id, shipped_id}
+        task = db.session.get(Tasks, task_id)
+        task.status_id = shipped_id
+        db.session.commit()
+        assert DeadlineWarningEngine.calculate_progress_score(task) == 1.0
+    body = client.get(f'/api/analytics/project/{project_id}/deadline-risk').get_json()
+    assert body['completed_tasks'] == 4
+
+
+def test_rename_rederives_progress_unless_given():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        client, project_id = client_for(user), project.id
+        todo_id, done_id = tasks[0].status_id, tasks[1].status_id
+        review = client.post('/api/custom-status/', json={'name': 'Review', 'project_id': project_id}).get_json()['status']
+        assert (review['progress'], review['is_terminal']) == (0.8, False)
+
+    assert client.put(f"/api/custom-status/{review['id']}", json={'name': 'Done and dusted'}).status_code == 200
+    assert client.put(f'/api/custom-status/{todo_id}', json={'name': 'Parked', 'progress': 0.3}).status_code == 200
+    with app.app_context():
+        statuses = {s['id']: (s['progress'], s['is_terminal'])
+                    for s in client.get(f'/api/custom-status/project/{project_id}').get_json()}
+        assert statuses[review['id']] == (1.0, True) and statuses[todo_id] == (0.3, False)
+        assert TaskHistory.done_status_ids(project_id) == {done_id, review['id']}
+
+        # Deadline analysis skips every task in a terminal status
+        open_tasks = [t for t in Tasks.query.all() if t.due_date and not t.custom_status.is_terminal]
+        assert DeadlineWarningEngine.analyze_all_tasks()['total_tasks_analyzed'] == len(open_tasks)
+
+    # Only a whole, un-negated word counts, so these stay open
+    for name in ('Not Done', 'Undone', 'Not yet done', 'Non-closed', 'Redeployed'):
+        assert client.put(f"/api/custom-status/{review['id']}", json={'name': name}).status_code == 200
+        with app.app_context():
+            status = db.session.get(CustomStatus, review['id'])
+            assert (status.progress, status.is_terminal) == (0.2, False), name
+
+
+if __name__ == "__main__":
+    run_checks("🏁 Terminal status checks", globals())
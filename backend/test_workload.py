@@ -0,0 +1,71 @@
+"""
+Workload-aware assignment checks (workload.py, /api/assignment).
+
+Member loads, greedy placement, and the load index following committed
+task writes. Allocation speed is checked in test_assignment_speed.py.
+
+    python test_workload.py
+"""
+
+from testing_support import (app, db, seed_project, make_user, add_member, client_for, reset_schema,
+                             drop_schema, run_checks)
+from workload import WorkloadBalancer
+from models import Tasks
+
+setup_module = reset_schema
+teardown_module = drop_schema
+
+
+def test_workload_balancing():
+    with app.app_context():
+        user, project, tasks = seed_project()
+        other = make_user('Workload Check')
+        add_member(project, other)
+        db.session.commit()
+
+        # Open tasks 0, 2 and 4 (effort 3) are due today, in 2 and in 4 days
+        loads = WorkloadBalancer.member_loads(project.id)
+        crowding = 3 + 3 * (1 - 2 / 14) + 3 * (1 - 4 / 14)
+        assert (loads[user.id]['active_effort'], loads[user.id]['open_tasks']) == (9, 3)
+        assert loads[user.id]['crowding'] == round(crowding, 2) and loads[other.id]['load'] == 0
+        assert WorkloadBalancer.allocate({1: 0, 2: 0}, [('a', 5), ('b', 4), ('c', 3), ('d', 3)]) == \
+            {'a': 1, 'b': 2, 'c': 2, 'd': 1}
+        suggestions = WorkloadBalancer.suggest(project.id, [{'effort_score': 3}] * 3)
+        assert [s['assigned_to'] for s in suggestions] == [other.id] * 3
+
+        index = WorkloadBalancer.index(project.id)
+        todo_id = tasks[0].status_id
+        unassigned = [Tasks(title=f'Unassigned {i}', project_id=project.id, status_id=todo_id, effort_score=5)
+                      for i in range(2)]
+        db.session.add_all(unassigned)
+        db.session.commit()
+        client, project_id, user_id, other_id = client_for(user), project.id, user.id, other.id
+        task_id, done_id = tasks[0].id, tasks[1].status_id
+
+    body = client.post(f'/api/assignment/project/{project_id}/auto-assign', json={}).get_json()
+    assert [a['assigned_to'] for a in body['assignments']] == [other_id, other_id]
+    assert client.put(f'/api/tasks/{task_id}', json={'status_id': done_id}).status_code == 200
+    body = client.post('/api/tasks/', json={'title': 'Balanced', 'project_id': project_id, 'auto_assign': True,
+                                            'effort_score': 1}).get_json()
+    # 6 open effort plus 4.71 crowding against 10 effort with no due dates
+    assert body['assigned_to'] == other_id
+
+    with app.app_context():
+        # Commits updated the cached index in place
+        assert WorkloadBalancer.index(project_id) is index
+        loads = WorkloadBalancer.member_loads(project_id)
+        assert (loads[user_id]['active_effort'], loads[user_id]['open_tasks']) == (6, 2)
+        assert (loads[other_id]['active_effort'], loads[other_id]['open_tasks']) == (11, 3)
+        WorkloadBalancer.invalidate(project_id)
+        assert WorkloadBalancer.member_loads(project_id) == loads
+
+    # Scores sent as strings are coerced; anything else is a 400, not a 500
+    draft = {'title': 'Typed', 'project_id': project_id, 'auto_assign': True}
+    response = client.post('/api/tasks/', json={**draft, 'effort_score': '2'})
+    assert response.status_code == 201 and response.get_json()['assigned_to'] in (user_id, other_id)
+    assert client.post('/api/tasks/', json={**draft, 'effort_score': 'lots'}).status_code == 400
+    assert client.post('/api/tasks/', json={**draft, 'blocked_by': 'task 1'}).status_code == 400
+
+
+if __name__ == "__main__":
+    run_checks("⚖️  Workload checks", globals())
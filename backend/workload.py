@@ -0,0 +1,294 @@
+import heapq
+import threading
+from datetime import date, datetime
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from database import db
+from db_routing import RoutingSession
+from models import Tasks, TeamMembers, Users
+from cache import TTLCache
+from status_catalog import StatusCatalog
+from config import Config
+
+
+class WorkloadIndex:
+    """
+    Open work of one project, per assignee
+
+    tasks holds every task's (assignee, effort, due ordinal, blocked) while it
+    is open; members holds per assignee the running totals, with effort due
+    per due date so crowding can be weighed against any day.
+    """
+
+    def __init__(self, project_id: int, catalog_version: int, terminal_ids):
+        self.project_id = project_id
+        self.catalog_version = catalog_version
+        self.terminal_ids = frozenset(terminal_ids)
+        self.tasks = {}    # task_id -> (assignee, effort, due ordinal or None, blocked)
+        self.members = {}  # user_id -> [active effort, blocked effort, open tasks, {due ordinal: effort}]
+
+    def entry(self, assigned_to, status_id, effort_score, due_date, blocked_by) -> Optional[Tuple]:
+        """A task's contribution, or None once it is in a terminal status"""
+        if status_id in self.terminal_ids:
+            return None
+        due = due_date.toordinal() if isinstance(due_date, date) else due_date
+        return (assigned_to, effort_score or WorkloadBalancer.DEFAULT_EFFORT, due, bool(blocked_by))
+
+    def apply(self, task_id: int, entry: Optional[Tuple]) -> None:
+        """Replace a task's contribution (None removes it)"""
+        old = self.tasks.pop(task_id, None)
+        if old is not None:
+            self._add(old, -1)
+        if entry is not None:
+            self.tasks[task_id] = entry
+            self._add(entry, 1)
+
+    def _add(self, entry: Tuple, sign: int) -> None:
+        assignee, effort, due, blocked = entry
+        if assignee is None:
+            return
+        load = self.members.setdefault(assignee, [0, 0, 0, {}])
+        load[1 if blocked else 0] += sign * effort
+        load[2] += sign
+        if due is not None:
+            remaining = load[3].get(due, 0) + sign * effort
+            if remaining:
+                load[3][due] = remaining
+            else:
+                load[3].pop(due, None)
+        if not load[2]:
+            del self.members[assignee]
+
+
+class WorkloadBalancer:
+    """
+    Workload-Aware Task Assignment
+
+    Keeps a live load index per project and hands new work to whoever has
+    the least of it:
+    1. Load: active (unblocked) open effort, plus blocked effort at
+       WORKLOAD_BLOCKED_WEIGHT (it will land on the assignee, just not yet),
+       plus crowding: effort due within WORKLOAD_CROWDING_DAYS, weighted from
+       0 (due at the end of the window) to 1 (due today or overdue)
+    2. Index: built from one column-projected task query, then updated in
+       place from each committed session's task changes (see
+       _apply_task_changes), so reads never rescan the project. Processes see
+       each other's writes within WORKLOAD_INDEX_TTL
+    3. Allocation: a min-heap of (load, member); tasks are taken largest cost
+       first and each goes to the least loaded member, whose load grows by the
+       task's cost. O((tasks + members) log members) per batch
+    """
+
+    # Effort assumed for tasks without an effort_score
+    DEFAULT_EFFORT = 3
+
+    _indexes = TTLCache(maxsize=512, ttl=Config.WORKLOAD_INDEX_TTL)
+    _lock = threading.Lock()
+
+    # ---------- index ----------
+
+    @classmethod
+    def index(cls, project_id: int) -> WorkloadIndex:
+        """The project's load index, rebuilt if missing or its statuses changed"""
+        catalog_version = StatusCatalog.version(project_id)
+        index = cls._indexes.get(str(project_id))
+        if index is not None and index.catalog_version == catalog_version:
+            return index
+
+        index = WorkloadIndex(project_id, catalog_version, StatusCatalog.terminal_ids(project_id))
+        rows = db.session.query(
+            Tasks.id, Tasks.assigned_to, Tasks.status_id, Tasks.effort_score, Tasks.due_date, Tasks.blocked_by
+        ).filter(Tasks.project_id == project_id)
+        with cls._lock:
+            for row in rows:
+                index.apply(row.id, index.entry(row.assigned_to, row.status_id, row.effort_score,
+                                                row.due_date, row.blocked_by))
+            cls._indexes.set(str(project_id), index)
+        return index
+
+    @classmethod
+    def apply_changes(cls, changes: Dict[Tuple[int, int], Optional[Tuple]]) -> None:
+        """Fold committed task changes {(project_id, task_id): fields or None} into loaded indexes"""
+        with cls._lock:
+            for (project_id, task_id), fields in changes.items():
+                index = cls._indexes.get(str(project_id))
+                if index is not None:
+                    index.apply(task_id, index.entry(*fields) if fields is not None else None)
+
+    @classmethod
+    def invalidate(cls, project_id: int) -> None:
+        cls._indexes.delete(str(project_id))
+
+    # ---------- load ----------
+
+    @staticmethod
+    def urgency(due: Optional[int], today: int) -> float:
+        """0 for no or distant due dates, rising to 1 for work due today or overdue"""
+        if due is None:
+            return 0.0
+        window = Config.WORKLOAD_CROWDING_DAYS
+        days = due - today
+        if days <= 0:
+            return 1.0
+        return max(0.0, 1 - days / window)
+
+    @classmethod
+    def task_cost(cls, effort: Optional[int], due: Optional[date] = None, blocked: bool = False,
+                  today: Optional[date] = None) -> float:
+        """How much a task adds to its assignee's load"""
+        today = today or datetime.utcnow().date()
+        effort = effort or cls.DEFAULT_EFFORT
+        weight = Config.WORKLOAD_BLOCKED_WEIGHT if blocked else 1.0
+        due = due.toordinal() if isinstance(due, date) else due
+        return effort * weight + effort * cls.urgency(due, today.toordinal())
+
+    @classmethod
+    def member_loads(cls, project_id: int, today: Optional[date] = None) -> Dict[int, Dict]:
+        """
+        Load breakdown for every team member of the project
+
+        Returns:
+            Dict: user_id -> {load, active_effort, blocked_effort, crowding,
+            open_tasks}; members without open work have zero load
+        """
+        today = (today or datetime.utcnow().date()).toordinal()
+        member_ids = [row.user_id for row in db.session.query(TeamMembers.user_id).filter(
+            TeamMembers.project_id == project_id
+        )]
+        index = cls.index(project_id)
+
+        with cls._lock:
+            return {user_id: cls.member_load(index, user_id, today) for user_id in member_ids}
+
+    @classmethod
+    def member_load(cls, index: WorkloadIndex, user_id: int, today: int) -> Dict:
+        """One member's load breakdown on day `today` (an ordinal)"""
+        active, blocked, open_tasks, due = index.members.get(user_id, (0, 0, 0, {}))
+        crowding = sum(effort * cls.urgency(day, today) for day, effort in due.items())
+        return {
+            "load": round(active + blocked * Config.WORKLOAD_BLOCKED_WEIGHT + crowding, 2),
+            "active_effort": active,
+            "blocked_effort": blocked,
+            "crowding": round(crowding, 2),
+            "open_tasks": open_tasks,
+        }
+
+    # ---------- allocation ----------
+
+    @staticmethod
+    def allocate(loads: Dict[int, float], costs: Iterable[Tuple[Hashable, float]]) -> Dict[Hashable, int]:
+        """
+        Greedy balanced assignment
+
+        Args:
+            loads: member -> current load (every candidate member)
+            costs: (key, cost) per task to place
+
+        Returns:
+            Dict: key -> member, largest tasks placed first, each on the
+            member with the lowest load so far (ties to the lower id)
+        """
+        if not loads:
+            return {}
+        heap = [(load, user_id) for user_id, load in loads.items()]
+        heapq.heapify(heap)
+        assignment = {}
+        for key, cost in sorted(costs, key=lambda c: c[1], reverse=True):
+            load, user_id = heap[0]
+            assignment[key] = user_id
+            heapq.heapreplace(heap, (load + cost, user_id))
+        return assignment
+
+    @classmethod
+    def suggest(cls, project_id: int, drafts: Sequence[Dict], today: Optional[date] = None) -> List[Dict]:
+        """
+        Balanced assignees for tasks that don't exist yet
+
+        Args:
+            drafts: [{effort_score, due_date (date or YYYY-MM-DD), blocked_by}]
+
+        Returns:
+            List: per draft, in order, {index, assigned_to, cost}; assigned_to
+            is None if the project has no members
+        """
+        today = today or datetime.utcnow().date()
+        costs = []
+        for i, draft in enumerate(drafts):
+            due = draft.get("due_date")
+            if isinstance(due, str):
+                due = datetime.strptime(due, "%Y-%m-%d").date()
+            costs.append((i, cls.task_cost(draft.get("effort_score"), due, bool(draft.get("blocked_by")), today)))
+
+        loads = {user_id: load["load"] for user_id, load in cls.member_loads(project_id, today).items()}
+        assignment = cls.allocate(loads, costs)
+        return [{"index": i, "assigned_to": assignment.get(i), "cost": round(cost, 2)} for i, cost in costs]
+
+    @classmethod
+    def auto_assign(cls, project_id: int, task_ids: Optional[List[int]] = None, dry_run: bool = False,
+                    today: Optional[date] = None) -> Dict:
+        """
+        Assign open unassigned tasks (all of the project's, or just task_ids) across the team
+
+        Returns:
+            Dict: assignments [{task_id, assigned_to, cost}], skipped task ids
+            (missing, closed or already assigned) and the members' loads after
+        """
+        today = today or datetime.utcnow().date()
+        terminal_ids = StatusCatalog.terminal_ids(project_id)
+        query = Tasks.query.filter(Tasks.project_id == project_id, Tasks.assigned_to.is_(None))
+        if task_ids is not None:
+            query = query.filter(Tasks.id.in_(task_ids))
+        tasks = {t.id: t for t in query if t.status_id not in terminal_ids}
+        skipped = sorted(set(task_ids or ()) - set(tasks))
+
+        costs = [(t.id, cls.task_cost(t.effort_score, t.due_date, bool(t.blocked_by), today)) for t in tasks.values()]
+        loads = cls.member_loads(project_id, today)
+        assignment = cls.allocate({user_id: load["load"] for user_id, load in loads.items()}, costs)
+
+        if assignment and not dry_run:
+            for task_id, user_id in assignment.items():
+                tasks[task_id].assigned_to = user_id
+            db.session.commit()
+            loads = cls.member_loads(project_id, today)
+
+        names = dict(db.session.query(Users.id, Users.name).filter(Users.id.in_(loads))) if loads else {}
+        cost_by_id = dict(costs)
+        return {
+            "project_id": project_id,
+            "dry_run": dry_run,
+            "assignments": [{"task_id": task_id, "assigned_to": user_id, "cost": round(cost_by_id[task_id], 2)}
+                            for task_id, user_id in sorted(assignment.items())],
+            "skipped": skipped,
+            "members": [{"user_id": user_id, "name": names.get(user_id), **load}
+                        for user_id, load in sorted(loads.items(), key=lambda item: item[1]["load"])],
+        }
+
+
+# ---------- index maintenance ----------
+
+def _task_fields(task: Tasks) -> Tuple:
+    return (task.assigned_to, task.status_id, task.effort_score, task.due_date, task.blocked_by)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _collect_task_changes(session, flush_context):
+    """Remember this flush's task writes until the transaction commits"""
+    changes = session.info.setdefault('workload_changes', {})
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Tasks):
+            changes[(obj.project_id, obj.id)] = _task_fields(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Tasks):
+            changes[(obj.project_id, obj.id)] = None
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _apply_task_changes(session):
+    changes = session.info.pop('workload_changes', None)
+    if changes:
+        WorkloadBalancer.apply_changes(changes)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_task_changes(session):
+    session.info.pop('workload_changes', None)